@@ -18,27 +18,38 @@
 """
 
 import sys
+import time
+import signal
+import logging
 import argparse
 from pathlib import Path
-from typing import Dict, Any
-
-from textual.app import App
-from textual.reactive import reactive
+from typing import Dict, Any, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.plugins.system_plugin import SystemPlugin
-from src.plugins.wifi_plugin import WiFiPlugin
-from src.plugins.network_plugin import NetworkPlugin
-from src.plugins.packet_analyzer_plugin import PacketAnalyzerPlugin
-from src.plugins.network_topology_plugin import NetworkTopologyPlugin, MockNetworkTopologyPlugin
-from src.plugins.arp_spoofing_detector import ARPSpoofingDetector, MockARPSpoofingDetector
-from src.plugins.dns_monitor_plugin import DNSMonitorPlugin
-from src.plugins.http_sniffer_plugin import HTTPSnifferPlugin
-from src.plugins.rogue_ap_detector import RogueAPDetector
-from src.plugins.handshake_capturer import HandshakeCapturer
-from src.plugins.base import PluginConfig
+# --profile-startup has to hook imports before the heavy ones below
+from src.utils.startup_profiler import StartupProfiler
+STARTUP_PROFILER = StartupProfiler.from_argv(sys.argv)
+
+from textual.app import App
+from textual.reactive import reactive
+
+# Plugin modules are cheap to import: scapy and requests load on first real-mode use
+from src.plugins.base import DEFAULT_MONITOR_INTERFACE
+from src.plugins.activation import PluginActivation
+from src.plugins.lifecycle import PluginLifecycle
+from src.plugins.packet_queue import DEFAULT_QUEUE_SIZE, DEFAULT_SAMPLE_EVERY, OVERFLOW_POLICIES
+from src.plugins.packet_sampler import DEFAULT_CPU_BUDGET, DEFAULT_SAMPLING_RATE, SAMPLING_MODES
+from src.plugins.packet_recorder import PacketRecorder
+from src.plugins.worker_pool import WorkerPool
+from src.plugins.plugin_config import PluginConfigWatcher
+from src.plugins.plugin_set import DEFAULT_PLUGIN_SPECS, build_plugin_set, reload_plugin_set
+from src.daemon import CollectorDaemon, DaemonClient, default_socket_path
+from src.utils.event_log import EventLog
+from src.utils.metrics_store import MetricsStore
+from src.utils.perf import get_perf_registry
+from src.utils.rollups import DEFAULT_TIERS, parse_duration, with_retention
 
 from src.screens import (
     LandingScreen,
@@ -55,8 +66,32 @@
     HTTPSnifferDashboard,
     RogueAPDashboard,
     HandshakeDashboard,
+    PerfDashboard,
 )
 
+if STARTUP_PROFILER:
+    STARTUP_PROFILER.mark("imports")
+
+
+# Plugins whose capture threads/scans run only while a screen shows them
+SCREEN_PLUGINS = {
+    "topology": ("topology",),
+    "arp_detector": ("arp_detector",),
+    "dns_monitor": ("dns_monitor",),
+    "http_sniffer": ("http_sniffer",),
+    "rogue_ap": ("rogue_ap",),
+    "handshake": ("handshake",),
+}
+
+# Seconds an unused plugin keeps running (cheap screen flipping)
+PLUGIN_GRACE_PERIOD = 30.0
+
+# Seconds between metric samples written to --history
+HISTORY_SAMPLE_INTERVAL = 1.0
+
+# Plugin set, rates and budgets (--config), used when present
+DEFAULT_CONFIG_PATH = Path(__file__).parent / "config" / "dashboard.yml"
+
 
 class WiFiSecurityDashboardApp(App):
     """
@@ -95,6 +130,7 @@ class WiFiSecurityDashboardApp(App):
         ("3", "switch_screen('wifi')", "WiFi"),
         ("4", "switch_screen('packets')", "Packets"),
         ("5", "switch_screen('topology')", "Topology"),
+        ("i", "switch_screen('perf')", "Perf"),
         ("escape", "back_to_menu", "Menu"),
         ("backspace", "back_to_menu", "Menu"),
         ("tab", "cycle_screen", "Next Screen"),
@@ -109,17 +145,76 @@ class WiFiSecurityDashboardApp(App):
     paused = reactive(False)
     current_screen_index = reactive(0)
 
-    def __init__(self, mock_mode: bool = False):
+    def __init__(self, mock_mode: bool = False, profiler: Optional[StartupProfiler] = None,
+                 history_path: Optional[str] = None, history_tiers=DEFAULT_TIERS,
+                 remote: Optional[DaemonClient] = None, event_log: Optional[EventLog] = None,
+                 packet_recorder: Optional[PacketRecorder] = None,
+                 capture_settings: Optional[Dict[str, Any]] = None,
+                 worker_pool: Optional[WorkerPool] = None,
+                 plugin_config: Optional[PluginConfigWatcher] = None):
         """
         Initialize dashboard application.
 
         Args:
             mock_mode: If True, use mock data instead of real metrics
+            profiler: Startup profiler; the app exits after the first frame
+            history_path: SQLite file for metrics history and plugin state
+                (real mode only; None disables persistence)
+            history_tiers: Rollup tiers and their retention
+            remote: Connected daemon client (--attach); plugins become
+                proxies for the daemon's collectors
+            event_log: JSON-lines sink for detections (real mode only)
+            packet_recorder: pcapng ring frozen on CRITICAL alerts (real mode only)
+            capture_settings: Packet queue size/overflow policy and sampling
+                for the capture plugins (see build_capture_settings)
+            worker_pool: Processes running DNS analysis (real mode only)
+            plugin_config: Watcher of the plugins section of --config; file
+                changes are applied to the running plugins
         """
         super().__init__()
-        self.mock_mode = mock_mode
-
-        # Plugins (initialized in on_mount)
+        self.mock_mode = remote.mock_mode if remote else mock_mode
+        self.profiler = profiler
+        self.remote = remote
+        if remote:
+            remote.on_event = self._on_daemon_event
+
+        # On-demand plugins start with their first consumer (see SCREEN_PLUGINS)
+        self.activation = PluginActivation(grace_period=PLUGIN_GRACE_PERIOD)
+        self.lifecycle = PluginLifecycle(self.activation)
+        self._screen_consumer = None
+
+        # Metrics history / plugin state survives restarts (--history)
+        self.history = MetricsStore(history_path, tiers=history_tiers) if history_path else None
+        self.lifecycle.resources.metrics_store = self.history
+        self._history_sampled = 0.0
+
+        # DNS queries, HTTP requests, alerts and handshakes for the SIEM (--events)
+        self.event_log = event_log
+        self.lifecycle.resources.event_log = event_log
+
+        # Packets from before an alert (--pcap-ring)
+        self.packet_recorder = packet_recorder
+        self.lifecycle.resources.packet_recorder = packet_recorder
+
+        # Bounded capture -> analysis queues and sampling (--capture-queue, --sampling)
+        self.lifecycle.resources.capture_settings = dict(capture_settings or {})
+
+        # Multi-process packet analysis (--workers)
+        self.worker_pool = worker_pool
+        self.lifecycle.resources.worker_pool = worker_pool
+
+        # Which plugins run, their rates and budgets (--config)
+        self.plugin_config = plugin_config
+        self.lifecycle.resources.plugin_specs = plugin_config.specs if plugin_config else None
+
+        # Latency per plugin, packet handler and screen (perf inspector)
+        self.perf = get_perf_registry()
+        self.lifecycle.resources.perf = self.perf
+
+        # Plugins (initialized in on_mount; None if disabled in --config)
+        self.plugins: Dict[str, Any] = {}
+        # {name: (plugin, its last collect_data())} between collections
+        self._collected: Dict[str, Tuple[Any, Dict[str, Any]]] = {}
         self.system_plugin = None
         self.wifi_plugin = None
         self.network_plugin = None
@@ -144,12 +239,24 @@ def __init__(self, mock_mode: bool = False):
             "http_sniffer",
             "rogue_ap",
             "handshake",
+            "perf",
         ]
 
     def on_mount(self) -> None:
         """Called when app is mounted. Setup plugins, screens, and timers."""
+        if self.history:
+            self.history.start()
+        if self.event_log:
+            self.event_log.start()
+        if self.packet_recorder:
+            self.packet_recorder.start(self.lifecycle.resources.capture_hub,
+                                       self.lifecycle.resources.capture_settings.get('interfaces'),
+                                       capture=not self.mock_mode)
+
         # Initialize plugins
         self._initialize_plugins()
+        if self.profiler:
+            self.profiler.mark("plugins")
 
         # Install screens (but don't show them yet)
         mode = "mock" if self.mock_mode else "real"
@@ -165,8 +272,11 @@ def on_mount(self) -> None:
         self.install_screen(HTTPSnifferDashboard(), name="http_sniffer")
         self.install_screen(RogueAPDashboard(), name="rogue_ap")
         self.install_screen(HandshakeDashboard(), name="handshake")
+        self.install_screen(PerfDashboard(), name="perf")
         self.install_screen(HelpScreen(), name="help")
         self.install_screen(TutorialScreen(), name="tutorial")
+        for name in self.screen_names:
+            self.perf.instrument_screen(name, self.get_screen(name))
 
         # Check if this is first run - show tutorial if needed
         if TutorialScreen.should_show_tutorial():
@@ -174,9 +284,14 @@ def on_mount(self) -> None:
         
         # Start with landing page
         self.push_screen("landing")
+        if self.profiler:
+            self.profiler.mark("screens")
+            self.call_after_refresh(self._finish_startup_profile)
 
         # Setup interval timer for data updates (10 FPS = 100ms)
         self.set_interval(0.1, self.update_all_metrics)
+        if self.plugin_config and not self.remote:
+            self.set_interval(self.plugin_config.interval, self._reload_plugin_config)
 
         # Show startup notification
         mode = "MOCK" if self.mock_mode else "REAL"
@@ -187,156 +302,95 @@ def on_mount(self) -> None:
             timeout=5,
         )
 
+    def _finish_startup_profile(self) -> None:
+        """First frame is on screen: stop profiling and exit."""
+        self.profiler.mark("first frame")
+        self.profiler.uninstall()
+        self.exit()
+
     def _initialize_plugins(self) -> None:
-        """Initialize all data collection plugins."""
-        # System Plugin
-        system_config = PluginConfig(
-            name="system",
-            rate_ms=100,  # 10 FPS
-            config={"mock_mode": self.mock_mode}
-        )
-        self.system_plugin = SystemPlugin(system_config)
-        self.system_plugin.initialize()
-
-        # WiFi Plugin
-        wifi_config = PluginConfig(
-            name="wifi",
-            rate_ms=1000,  # 1 Hz (WiFi data changes slowly)
-            config={"interface": "wlan0", "mock_mode": self.mock_mode}
-        )
-        self.wifi_plugin = WiFiPlugin(wifi_config)
-        self.wifi_plugin.initialize()
-
-        # Network Plugin
-        network_config = PluginConfig(
-            name="network",
-            rate_ms=500,  # 2 Hz
-            config={"interface": "wlan0", "mock_mode": self.mock_mode}
-        )
-        self.network_plugin = NetworkPlugin(network_config)
-        self.network_plugin.initialize()
-
-        # PacketAnalyzer Plugin
-        packet_config = PluginConfig(
-            name="packet_analyzer",
-            rate_ms=2000,  # 0.5 Hz (packet capture is slow)
-            config={"interface": "wlan0", "mock_mode": self.mock_mode}
-        )
-        self.packet_analyzer_plugin = PacketAnalyzerPlugin(packet_config)
-        self.packet_analyzer_plugin.initialize()
-        
-        # NetworkTopology Plugin
-        topology_config = PluginConfig(
-            name="topology",
-            rate_ms=30000,  # Scan every 30 seconds
-            config={"mock_mode": self.mock_mode}
-        )
-        if self.mock_mode:
-            self.topology_plugin = MockNetworkTopologyPlugin(topology_config)
-        else:
-            self.topology_plugin = NetworkTopologyPlugin(topology_config)
-        self.topology_plugin.initialize()
-        
-        # ARP Spoofing Detector Plugin
-        arp_config = PluginConfig(
-            name="arp_detector",
-            rate_ms=1000,  # Check every second
-            config={"mock_mode": self.mock_mode}
-        )
-        if self.mock_mode:
-            self.arp_detector_plugin = MockARPSpoofingDetector(arp_config)
+        """Initialize all data collection plugins (tearing down any previous set)."""
+        self.lifecycle.teardown()
+        # Mock data must never overwrite state saved from real captures
+        self.lifecycle.persist_state = not self.mock_mode
+
+        if self.remote:
+            # Attached: plugins, history and mode belong to the daemon
+            if self.remote.mock_mode != self.mock_mode:
+                self.remote.set_mode(self.mock_mode)
+            self.lifecycle.persist_state = False
+            plugins = self.remote.build_plugin_set(self.lifecycle)
         else:
-            self.arp_detector_plugin = ARPSpoofingDetector(arp_config)
-        self.arp_detector_plugin.initialize()
-        
-        # DNS Monitor Plugin
-        dns_config = PluginConfig(
-            name="dns_monitor",
-            rate_ms=500,  # Fast updates for queries
-            config={"mock_mode": self.mock_mode}
-        )
-        self.dns_monitor_plugin = DNSMonitorPlugin(dns_config)
-        self.dns_monitor_plugin.initialize()
-        
-        # HTTP Sniffer Plugin (ETHICAL USE ONLY!)
-        http_config = PluginConfig(
-            name="http_sniffer",
-            rate_ms=1000,
-            config={
-                "mock_mode": self.mock_mode,
-                "ethical_consent": self.mock_mode  # Only auto-consent in mock mode
-            }
-        )
-        self.http_sniffer_plugin = HTTPSnifferPlugin(http_config)
-        self.http_sniffer_plugin.initialize()
-        
-        # Rogue AP Detector Plugin
-        rogue_config = PluginConfig(
-            name="rogue_ap",
-            rate_ms=2000,
-            config={"mock_mode": self.mock_mode}
-        )
-        self.rogue_ap_plugin = RogueAPDetector(rogue_config)
-        self.rogue_ap_plugin.initialize()
-        
-        # Handshake Capturer Plugin (LEGAL USE ONLY!)
-        handshake_config = PluginConfig(
-            name="handshake",
-            rate_ms=2000,
-            config={
-                "mock_mode": self.mock_mode,
-                "ethical_consent": self.mock_mode,  # Only auto-consent in mock
-                "capture_dir": "/tmp/handshakes"
-            }
-        )
-        self.handshake_plugin = HandshakeCapturer(handshake_config)
-        self.handshake_plugin.initialize()
-        
+            plugins = build_plugin_set(self.lifecycle, self.mock_mode)
+
+        self._bind_plugins(plugins)
+
         # Create simple plugin manager for ConsolidatedDashboard
         class SimplePluginManager:
             def __init__(self, app):
                 self.app = app
             def get_plugin_data(self, plugin_name):
-                if plugin_name == 'system':
-                    return self.app.system_plugin.collect_data()
-                elif plugin_name == 'wifi':
-                    return self.app.wifi_plugin.collect_data()
-                elif plugin_name == 'network':
-                    return self.app.network_plugin.collect_data()
-                elif plugin_name == 'packet_analyzer':
-                    return self.app.packet_analyzer_plugin.collect_data()
-                elif plugin_name == 'topology':
-                    return self.app.topology_plugin.collect_data()
-                elif plugin_name == 'arp_detector':
-                    return self.app.arp_detector_plugin.collect_data()
-                elif plugin_name == 'dns_monitor':
-                    return self.app.dns_monitor_plugin.collect_data()
-                elif plugin_name == 'http_sniffer':
-                    return self.app.http_sniffer_plugin.collect_data()
-                elif plugin_name == 'rogue_ap':
-                    return self.app.rogue_ap_plugin.collect_data()
-                elif plugin_name == 'handshake':
-                    return self.app.handshake_plugin.collect_data()
-                return None
+                if plugin_name not in self.app.plugins:
+                    return None
+                return self.app._collect(plugin_name)
         
         self.plugin_manager = SimplePluginManager(self)
 
+    def _bind_plugins(self, plugins: Dict[str, Any]) -> None:
+        """self.system_plugin, self.wifi_plugin, ... (None for plugins no longer running)."""
+        for name in set(self.plugins) - set(plugins):
+            setattr(self, f"{name}_plugin", None)
+        for name, plugin in plugins.items():
+            setattr(self, f"{name}_plugin", plugin)
+        self.plugins = plugins
+
+    def _reload_plugin_config(self) -> None:
+        """Apply --config changes to the running plugins (rates, budgets, enabled)."""
+        specs = self.plugin_config.poll()
+        if specs is None:
+            return
+        plugins, report = reload_plugin_set(self.lifecycle, self.plugins, self.mock_mode, specs)
+        self._bind_plugins(plugins)
+        changes = [f"{key}: {', '.join(names)}" for key, names in report.items() if names]
+        self.notify("\n".join(changes) or "No plugin changes", title="⚙️ Plugin Config Reloaded", timeout=4)
+
+    def _collect(self, name: str) -> Dict[str, Any]:
+        """
+        Data of plugin ``name`` at its configured rate ({} if it is disabled).
+
+        collect_data() runs only when the plugin's ``rate_ms`` has elapsed
+        (should_collect()); refreshes in between reuse its last result.
+        """
+        plugin = self.plugins.get(name)
+        if not plugin:
+            return {}
+        cached = self._collected.get(name)
+        if cached is not None and cached[0] is plugin and not plugin.should_collect():
+            return cached[1]
+        data = plugin.collect_tracked()
+        self._collected[name] = (plugin, data)
+        return data
+
     def update_all_metrics(self) -> None:
         """
         Collect data from all plugins and update current screen.
 
-        Called every 100ms (10 FPS) by set_interval timer.
+        Called every 100ms (10 FPS) by set_interval timer; each plugin
+        collects at its own ``rate_ms`` (see _collect()).
         Only updates the currently visible screen for efficiency.
         """
+        self.perf.tick()
+
         # Skip updates if paused
         if self.paused:
             return
 
         # Collect data from all plugins
-        system_data = self.system_plugin.collect_data()
-        wifi_data = self.wifi_plugin.collect_data()
-        network_data = self.network_plugin.collect_data()
-        packet_data = self.packet_analyzer_plugin.collect_data()
+        system_data = self._collect("system")
+        wifi_data = self._collect("wifi")
+        network_data = self._collect("network")
+        packet_data = self._collect("packet_analyzer")
+        self._record_history(system_data, network_data, wifi_data)
 
         # Update current screen based on which one is active
         current_screen = self.screen
@@ -356,6 +410,38 @@ def update_all_metrics(self) -> None:
             current_screen.update_metrics(packet_data)
         # HelpScreen doesn't need updates
 
+    def _on_daemon_event(self, event: Dict[str, Any]) -> None:
+        """Daemon event (client reader thread)."""
+        if event.get("event") == "mode":
+            try:
+                self.call_from_thread(self._daemon_mode_changed, event.get("mode") == "mock")
+            except RuntimeError:
+                pass  # App not running (yet / any more)
+
+    def _daemon_mode_changed(self, mock_mode: bool) -> None:
+        """Another client switched the daemon's mode: follow it."""
+        if mock_mode == self.mock_mode:
+            return
+        self.mock_mode = mock_mode
+        mode_label = "MOCK (Educational)" if mock_mode else "REAL (Live Data)"
+        self.notify(f"Daemon switched to {mode_label}", title="🔄 Mode Changed", severity="information")
+
+    def _record_history(self, system_data: Dict[str, Any], network_data: Dict[str, Any],
+                        wifi_data: Dict[str, Any]) -> None:
+        """Buffer a metrics sample (once per HISTORY_SAMPLE_INTERVAL, real mode only)."""
+        if not self.history or self.mock_mode:
+            return
+        now = time.time()
+        if now - self._history_sampled < HISTORY_SAMPLE_INTERVAL:
+            return
+        self._history_sampled = now
+        self.history.record_many("system", system_data, now)
+        self.history.record_many("network", network_data, now)
+        self.history.record_many("wifi", wifi_data, now)
+        if self.activation.is_running("dns_monitor"):
+            self.history.record("dns.queries_per_minute",
+                                self.dns_monitor_plugin.stats['queries_per_minute'], now)
+
     def action_switch_screen(self, screen_name: str) -> None:
         """
         Switch to a specific screen by name.
@@ -364,6 +450,7 @@ def action_switch_screen(self, screen_name: str) -> None:
             screen_name: Name of screen to switch to ("consolidated", "system", etc.)
         """
         if screen_name in self.screen_names:
+            self._use_screen_plugins(screen_name)
             self.switch_screen(screen_name)
             self.current_screen_index = self.screen_names.index(screen_name)
 
@@ -375,10 +462,23 @@ def action_switch_screen(self, screen_name: str) -> None:
                 "wifi": "📡 WiFi Details",
                 "packets": "📦 Packet Analysis",
                 "topology": "🗺️ Network Topology",
+                "perf": "⏱️ Perf Inspector",
             }
             title = screen_titles.get(screen_name, screen_name.title())
             self.notify(f"Switched to: {title}", timeout=2)
 
+    def _use_screen_plugins(self, screen_name: str) -> None:
+        """Make ``screen_name`` the consumer of its plugins, releasing the previous screen's."""
+        consumer = f"screen:{screen_name}"
+        if consumer == self._screen_consumer:
+            return
+
+        if self._screen_consumer:
+            self.activation.release_consumer(self._screen_consumer)
+        for plugin_name in SCREEN_PLUGINS.get(screen_name, ()):
+            self.activation.acquire(plugin_name, consumer)
+        self._screen_consumer = consumer
+
     def action_cycle_screen(self) -> None:
         """Cycle to next screen (Tab key)."""
         self.current_screen_index = (self.current_screen_index + 1) % len(self.screen_names)
@@ -396,6 +496,7 @@ def action_back_to_menu(self) -> None:
             if hasattr(menu_widget, 'current_mode'):
                 menu_widget.current_mode = mode
 
+        self._use_screen_plugins("landing")
         self.switch_screen("landing")
         self.notify("Back to main menu", timeout=1)
 
@@ -404,8 +505,10 @@ def action_toggle_mode(self) -> None:
         self.mock_mode = not self.mock_mode
         new_mode = "mock" if self.mock_mode else "real"
 
-        # Reinitialize plugins with new mode
+        # Tear down the old plugin set and build one for the new mode
         self._initialize_plugins()
+        counts = self.lifecycle.resource_counts()
+        sockets = counts['sockets'] if counts['sockets'] is not None else "?"
 
         # Update landing screen
         try:
@@ -421,7 +524,7 @@ def action_toggle_mode(self) -> None:
         # Notify user
         mode_label = "MOCK (Educational)" if self.mock_mode else "REAL (Live Data)"
         self.notify(
-            f"Switched to {mode_label}",
+            f"Switched to {mode_label} ({counts['threads']} threads, {sockets} sockets)",
             title="🔄 Mode Changed",
             severity="information"
         )
@@ -454,49 +557,22 @@ def get_plugin_data(self, plugin_name: str) -> Dict[str, Any]:
         """
         if plugin_name == 'topology' and self.topology_plugin:
             return self.topology_plugin.get_data()
-        elif plugin_name == 'system' and self.system_plugin:
-            return self.system_plugin.collect_data()
-        elif plugin_name == 'wifi' and self.wifi_plugin:
-            return self.wifi_plugin.collect_data()
-        elif plugin_name == 'network' and self.network_plugin:
-            return self.network_plugin.collect_data()
-        elif plugin_name == 'packet_analyzer' and self.packet_analyzer_plugin:
-            return self.packet_analyzer_plugin.collect_data()
-        elif plugin_name == 'arp_detector' and self.arp_detector_plugin:
-            return self.arp_detector_plugin.collect_data()
-        elif plugin_name == 'dns_monitor' and self.dns_monitor_plugin:
-            return self.dns_monitor_plugin.collect_data()
-        elif plugin_name == 'http_sniffer' and self.http_sniffer_plugin:
-            return self.http_sniffer_plugin.collect_data()
-        elif plugin_name == 'rogue_ap' and self.rogue_ap_plugin:
-            return self.rogue_ap_plugin.collect_data()
-        elif plugin_name == 'handshake' and self.handshake_plugin:
-            return self.handshake_plugin.collect_data()
-        return {}
+        return self._collect(plugin_name)
     
     def action_quit(self) -> None:
         """Quit the application gracefully."""
-        # Cleanup all plugins
-        if self.system_plugin:
-            self.system_plugin.cleanup()
-        if self.wifi_plugin:
-            self.wifi_plugin.cleanup()
-        if self.network_plugin:
-            self.network_plugin.cleanup()
-        if self.packet_analyzer_plugin:
-            self.packet_analyzer_plugin.cleanup()
-        if self.topology_plugin:
-            self.topology_plugin.stop()
-        if self.arp_detector_plugin:
-            self.arp_detector_plugin.cleanup()
-        if self.dns_monitor_plugin:
-            self.dns_monitor_plugin.cleanup()
-        if self.http_sniffer_plugin:
-            self.http_sniffer_plugin.cleanup()
-        if self.rogue_ap_plugin:
-            self.rogue_ap_plugin.cleanup()
-        if self.handshake_plugin:
-            self.handshake_plugin.cleanup()
+        # Stop on-demand workers now and clean up every plugin
+        self.lifecycle.teardown()
+        if self.history:
+            self.history.close()
+        if self.event_log:
+            self.event_log.close()
+        if self.packet_recorder:
+            self.packet_recorder.stop()
+        if self.worker_pool:
+            self.worker_pool.stop()
+        if self.remote:
+            self.remote.close()
 
         self.exit()
 
@@ -524,6 +600,18 @@ def parse_args():
 Examples:
   python app_textual.py              # Run with real data
   python app_textual.py --mock       # Run with mock data (educational)
+  python app_textual.py --mock --profile-startup   # Time startup, then exit
+  python app_textual.py --history ~/.local/share/wf-tool/history.db   # Keep history
+  sudo python app_textual.py --events /var/log/wf-tool/events.jsonl --events-compress gzip
+  sudo python app_textual.py --pcap-ring /var/lib/wf-tool/pcap   # Lookback pcaps for alerts
+  sudo python app_textual.py --daemon      # Headless collectors on a Unix socket
+  python app_textual.py --attach           # UI for a running daemon (several allowed)
+  sudo python app_textual.py --daemon --metrics-port 9469   # ...plus Prometheus /metrics
+  sudo python app_textual.py --capture-queue 50000 --overflow-policy drop-oldest
+  sudo python app_textual.py --sampling adaptive --sampling-budget 0.5   # Busy mirror port
+  sudo python app_textual.py --workers 4   # DNS/HTTP analysis on 4 cores
+  sudo python app_textual.py --interface eth0 --interface wlan0 --monitor-interface wlan1mon
+  sudo python app_textual.py --config /etc/wf-tool/sensor.yml   # Plugins, rates, budgets
 
 Author: Juan-Dev - Soli Deo Gloria ✝️
         """
@@ -536,17 +624,350 @@ def parse_args():
         help='Run in mock mode with simulated data (educational, no root required)'
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run the collectors headless and serve them on --socket (no UI)'
+    )
+
+    parser.add_argument(
+        '--attach',
+        action='store_true',
+        help='Attach to a running --daemon instead of capturing in this process'
+    )
+
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        default=default_socket_path(),
+        help='Unix socket of the collector daemon (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--metrics-port',
+        metavar='PORT',
+        type=int,
+        help='With --daemon: serve Prometheus/OpenMetrics /metrics on 127.0.0.1:PORT '
+             '(keeps the ARP, DNS, rogue AP and handshake detectors running)'
+    )
+
+    parser.add_argument(
+        '--history',
+        metavar='PATH',
+        help='Keep metrics history and plugin state in this SQLite file (real mode)'
+    )
+
+    parser.add_argument(
+        '--history-retention',
+        metavar='SPEC',
+        type=with_retention,
+        default=DEFAULT_TIERS,
+        help='Per-tier retention, e.g. "1s=2d,1min=30d,1h=forever" '
+             '(default: 1s=1d,1min=7d,1h=365d)'
+    )
+
+    parser.add_argument(
+        '--events',
+        metavar='PATH',
+        help='Append DNS queries, HTTP requests, alerts and handshakes to this '
+             'JSON-lines file (real mode)'
+    )
+
+    parser.add_argument(
+        '--events-max-size',
+        metavar='MB',
+        type=int,
+        default=64,
+        help='Rotate the event log at this size (default: %(default)s MB)'
+    )
+
+    parser.add_argument(
+        '--events-max-age',
+        metavar='DURATION',
+        type=parse_duration,
+        default=3600.0,
+        help='Rotate the event log at this age, e.g. 30m, 1d, forever (default: 1h)'
+    )
+
+    parser.add_argument(
+        '--events-compress',
+        choices=['gzip', 'zstd'],
+        help='Compress rotated event logs (zstd needs: pip install zstandard)'
+    )
+
+    parser.add_argument(
+        '--pcap-ring',
+        metavar='DIR',
+        help='Record all frames on the --interface NICs in a ring of pcapng files; '
+             'CRITICAL alerts freeze the ring into DIR/lookback (real mode). 802.11 '
+             'frames are only recorded while the rogue AP or handshake plugin runs, '
+             'and without capture privileges only what the running plugins capture'
+    )
+
+    parser.add_argument(
+        '--pcap-ring-files',
+        metavar='N',
+        type=int,
+        default=8,
+        help='Segments in the pcap ring (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--pcap-segment-size',
+        metavar='MB',
+        type=int,
+        default=16,
+        help='Size of each pcap ring segment (default: %(default)s MB)'
+    )
+
+    parser.add_argument(
+        '--interface',
+        metavar='IFACE',
+        action='append',
+        dest='interfaces',
+        default=[],
+        help='Capture and count traffic on IFACE; repeat for several interfaces '
+             '(e.g. wired uplink and WiFi), each captured concurrently with its '
+             'own counters (default: the WiFi interface)'
+    )
+
+    parser.add_argument(
+        '--wifi-interface',
+        metavar='IFACE',
+        default='wlan0',
+        help='Managed WiFi NIC for signal/link metrics (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--monitor-interface',
+        metavar='IFACE',
+        default=DEFAULT_MONITOR_INTERFACE,
+        help='Monitor-mode NIC for beacon and EAPOL capture (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--capture-queue',
+        metavar='N',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help='Packets each capture plugin buffers for analysis (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--overflow-policy',
+        choices=[policy.replace('_', '-') for policy in OVERFLOW_POLICIES],
+        default='drop-newest',
+        help='What a full capture queue drops: the arriving packet, the oldest '
+             'one, or all but every --sample-every-th packet (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--sample-every',
+        metavar='N',
+        type=int,
+        default=DEFAULT_SAMPLE_EVERY,
+        help='With --overflow-policy sample: packets admitted under pressure, 1 in N '
+             '(default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--sampling',
+        choices=SAMPLING_MODES,
+        default='off',
+        help='Analyse a sample of the traffic for volume counters (totals, top talkers, '
+             'protocols), scaled back up with 95%% intervals: 1 in N packets (count), '
+             '1 in N flows (flow) or N tuned to --sampling-budget (adaptive). '
+             'ARP, DNS, EAPOL and beacons are never sampled (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--sampling-rate',
+        metavar='N',
+        type=int,
+        default=DEFAULT_SAMPLING_RATE,
+        help='N of --sampling count/flow, starting N of adaptive (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--sampling-budget',
+        metavar='FRACTION',
+        type=float,
+        default=DEFAULT_CPU_BUDGET,
+        help='With --sampling adaptive: share of one core for packet analysis '
+             '(default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        metavar='N',
+        type=int,
+        default=0,
+        help='Analyse DNS (and, once consent is given, HTTP) traffic in N worker '
+             'processes, sharded by flow; other plugins stay in-process '
+             '(real mode; default: in-process)'
+    )
+
+    parser.add_argument(
+        '--config',
+        metavar='PATH',
+        help='Dashboard config whose plugins section enables plugins and sets their '
+             'rate, interface and budget (queue, entries, CPU share); edits apply '
+             'while running (default: config/dashboard.yml, if present)'
+    )
+
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='Print an import-time breakdown and time to first frame, then exit'
+    )
+
+    args = parser.parse_args()
+    if args.metrics_port is not None and not args.daemon:
+        parser.error("--metrics-port requires --daemon")
+    if args.capture_queue < 1 or args.sample_every < 1:
+        parser.error("--capture-queue and --sample-every must be positive")
+    if args.sampling_rate < 1 or args.sampling_budget <= 0:
+        parser.error("--sampling-rate and --sampling-budget must be positive")
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    return args
+
+
+def build_capture_settings(args) -> Dict[str, Any]:
+    """Capture plugin packet queue, sampling and interface settings from the command line."""
+    return {
+        'interfaces': list(dict.fromkeys(args.interfaces)),
+        'wifi_interface': args.wifi_interface,
+        'monitor_interface': args.monitor_interface,
+        'queue_size': args.capture_queue,
+        'overflow_policy': args.overflow_policy.replace('-', '_'),
+        'sample_every': args.sample_every,
+        'sampling_mode': args.sampling,
+        'sampling_rate': args.sampling_rate,
+        'sampling_cpu_budget': args.sampling_budget
+    }
+
+
+def build_plugin_config(args) -> Optional[PluginConfigWatcher]:
+    """PluginConfigWatcher for --config (exits with a message on a bad file)."""
+    path = args.config
+    if path is None and DEFAULT_CONFIG_PATH.exists():
+        path = str(DEFAULT_CONFIG_PATH)
+    if path is None:
+        return None  # The built-in plugin set
+    try:
+        return PluginConfigWatcher(path, DEFAULT_PLUGIN_SPECS)
+    except ValueError as e:
+        print(f"--config: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def build_worker_pool(args) -> Optional[WorkerPool]:
+    """WorkerPool for --workers (None: analysis runs in-process)."""
+    if not args.workers or args.mock:
+        return None
+    # One packet socket feeds every worker: bound to the only --interface,
+    # unbound (every interface) with several
+    iface = args.interfaces[0] if len(args.interfaces) == 1 else None
+    return WorkerPool(args.workers, iface=iface)
+
+
+def build_event_log(args) -> Optional[EventLog]:
+    """EventLog for --events (exits with a message on bad options)."""
+    if not args.events:
+        return None
+    try:
+        return EventLog(args.events, max_bytes=args.events_max_size * 1024 * 1024,
+                        max_age=args.events_max_age, compression=args.events_compress)
+    except (ValueError, OSError) as e:
+        print(f"--events: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def build_packet_recorder(args) -> Optional[PacketRecorder]:
+    """PacketRecorder for --pcap-ring (exits with a message on bad options)."""
+    if not args.pcap_ring:
+        return None
+    try:
+        return PacketRecorder(args.pcap_ring, segment_size=args.pcap_segment_size * 1024 * 1024,
+                              ring_size=args.pcap_ring_files)
+    except (ValueError, OSError) as e:
+        print(f"--pcap-ring: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_daemon(args) -> None:
+    """Run the headless collector daemon until SIGTERM/SIGINT."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    history = None
+    if args.history:
+        history = MetricsStore(args.history, tiers=args.history_retention)
+        history.start()
+    event_log = build_event_log(args)
+    if event_log:
+        event_log.start()
+    recorder = build_packet_recorder(args)
+    pool = build_worker_pool(args)
+
+    daemon = CollectorDaemon(args.socket, mock_mode=args.mock, history=history,
+                             metrics_port=args.metrics_port, event_log=event_log,
+                             packet_recorder=recorder,
+                             capture_settings=build_capture_settings(args),
+                             worker_pool=pool, plugin_config=build_plugin_config(args))
+    if recorder:
+        recorder.start(daemon.lifecycle.resources.capture_hub,
+                       daemon.lifecycle.resources.capture_settings.get('interfaces'),
+                       capture=not args.mock)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.request_stop())
+    try:
+        daemon.serve_forever()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if history:
+            history.close()
+        if event_log:
+            event_log.close()
+        if recorder:
+            recorder.stop()
+        if pool:
+            pool.stop()
 
 
 def main():
     """Main entry point."""
     args = parse_args()
 
+    if args.daemon:
+        run_daemon(args)
+        return
+
+    remote = None
+    if args.attach:
+        remote = DaemonClient(args.socket)
+        try:
+            remote.connect()
+        except ConnectionError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+
     # Create and run Textual app
-    app = WiFiSecurityDashboardApp(mock_mode=args.mock)
+    profiler = STARTUP_PROFILER if args.profile_startup else None
+    app = WiFiSecurityDashboardApp(mock_mode=args.mock, profiler=profiler,
+                                   history_path=None if remote else args.history,
+                                   history_tiers=args.history_retention, remote=remote,
+                                   event_log=None if remote else build_event_log(args),
+                                   packet_recorder=None if remote else build_packet_recorder(args),
+                                   capture_settings=build_capture_settings(args),
+                                   worker_pool=None if remote else build_worker_pool(args),
+                                   plugin_config=None if remote else build_plugin_config(args))
     app.run()
 
+    if profiler:
+        print(profiler.report())
+
 
 if __name__ == "__main__":
     main()
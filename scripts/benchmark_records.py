@@ -0,0 +1,120 @@
+"""
+Benchmark script for the plugin record types.
+
+Compares the slotted records' hand-written to_dict() with
+dataclasses.asdict() on the plain (dict-backed) dataclasses they replaced,
+and memory per record. Reports numbers only: timings depend on the machine
+and its load, so nothing here passes or fails.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import dataclasses
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from plugins.arp_spoofing_detector import ARPEntry, SpoofingAlert
+from plugins.dns_monitor_plugin import DNSQuery
+from plugins.http_sniffer_plugin import HTTPRequest
+from plugins.network_topology_plugin import NetworkDevice
+from plugins.rogue_ap_detector import AccessPoint
+from plugins.traffic_statistics import DeviceStats
+
+
+RECORDS = [
+    ARPEntry(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:ff", timestamp=1.0),
+    SpoofingAlert(ip="10.0.0.1", old_mac="aa", new_mac="bb", timestamp=1.0, severity="HIGH",
+                  description="d", educational_note="n", pcap_files=["a.pcapng"]),
+    DNSQuery(timestamp=1.0, source_ip="10.0.0.2", domain="example.com", query_type="A"),
+    HTTPRequest(timestamp=1.0, source_ip="10.0.0.2", dest_ip="1.1.1.1", method="GET",
+                host="example.com", path="/", cookies="c=1"),
+    NetworkDevice(ip="10.0.0.3", mac="cc", hostname="host", vendor="vendor", last_seen=1.0),
+    AccessPoint(bssid="aa", ssid="home", channel=6, signal_strength=-40, encryption="WPA2",
+                vendor="v", first_seen=1.0, last_seen=2.0),
+    DeviceStats(mac="cc", ip="10.0.0.3", hostname="host", bytes_sent=10, bytes_received=20,
+                packets_sent=1, packets_received=2, protocols={"HTTPS": 3}, first_seen=1.0, last_seen=2.0),
+]
+
+
+def plain_twin(record):
+    """The record as a plain dataclass (instance __dict__)."""
+    cls = type(record)
+    plain = dataclasses.make_dataclass(
+        f"Plain{cls.__name__}",
+        [(f.name, f.type, f) for f in dataclasses.fields(cls)]
+    )
+    return plain(**dataclasses.asdict(record))
+
+
+def serialize_rate(records, to_dict) -> float:
+    """Records serialized per second."""
+    start = time.perf_counter()
+    for record in records:
+        to_dict(record)
+    return len(records) / (time.perf_counter() - start)
+
+
+def memory_per_record(factory, count: int) -> float:
+    """Bytes allocated per record built by ``factory``."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    records = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del records
+    return size / count
+
+
+def benchmark_records(count: int = 20000) -> dict:
+    """
+    Benchmark every record type.
+
+    Args:
+        count: Records serialized (and built) per measurement
+
+    Returns:
+        {record type: {'asdict': rate, 'to_dict': rate, 'plain_bytes': n, 'slotted_bytes': n}}
+    """
+    results = {}
+    for record in RECORDS:
+        plain = plain_twin(record)
+        fields = dataclasses.asdict(record)
+        results[type(record).__name__] = {
+            'asdict': serialize_rate([plain] * count, dataclasses.asdict),
+            'to_dict': serialize_rate([record] * count, type(record).to_dict),
+            'plain_bytes': memory_per_record(lambda: type(plain)(**fields), count),
+            'slotted_bytes': memory_per_record(lambda: type(record)(**fields), count),
+        }
+    return results
+
+
+def main():
+    """Run benchmark and display results."""
+    print("="*60)
+    print("Plugin Record Benchmark (slotted to_dict vs plain asdict)")
+    print("="*60)
+    print()
+
+    print("Running benchmark (20000 records per type)...")
+    results = benchmark_records(20000)
+
+    print()
+    print(f"  {'Record':16s} {'asdict/s':>12s} {'to_dict/s':>12s} {'speedup':>8s} {'bytes':>12s}")
+    print("-"*60)
+    for name, result in results.items():
+        speedup = result['to_dict'] / result['asdict']
+        print(f"  {name:16s} {result['asdict']:12,.0f} {result['to_dict']:12,.0f} {speedup:7.1f}x "
+              f"{result['plain_bytes']:5.0f} -> {result['slotted_bytes']:4.0f}")
+
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
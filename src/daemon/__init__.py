@@ -0,0 +1,17 @@
+"""
+Headless collector daemon and attachable clients.
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+from .server import CollectorDaemon
+from .client import DaemonClient, RemotePlugin
+from .protocol import default_socket_path
+
+__all__ = [
+    "CollectorDaemon",
+    "DaemonClient",
+    "RemotePlugin",
+    "default_socket_path",
+]
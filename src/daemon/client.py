@@ -0,0 +1,260 @@
+"""
+Daemon client - thin TUI side of ``app_textual.py --attach``.
+
+DaemonClient keeps a socket to the collector daemon and a cache of the
+latest snapshot per plugin, kept current by applying the daemon's deltas. RemotePlugin stands in for a real plugin: its
+``collect_data()`` returns the cached snapshot, and initialize()/stop()
+watch/unwatch the plugin on the daemon, so the app's on-demand activation
+drives the daemon's captures unchanged.
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import logging
+import socket
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set
+
+from ..plugins.base import Plugin, PluginConfig, PluginStatus
+from ..plugins.lifecycle import PluginLifecycle
+from ..plugins.snapshot import apply_changes
+from .protocol import MAX_LINE, decode, default_socket_path, encode
+
+
+logger = logging.getLogger(__name__)
+
+
+class DaemonClient:
+    """
+    Connection to a collector daemon.
+
+    Args:
+        socket_path: Daemon socket (default: protocol.default_socket_path())
+        timeout: Seconds to wait for the connection and the daemon's hello
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 5.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self.mode: Optional[str] = None
+        self.plugins: Dict[str, Dict[str, Any]] = {}  # {name: {"on_demand": bool}}
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self.last_status: Optional[Dict[str, Any]] = None
+        self.on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._resyncing: Set[str] = set()  # Deltas missed, full snapshot requested
+        self.stats = {
+            'deltas': 0,
+            'resyncs': 0
+        }
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._status_ready = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._stream = None
+        self._reader: Optional[threading.Thread] = None
+        self.connected = False
+
+    def connect(self) -> None:
+        """
+        Connect and read the daemon's hello.
+
+        Raises:
+            ConnectionError: No daemon on the socket or bad handshake
+        """
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise ConnectionError(
+                f"No collector daemon on {self.socket_path} ({e}). "
+                f"Start one with: python app_textual.py --daemon"
+            ) from e
+
+        stream = sock.makefile('rb')
+        hello = decode(stream.readline(MAX_LINE))
+        if not hello or hello.get("type") != "hello":
+            stream.close()
+            sock.close()
+            raise ConnectionError(f"Unexpected handshake from {self.socket_path}: {hello!r}")
+
+        sock.settimeout(None)
+        self._sock, self._stream = sock, stream
+        self.mode = hello.get("mode")
+        self.plugins = hello.get("plugins", {})
+        self.connected = True
+        self._reader = threading.Thread(target=self._read_loop, name="daemon-client-reader", daemon=True)
+        self._reader.start()
+
+    def close(self) -> None:
+        """Disconnect (the daemon releases everything this client watched)."""
+        self.connected = False
+        if self._sock:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+        if self._reader and self._reader is not threading.current_thread():
+            self._reader.join(timeout=2.0)
+
+    @property
+    def mock_mode(self) -> bool:
+        return self.mode == "mock"
+
+    # Requests
+
+    def _send(self, message: Dict[str, Any]) -> bool:
+        if not self.connected:
+            return False
+        try:
+            with self._send_lock:
+                self._sock.sendall(encode(message))
+            return True
+        except OSError as e:
+            logger.error(f"Lost connection to daemon: {e}")
+            self.connected = False
+            return False
+
+    def watch(self, names: Iterable[str]) -> None:
+        self._send({"op": "watch", "plugins": list(names)})
+
+    def unwatch(self, names: Iterable[str]) -> None:
+        names = list(names)
+        with self._lock:
+            for name in names:
+                self._snapshots.pop(name, None)
+                self._versions.pop(name, None)
+                self._resyncing.discard(name)
+        self._send({"op": "unwatch", "plugins": names})
+
+    def set_mode(self, mock_mode: bool) -> None:
+        """Switch the daemon (and every attached client) to another mode."""
+        if self._send({"op": "set_mode", "mock": mock_mode}):
+            self.mode = "mock" if mock_mode else "real"  # Confirmed by the mode event
+
+    def status(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """Ask the daemon for its status and wait for the reply."""
+        self._status_ready.clear()
+        if not self._send({"op": "status"}):
+            return None
+        self._status_ready.wait(timeout)
+        return self.last_status
+
+    def snapshot(self, name: str) -> Optional[Dict[str, Any]]:
+        """Latest data of ``name`` received from the daemon."""
+        with self._lock:
+            return self._snapshots.get(name)
+
+    # Incoming
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                line = self._stream.readline(MAX_LINE)
+                if not line:
+                    break
+                message = decode(line)
+                if message:
+                    self._dispatch(message)
+        except (OSError, ValueError):
+            pass
+        if self.connected:
+            logger.error("Collector daemon closed the connection")
+        self.connected = False
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        kind = message.get("type")
+        if kind == "snapshot":
+            name = message.get("plugin")
+            with self._lock:
+                self._snapshots[name] = message.get("data") or {}
+                self._versions[name] = message.get("version")
+                self._resyncing.discard(name)
+        elif kind == "changes":
+            self._apply_changes(message.get("plugin"), message.get("changes") or {})
+        elif kind == "event":
+            if message.get("event") == "mode":
+                self.mode = message.get("mode")
+                with self._lock:
+                    self._snapshots.clear()
+                    self._versions.clear()
+            self.events.append(message)
+            if self.on_event:
+                self.on_event(message)
+        elif kind == "status":
+            self.last_status = message
+            self._status_ready.set()
+        elif kind == "error":
+            logger.error(f"Daemon error: {message.get('message')}")
+
+    def _apply_changes(self, name: str, changes: Dict[str, Any]) -> None:
+        """Bring ``name``'s cached snapshot to the delta's version, or ask for a resync."""
+        with self._lock:
+            data = self._snapshots.get(name)
+            if data is not None and self._versions.get(name) == changes.get('since'):
+                self._snapshots[name] = apply_changes(data, changes)
+                self._versions[name] = changes.get('version')
+                self.stats['deltas'] += 1
+                return
+            if name in self._resyncing:
+                return  # Already asked; the full snapshot is on its way
+            self._resyncing.add(name)
+            self.stats['resyncs'] += 1
+        self._send({"op": "resync", "plugins": [name]})
+
+    # Plugin proxies
+
+    def build_plugin_set(self, lifecycle: PluginLifecycle) -> Dict[str, 'RemotePlugin']:
+        """
+        Proxies for every daemon plugin, added to ``lifecycle`` with the
+        daemon's on-demand flags.
+        """
+        plugins = {}
+        for name, info in self.plugins.items():
+            proxy = RemotePlugin(PluginConfig(name=name), self)
+            plugins[name] = lifecycle.add(name, proxy, on_demand=info.get("on_demand", False))
+        return plugins
+
+
+class RemotePlugin(Plugin):
+    """Stand-in for a plugin running in the collector daemon."""
+
+    def __init__(self, config: PluginConfig, client: DaemonClient):
+        super().__init__(config)
+        self.client = client
+
+    def initialize(self) -> None:
+        """Start receiving snapshots (starts on-demand plugins on the daemon)."""
+        self.client.watch([self.name])
+        self._status = PluginStatus.READY
+
+    def stop(self) -> None:
+        """Stop receiving snapshots."""
+        self.client.unwatch([self.name])
+        self._status = PluginStatus.STOPPED
+
+    def cleanup(self) -> None:
+        if self._status is not PluginStatus.STOPPED and self.client.connected:
+            self.stop()
+
+    def should_collect(self) -> bool:
+        """Always: the daemon pushes at the plugin's rate, reading the last push is free."""
+        return True
+
+    def collect_data(self) -> Dict[str, Any]:
+        """Latest snapshot from the daemon ({} until the first arrives)."""
+        return dict(self.client.snapshot(self.name) or {})
+
+    def get_data(self) -> Dict[str, Any]:
+        return self.collect_data()
+
+    def capture_stats(self) -> Optional[Dict[str, Any]]:
+        """The daemon-side plugin's packet queue counters."""
+        return (self.client.snapshot(self.name) or {}).get('capture')
@@ -0,0 +1,63 @@
+"""
+Wire protocol between the collector daemon and attached clients.
+
+Newline-delimited JSON over a Unix stream socket, one object per line.
+
+Client -> daemon (``op``):
+    watch     {"plugins": [...]}   send snapshots of these plugins; on-demand
+                                    plugins are started for this client
+    unwatch   {"plugins": [...]}
+    resync    {"plugins": [...]}   resend the full snapshot (a delta was missed)
+    set_mode  {"mock": bool}       rebuild the daemon's plugins
+    status    {}
+
+Daemon -> client (``type``):
+    hello     {"version", "mode", "plugins": {name: {"on_demand": bool}}}
+    snapshot  {"plugin", "ts", "version", "data"}
+    changes   {"plugin", "ts", "changes"}
+                                    delta from the snapshot at changes.since to
+                                    changes.version (plugins.snapshot.make_changes)
+    event     {"event", ...}       e.g. mode, plugin_started, plugin_stopped,
+                                    config (plugins updated/removed/added by
+                                    a plugin config reload)
+    status    {...}
+    error     {"message"}
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+
+PROTOCOL_VERSION = 2
+
+# Longest line a peer may send (snapshots of big tables included)
+MAX_LINE = 16 * 1024 * 1024
+
+
+def default_socket_path() -> str:
+    """Per-user socket path ($XDG_RUNTIME_DIR if set, else /tmp)."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "wf-tool.sock")
+    return f"/tmp/wf-tool-{os.getuid()}.sock"
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    """Serialize one message (non-JSON values become strings)."""
+    return json.dumps(message, default=str, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def decode(line: bytes) -> Optional[Dict[str, Any]]:
+    """Parse one line; None for blank or malformed lines."""
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    return message if isinstance(message, dict) else None
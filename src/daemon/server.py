@@ -0,0 +1,570 @@
+"""
+Collector daemon - runs the plugins headless and serves them over a Unix socket.
+
+One daemon owns the capture stack; any number of TUI clients
+(``app_textual.py --attach``) share it. Closing a terminal no longer stops
+monitoring, and UI rendering never competes with packet capture.
+
+- A collector thread polls every plugin that has a reader (always-on
+  plugins, and on-demand plugins some client is watching) at its rate
+  (at least once a second), encodes the snapshot once and queues the same
+  bytes to every watching client
+- Each client has a bounded send queue and its own writer thread: a stalled
+  client loses snapshots (counted) instead of stalling the collector
+- Watching an on-demand plugin acquires it for that client through
+  PluginActivation, so captures run only while somebody looks at them
+- Plugins with entity tables (``snapshot_entities``: devices, APs, ARP
+  cache) are streamed as deltas: a full snapshot when a client starts
+  watching, then only the added, updated and removed records. A client
+  that missed a delta (dropped, or joined mid-stream) asks for a resync
+- With a plugin config (``--config``), the collector thread applies file
+  changes: new rates and budgets in place, disabled plugins stopped,
+  enabled ones started. Clients learn of it from a ``config`` event;
+  plugins added after a client attached appear when it reconnects
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import itertools
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..plugins.activation import PluginActivation
+from ..plugins.base import Plugin
+from ..plugins.lifecycle import PluginLifecycle
+from ..plugins.plugin_set import build_plugin_set, reload_plugin_set
+from ..plugins.snapshot import make_changes
+from ..utils.metrics_exporter import COUNTER, GAUGE, MetricFamily, MetricsExporter, perf_families
+from ..utils.perf import get_perf_registry
+from .protocol import MAX_LINE, PROTOCOL_VERSION, decode, default_socket_path, encode
+
+
+logger = logging.getLogger(__name__)
+
+
+# Slowest snapshot rate for any plugin (seconds); topology scans every 30 s
+# but clients still want its live device list
+MAX_PUBLISH_INTERVAL = 1.0
+
+# Plugins whose numeric fields go to the metrics history, and how often
+HISTORY_PLUGINS = ("system", "network", "wifi")
+HISTORY_SAMPLE_INTERVAL = 1.0
+
+
+class _Client:
+    """One attached client: socket, watch set and bounded send queue."""
+
+    def __init__(self, client_id: int, sock: socket.socket, queue_size: int):
+        self.id = client_id
+        self.sock = sock
+        self.consumer = f"client:{client_id}"
+        self.watching: Set[str] = set()
+        self.queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.dropped = 0
+        self.writer: Optional[threading.Thread] = None
+        self.reader: Optional[threading.Thread] = None
+
+    def send(self, payload: bytes) -> bool:
+        """Queue ``payload``; drops it if the client is too far behind."""
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+
+class CollectorDaemon:
+    """
+    Headless plugin host with a Unix socket for clients.
+
+    Args:
+        socket_path: Socket to listen on (default: protocol.default_socket_path())
+        mock_mode: Run mock plugins
+        history: Optional MetricsStore for metrics history and plugin state
+            (real mode only, like the app)
+        tick: Collector loop period in seconds
+        grace_period: Seconds an unwatched on-demand plugin keeps running
+        client_queue: Messages buffered per client before dropping
+        metrics_port: Serve Prometheus /metrics on this localhost port
+            (None: no exporter, 0: any free port)
+        event_log: Optional EventLog for detections (real mode only, like
+            history); started and closed by the caller
+        packet_recorder: Optional PacketRecorder whose ring CRITICAL alerts
+            freeze (real mode only); started and stopped by the caller
+        capture_settings: Packet queue and sampling settings for the capture
+            plugins (queue_size, overflow_policy, sample_every, sampling_mode, ...)
+        worker_pool: Optional WorkerPool running DNS analysis in worker
+            processes (real mode only); stopped by the caller
+        plugin_config: Optional PluginConfigWatcher for the plugins section
+            of the dashboard config (default: the built-in plugin set)
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, mock_mode: bool = False,
+                 history=None, tick: float = 0.1, grace_period: float = 30.0,
+                 client_queue: int = 256, metrics_port: Optional[int] = None,
+                 event_log=None, packet_recorder=None,
+                 capture_settings: Optional[Dict[str, Any]] = None, worker_pool=None,
+                 plugin_config=None):
+        self.socket_path = socket_path or default_socket_path()
+        self.mock_mode = mock_mode
+        self.history = history
+        self.tick = tick
+        self.client_queue = client_queue
+
+        self.activation = PluginActivation(grace_period=grace_period)
+        self.lifecycle = PluginLifecycle(self.activation)
+        self.lifecycle.resources.metrics_store = history
+        self.lifecycle.resources.event_log = event_log
+        self.lifecycle.resources.packet_recorder = packet_recorder
+        self.lifecycle.resources.capture_settings = dict(capture_settings or {})
+        self.lifecycle.resources.worker_pool = worker_pool
+        self.plugin_config = plugin_config
+        self.lifecycle.resources.plugin_specs = plugin_config.specs if plugin_config else None
+        # Per-plugin collect/packet handler latency for /metrics
+        self.lifecycle.resources.perf = get_perf_registry()
+        self.plugins: Dict[str, Plugin] = {}
+
+        # Serializes plugin (re)builds against the collector loop
+        self._plugins_lock = threading.RLock()
+        self._clients_lock = threading.Lock()
+        self._clients: Dict[int, _Client] = {}
+        self._client_ids = itertools.count(1)
+
+        # {plugin: (ts, data)} - latest snapshot, also for late joiners
+        self._snapshots: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # {plugin: version of its latest snapshot}; deltas go from one to the next
+        self._versions: Dict[str, int] = {}
+        self._last_collect: Dict[str, float] = {}
+        self._last_history: Dict[str, float] = {}
+
+        self._stop_event = threading.Event()
+        self._listener: Optional[socket.socket] = None
+        self._threads: List[threading.Thread] = []
+
+        # Scrapes read the cached snapshots, never the plugins' collect_data();
+        # the exporter holds the detectors so they're collected headless
+        self.exporter: Optional[MetricsExporter] = None
+        if metrics_port is not None:
+            self.exporter = MetricsExporter(self.snapshots, self._plugins_snapshot,
+                                            self.metric_families, port=metrics_port,
+                                            activation=self.activation)
+
+        self.stats = {
+            'clients_total': 0,
+            'snapshots': 0,
+            'deltas': 0,
+            'resyncs': 0,
+            'config_reloads': 0,
+            'collect_errors': 0,
+            'dropped': 0
+        }
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Build the plugins, bind the socket and start serving."""
+        self._stop_event.clear()
+        self._listener = self._bind()  # Fails before any capture starts
+        if self.exporter:
+            try:
+                self.exporter.start()
+            except OSError as e:
+                self._listener.close()
+                self._listener = None
+                os.unlink(self.socket_path)
+                raise RuntimeError(f"Cannot serve metrics on port {self.exporter.port}: {e}") from e
+        self._build_plugins()
+        for target, name in ((self._accept_loop, "daemon-accept"), (self._collect_loop, "daemon-collect")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Collector daemon listening on {self.socket_path} ({self.mode} mode)")
+
+    def serve_forever(self) -> None:
+        """start(), then block until request_stop() (or Ctrl+C)."""
+        self.start()
+        try:
+            while not self._stop_event.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def request_stop(self) -> None:
+        """Ask serve_forever() to return (safe from signal handlers)."""
+        self._stop_event.set()
+
+    def stop(self) -> None:
+        """Disconnect clients, stop every plugin and remove the socket."""
+        self._stop_event.set()
+        if self._listener:
+            self._listener.close()
+            self._listener = None
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads.clear()
+        if self.exporter:
+            self.exporter.stop()
+
+        with self._clients_lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            self._disconnect(client)
+
+        with self._plugins_lock:
+            self.lifecycle.teardown()
+            self.plugins = {}
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+        logger.info("Collector daemon stopped")
+
+    @property
+    def mode(self) -> str:
+        return "mock" if self.mock_mode else "real"
+
+    def set_mode(self, mock_mode: bool) -> None:
+        """Rebuild the plugins for another mode; watchers carry over."""
+        with self._plugins_lock:
+            self.mock_mode = mock_mode
+            self._build_plugins()
+        self.publish_event("mode", mode=self.mode)
+
+    def _build_plugins(self) -> None:
+        with self._plugins_lock:
+            self.lifecycle.teardown()
+            # Mock data must never overwrite state saved from real captures
+            self.lifecycle.persist_state = not self.mock_mode
+            self._snapshots.clear()
+            self._last_collect.clear()
+            self.plugins = build_plugin_set(self.lifecycle, self.mock_mode)
+            if self.exporter:
+                self.exporter.acquire_plugins()
+
+    def _bind(self) -> socket.socket:
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)  # Stale socket from a dead daemon
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)  # Owner only: snapshots include captured traffic
+        listener.listen(16)
+        listener.settimeout(0.5)
+        return listener
+
+    # Collection
+
+    def _collect_loop(self) -> None:
+        while not self._stop_event.wait(self.tick):
+            try:
+                self.reload_config()
+                self.collect_once()
+            except Exception as e:
+                logger.error(f"Collector loop error: {e}")
+
+    def reload_config(self) -> bool:
+        """
+        Apply the plugin config file if it changed (see plugin_set.reload_plugin_set()).
+
+        Returns:
+            True if a new config was applied
+        """
+        specs = self.plugin_config.poll() if self.plugin_config else None
+        if specs is None:
+            return False
+        with self._plugins_lock:
+            self.plugins, report = reload_plugin_set(self.lifecycle, self.plugins, self.mock_mode, specs)
+            for name in report['removed']:
+                # A rebuilt plugin starts over: its watchers get a full snapshot
+                self._snapshots.pop(name, None)
+                self._last_collect.pop(name, None)
+            if self.exporter:
+                self.exporter.acquire_plugins()  # Detectors enabled by the new config
+        self.stats['config_reloads'] += 1
+        logger.info(f"Plugin config applied: {report}")
+        self.publish_event("config", **report)
+        return True
+
+    def collect_once(self, now: Optional[float] = None) -> int:
+        """
+        Collect and publish every plugin that is due.
+
+        Returns:
+            Number of snapshots published
+        """
+        now = time.time() if now is None else now
+        published = 0
+        with self._plugins_lock:
+            for name, plugin in self.plugins.items():
+                if self.lifecycle.is_on_demand(name) and not self.activation.is_running(name):
+                    continue
+                interval = min(plugin.config.rate_ms / 1000, MAX_PUBLISH_INTERVAL)
+                if now - self._last_collect.get(name, 0.0) < interval:
+                    continue
+                self._last_collect[name] = now
+
+                errors = plugin.error_count
+                data = plugin.collect_tracked()
+                if plugin.error_count != errors:
+                    self.stats['collect_errors'] += 1
+                    logger.error(f"Collecting {name} failed: {plugin.last_error}")
+                    continue
+
+                self._publish_snapshot(name, data, now, plugin.snapshot_entities)
+                self._record_history(name, data, now)
+                published += 1
+        return published
+
+    def _publish_snapshot(self, name: str, data: Dict[str, Any], now: float,
+                          keys: Optional[Dict[str, str]] = None) -> None:
+        """
+        Store ``data`` and send it to the watchers.
+
+        Args:
+            keys: Entity tables of ``data`` ({table: id field}); when given,
+                watchers get the changes since the previous snapshot
+        """
+        previous = self._snapshots.get(name)
+        version = self._versions.get(name, 0) + 1
+        self._snapshots[name] = (now, data)
+        self._versions[name] = version
+        self.stats['snapshots'] += 1
+        payload = None
+        for client in self._watchers(name):
+            if payload is None:
+                if keys and previous is not None:
+                    changes = make_changes(previous[1], data, keys, version - 1, version)
+                    payload = encode({"type": "changes", "plugin": name, "ts": now, "changes": changes})
+                    self.stats['deltas'] += 1
+                else:
+                    payload = self._snapshot_message(name)
+            if not client.send(payload):
+                self.stats['dropped'] += 1
+
+    def _snapshot_message(self, name: str) -> Optional[bytes]:
+        """Full latest snapshot of ``name`` (None before the first one)."""
+        entry = self._snapshots.get(name)
+        if entry is None:
+            return None
+        return encode({"type": "snapshot", "plugin": name, "ts": entry[0],
+                       "version": self._versions.get(name, 0), "data": entry[1]})
+
+    def _record_history(self, name: str, data: Dict[str, Any], now: float) -> None:
+        if not self.history or self.mock_mode:
+            return
+        if name not in HISTORY_PLUGINS and name != "dns_monitor":
+            return
+        if now - self._last_history.get(name, 0.0) < HISTORY_SAMPLE_INTERVAL:
+            return
+        self._last_history[name] = now
+        if name == "dns_monitor":
+            self.history.record_many("dns", data.get('stats', {}), now)
+        else:
+            self.history.record_many(name, data, now)
+
+    def snapshot(self, name: str) -> Optional[Dict[str, Any]]:
+        """Latest published data of ``name`` (None before the first one)."""
+        entry = self._snapshots.get(name)
+        return entry[1] if entry else None
+
+    def snapshots(self) -> Dict[str, Tuple[float, Dict[str, Any]]]:
+        """All latest snapshots: {plugin: (ts, data)}."""
+        return dict(self._snapshots)
+
+    def _plugins_snapshot(self) -> Dict[str, Plugin]:
+        return dict(self.plugins)
+
+    def metric_families(self) -> List[MetricFamily]:
+        """Daemon, event log, pcap ring and latency metrics for the exporter."""
+        families = [
+            MetricFamily("wf_daemon_clients", GAUGE, "Attached clients").add(self.client_count()),
+            MetricFamily("wf_daemon_snapshots", COUNTER, "Snapshots published").add(self.stats['snapshots']),
+            MetricFamily("wf_daemon_dropped_messages", COUNTER,
+                         "Messages dropped for clients that fell behind").add(self.stats['dropped']),
+            MetricFamily("wf_daemon_collect_errors", COUNTER, "Failed plugin collections").add(self.stats['collect_errors']),
+        ]
+        event_log = self.lifecycle.resources.event_log
+        if event_log:
+            families.append(MetricFamily("wf_event_log_written", COUNTER,
+                                         "Events written to the event log").add(event_log.stats['written']))
+            dropped = MetricFamily("wf_event_log_dropped", COUNTER, "Events dropped by the event log")
+            for event, count in sorted(dict(event_log.stats['dropped_by_type']).items()):
+                dropped.add(count, event=event)
+            families.append(dropped)
+        recorder = self.lifecycle.resources.packet_recorder
+        if recorder:
+            families += [
+                MetricFamily("wf_pcap_ring_packets", COUNTER, "Frames written to the pcap ring").add(recorder.stats['packets']),
+                MetricFamily("wf_pcap_lookbacks", COUNTER, "Lookback windows frozen by alerts").add(recorder.stats['lookbacks']),
+            ]
+        families += perf_families(self.lifecycle.resources.perf)
+        return families
+
+    def publish_event(self, event: str, **payload: Any) -> None:
+        """Send an event to every client."""
+        message = encode({"type": "event", "event": event, "ts": time.time(), **payload})
+        with self._clients_lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            client.send(message)
+
+    # Clients
+
+    def _watchers(self, name: str) -> List[_Client]:
+        with self._clients_lock:
+            return [client for client in self._clients.values() if name in client.watching]
+
+    def client_count(self) -> int:
+        with self._clients_lock:
+            return len(self._clients)
+
+    def _accept_loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                sock, _ = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break  # Listener closed
+            sock.settimeout(None)
+            self._add_client(sock)
+
+    def _add_client(self, sock: socket.socket) -> _Client:
+        client = _Client(next(self._client_ids), sock, self.client_queue)
+        with self._clients_lock:
+            self._clients[client.id] = client
+        self.stats['clients_total'] += 1
+
+        client.send(encode(self._hello()))
+        client.writer = threading.Thread(target=self._write_loop, args=(client,),
+                                         name=f"daemon-client-{client.id}-writer", daemon=True)
+        client.reader = threading.Thread(target=self._read_loop, args=(client,),
+                                         name=f"daemon-client-{client.id}-reader", daemon=True)
+        client.writer.start()
+        client.reader.start()
+        logger.info(f"Client {client.id} attached")
+        return client
+
+    def _hello(self) -> Dict[str, Any]:
+        with self._plugins_lock:
+            plugins = {name: {"on_demand": self.lifecycle.is_on_demand(name)} for name in self.plugins}
+        return {"type": "hello", "version": PROTOCOL_VERSION, "mode": self.mode, "plugins": plugins}
+
+    def _write_loop(self, client: _Client) -> None:
+        while True:
+            payload = client.queue.get()
+            if payload is None:
+                return
+            try:
+                client.sock.sendall(payload)
+                client.sent += 1
+            except OSError:
+                self._disconnect(client)
+                return
+
+    def _read_loop(self, client: _Client) -> None:
+        try:
+            with client.sock.makefile('rb') as stream:
+                while True:
+                    line = stream.readline(MAX_LINE)
+                    if not line:
+                        break
+                    message = decode(line)
+                    if message is None:
+                        client.send(encode({"type": "error", "message": "malformed message"}))
+                        continue
+                    self._handle(client, message)
+        except (OSError, ValueError):
+            pass
+        self._disconnect(client)
+
+    def _handle(self, client: _Client, message: Dict[str, Any]) -> None:
+        op = message.get("op")
+        if op == "watch":
+            for name in message.get("plugins", []):
+                self._watch(client, name)
+        elif op == "unwatch":
+            for name in message.get("plugins", []):
+                client.watching.discard(name)
+                self.activation.release(name, client.consumer)
+        elif op == "set_mode":
+            self.set_mode(bool(message.get("mock")))
+        elif op == "resync":
+            for name in message.get("plugins", []):
+                payload = self._snapshot_message(name) if name in client.watching else None
+                if payload is not None:
+                    self.stats['resyncs'] += 1
+                    client.send(payload)
+        elif op == "status":
+            client.send(encode(self.status()))
+        else:
+            client.send(encode({"type": "error", "message": f"unknown op {op!r}"}))
+
+    def _watch(self, client: _Client, name: str) -> None:
+        with self._plugins_lock:
+            if name not in self.plugins:
+                client.send(encode({"type": "error", "message": f"unknown plugin {name!r}"}))
+                return
+            client.watching.add(name)
+            if self.lifecycle.is_on_demand(name) and self.activation.acquire(name, client.consumer):
+                self.publish_event("plugin_started", plugin=name)
+            payload = self._snapshot_message(name)
+            if payload is not None:
+                client.send(payload)  # Before any delta the collector sends next
+
+    def _disconnect(self, client: _Client) -> None:
+        with self._clients_lock:
+            if self._clients.pop(client.id, None) is None:
+                return
+        self.activation.release_consumer(client.consumer)
+        client.watching.clear()
+        try:
+            client.queue.put_nowait(None)
+        except queue.Full:
+            pass
+        try:
+            client.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        client.sock.close()
+        if client.writer and client.writer is not threading.current_thread():
+            client.writer.join(timeout=1.0)
+        logger.info(f"Client {client.id} detached ({client.dropped} dropped)")
+
+    def status(self) -> Dict[str, Any]:
+        """Daemon health for clients and operators."""
+        with self._plugins_lock:
+            counts = self.lifecycle.resource_counts()
+        counts.pop('thread_names', None)
+        with self._clients_lock:
+            clients = [
+                {"id": client.id, "watching": sorted(client.watching),
+                 "sent": client.sent, "dropped": client.dropped}
+                for client in self._clients.values()
+            ]
+        return {
+            "type": "status",
+            "mode": self.mode,
+            "clients": clients,
+            "running": self.activation.running(),
+            "stats": dict(self.stats),
+            "resources": counts
+        }
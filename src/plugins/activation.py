@@ -0,0 +1,203 @@
+"""
+Plugin Activation - Reference-counted start/stop of plugin background work
+
+Sniffers and scanners are expensive to keep running (capture threads, ARP
+sweeps), yet most of the time nobody is looking at them. Consumers (screens,
+exporters) ``acquire()`` the plugins they read from; a plugin's workers start
+with its first consumer and stop ``grace_period`` seconds after its last one
+leaves, so quickly flipping between screens doesn't restart captures.
+
+Usage:
+    >>> activation = PluginActivation(grace_period=30.0)
+    >>> activation.register("dns_monitor", start=dns.initialize, stop=dns.stop)
+    >>> activation.acquire("dns_monitor", "screen:dns_monitor")   # starts
+    >>> activation.release_consumer("screen:dns_monitor")         # stops in 30 s
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Activation:
+    """Registration and live state of one on-demand plugin."""
+    start: Callable[[], None]
+    stop: Callable[[], None]
+    consumers: Set[str] = field(default_factory=set)
+    running: bool = False
+    idle_since: Optional[float] = None
+    timer: Optional[threading.Timer] = None
+
+
+class PluginActivation:
+    """
+    Reference-counted activation of plugin workers.
+
+    All state changes, including the start/stop callbacks, run under one
+    lock so a grace-period stop can never race a new acquire.
+    """
+
+    def __init__(self, grace_period: float = 30.0):
+        self.grace_period = grace_period
+        self._lock = threading.RLock()
+        self._plugins: Dict[str, _Activation] = {}
+        # Consumers of unregistered plugins, handed to their next register()
+        self._parked: Dict[str, Set[str]] = {}
+        self.stats = {
+            'starts': 0,
+            'stops': 0,
+            'errors': 0
+        }
+
+    def register(self, name: str, start: Callable[[], None], stop: Callable[[], None]) -> None:
+        """
+        Register (or replace) a plugin's start/stop callbacks.
+
+        Replacing a running plugin stops the old instance and starts the new
+        one for the same consumers.
+        """
+        with self._lock:
+            previous = self._plugins.get(name)
+            consumers = set(previous.consumers) if previous else self._parked.pop(name, set())
+            if previous:
+                self._cancel_timer(previous)
+                if previous.running:
+                    self._stop(name, previous)
+
+            entry = _Activation(start=start, stop=stop, consumers=consumers)
+            self._plugins[name] = entry
+            if consumers:
+                self._start(name, entry)
+
+    def unregister(self, name: str) -> None:
+        """
+        Stop ``name`` (if running) and drop its callbacks.
+
+        Its consumers are remembered: registering ``name`` again starts it
+        for them, as if it had been replaced.
+        """
+        with self._lock:
+            entry = self._plugins.pop(name, None)
+            if entry is None:
+                return
+            self._cancel_timer(entry)
+            if entry.running:
+                self._stop(name, entry)
+            if entry.consumers:
+                self._parked[name] = set(entry.consumers)
+
+    def acquire(self, name: str, consumer: str) -> bool:
+        """
+        Add ``consumer`` to ``name``; starts the plugin if it was stopped.
+
+        Returns:
+            True if this call started the plugin
+        """
+        with self._lock:
+            entry = self._plugins.get(name)
+            if entry is None:
+                return False
+
+            entry.consumers.add(consumer)
+            entry.idle_since = None
+            self._cancel_timer(entry)
+            if entry.running:
+                return False
+            return self._start(name, entry)
+
+    def release(self, name: str, consumer: str) -> None:
+        """Remove ``consumer`` from ``name``; the last one starts the grace period."""
+        with self._lock:
+            entry = self._plugins.get(name)
+            if entry is None or consumer not in entry.consumers:
+                return
+
+            entry.consumers.discard(consumer)
+            if entry.consumers or not entry.running:
+                return
+
+            entry.idle_since = time.monotonic()
+            if self.grace_period <= 0:
+                self._stop(name, entry)
+                return
+
+            entry.timer = threading.Timer(self.grace_period, self._expire, args=(name, entry))
+            entry.timer.daemon = True
+            entry.timer.start()
+
+    def release_consumer(self, consumer: str) -> None:
+        """Release every plugin held by ``consumer``."""
+        with self._lock:
+            names = [name for name, entry in self._plugins.items() if consumer in entry.consumers]
+        for name in names:
+            self.release(name, consumer)
+
+    def is_running(self, name: str) -> bool:
+        with self._lock:
+            entry = self._plugins.get(name)
+            return bool(entry and entry.running)
+
+    def consumers(self, name: str) -> Set[str]:
+        with self._lock:
+            entry = self._plugins.get(name)
+            return set(entry.consumers) if entry else set()
+
+    def running(self) -> List[str]:
+        """Names of plugins whose workers are running."""
+        with self._lock:
+            return [name for name, entry in self._plugins.items() if entry.running]
+
+    def stop_all(self) -> None:
+        """Stop every running plugin now (consumers are kept)."""
+        with self._lock:
+            for name, entry in self._plugins.items():
+                self._cancel_timer(entry)
+                if entry.running:
+                    self._stop(name, entry)
+
+    def _expire(self, name: str, entry: _Activation) -> None:
+        """Grace period over: stop unless someone came back meanwhile."""
+        with self._lock:
+            if self._plugins.get(name) is not entry:
+                return  # Replaced since the timer was armed
+            entry.timer = None
+            if entry.running and not entry.consumers:
+                self._stop(name, entry)
+
+    def _start(self, name: str, entry: _Activation) -> bool:
+        try:
+            entry.start()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Failed to start plugin {name}: {e}")
+            return False
+        entry.running = True
+        self.stats['starts'] += 1
+        logger.info(f"Plugin {name} activated ({len(entry.consumers)} consumer(s))")
+        return True
+
+    def _stop(self, name: str, entry: _Activation) -> None:
+        try:
+            entry.stop()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f"Failed to stop plugin {name}: {e}")
+        entry.running = False
+        entry.idle_since = None
+        self.stats['stops'] += 1
+        logger.info(f"Plugin {name} deactivated")
+
+    @staticmethod
+    def _cancel_timer(entry: _Activation) -> None:
+        if entry.timer is not None:
+            entry.timer.cancel()
+            entry.timer = None
@@ -12,23 +12,29 @@
 import threading
 import time
 from typing import Dict, List, Any, Optional, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from collections import defaultdict
 
-try:
-    from scapy.all import ARP, sniff, conf
-    conf.verb = 0
-    SCAPY_AVAILABLE = True
-except ImportError:
-    SCAPY_AVAILABLE = False
+from .scapy_loader import scapy_binder, scapy_installed
+
+SCAPY_AVAILABLE = scapy_installed()
+
+# scapy names, bound by _load_scapy() on first real-mode use
+_SCAPY_NAMES = ('ARP', 'sniff', 'conf')
+ARP = sniff = conf = None
 
 from .base import Plugin, PluginConfig
+from .capture_hub import get_capture_hub
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Imports scapy and binds _SCAPY_NAMES (clears SCAPY_AVAILABLE on failure)
+_load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
+
+
+@dataclass(slots=True)
 class ARPEntry:
     """Represents an ARP cache entry."""
     ip: str
@@ -36,10 +42,14 @@ class ARPEntry:
     timestamp: float
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'ip': self.ip,
+            'mac': self.mac,
+            'timestamp': self.timestamp
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class SpoofingAlert:
     """Represents a detected spoofing attack."""
     ip: str
@@ -49,9 +59,20 @@ class SpoofingAlert:
     severity: str  # LOW, MEDIUM, HIGH, CRITICAL
     description: str
     educational_note: str
+    pcap_files: List[str] = field(default_factory=list)  # Lookback capture (CRITICAL only)
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        """Shallow copy (pcap_files copied: mutated in place)."""
+        return {
+            'ip': self.ip,
+            'old_mac': self.old_mac,
+            'new_mac': self.new_mac,
+            'timestamp': self.timestamp,
+            'severity': self.severity,
+            'description': self.description,
+            'educational_note': self.educational_note,
+            'pcap_files': list(self.pcap_files)
+        }
 
 
 class ARPSpoofingDetector(Plugin):
@@ -65,6 +86,9 @@ class ARPSpoofingDetector(Plugin):
     - Educational explanations
     - Attack pattern recognition
     """
+
+    packet_handlers = ("_process_arp_packet",)
+    snapshot_entities = {'arp_cache': 'ip'}
     
     def __init__(self, config: PluginConfig):
         super().__init__(config)
@@ -89,6 +113,9 @@ def __init__(self, config: PluginConfig):
         self._stop_event = threading.Event()
         self._monitor_thread: Optional[threading.Thread] = None
         
+        # Captured packets are shared with other plugins (e.g. topology)
+        self._capture_hub = get_capture_hub()
+        
         # Statistics
         self.stats = {
             'arp_packets': 0,
@@ -96,6 +123,10 @@ def __init__(self, config: PluginConfig):
             'alerts_raised': 0,
             'critical_alerts': 0
         }
+
+        # Real mode: import scapy before any capture or packet handling
+        if not self.config.config.get('mock_mode', False):
+            _load_scapy()
     
     def initialize(self) -> None:
         """Initialize plugin."""
@@ -113,28 +144,64 @@ def start(self):
         
         logger.info("Starting ARP Spoofing Detector...")
         self._stop_event.clear()
+        self.snapshots.start()
         
         # Start monitoring thread
         self._monitor_thread = threading.Thread(target=self._monitor_arp, daemon=True)
+        self._capture_hub.add_publisher(self.config.name, "arp")
         self._monitor_thread.start()
     
     def stop(self):
         """Stop ARP monitoring."""
         logger.info("Stopping ARP Spoofing Detector...")
         self._stop_event.set()
+        self._capture_hub.remove_publisher(self.config.name)
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
+        self.snapshots.stop()
     
-    def get_data(self) -> Dict[str, Any]:
-        """Get current detection status."""
+    def cleanup(self) -> None:
+        """Cleanup resources."""
+        self.stop()
+
+    def build_state(self) -> Dict[str, Any]:
+        """Known IP->MAC bindings and change history (persisted across restarts)."""
         return {
-            'monitoring': not self._stop_event.is_set(),
+            'arp_cache': [entry.to_dict() for entry in self.arp_cache.values()],
+            'mac_history': {ip: list(macs) for ip, macs in self.mac_history.items()},
+            'trusted_devices': sorted(self.trusted_devices),
+            'stats': dict(self.stats)
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore bindings saved by build_state()."""
+        self.arp_cache = {entry['ip']: ARPEntry(**entry) for entry in state.get('arp_cache', [])}
+        self.mac_history = defaultdict(list, {
+            ip: list(macs) for ip, macs in state.get('mac_history', {}).items()
+        })
+        self.trusted_devices = set(state.get('trusted_devices', []))
+        self.stats.update(state.get('stats', {}))
+    
+    def build_snapshot(self) -> Dict[str, Any]:
+        """Cache size, alerts and counters (capture thread side)."""
+        return {
+            'arp_cache': [entry.to_dict() for entry in self.arp_cache.values()],
             'arp_cache_size': len(self.arp_cache),
             'alert_count': len(self.alerts),
             'recent_alerts': [a.to_dict() for a in self.alerts[-10:]],
             'stats': self.stats.copy(),
             'trusted_devices': list(self.trusted_devices)
         }
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get current detection status (the latest published snapshot)."""
+        snapshot = self.snapshots.current()
+        return {
+            **snapshot.data,
+            'monitoring': not self._stop_event.is_set(),
+            'capture': self.capture_stats(),
+            'snapshot_version': snapshot.version
+        }
     
     def requires_root(self) -> bool:
         """ARP sniffing requires root privileges."""
@@ -148,34 +215,44 @@ def add_trusted_device(self, mac: str, ip: str = None):
     
     def _monitor_arp(self):
         """Monitor ARP traffic continuously."""
-        while not self._stop_event.is_set():
-            try:
-                # Sniff ARP packets (1 second batches)
-                sniff(
-                    filter="arp",
-                    prn=self._process_arp_packet,
-                    store=0,
-                    timeout=1
-                )
-            except Exception as e:
-                logger.error(f"ARP monitoring error: {e}")
-                time.sleep(1)
+        # Packets are analysed on the queue's worker, off the sniffer thread
+        self.start_packet_queue(self._process_arp_packet, "arp")
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    # Sniff ARP packets (1 second batches)
+                    sniff(
+                        filter="arp",
+                        store=0,
+                        timeout=1,
+                        **self.capture_options(self._process_arp_packet)
+                    )
+                    self.capture_tick()
+                except Exception as e:
+                    logger.error(f"ARP monitoring error: {e}")
+                    time.sleep(1)
+        finally:
+            self.stop_packet_queue()
     
     def _process_arp_packet(self, packet):
         """Process individual ARP packet."""
-        if not packet.haslayer(ARP):
-            return
+        self._capture_hub.publish(packet)
+        try:
+            if not packet.haslayer(ARP):
+                return
         
-        self.stats['arp_packets'] += 1
+            self.stats['arp_packets'] += 1
         
-        arp_layer = packet[ARP]
+            arp_layer = packet[ARP]
         
-        # We care about ARP replies (responses)
-        if arp_layer.op == 2:  # ARP Reply
-            ip = arp_layer.psrc
-            mac = arp_layer.hwsrc.lower()
+            # We care about ARP replies (responses)
+            if arp_layer.op == 2:  # ARP Reply
+                ip = arp_layer.psrc
+                mac = arp_layer.hwsrc.lower()
             
-            self._check_arp_entry(ip, mac)
+                self._check_arp_entry(ip, mac)
+        finally:
+            self.snapshots.tick()
     
     def _check_arp_entry(self, ip: str, mac: str):
         """Check if ARP entry is suspicious."""
@@ -264,16 +341,18 @@ def _raise_alert(self, ip: str, old_mac: str, new_mac: str, timestamp: float, se
             timestamp=timestamp,
             severity=severity,
             description=f"MAC address changed for {ip}",
-            educational_note=educational_note
+            educational_note=educational_note,
+            pcap_files=self.freeze_lookback(ip) if severity == "CRITICAL" else []
         )
         
         self.alerts.append(alert)
+        self.emit_event("arp_alert", alert)
         
         logger.warning(f"🚨 ARP SPOOFING ALERT [{severity}]: {ip} changed from {old_mac} to {new_mac}")
         
-        # Keep only recent alerts (last 100)
-        if len(self.alerts) > 100:
-            self.alerts = self.alerts[-100:]
+        # Keep only recent alerts (last max_entries)
+        if len(self.alerts) > self.max_entries:
+            self.alerts = self.alerts[-self.max_entries:]
     
     def _generate_educational_note(self, severity: str, ip: str) -> str:
         """Generate educational explanation for alert."""
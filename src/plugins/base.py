@@ -13,10 +13,22 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
 import time
 
+from .packet_queue import (
+    DEFAULT_QUEUE_SIZE, DEFAULT_SAMPLE_EVERY, DROP_NEWEST, PacketQueue, open_capture_socket
+)
+from .snapshot import DEFAULT_SNAPSHOT_MS, SnapshotPublisher, full_changes, make_changes
+
+
+# 802.11 capture NIC of monitor_capture plugins (rogue AP, handshakes)
+DEFAULT_MONITOR_INTERFACE = "wlan0mon"
+
+# Records kept in rolling lists (recent queries, requests, alerts); config ``max_entries``
+DEFAULT_MAX_ENTRIES = 100
+
 
 class PluginStatus(Enum):
     """Plugin operational status"""
@@ -87,6 +99,21 @@ class Plugin(ABC):
         >>> print(data["cpu_percent"])
     """
 
+    # Per-packet callbacks (sniff prn / capture hub subscribers), timed by
+    # the perf registry when the lifecycle has one
+    packet_handlers: Tuple[str, ...] = ()
+
+    # BPF filter of the packets the handlers want (worker mode capture)
+    capture_filter: Optional[str] = None
+
+    # Captures 802.11 frames on the monitor-mode NIC (config
+    # ``monitor_interface``) instead of the IP interfaces (``interfaces``)
+    monitor_capture: bool = False
+
+    # Entity tables of the snapshot sent as deltas by get_changes():
+    # {table: id field}, e.g. {"devices": "ip"}
+    snapshot_entities: Dict[str, str] = {}
+
     def __init__(self, config: PluginConfig):
         """
         Initialize plugin with configuration.
@@ -103,6 +130,19 @@ def __init__(self, config: PluginConfig):
         self._error_count: int = 0
         self._consecutive_errors: int = 0
         self._last_error: Optional[str] = None
+        # Structured event sink (utils.event_log.EventLog) and pcap ring
+        # (plugins.packet_recorder.PacketRecorder), set by PluginLifecycle
+        self.event_sink = None
+        self.packet_recorder = None
+        # Bounded capture -> analysis hand-off (start_packet_queue())
+        self.packet_queue: Optional[PacketQueue] = None
+        # Copy-on-write state for readers (build_snapshot()); writer threads
+        # tick() it per packet, get_data() reads snapshots.current()
+        self.snapshots = SnapshotPublisher(
+            self.build_snapshot,
+            interval=config.config.get('snapshot_ms', DEFAULT_SNAPSHOT_MS) / 1000,
+            build_state=self.build_state
+        )
 
     @property
     def name(self) -> str:
@@ -133,6 +173,11 @@ def last_error(self) -> Optional[str]:
         """Get last error message (if any)"""
         return self._last_error
 
+    @property
+    def max_entries(self) -> int:
+        """Records kept in the plugin's rolling lists (config ``max_entries``)."""
+        return self.config.config.get('max_entries', DEFAULT_MAX_ENTRIES)
+
     def should_collect(self) -> bool:
         """
         Determine if plugin should collect data based on rate_ms.
@@ -222,6 +267,266 @@ def cleanup(self) -> None:
         # Subclasses override as needed
         pass
 
+    def get_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Get durable state to persist across restarts.
+
+        Safe from any thread (the metrics store calls it from its flush
+        thread): returns the state published with the current snapshot, see
+        build_state().
+
+        Returns:
+            State dictionary, or None if there is nothing to save
+        """
+        state = self.snapshots.current().state
+        return dict(state) if state is not None else None
+
+    def build_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Copy the durable state into fresh dicts and lists.
+
+        Hook method - the base plugin has nothing worth persisting. Plugins
+        that accumulate history (counters, caches, baselines) override this
+        together with restore_state(). Called with build_snapshot(), on the
+        writer thread; the result must be JSON-serializable.
+
+        Returns:
+            State dictionary, or None if there is nothing to save
+        """
+        return None
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restore state previously returned by get_state().
+
+        Called before initialize(), so no worker threads are running yet.
+
+        Args:
+            state: Saved state dictionary
+        """
+        # Intentionally empty - Template Method pattern
+        pass
+
+    def reconfigure(self, rate_ms: int, settings: Dict[str, Any]) -> None:
+        """
+        Apply a new collection rate and settings to the live plugin.
+
+        Called when the plugin config file changes only the rate or budget
+        of a plugin (see plugins.plugin_config), so its capture keeps
+        running. Settings read on use (``max_entries``) apply at once and a
+        running packet queue is resized to ``queue_size``; plugins caching
+        other settings override this and call super().
+
+        Args:
+            rate_ms: New collection interval
+            settings: The plugin's complete new config
+        """
+        self.config.rate_ms = rate_ms
+        self.config.config = dict(settings)
+        queue = self.packet_queue
+        if queue is not None and 'queue_size' in settings:
+            queue.resize(settings['queue_size'])
+
+    def build_snapshot(self) -> Dict[str, Any]:
+        """
+        Copy the state readers see into fresh dicts and lists.
+
+        Hook method - plugins whose state is mutated by capture threads
+        override this and build get_data() from ``self.snapshots.current()``.
+        Called on the writer thread (or by a reader while no writer runs), so
+        it may iterate the plugin's containers freely. Nothing in the result
+        may be shared with the live state.
+
+        Returns:
+            Snapshot data dictionary
+        """
+        return {}
+
+    def get_changes(self, since_version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        What changed since the reader's copy at ``since_version``.
+
+        Entity tables (``snapshot_entities``) come as added, updated and
+        removed records; every other field of get_data() comes whole. The
+        full data is returned instead (``full``: True) when there is no
+        ``since_version``, it is no longer in the snapshot history, or the
+        plugin has no entity tables. See plugins.snapshot.apply_changes().
+
+        Args:
+            since_version: ``version`` of the caller's last result
+
+        Returns:
+            Delta dict with the new ``version``
+        """
+        data = self.get_data()
+        version = data.get('snapshot_version', 0)
+        previous = None
+        if since_version is not None and self.snapshot_entities:
+            previous = self.snapshots.get(since_version)
+        if previous is None:
+            return full_changes(data, version)
+        return make_changes(previous.data, data, self.snapshot_entities, since_version, version)
+
+    def take_partial(self) -> Optional[Dict[str, Any]]:
+        """
+        Hand over what was counted since the last call, and reset it.
+
+        Hook for sharded analysis (plugins.worker_pool): a worker process's
+        instance ships these partial aggregates to the UI process, where
+        merge_partial() adds them into the instance the screens read.
+        Plugins that support sharding override both. The result must be
+        picklable.
+
+        Returns:
+            Partial aggregates, or None if nothing was counted
+        """
+        return None
+
+    def merge_partial(self, partial: Dict[str, Any]) -> None:
+        """
+        Add partial aggregates from take_partial() of another instance.
+
+        Args:
+            partial: A worker instance's take_partial() result
+        """
+        # Intentionally empty - Template Method pattern
+        pass
+
+    def emit_event(self, event: str, record: Any) -> None:
+        """
+        Hand a detection (DNS query, alert, ...) to the event sink, if any.
+
+        Safe to call from capture threads: the sink only buffers in memory.
+
+        Args:
+            event: Event type, e.g. "dns_query"
+            record: Dict, or an object with to_dict()
+        """
+        sink = self.event_sink
+        if sink is not None:
+            sink.emit(event, record, source=self.name)
+
+    def freeze_lookback(self, reason: str) -> List[str]:
+        """
+        Preserve the packets recorded before an alert (pcap ring lookback).
+
+        Args:
+            reason: Short label for the lookback directory
+
+        Returns:
+            Frozen pcapng paths ([] if no recorder is running)
+        """
+        recorder = self.packet_recorder
+        if recorder is None:
+            return []
+        return recorder.freeze(f"{self.name}_{reason}")
+
+    def capture_interfaces(self) -> Optional[List[str]]:
+        """
+        Interfaces this plugin sniffs on.
+
+        Returns:
+            The monitor NIC for monitor_capture plugins, else the configured
+            ``interfaces`` (None: scapy's default interface)
+        """
+        settings = self.config.config
+        if self.monitor_capture:
+            return [settings.get('monitor_interface', DEFAULT_MONITOR_INTERFACE)]
+        return list(settings.get('interfaces') or []) or None
+
+    def start_packet_queue(self, handler, bpf_filter: Optional[str] = None,
+                           iface: Optional[str] = None) -> PacketQueue:
+        """
+        Move packet analysis off the sniffer thread.
+
+        Called by the capture thread itself, so the worker lives exactly as
+        long as the capture loop. Starts a PacketQueue worker running
+        ``handler`` and opens a capture socket per interface (for kernel
+        drop counters) when scapy can. Size and overflow
+        policy come from the plugin config: ``queue_size``,
+        ``overflow_policy`` and ``sample_every``. The worker also ticks
+        the snapshot publisher while the capture is quiet, so the last
+        packets of a burst and time-based rates still get published.
+
+        Args:
+            handler: Per-packet callback (e.g. self._process_dns_packet)
+            bpf_filter: Capture filter for the sockets
+            iface: Capture interface (default: capture_interfaces())
+
+        Returns:
+            The running queue
+        """
+        self.stop_packet_queue()
+        settings = self.config.config
+        queue = PacketQueue(
+            handler,
+            name=self.name,
+            maxsize=settings.get('queue_size', DEFAULT_QUEUE_SIZE),
+            policy=settings.get('overflow_policy', DROP_NEWEST),
+            sample_every=settings.get('sample_every', DEFAULT_SAMPLE_EVERY),
+            idle=self.snapshots.tick,
+            idle_interval=self.snapshots.interval
+        )
+        interfaces = [iface] if iface else self.capture_interfaces() or [None]
+        for name in interfaces:
+            queue.attach_socket(open_capture_socket(bpf_filter, name), name)
+        if len(queue.sockets) < len(interfaces):
+            queue.close_socket()  # Partial set: let sniff() open its own on every interface
+        queue.start()
+        self.packet_queue = queue
+        return queue
+
+    def stop_packet_queue(self) -> None:
+        """
+        Analyse what is still queued, stop the worker, close the socket.
+
+        The stopped queue stays attached so its final counters remain
+        visible in capture_stats().
+        """
+        queue = self.packet_queue
+        if queue is not None and queue.running:
+            queue.stop()
+            queue.close_socket()
+
+    def capture_options(self, handler) -> Dict[str, Any]:
+        """
+        sniff() keyword arguments for one capture batch.
+
+        With a packet queue, packets go to its put() (and sniff reads the
+        queue's sockets); without one, ``handler`` runs inline as before.
+        Several interfaces are sniffed together, each packet tagged with
+        its ``sniffed_on`` interface.
+        """
+        queue = self.packet_queue
+        if queue is None or not queue.running:
+            options: Dict[str, Any] = {'prn': handler}
+        else:
+            queue.poll_kernel_stats()
+            options = {'prn': queue.put}
+            if queue.sockets:
+                options['opened_socket'] = queue.socket if len(queue.sockets) == 1 else dict(queue.sockets)
+                return options
+        interfaces = self.capture_interfaces()
+        if interfaces:
+            options['iface'] = interfaces[0] if len(interfaces) == 1 else interfaces
+        return options
+
+    def capture_tick(self) -> None:
+        """
+        Publish between sniff() batches when the handler runs inline.
+
+        With a running packet queue its worker publishes instead (on its
+        own thread, where the state is written).
+        """
+        queue = self.packet_queue
+        if queue is None or not queue.running:
+            self.snapshots.tick()
+
+    def capture_stats(self) -> Optional[Dict[str, Any]]:
+        """Packet queue counters (None without a queue)."""
+        queue = self.packet_queue
+        return queue.snapshot() if queue is not None else None
+
     def collect_safe(self) -> Dict[str, Any]:
         """
         Safely collect data with error handling and auto-recovery.
@@ -254,6 +559,17 @@ def collect_safe(self) -> Dict[str, Any]:
         if not self.should_collect():
             return {}
 
+        return self.collect_tracked()
+
+    def collect_tracked(self) -> Dict[str, Any]:
+        """
+        collect_data() with collect_safe()'s error tracking, without the
+        enabled/rate gating (for hosts that schedule collection themselves,
+        like the collector daemon).
+
+        Returns:
+            Dictionary with collected data, or empty dict on error
+        """
         try:
             data = self.collect_data()
             self._last_collection = time.time() * 1000
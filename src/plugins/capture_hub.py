@@ -0,0 +1,108 @@
+"""
+Capture Hub - Shared packet fan-out between plugins
+
+Plugins that already sniff traffic publish every captured packet here, and
+other plugins subscribe instead of opening a second capture on the same
+interface. Publishers also register the BPF filter they sniff with, so a
+subscriber can tell which traffic is already covered and capture only the
+rest itself.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+PacketCallback = Callable[[Any], None]
+
+
+class CaptureHub:
+    """
+    Fan-out of captured packets to in-process subscribers.
+
+    ``publish()`` runs on the publisher's sniff thread, so subscribers must
+    be cheap (extract fields, enqueue) and must not block. A subscriber that
+    raises is logged and counted, never propagated to the publisher.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[PacketCallback] = []
+        # {publisher name: BPF filter it sniffs with, None = unfiltered}
+        self._publishers: Dict[str, Optional[str]] = {}
+        self.stats = {
+            'published': 0,
+            'delivered': 0,
+            'subscriber_errors': 0
+        }
+
+    def subscribe(self, callback: PacketCallback) -> None:
+        """Receive every published packet."""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: PacketCallback) -> None:
+        """Stop receiving packets (no-op if not subscribed)."""
+        with self._lock:
+            self._subscribers = [cb for cb in self._subscribers if cb != callback]
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def add_publisher(self, name: str, bpf_filter: Optional[str] = None) -> None:
+        """Announce that ``name`` is capturing with ``bpf_filter``."""
+        with self._lock:
+            self._publishers[name] = bpf_filter
+
+    def remove_publisher(self, name: str) -> None:
+        with self._lock:
+            self._publishers.pop(name, None)
+
+    def covers(self, bpf_filter: str) -> bool:
+        """True if some active publisher captures ``bpf_filter`` traffic (or everything)."""
+        with self._lock:
+            return any(f is None or f == bpf_filter for f in self._publishers.values())
+
+    def publish(self, packet: Any) -> None:
+        """Hand a captured packet to all subscribers."""
+        # Copy-on-write list: read without the lock on the hot path
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+
+        self.stats['published'] += 1
+        for callback in subscribers:
+            try:
+                callback(packet)
+                self.stats['delivered'] += 1
+            except Exception as e:
+                self.stats['subscriber_errors'] += 1
+                logger.debug(f"Capture hub subscriber failed: {e}")
+
+
+# Global instance (singleton pattern)
+_hub_instance: Optional[CaptureHub] = None
+
+
+def get_capture_hub() -> CaptureHub:
+    """
+    Get the global capture hub instance.
+
+    Uses singleton pattern so every plugin in the process shares one hub.
+
+    Returns:
+        CaptureHub instance
+    """
+    global _hub_instance
+
+    if _hub_instance is None:
+        _hub_instance = CaptureHub()
+
+    return _hub_instance
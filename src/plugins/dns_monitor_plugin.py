@@ -12,23 +12,31 @@
 import threading
 import time
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from collections import defaultdict, Counter
 
-try:
-    from scapy.all import DNS, DNSQR, DNSRR, sniff, conf, IP
-    conf.verb = 0
-    SCAPY_AVAILABLE = True
-except ImportError:
-    SCAPY_AVAILABLE = False
+from .scapy_loader import scapy_binder, scapy_installed
+
+SCAPY_AVAILABLE = scapy_installed()
+
+# scapy names, bound by _load_scapy() on first real-mode use
+_SCAPY_NAMES = ('DNS', 'DNSQR', 'DNSRR', 'sniff', 'conf', 'IP')
+DNS = DNSQR = DNSRR = sniff = conf = IP = None
 
 from .base import Plugin, PluginConfig
 
 
 logger = logging.getLogger(__name__)
 
+# Most-queried domains kept in persisted state
+STATE_MAX_DOMAINS = 1000
+
+
+# Imports scapy and binds _SCAPY_NAMES (clears SCAPY_AVAILABLE on failure)
+_load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
+
 
-@dataclass
+@dataclass(slots=True)
 class DNSQuery:
     """Represents a DNS query."""
     timestamp: float
@@ -38,7 +46,13 @@ class DNSQuery:
     resolved_ip: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'timestamp': self.timestamp,
+            'source_ip': self.source_ip,
+            'domain': self.domain,
+            'query_type': self.query_type,
+            'resolved_ip': self.resolved_ip
+        }
 
 
 class DNSMonitorPlugin(Plugin):
@@ -52,11 +66,14 @@ class DNSMonitorPlugin(Plugin):
     - Privacy awareness demonstration
     - Domain categorization
     """
+
+    packet_handlers = ("_process_dns_packet",)
+    capture_filter = "udp port 53"
     
     def __init__(self, config: PluginConfig):
         super().__init__(config)
         
-        # Query storage: recent queries (last 100)
+        # Query storage: recent queries (last max_entries)
         self.recent_queries: List[DNSQuery] = []
         
         # Domain tracking: {domain: count}
@@ -82,6 +99,10 @@ def __init__(self, config: PluginConfig):
         
         # Rate tracking for queries/minute
         self._query_timestamps: List[float] = []
+
+        # Real mode: import scapy before any capture or packet handling
+        if not self.config.config.get('mock_mode', False):
+            _load_scapy()
     
     def initialize(self) -> None:
         """Initialize plugin."""
@@ -106,6 +127,7 @@ def start(self):
         """Start DNS monitoring."""
         logger.info("Starting DNS Monitor...")
         self._stop_event.clear()
+        self.snapshots.start()
         
         # Start monitoring thread
         self._monitor_thread = threading.Thread(target=self._monitor_dns, daemon=True)
@@ -117,13 +139,75 @@ def stop(self):
         self._stop_event.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
+        self.snapshots.stop()
     
     def cleanup(self) -> None:
         """Cleanup resources."""
         self.stop()
+
+    def build_state(self) -> Dict[str, Any]:
+        """Query counters and DNS cache (persisted across restarts)."""
+        return {
+            'domains': dict(self.domain_counter.most_common(STATE_MAX_DOMAINS)),
+            'query_types': dict(self.query_types),
+            'dns_cache': dict(self.dns_cache),
+            'total_queries': self.stats['total_queries'],
+            'cache_hits': self.stats['cache_hits']
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore counters saved by build_state()."""
+        self.domain_counter = Counter(state.get('domains', {}))
+        self.query_types = Counter(state.get('query_types', {}))
+        self.dns_cache = dict(state.get('dns_cache', {}))
+        self.stats['total_queries'] = state.get('total_queries', 0)
+        self.stats['cache_hits'] = state.get('cache_hits', 0)
+        self.stats['unique_domains'] = len(self.domain_counter)
+
+    def take_partial(self) -> Optional[Dict[str, Any]]:
+        """Queries, counters and resolutions since the last call (worker mode)."""
+        if not self.stats['total_queries'] and not self.dns_cache:
+            return None
+        partial = {
+            'queries': [q.to_dict() for q in self.recent_queries],
+            'domains': dict(self.domain_counter),
+            'query_types': dict(self.query_types),
+            'dns_cache': self.dns_cache,
+            'total_queries': self.stats['total_queries'],
+            'cache_hits': self.stats['cache_hits'],
+            'timestamps': self._query_timestamps
+        }
+        self.recent_queries = []
+        self.domain_counter = Counter()
+        self.query_types = Counter()
+        self.dns_cache = {}
+        self.stats['total_queries'] = 0
+        self.stats['cache_hits'] = 0
+        self._query_timestamps = []
+        return partial
+
+    def merge_partial(self, partial: Dict[str, Any]) -> None:
+        """Add a worker's take_partial()."""
+        self.recent_queries.extend(DNSQuery(**record) for record in partial['queries'])
+        self.recent_queries.sort(key=lambda q: q.timestamp)
+        self.recent_queries = self.recent_queries[-self.max_entries:]
+
+        self.domain_counter.update(partial['domains'])
+        self.query_types.update(partial['query_types'])
+        self.stats['total_queries'] += partial['total_queries']
+        self.stats['cache_hits'] += partial['cache_hits']
+        self._query_timestamps.extend(partial['timestamps'])
+
+        # Answers to queries shipped in an earlier partial
+        for domain, resolved_ip in partial['dns_cache'].items():
+            self.dns_cache[domain] = resolved_ip
+            for query in reversed(self.recent_queries):
+                if query.domain == domain and query.resolved_ip is None:
+                    query.resolved_ip = resolved_ip
+                    break
     
-    def get_data(self) -> Dict[str, Any]:
-        """Get current monitoring data."""
+    def build_snapshot(self) -> Dict[str, Any]:
+        """Counters, top domains and recent queries (capture thread side)."""
         # Update queries per minute
         current_time = time.time()
         recent_timestamps = [ts for ts in self._query_timestamps if current_time - ts < 60]
@@ -133,20 +217,23 @@ def get_data(self) -> Dict[str, Any]:
         # Update unique domains count
         self.stats['unique_domains'] = len(self.domain_counter)
         
-        # Get top 10 domains
-        top_domains = self.domain_counter.most_common(10)
-        
-        # Get recent queries (last 20)
-        recent = [q.to_dict() for q in self.recent_queries[-20:]]
-        
         return {
-            'monitoring': not self._stop_event.is_set(),
             'stats': self.stats.copy(),
-            'recent_queries': recent,
-            'top_domains': top_domains,
+            'recent_queries': [q.to_dict() for q in self.recent_queries[-20:]],
+            'top_domains': self.domain_counter.most_common(10),
             'query_types': dict(self.query_types),
-            'dns_cache_size': len(self.dns_cache),
-            'educational_tip': self._get_educational_tip()
+            'dns_cache_size': len(self.dns_cache)
+        }
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get current monitoring data (the latest published snapshot)."""
+        snapshot = self.snapshots.current()
+        return {
+            **snapshot.data,
+            'monitoring': not self._stop_event.is_set(),
+            'educational_tip': self._get_educational_tip(),
+            'capture': self.capture_stats(),
+            'snapshot_version': snapshot.version
         }
     
     def requires_root(self) -> bool:
@@ -155,33 +242,42 @@ def requires_root(self) -> bool:
     
     def _monitor_dns(self):
         """Monitor DNS traffic continuously."""
-        while not self._stop_event.is_set():
-            try:
-                # Sniff DNS packets (port 53)
-                sniff(
-                    filter="udp port 53",
-                    prn=self._process_dns_packet,
-                    store=0,
-                    timeout=1
-                )
-            except Exception as e:
-                logger.error(f"DNS monitoring error: {e}")
-                time.sleep(1)
+        # Packets are analysed on the queue's worker, off the sniffer thread
+        self.start_packet_queue(self._process_dns_packet, self.capture_filter)
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    # Sniff DNS packets (port 53)
+                    sniff(
+                        filter=self.capture_filter,
+                        store=0,
+                        timeout=1,
+                        **self.capture_options(self._process_dns_packet)
+                    )
+                    self.capture_tick()
+                except Exception as e:
+                    logger.error(f"DNS monitoring error: {e}")
+                    time.sleep(1)
+        finally:
+            self.stop_packet_queue()
     
     def _process_dns_packet(self, packet):
         """Process individual DNS packet."""
-        if not packet.haslayer(DNS):
-            return
+        try:
+            if not packet.haslayer(DNS):
+                return
         
-        dns_layer = packet[DNS]
+            dns_layer = packet[DNS]
         
-        # DNS Query (Question)
-        if dns_layer.qr == 0 and packet.haslayer(DNSQR):
-            self._process_dns_query(packet)
+            # DNS Query (Question)
+            if dns_layer.qr == 0 and packet.haslayer(DNSQR):
+                self._process_dns_query(packet)
         
-        # DNS Response (Answer)
-        elif dns_layer.qr == 1 and packet.haslayer(DNSRR):
-            self._process_dns_response(packet)
+            # DNS Response (Answer)
+            elif dns_layer.qr == 1 and packet.haslayer(DNSRR):
+                self._process_dns_response(packet)
+        finally:
+            self.snapshots.tick()
     
     def _process_dns_query(self, packet):
         """Process DNS query packet."""
@@ -203,8 +299,9 @@ def _process_dns_query(self, packet):
             
             # Store query
             self.recent_queries.append(query)
-            if len(self.recent_queries) > 100:
-                self.recent_queries = self.recent_queries[-100:]
+            self.emit_event("dns_query", query)
+            if len(self.recent_queries) > self.max_entries:
+                self.recent_queries = self.recent_queries[-self.max_entries:]
             
             # Update counters
             self.domain_counter[domain] += 1
@@ -16,18 +16,20 @@
 import time
 import os
 from typing import Dict, List, Any, Optional, Set, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from collections import defaultdict
 
-try:
-    from scapy.all import (
-        Dot11, Dot11Auth, Dot11Deauth, Dot11AssoReq, Dot11AssoResp,
-        EAPOL, sniff, wrpcap, conf, RadioTap
-    )
-    conf.verb = 0
-    SCAPY_AVAILABLE = True
-except ImportError:
-    SCAPY_AVAILABLE = False
+from .scapy_loader import scapy_binder, scapy_installed
+
+SCAPY_AVAILABLE = scapy_installed()
+
+# scapy names, bound by _load_scapy() on first real-mode use
+_SCAPY_NAMES = (
+    'Dot11', 'Dot11Auth', 'Dot11Deauth', 'Dot11AssoReq', 'Dot11AssoResp',
+    'EAPOL', 'sniff', 'wrpcap', 'conf', 'RadioTap',
+)
+Dot11 = Dot11Auth = Dot11Deauth = Dot11AssoReq = Dot11AssoResp = None
+EAPOL = sniff = wrpcap = conf = RadioTap = None
 
 from .base import Plugin, PluginConfig
 
@@ -35,7 +37,11 @@
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Imports scapy and binds _SCAPY_NAMES (clears SCAPY_AVAILABLE on failure)
+_load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
+
+
+@dataclass(slots=True)
 class HandshakeCapture:
     """Represents a captured WPA handshake."""
     bssid: str
@@ -49,10 +55,20 @@ class HandshakeCapture:
     educational_note: str = ""
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'bssid': self.bssid,
+            'ssid': self.ssid,
+            'client_mac': self.client_mac,
+            'timestamp': self.timestamp,
+            'packets_captured': self.packets_captured,
+            'is_complete': self.is_complete,
+            'file_path': self.file_path,
+            'password_strength': self.password_strength,
+            'educational_note': self.educational_note
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class TargetNetwork:
     """Represents a target network for handshake capture."""
     bssid: str
@@ -63,7 +79,14 @@ class TargetNetwork:
     clients_count: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'bssid': self.bssid,
+            'ssid': self.ssid,
+            'channel': self.channel,
+            'encryption': self.encryption,
+            'signal_strength': self.signal_strength,
+            'clients_count': self.clients_count
+        }
 
 
 class HandshakeCapturer(Plugin):
@@ -91,6 +114,10 @@ class HandshakeCapturer(Plugin):
     5. Validate handshake completeness
     6. Export for password strength analysis
     """
+
+    packet_handlers = ("_process_packet",)
+    monitor_capture = True
+    snapshot_entities = {'target_networks': 'bssid'}
     
     def __init__(self, config: PluginConfig):
         super().__init__(config)
@@ -124,6 +151,10 @@ def __init__(self, config: PluginConfig):
         
         # Ethical consent
         self._ethical_consent = config.config.get('ethical_consent', False)
+
+        # Real mode: import scapy before any capture or packet handling
+        if not self.config.config.get('mock_mode', False):
+            _load_scapy()
     
     def initialize(self) -> None:
         """Initialize plugin with ethical checks."""
@@ -159,6 +190,7 @@ def start(self):
         logger.warning("⚠️ EDUCATIONAL USE ONLY - Own network only!")
         
         self._stop_event.clear()
+        self.snapshots.start()
         
         # Start monitoring thread
         self._monitor_thread = threading.Thread(target=self._monitor_handshakes, daemon=True)
@@ -170,32 +202,36 @@ def stop(self):
         self._stop_event.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
+        self.snapshots.stop()
     
     def cleanup(self) -> None:
         """Cleanup resources."""
         self.stop()
     
-    def get_data(self) -> Dict[str, Any]:
-        """Get current capture data."""
+    def build_snapshot(self) -> Dict[str, Any]:
+        """Target networks and recent handshakes (capture thread side)."""
         # Update stats
         self.stats['networks_detected'] = len(self.target_networks)
         self.stats['handshakes_captured'] = len(self.handshakes)
         self.stats['complete_handshakes'] = sum(1 for h in self.handshakes if h.is_complete)
         
-        # Get target networks
-        targets = [net.to_dict() for net in self.target_networks.values()]
-        
-        # Get handshakes (last 10)
-        recent_handshakes = [h.to_dict() for h in self.handshakes[-10:]]
-        
         return {
+            'stats': self.stats.copy(),
+            'target_networks': [net.to_dict() for net in self.target_networks.values()],
+            'handshakes': [h.to_dict() for h in self.handshakes[-10:]]
+        }
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get current capture data (the latest published snapshot)."""
+        snapshot = self.snapshots.current()
+        return {
+            **snapshot.data,
             'monitoring': not self._stop_event.is_set(),
             'ethical_consent': self._ethical_consent,
-            'stats': self.stats.copy(),
-            'target_networks': targets,
-            'handshakes': recent_handshakes,
             'capture_dir': self.capture_dir,
-            'educational_warning': self._get_educational_warning()
+            'educational_warning': self._get_educational_warning(),
+            'capture': self.capture_stats(),
+            'snapshot_version': snapshot.version
         }
     
     def requires_root(self) -> bool:
@@ -204,32 +240,40 @@ def requires_root(self) -> bool:
     
     def _monitor_handshakes(self):
         """Monitor for EAPOL handshake packets."""
-        while not self._stop_event.is_set():
-            try:
-                # Sniff on monitor mode interface
-                sniff(
-                    iface="wlan0mon",
-                    prn=self._process_packet,
-                    store=0,
-                    timeout=1
-                )
-            except Exception as e:
-                logger.error(f"Handshake monitoring error: {e}")
-                logger.warning("Ensure WiFi adapter is in monitor mode!")
-                time.sleep(1)
+        # Packets are analysed on the queue's worker, off the sniffer thread
+        self.start_packet_queue(self._process_packet)
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    # Sniff on the monitor mode interface (monitor_interface)
+                    sniff(
+                        store=0,
+                        timeout=1,
+                        **self.capture_options(self._process_packet)
+                    )
+                    self.capture_tick()
+                except Exception as e:
+                    logger.error(f"Handshake monitoring error: {e}")
+                    logger.warning("Ensure WiFi adapter is in monitor mode!")
+                    time.sleep(1)
+        finally:
+            self.stop_packet_queue()
     
     def _process_packet(self, packet):
         """Process packet for handshake data."""
-        if not packet.haslayer(Dot11):
-            return
+        try:
+            if not packet.haslayer(Dot11):
+                return
         
-        # Process beacon frames (discover networks)
-        if packet.haslayer(Dot11Beacon):
-            self._process_beacon(packet)
+            # Process beacon frames (discover networks)
+            if packet.haslayer(Dot11Beacon):
+                self._process_beacon(packet)
         
-        # Process EAPOL frames (handshake packets!)
-        elif packet.haslayer(EAPOL):
-            self._process_eapol(packet)
+            # Process EAPOL frames (handshake packets!)
+            elif packet.haslayer(EAPOL):
+                self._process_eapol(packet)
+        finally:
+            self.snapshots.tick()
     
     def _process_beacon(self, packet):
         """Process beacon to discover target networks."""
@@ -355,6 +399,7 @@ def _validate_and_save_handshake(self, bssid: str, client: str):
         )
         
         self.handshakes.append(handshake)
+        self.emit_event("handshake", handshake)
         self.stats['handshakes_captured'] += 1
         
         logger.warning(f"🎯 HANDSHAKE CAPTURED: {network.ssid} - Password strength: {password_strength}")
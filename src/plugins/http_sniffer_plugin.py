@@ -16,24 +16,32 @@
 import time
 import re
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from collections import defaultdict
 from urllib.parse import urlparse, parse_qs
 
-try:
-    from scapy.all import sniff, TCP, IP, Raw, conf
-    conf.verb = 0
-    SCAPY_AVAILABLE = True
-except ImportError:
-    SCAPY_AVAILABLE = False
+from .scapy_loader import scapy_binder, scapy_installed
+
+SCAPY_AVAILABLE = scapy_installed()
+
+# scapy names, bound by _load_scapy() on first real-mode use
+_SCAPY_NAMES = ('sniff', 'TCP', 'IP', 'Raw', 'conf')
+sniff = TCP = IP = Raw = conf = None
 
 from .base import Plugin, PluginConfig
 
 
 logger = logging.getLogger(__name__)
 
+# Additive counters shipped by take_partial()
+PARTIAL_STATS = ('total_http_packets', 'http_requests', 'https_blocked', 'credentials_found')
+
+
+# Imports scapy and binds _SCAPY_NAMES (clears SCAPY_AVAILABLE on failure)
+_load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
 
-@dataclass
+
+@dataclass(slots=True)
 class HTTPRequest:
     """Represents captured HTTP request."""
     timestamp: float
@@ -47,10 +55,27 @@ class HTTPRequest:
     post_data: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'timestamp': self.timestamp,
+            'source_ip': self.source_ip,
+            'dest_ip': self.dest_ip,
+            'method': self.method,
+            'host': self.host,
+            'path': self.path,
+            'user_agent': self.user_agent,
+            'cookies': self.cookies,
+            'post_data': self.post_data
+        }
+
+    def to_event(self) -> Dict[str, Any]:
+        """Event log record: cookies and POST bodies are never written to disk."""
+        event = self.to_dict()
+        event['has_cookies'] = bool(event.pop('cookies'))
+        event['has_post_data'] = bool(event.pop('post_data'))
+        return event
 
 
-@dataclass
+@dataclass(slots=True)
 class CredentialCapture:
     """Represents captured credentials (passwords, tokens)."""
     timestamp: float
@@ -61,7 +86,14 @@ class CredentialCapture:
     redacted_value: str = "***REDACTED***"  # Never store actual passwords!
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'timestamp': self.timestamp,
+            'source_ip': self.source_ip,
+            'url': self.url,
+            'credential_type': self.credential_type,
+            'username': self.username,
+            'redacted_value': self.redacted_value
+        }
 
 
 class HTTPSnifferPlugin(Plugin):
@@ -80,6 +112,9 @@ class HTTPSnifferPlugin(Plugin):
     - Highlights credential exposure risks
     - Teaches importance of SSL/TLS
     """
+
+    packet_handlers = ("_process_http_packet",)
+    capture_filter = "tcp port 80"
     
     def __init__(self, config: PluginConfig):
         super().__init__(config)
@@ -115,6 +150,10 @@ def __init__(self, config: PluginConfig):
             'username': re.compile(rb'(?:username|user|email|login)=([^&\s]+)', re.IGNORECASE),
             'token': re.compile(rb'(?:token|auth|api_key)=([^&\s]+)', re.IGNORECASE),
         }
+
+        # Real mode: import scapy before any capture or packet handling
+        if not self.config.config.get('mock_mode', False):
+            _load_scapy()
     
     def initialize(self) -> None:
         """Initialize plugin with ethical checks."""
@@ -146,6 +185,7 @@ def start(self):
         logger.warning("⚠️ Remember: EDUCATIONAL USE ONLY on YOUR network!")
         
         self._stop_event.clear()
+        self.snapshots.start()
         
         # Start monitoring thread
         self._monitor_thread = threading.Thread(target=self._monitor_http, daemon=True)
@@ -157,6 +197,7 @@ def stop(self):
         self._stop_event.set()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
+        self.snapshots.stop()
     
     def cleanup(self) -> None:
         """Cleanup resources."""
@@ -164,26 +205,55 @@ def cleanup(self) -> None:
         # Clear sensitive data
         self.http_requests.clear()
         self.credential_captures.clear()
+
+    def take_partial(self) -> Optional[Dict[str, Any]]:
+        """Requests, credential captures and counters since the last call (worker mode)."""
+        if not self.stats['total_http_packets']:
+            return None
+        partial = {
+            'requests': [r.to_dict() for r in self.http_requests],
+            'credentials': [c.to_dict() for c in self.credential_captures],
+            'hosts': list(self.hosts_seen),
+            'stats': {key: self.stats[key] for key in PARTIAL_STATS}
+        }
+        self.http_requests = []
+        self.credential_captures = []
+        self.hosts_seen = set()
+        for key in PARTIAL_STATS:
+            self.stats[key] = 0
+        return partial
+
+    def merge_partial(self, partial: Dict[str, Any]) -> None:
+        """Add a worker's take_partial()."""
+        self.http_requests.extend(HTTPRequest(**record) for record in partial['requests'])
+        self.http_requests = self.http_requests[-self.max_entries:]
+        self.credential_captures.extend(CredentialCapture(**record) for record in partial['credentials'])
+        self.hosts_seen.update(partial['hosts'])
+        for key, value in partial['stats'].items():
+            self.stats[key] += value
     
-    def get_data(self) -> Dict[str, Any]:
-        """Get current sniffing data."""
+    def build_snapshot(self) -> Dict[str, Any]:
+        """Counters, recent requests and credential captures (capture thread side)."""
         # Update stats
         self.stats['unique_hosts'] = len(self.hosts_seen)
         
-        # Get recent requests (last 20)
-        recent_requests = [r.to_dict() for r in self.http_requests[-20:]]
-        
-        # Get recent credential captures (last 10)
-        recent_credentials = [c.to_dict() for c in self.credential_captures[-10:]]
-        
         return {
+            'stats': self.stats.copy(),
+            'recent_requests': [r.to_dict() for r in self.http_requests[-20:]],
+            'credential_captures': [c.to_dict() for c in self.credential_captures[-10:]],
+            'https_percentage': self._calculate_https_percentage()
+        }
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get current sniffing data (the latest published snapshot)."""
+        snapshot = self.snapshots.current()
+        return {
+            **snapshot.data,
             'monitoring': not self._stop_event.is_set(),
             'ethical_consent': self._ethical_consent_given,
-            'stats': self.stats.copy(),
-            'recent_requests': recent_requests,
-            'credential_captures': recent_credentials,
             'educational_warning': self._get_educational_warning(),
-            'https_percentage': self._calculate_https_percentage()
+            'capture': self.capture_stats(),
+            'snapshot_version': snapshot.version
         }
     
     def requires_root(self) -> bool:
@@ -192,22 +262,29 @@ def requires_root(self) -> bool:
     
     def _monitor_http(self):
         """Monitor HTTP traffic continuously."""
-        while not self._stop_event.is_set():
-            try:
-                # Sniff HTTP packets (port 80)
-                sniff(
-                    filter="tcp port 80",
-                    prn=self._process_http_packet,
-                    store=0,
-                    timeout=1
-                )
-            except Exception as e:
-                logger.error(f"HTTP monitoring error: {e}")
-                time.sleep(1)
+        # Packets are analysed on the queue's worker, off the sniffer thread
+        self.start_packet_queue(self._process_http_packet, self.capture_filter)
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    # Sniff HTTP packets (port 80)
+                    sniff(
+                        filter=self.capture_filter,
+                        store=0,
+                        timeout=1,
+                        **self.capture_options(self._process_http_packet)
+                    )
+                    self.capture_tick()
+                except Exception as e:
+                    logger.error(f"HTTP monitoring error: {e}")
+                    time.sleep(1)
+        finally:
+            self.stop_packet_queue()
     
     def _process_http_packet(self, packet):
         """Process individual HTTP packet."""
         if not packet.haslayer(TCP) or not packet.haslayer(Raw):
+            self.snapshots.tick()
             return
         
         self.stats['total_http_packets'] += 1
@@ -222,6 +299,8 @@ def _process_http_packet(self, packet):
                 
         except Exception as e:
             logger.error(f"Error processing HTTP packet: {e}")
+        finally:
+            self.snapshots.tick()
     
     def _parse_http_request(self, packet, payload: bytes):
         """Parse HTTP request from packet."""
@@ -284,8 +363,9 @@ def _parse_http_request(self, packet, payload: bytes):
             
             # Store request
             self.http_requests.append(request)
-            if len(self.http_requests) > 100:
-                self.http_requests = self.http_requests[-100:]
+            self.emit_event("http_request", request.to_event())
+            if len(self.http_requests) > self.max_entries:
+                self.http_requests = self.http_requests[-self.max_entries:]
             
             # Track host
             self.hosts_seen.add(host)
@@ -324,6 +404,7 @@ def _check_for_credentials(self, source_ip: str, host: str, path: str, data: byt
                     redacted_value="***REDACTED***"
                 )
                 self.credential_captures.append(credential)
+                self.emit_event("http_credential", credential)
                 self.stats['credentials_found'] += 1
                 found_credentials = True
                 
@@ -340,6 +421,7 @@ def _check_for_credentials(self, source_ip: str, host: str, path: str, data: byt
                     redacted_value="***REDACTED***"
                 )
                 self.credential_captures.append(credential)
+                self.emit_event("http_credential", credential)
                 self.stats['credentials_found'] += 1
                 found_credentials = True
             
@@ -0,0 +1,246 @@
+"""
+Plugin Lifecycle - Owns the live plugin set and swaps it without leaks
+
+Switching between mock and real mode replaces every plugin. The old set
+must be gone (threads joined, capture sockets closed, hub subscriptions
+dropped) before the new one starts, or each toggle stacks another set of
+sniffers on the interface.
+
+PluginLifecycle:
+- ``add()`` adopts a plugin: always-on plugins are initialized right away,
+  on-demand ones are registered with PluginActivation
+- ``teardown()`` stops on-demand workers, cleans up every plugin and reports
+  what is still alive
+- ``remove()`` does the same for one plugin (disabled by a config reload)
+- ``resources`` are created once and handed to each new plugin set
+  (capture hub, vendor/OUI cache, metrics store, perf registry)
+- with a metrics store and ``persist_state`` on, plugin state is restored
+  before initialize(), snapshotted in the background and saved on teardown
+- with a perf registry, collect_data() and the packet handlers of every
+  plugin are timed
+- ``resource_counts()`` reports live threads and sockets
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .activation import PluginActivation
+from .base import Plugin
+from .capture_hub import CaptureHub, get_capture_hub
+
+
+logger = logging.getLogger(__name__)
+
+
+PROC_SELF_FD = "/proc/self/fd"
+
+
+@dataclass
+class SharedResources:
+    """Expensive state that survives plugin set swaps."""
+    capture_hub: CaptureHub = field(default_factory=get_capture_hub)
+    vendor_cache: Dict[str, str] = field(default_factory=dict)  # {mac: vendor}
+    metrics_store: Optional[Any] = None  # utils.metrics_store.MetricsStore
+    event_log: Optional[Any] = None  # utils.event_log.EventLog
+    packet_recorder: Optional[Any] = None  # plugins.packet_recorder.PacketRecorder
+    perf: Optional[Any] = None  # utils.perf.PerfRegistry
+    # Packet queue settings for capture plugins (queue_size, overflow_policy, sample_every)
+    capture_settings: Dict[str, Any] = field(default_factory=dict)
+    # {name: plugins.plugin_config.PluginSpec} from --config (None: the built-in set)
+    plugin_specs: Optional[Dict[str, Any]] = None
+    worker_pool: Optional[Any] = None  # plugins.worker_pool.WorkerPool (--workers)
+
+
+def count_open_sockets(fd_dir: Optional[str] = None) -> Optional[int]:
+    """
+    Sockets open in this process (Linux /proc), or None if unavailable.
+    """
+    fd_dir = fd_dir or PROC_SELF_FD
+    try:
+        entries = os.listdir(fd_dir)
+    except OSError:
+        return None
+
+    sockets = 0
+    for entry in entries:
+        try:
+            if os.readlink(os.path.join(fd_dir, entry)).startswith('socket:'):
+                sockets += 1
+        except OSError:
+            continue  # fd closed while listing
+    return sockets
+
+
+class PluginLifecycle:
+    """
+    Deterministic build/teardown of the application's plugins.
+
+    Args:
+        activation: Registry for on-demand plugins (reused across swaps so
+            consumers carry over to the new instances)
+        resources: Shared resources (default: created once here)
+    """
+
+    def __init__(self, activation: PluginActivation, resources: Optional[SharedResources] = None):
+        self.activation = activation
+        self.resources = resources or SharedResources()
+        self._plugins: Dict[str, Plugin] = {}
+        self._on_demand: Dict[str, bool] = {}
+        # Off for plugin sets whose state and events must not outlive them (mock mode)
+        self.persist_state = True
+        self.stats = {
+            'generation': 0,
+            'teardowns': 0,
+            'cleanup_errors': 0
+        }
+
+    def add(self, name: str, plugin: Plugin, on_demand: bool = False) -> Plugin:
+        """
+        Adopt ``plugin`` under ``name``.
+
+        Always-on plugins are initialized now; on-demand plugins are
+        initialized by their first consumer (see PluginActivation).
+
+        Returns:
+            The plugin, for assignment by the caller
+        """
+        if name in self._plugins:
+            raise ValueError(f"Plugin {name!r} already added; call teardown() first")
+
+        self._plugins[name] = plugin
+        self._on_demand[name] = on_demand
+
+        store = self._state_store()
+        if store is not None:
+            state = store.load_state(name)
+            if state:
+                try:
+                    plugin.restore_state(state)
+                except Exception as e:
+                    logger.error(f"Restoring state of plugin {name} failed: {e}")
+            store.add_state_source(name, plugin.get_state)
+        plugin.event_sink = self.resources.event_log if self.persist_state else None
+        plugin.packet_recorder = self.resources.packet_recorder if self.persist_state else None
+        if self.resources.perf is not None:
+            self.resources.perf.instrument_plugin(name, plugin)
+
+        if on_demand:
+            self.activation.register(name, start=plugin.initialize, stop=plugin.stop)
+        else:
+            plugin.initialize()
+        return plugin
+
+    def remove(self, name: str) -> Optional[Plugin]:
+        """
+        Stop, clean up and forget one plugin; the others keep running.
+
+        Its final state is saved like on teardown(). Consumers of an
+        on-demand plugin stay with the activation registry, so a plugin
+        added again under ``name`` starts for them right away.
+
+        Returns:
+            The removed plugin (None if there was none)
+        """
+        plugin = self._plugins.pop(name, None)
+        if plugin is None:
+            return None
+        on_demand = self._on_demand.pop(name, False)
+        store = self._state_store()
+        if store is not None:
+            store.remove_state_source(name)
+        if on_demand:
+            self.activation.unregister(name)
+
+        try:
+            plugin.cleanup()
+        except Exception as e:
+            self.stats['cleanup_errors'] += 1
+            logger.error(f"Cleanup of plugin {name} failed: {e}")
+        if store is not None:
+            self._save_state(store, name, plugin)
+        return plugin
+
+    def get(self, name: str) -> Optional[Plugin]:
+        return self._plugins.get(name)
+
+    def names(self) -> List[str]:
+        return list(self._plugins)
+
+    def is_on_demand(self, name: str) -> bool:
+        return self._on_demand.get(name, False)
+
+    def teardown(self) -> Dict[str, Any]:
+        """
+        Stop and clean up every plugin, then forget them.
+
+        On-demand workers are stopped first (joining their threads), then
+        each plugin's ``cleanup()`` runs and its final state is saved. Consumers registered with the
+        activation registry are kept, so the next plugin set starts for
+        them right away.
+
+        Returns:
+            resource_counts() after teardown, plus the plugins torn down
+        """
+        plugins = list(self._plugins.items())
+        store = self._state_store()
+        if store is not None:
+            for name, _ in plugins:
+                store.remove_state_source(name)
+        self.activation.stop_all()
+
+        for name, plugin in plugins:
+            try:
+                plugin.cleanup()
+            except Exception as e:
+                self.stats['cleanup_errors'] += 1
+                logger.error(f"Cleanup of plugin {name} failed: {e}")
+            if store is not None:
+                self._save_state(store, name, plugin)
+
+        self._plugins.clear()
+        self._on_demand.clear()
+        if plugins:
+            self.stats['teardowns'] += 1
+            self.stats['generation'] += 1
+
+        report = self.resource_counts()
+        report['torn_down'] = [name for name, _ in plugins]
+        # The packet recorder outlives plugin sets: its subscription is expected
+        recorder = self.resources.packet_recorder
+        leaked = report['capture_subscribers'] - (1 if recorder and recorder.recording else 0)
+        if leaked > 0:
+            logger.warning(f"{leaked} capture hub subscriber(s) survived teardown")
+        return report
+
+    def _state_store(self):
+        if self.persist_state:
+            return self.resources.metrics_store
+        return None
+
+    def _save_state(self, store, name: str, plugin: Plugin) -> None:
+        try:
+            state = plugin.get_state()
+        except Exception as e:
+            logger.error(f"Saving state of plugin {name} failed: {e}")
+            return
+        if state is not None:
+            store.save_state(name, state)
+
+    def resource_counts(self) -> Dict[str, Any]:
+        """Live threads, sockets and plugins (for leak checks and the UI)."""
+        threads = threading.enumerate()
+        return {
+            'threads': len(threads),
+            'thread_names': sorted(thread.name for thread in threads),
+            'sockets': count_open_sockets(),
+            'plugins': len(self._plugins),
+            'running_plugins': self.activation.running(),
+            'capture_subscribers': self.resources.capture_hub.subscriber_count(),
+            'generation': self.stats['generation']
+        }
@@ -2,18 +2,108 @@
 Network metrics plugin using psutil.
 
 Collects network interface statistics, bandwidth usage, and connection information.
-Uses psutil library for cross-platform network monitoring.
+Uses psutil library for cross-platform network monitoring. On Linux, socket
+counts are read straight from /proc/net/{tcp,tcp6,udp,udp6}, which is far
+cheaper than psutil.net_connections() walking every process's descriptors.
 
 Author: Juan-Dev - Soli Deo Gloria ✝️
 Date: 2025-11-09
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+import logging
 import time
 
 from .base import Plugin, PluginConfig, PluginStatus
 
 
+logger = logging.getLogger(__name__)
+
+
+# Socket tables parsed by the 'proc' connections backend
+PROC_NET = Path('/proc/net')
+PROC_SOCKET_TABLES = ('tcp', 'tcp6', 'udp', 'udp6')
+
+# Kernel TCP state codes (include/net/tcp_states.h) as shown in /proc/net/tcp
+TCP_STATES = {
+    '01': 'ESTABLISHED',
+    '02': 'SYN_SENT',
+    '03': 'SYN_RECV',
+    '04': 'FIN_WAIT1',
+    '05': 'FIN_WAIT2',
+    '06': 'TIME_WAIT',
+    '07': 'CLOSE',
+    '08': 'CLOSE_WAIT',
+    '09': 'LAST_ACK',
+    '0A': 'LISTEN',
+    '0B': 'CLOSING',
+    '0C': 'NEW_SYN_RECV',
+}
+
+COUNTER_32_MAX = 2 ** 32
+
+# psutil snetio fields summed over the configured interfaces
+IO_COUNTER_FIELDS = ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                     'errin', 'errout', 'dropin', 'dropout')
+
+
+def count_proc_sockets(proc_net: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Count inet sockets by state from /proc/net socket tables.
+
+    Only the state column is parsed, so this stays cheap on hosts with tens
+    of thousands of sockets. TCP sockets are keyed by state name; UDP
+    sockets (stateless, like psutil's 'NONE') are counted under 'UDP'.
+
+    Returns:
+        {state: count}, e.g. {'ESTABLISHED': 12, 'LISTEN': 4, 'UDP': 7}
+    """
+    proc_net = proc_net or PROC_NET
+    counts: Counter = Counter()
+    for table in PROC_SOCKET_TABLES:
+        try:
+            with open(proc_net / table, 'r') as f:
+                next(f, None)  # Header
+                if table.startswith('udp'):
+                    counts['UDP'] += sum(1 for _ in f)
+                    continue
+                for line in f:
+                    fields = line.split(None, 4)
+                    if len(fields) > 3:
+                        counts[TCP_STATES.get(fields[3], 'UNKNOWN')] += 1
+        except FileNotFoundError:
+            continue  # e.g. IPv6 disabled
+    return dict(counts)
+
+
+def counter_delta(current: int, previous: int) -> int:
+    """
+    Increase of a monotonically growing interface counter.
+
+    Handles 32-bit wraparound (drivers exposing 32-bit counters) and counter
+    resets (interface removed and re-created), which would otherwise show
+    up as negative bandwidth.
+    """
+    if current >= previous:
+        return current - previous
+    if previous < COUNTER_32_MAX:
+        wrapped = COUNTER_32_MAX - previous + current
+        if wrapped < COUNTER_32_MAX // 2:
+            return wrapped
+    # Reset: everything since the reset is new traffic
+    return current
+
+
+def sum_counters(counters: List[Any]) -> SimpleNamespace:
+    """Field-wise sum of psutil I/O counters (several interfaces as one)."""
+    return SimpleNamespace(**{
+        name: sum(getattr(c, name) for c in counters) for name in IO_COUNTER_FIELDS
+    })
+
+
 class NetworkPlugin(Plugin):
     """
     Network metrics collection plugin.
@@ -37,6 +127,18 @@ class NetworkPlugin(Plugin):
         errors_out: Total transmit errors
         drops_in: Total receive drops
         drops_out: Total transmit drops
+        interfaces: With ``interfaces`` configured, the same counters and
+            bandwidth per interface ({nic: {...}}); the fields above are
+            then their sum
+
+    Config options:
+        interface: Interface whose counters are reported (default: all
+            interfaces combined; falls back to all if the NIC is missing)
+        interfaces: Several interfaces, reported together and one by one
+            (takes precedence over ``interface``)
+        connections_backend: 'proc', 'psutil' or 'auto' (default; proc when
+            /proc/net/tcp exists)
+        connections_interval: Seconds between socket counts (default 5.0)
 
     Example:
         >>> config = PluginConfig(name="network", rate_ms=1000)
@@ -78,13 +180,28 @@ def initialize(self) -> None:
 
         # Get interface to monitor (None = all interfaces)
         self._interface = self.config.config.get('interface', None)
+        self._interfaces: List[str] = list(self.config.config.get('interfaces') or [])
+        self._interface_missing_logged = False
+        # Latest per-interface counters and the previous (sent, recv) bytes
+        self._per_nic: Dict[str, Any] = {}
+        self._last_per_nic: Dict[str, Tuple[int, int]] = {}
+
+        # Socket counting is far more expensive than counters: own cadence
+        backend = self.config.config.get('connections_backend', 'auto')
+        if backend == 'auto':
+            backend = 'proc' if (PROC_NET / 'tcp').exists() else 'psutil'
+        self._connections_backend = backend
+        self._connections_interval = self.config.config.get('connections_interval', 5.0)
+        self._connections: Optional[Tuple[int, int]] = None
+        self._connections_at = 0.0
 
         # Initialize baseline counters for bandwidth calculation
         try:
-            counters = self.psutil.net_io_counters(pernic=False)
+            counters = self._read_counters()
             self._last_bytes_sent = counters.bytes_sent
             self._last_bytes_recv = counters.bytes_recv
             self._last_time = time.time()
+            self._last_per_nic = {nic: (c.bytes_sent, c.bytes_recv) for nic, c in self._per_nic.items()}
         except Exception as e:
             raise RuntimeError(f"Failed to get network counters: {e}")
 
@@ -107,17 +224,25 @@ def collect_data(self) -> Dict[str, Any]:
         if self._mock_mode:
             return self._mock_generator.get_network_stats()
 
-        # Real mode: Get network I/O counters (all interfaces combined)
-        counters = self.psutil.net_io_counters(pernic=False)
+        # Real mode: Get network I/O counters (configured interface or all)
+        counters = self._read_counters()
 
         # Calculate bandwidth (bytes per second -> Mbps)
         current_time = time.time()
         time_delta = current_time - self._last_time
 
+        # Per interface first: a NIC that resets or disappears then only
+        # drops out of the sum instead of skewing the combined counters
+        nic_deltas = self._nic_deltas()
+
         if time_delta > 0:
             # bytes/second -> bits/second -> megabits/second
-            bytes_sent_delta = counters.bytes_sent - self._last_bytes_sent
-            bytes_recv_delta = counters.bytes_recv - self._last_bytes_recv
+            if self._per_nic:
+                bytes_sent_delta = sum(sent for sent, _ in nic_deltas.values())
+                bytes_recv_delta = sum(recv for _, recv in nic_deltas.values())
+            else:
+                bytes_sent_delta = counter_delta(counters.bytes_sent, self._last_bytes_sent)
+                bytes_recv_delta = counter_delta(counters.bytes_recv, self._last_bytes_recv)
 
             bandwidth_tx_mbps = (bytes_sent_delta * 8) / (time_delta * 1_000_000)
             bandwidth_rx_mbps = (bytes_recv_delta * 8) / (time_delta * 1_000_000)
@@ -131,12 +256,8 @@ def collect_data(self) -> Dict[str, Any]:
         self._last_bytes_recv = counters.bytes_recv
         self._last_time = current_time
 
-        # Get connection count
-        connections = self.psutil.net_connections(kind='inet')
-        connections_established = sum(
-            1 for conn in connections if conn.status == 'ESTABLISHED'
-        )
-        connections_total = len(connections)
+        # Get connection count (cached between slower refreshes)
+        connections_established, connections_total = self._get_connections()
 
         data = {
             "bandwidth_tx_mbps": bandwidth_tx_mbps,
@@ -152,9 +273,91 @@ def collect_data(self) -> Dict[str, Any]:
             "drops_in": counters.dropin,
             "drops_out": counters.dropout,
         }
+        if self._interfaces:
+            data["interfaces"] = self._interface_views(time_delta, nic_deltas)
+        self._last_per_nic = {nic: (c.bytes_sent, c.bytes_recv) for nic, c in self._per_nic.items()}
 
         return data
 
+    def _nic_deltas(self) -> Dict[str, Tuple[int, int]]:
+        """(sent, recv) bytes since the last collection of each interface seen both times."""
+        last = self._last_per_nic
+        return {
+            nic: (counter_delta(c.bytes_sent, last[nic][0]), counter_delta(c.bytes_recv, last[nic][1]))
+            for nic, c in self._per_nic.items() if nic in last
+        }
+
+    def _interface_views(self, time_delta: float,
+                         nic_deltas: Dict[str, Tuple[int, int]]) -> Dict[str, Dict[str, Any]]:
+        """Counters and bandwidth of each configured interface present."""
+        views = {}
+        for nic, counters in self._per_nic.items():
+            tx_mbps = rx_mbps = 0.0
+            if time_delta > 0 and nic in nic_deltas:
+                sent, recv = nic_deltas[nic]
+                tx_mbps = sent * 8 / (time_delta * 1_000_000)
+                rx_mbps = recv * 8 / (time_delta * 1_000_000)
+            views[nic] = {
+                "bandwidth_tx_mbps": tx_mbps,
+                "bandwidth_rx_mbps": rx_mbps,
+                "bytes_sent": counters.bytes_sent,
+                "bytes_recv": counters.bytes_recv,
+                "packets_sent": counters.packets_sent,
+                "packets_recv": counters.packets_recv,
+                "errors_in": counters.errin,
+                "errors_out": counters.errout,
+                "drops_in": counters.dropin,
+                "drops_out": counters.dropout,
+            }
+        return views
+
+    def _read_counters(self):
+        """I/O counters for the configured interface(s), or all interfaces combined."""
+        if self._interfaces:
+            per_nic = self.psutil.net_io_counters(pernic=True)
+            if isinstance(per_nic, dict):
+                self._per_nic = {nic: per_nic[nic] for nic in self._interfaces if nic in per_nic}
+                if self._per_nic:
+                    return sum_counters(list(self._per_nic.values()))
+            if not self._interface_missing_logged:
+                logger.warning(
+                    f"Interfaces {', '.join(self._interfaces)} not found; reporting all interfaces"
+                )
+                self._interface_missing_logged = True
+            return self.psutil.net_io_counters(pernic=False)
+        if self._interface:
+            per_nic = self.psutil.net_io_counters(pernic=True)
+            if isinstance(per_nic, dict):
+                if self._interface in per_nic:
+                    return per_nic[self._interface]
+                if not self._interface_missing_logged:
+                    logger.warning(
+                        f"Interface {self._interface} not found; reporting all interfaces"
+                    )
+                    self._interface_missing_logged = True
+        return self.psutil.net_io_counters(pernic=False)
+
+    def _get_connections(self) -> Tuple[int, int]:
+        """(established, total) inet sockets, refreshed every connections_interval."""
+        now = time.monotonic()
+        if self._connections is not None and now - self._connections_at < self._connections_interval:
+            return self._connections
+
+        if self._connections_backend == 'proc':
+            counts = count_proc_sockets()
+            established = counts.get('ESTABLISHED', 0)
+            total = sum(counts.values())
+        else:
+            connections = self.psutil.net_connections(kind='inet')
+            established = sum(
+                1 for conn in connections if conn.status == 'ESTABLISHED'
+            )
+            total = len(connections)
+
+        self._connections = (established, total)
+        self._connections_at = now
+        return self._connections
+
     def cleanup(self) -> None:
         """
         Cleanup network plugin.
@@ -2,27 +2,34 @@
 Network Topology Mapper Plugin
 
 Discovers all devices connected to the local network using:
-- ARP scanning (scapy)
+- Passive discovery from observed ARP, DHCP (hostname option) and mDNS
+- ARP scanning (scapy), chunked and rate-limited, as a slow fallback
 - MAC vendor lookup (OUI database)
-- Hostname resolution
+- Hostname resolution (parallel, cached reverse DNS)
 
 Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
 Date: 2025-11-12
 """
 
+import ipaddress
 import logging
+import queue
 import threading
 import time
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
 import socket
 
-try:
-    from scapy.all import ARP, Ether, srp, conf
-    conf.verb = 0  # Suppress scapy verbosity
-    SCAPY_AVAILABLE = True
-except ImportError:
-    SCAPY_AVAILABLE = False
+from .scapy_loader import scapy_binder, scapy_installed
+
+SCAPY_AVAILABLE = scapy_installed()
+
+# scapy names, bound by _load_scapy() on first real-mode use
+_SCAPY_NAMES = (
+    'ARP', 'Ether', 'IP', 'UDP', 'BOOTP', 'DHCP', 'DNS', 'srp', 'sniff', 'conf',
+)
+ARP = Ether = IP = UDP = BOOTP = DHCP = DNS = srp = sniff = conf = None
 
 try:
     import netifaces
@@ -30,15 +37,178 @@
 except ImportError:
     NETIFACES_AVAILABLE = False
 
-import requests
-
 from .base import Plugin, PluginConfig
+from .capture_hub import get_capture_hub
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Imports scapy and binds _SCAPY_NAMES (clears SCAPY_AVAILABLE on failure)
+_load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
+
+
+# Hostname shown while a reverse lookup is still in flight
+HOSTNAME_PENDING = "Resolving..."
+HOSTNAME_UNKNOWN = "Unknown"
+
+# Fallback when the interface netmask cannot be read
+DEFAULT_SUBNET = "192.168.1.0/24"
+
+# Passive discovery traffic: ARP, DHCP client/server, mDNS
+PASSIVE_ARP_FILTER = "arp"
+PASSIVE_UDP_FILTER = "udp and (port 67 or port 68 or port 5353)"
+MDNS_PORT = 5353
+
+
+class HostnameResolver:
+    """
+    Bounded, cached reverse-DNS resolver.
+
+    Lookups run on a small thread pool so a slow PTR query never stalls
+    the scan thread. Successful and failed lookups are both cached, each
+    with its own TTL, so unresolvable hosts are not retried every scan.
+
+    ``socket.gethostbyaddr`` cannot be cancelled, so the per-lookup timeout
+    is enforced by ``expire_overdue()``: overdue lookups are reported as
+    Unknown and negatively cached. A late answer still updates the cache.
+    """
+
+    def __init__(
+        self,
+        resolve_fn: Callable[[str], str],
+        max_workers: int = 8,
+        timeout: float = 2.0,
+        ttl: float = 3600.0,
+        negative_ttl: float = 300.0,
+    ):
+        self._resolve_fn = resolve_fn
+        self._max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # Cache: {ip: (hostname, expires_at)}
+        self._cache: Dict[str, Tuple[str, float]] = {}
+        # In-flight lookups: {ip: [deadline, callback, timed_out]}
+        self._pending: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        self.stats = {
+            'lookups': 0,
+            'cache_hits': 0,
+            'failures': 0,
+            'timeouts': 0
+        }
+
+    def get_cached(self, ip: str) -> Optional[str]:
+        """Return a non-expired cached hostname, or None."""
+        with self._lock:
+            entry = self._cache.get(ip)
+            if entry and entry[1] > time.monotonic():
+                self.stats['cache_hits'] += 1
+                return entry[0]
+        return None
+
+    def remember(self, ip: str, hostname: str) -> None:
+        """Seed the cache with a hostname learned elsewhere (e.g. DHCP)."""
+        with self._lock:
+            self._cache[ip] = (hostname, time.monotonic() + self.ttl)
+
+    def submit(self, ip: str, callback: Callable[[str, str], None]) -> bool:
+        """
+        Schedule a background lookup for ``ip``.
+
+        Args:
+            ip: Address to resolve
+            callback: Called as ``callback(ip, hostname)`` when the name
+                comes back (Unknown on failure/timeout)
+
+        Returns:
+            True if a lookup was scheduled, False if cached or in flight
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = self._cache.get(ip)
+            if entry and entry[1] > now:
+                return False
+            # A timed-out lookup still occupies a worker; don't pile more on
+            if ip in self._pending:
+                return False
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="topology-rdns"
+                )
+            self._pending[ip] = [now + self.timeout, callback, False]
+            self.stats['lookups'] += 1
+            executor = self._executor
+
+        executor.submit(self._lookup, ip)
+        return True
+
+    def expire_overdue(self) -> int:
+        """
+        Report lookups that exceeded the timeout as Unknown.
+
+        Returns:
+            Number of lookups expired by this call
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for ip, entry in self._pending.items():
+                if not entry[2] and entry[0] <= now:
+                    entry[2] = True
+                    self._cache[ip] = (HOSTNAME_UNKNOWN, now + self.negative_ttl)
+                    self.stats['timeouts'] += 1
+                    expired.append((ip, entry[1]))
+
+        for ip, callback in expired:
+            callback(ip, HOSTNAME_UNKNOWN)
+        return len(expired)
+
+    def pending_count(self) -> int:
+        """Number of lookups currently in flight."""
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for blocked lookups."""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._pending.clear()
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _lookup(self, ip: str) -> None:
+        """Worker body: resolve and cache one address."""
+        try:
+            hostname = self._resolve_fn(ip) or HOSTNAME_UNKNOWN
+        except Exception:
+            hostname = HOSTNAME_UNKNOWN
+
+        failed = hostname == HOSTNAME_UNKNOWN
+        with self._lock:
+            if failed:
+                self.stats['failures'] += 1
+            ttl = self.negative_ttl if failed else self.ttl
+            self._cache[ip] = (hostname, time.monotonic() + ttl)
+            entry = self._pending.pop(ip, None)
+
+        if entry is None:
+            return  # Resolver was shut down meanwhile
+
+        # Timed-out lookups already reported Unknown; a late name still upgrades
+        timed_out = entry[2]
+        if not timed_out or not failed:
+            entry[1](ip, hostname)
+
+
+@dataclass(slots=True)
 class NetworkDevice:
     """Represents a discovered network device."""
     ip: str
@@ -48,7 +218,13 @@ class NetworkDevice:
     last_seen: float
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'ip': self.ip,
+            'mac': self.mac,
+            'hostname': self.hostname,
+            'vendor': self.vendor,
+            'last_seen': self.last_seen
+        }
 
 
 class NetworkTopologyPlugin(Plugin):
@@ -56,23 +232,94 @@ class NetworkTopologyPlugin(Plugin):
     Network Topology Mapper - Discovers devices on local network.
     
     Features:
-    - ARP scanning for device discovery
+    - Passive discovery from ARP/DHCP/mDNS traffic (no injected packets)
+    - ARP scanning for device discovery (real subnet size, chunked sweeps)
     - MAC vendor lookup via API
-    - Hostname resolution
+    - Hostname resolution (background worker pool, TTL cache)
     - Real-time device tracking
+
+    Passive sightings come from the shared capture hub when other plugins
+    already sniff that traffic; whatever the hub does not cover is captured
+    here with a narrow BPF filter. Active sweeps then only run every
+    ``sweep_interval`` seconds to catch silent hosts.
+
+    Config options:
+        passive: Learn devices from observed traffic (default True)
+        sweep_interval: Seconds between ARP sweeps (default 300 when passive,
+            30 otherwise)
+        passive_queue_size: Max sightings buffered between sweeps (default 1024)
+        scan_chunk_size: Addresses probed per ARP batch (default 256)
+        scan_rate_pps: Max ARP requests sent per second (default 200)
+        scan_chunk_timeout: Seconds to wait for replies per batch (default 1.0)
+        max_scan_hosts: Largest sweep; bigger subnets are narrowed around
+            the local address (default 4096)
+        stale_after: Seconds before an unseen device is dropped (default 300)
+        resolver_workers: Max concurrent reverse lookups (default 8)
+        resolver_timeout: Seconds before a lookup is reported Unknown (default 2.0)
+        hostname_ttl: Seconds to cache a resolved hostname (default 3600)
+        hostname_negative_ttl: Seconds to cache a failed lookup (default 300)
+        vendor_cache: {mac: vendor} dict to share between instances, e.g.
+            across mode switches (default: private cache)
     """
+
+    packet_handlers = ("observe_packet",)
+    snapshot_entities = {"devices": "ip"}
     
     def __init__(self, config: PluginConfig):
         super().__init__(config)
         self.devices: Dict[str, NetworkDevice] = {}
         self.gateway_ip: Optional[str] = None
-        self.subnet: str = "192.168.1.0/24"
+        self.subnet: str = DEFAULT_SUBNET
+        self.local_ip: Optional[str] = None
         self._stop_event = threading.Event()
         self._scan_thread: Optional[threading.Thread] = None
         
-        # Cache for vendor lookups (avoid API spam)
-        self._vendor_cache: Dict[str, str] = {}
+        # Cache for vendor lookups (avoid API spam); may be shared across instances
+        self._vendor_cache: Dict[str, str] = config.config.get('vendor_cache', {})
+        
+        # Reverse DNS runs off the scan thread; devices show HOSTNAME_PENDING meanwhile
+        opts = config.config
+        self._resolver = HostnameResolver(
+            resolve_fn=self._resolve_hostname,
+            max_workers=opts.get('resolver_workers', 8),
+            timeout=opts.get('resolver_timeout', 2.0),
+            ttl=opts.get('hostname_ttl', 3600.0),
+            negative_ttl=opts.get('hostname_negative_ttl', 300.0)
+        )
         
+        # Sweep pacing: large subnets are probed in rate-limited batches
+        self.scan_chunk_size = max(1, opts.get('scan_chunk_size', 256))
+        self.scan_rate_pps = max(1, opts.get('scan_rate_pps', 200))
+        self.scan_chunk_timeout = opts.get('scan_chunk_timeout', 1.0)
+        self.max_scan_hosts = max(1, opts.get('max_scan_hosts', 4096))
+        self.stale_after = opts.get('stale_after', 300)
+        
+        # Passive discovery: capture threads only enqueue, the scan thread merges
+        self.passive = opts.get('passive', True)
+        self.sweep_interval = opts.get('sweep_interval', 300.0 if self.passive else 30.0)
+        self._capture_hub = get_capture_hub()
+        self._sightings: queue.Queue = queue.Queue(maxsize=opts.get('passive_queue_size', 1024))
+        self._dhcp_hostnames: Dict[str, str] = {}  # {mac: hostname} until the IP is known
+        self._own_capture_failed = False
+        self.passive_stats = {
+            'arp': 0,
+            'dhcp': 0,
+            'mdns': 0,
+            'dropped': 0
+        }
+        self.scan_progress: Dict[str, Any] = {
+            "scanning": False,
+            "scanned": 0,
+            "total": 0,
+            "percent": 0.0,
+            "replies": 0,
+            "last_sweep_seconds": None
+        }
+
+        # Real mode: import scapy before any capture or packet handling
+        if not self.config.config.get('mock_mode', False):
+            _load_scapy()
+    
     def initialize(self) -> None:
         """Initialize plugin (required by base Plugin class)."""
         self.start()
@@ -93,7 +340,12 @@ def start(self):
         # Detect gateway and subnet
         self._detect_network()
         
+        # Sightings from packets other plugins already capture
+        if self.passive:
+            self._capture_hub.subscribe(self.observe_packet)
+        
         # Start scanning thread
+        self.snapshots.start()
         self._scan_thread = threading.Thread(target=self._scan_loop, daemon=True)
         self._scan_thread.start()
         
@@ -101,16 +353,37 @@ def stop(self):
         """Stop network scanning."""
         logger.info("Stopping Network Topology Mapper...")
         self._stop_event.set()
+        self._capture_hub.unsubscribe(self.observe_packet)
         if self._scan_thread:
             self._scan_thread.join(timeout=2.0)
+        self.snapshots.stop()
+        self._resolver.shutdown()
     
+    def cleanup(self) -> None:
+        """Cleanup resources."""
+        self.stop()
+    
+    def build_snapshot(self) -> Dict[str, Any]:
+        """Device table (scan thread side)."""
+        return {
+            "device_count": len(self.devices),
+            "devices": [device.to_dict() for device in list(self.devices.values())]
+        }
+
     def get_data(self) -> Dict[str, Any]:
-        """Get current topology data."""
+        """Get current topology data (devices from the latest published snapshot)."""
+        self._resolver.expire_overdue()
+        snapshot = self.snapshots.current()
+        
         return {
+            **snapshot.data,
+            "snapshot_version": snapshot.version,
             "gateway_ip": self.gateway_ip,
             "subnet": self.subnet,
-            "device_count": len(self.devices),
-            "devices": [device.to_dict() for device in self.devices.values()]
+            "pending_hostnames": self._resolver.pending_count(),
+            "scan_progress": dict(self.scan_progress),
+            "passive": self.passive,
+            "passive_stats": self.passive_stats.copy()
         }
     
     def requires_root(self) -> bool:
@@ -122,7 +395,7 @@ def _detect_network(self):
         if not NETIFACES_AVAILABLE:
             logger.warning("netifaces not installed. Using defaults. Install with: pip install netifaces")
             self.gateway_ip = "192.168.1.1"
-            self.subnet = "192.168.1.0/24"
+            self.subnet = DEFAULT_SUBNET
             return
         
         try:
@@ -141,80 +414,361 @@ def _detect_network(self):
                 netmask = ipv4_info.get('netmask')
                 
                 if ip and netmask:
-                    # Calculate subnet (simple /24 assumption)
-                    parts = ip.split('.')
-                    self.subnet = f"{parts[0]}.{parts[1]}.{parts[2]}.0/24"
+                    # Real prefix length from the netmask (/22, /16, ...)
+                    self.local_ip = ip
+                    network = ipaddress.IPv4Interface(f"{ip}/{netmask}").network
+                    self.subnet = str(network)
                     
                 logger.info(f"Detected gateway: {self.gateway_ip}, subnet: {self.subnet}")
         except Exception as e:
             logger.warning(f"Failed to detect network: {e}. Using defaults.")
             self.gateway_ip = "192.168.1.1"
-            self.subnet = "192.168.1.0/24"
+            self.subnet = DEFAULT_SUBNET
     
     def _scan_loop(self):
-        """Main scanning loop."""
+        """
+        Main discovery loop.
+        
+        Sweeps once at start, then every ``sweep_interval`` seconds. In
+        between, passive sightings are merged as they arrive.
+        """
+        next_sweep = 0.0
         while not self._stop_event.is_set():
-            try:
-                self._scan_network()
-            except Exception as e:
-                logger.error(f"Scan error: {e}")
+            self.snapshots.tick()
+            remaining = next_sweep - time.monotonic()
+            if remaining <= 0:
+                try:
+                    self._scan_network()
+                except Exception as e:
+                    logger.error(f"Scan error: {e}")
+                next_sweep = time.monotonic() + self.sweep_interval
+                continue
             
-            # Wait before next scan (avoid network spam)
-            self._stop_event.wait(timeout=30.0)
+            if self.passive:
+                self._listen(timeout=min(1.0, remaining))
+            else:
+                # Wait before next scan (avoid network spam)
+                self._stop_event.wait(timeout=remaining)
     
     def _scan_network(self):
-        """Perform ARP scan of subnet."""
+        """
+        Perform one ARP sweep of the subnet.
+        
+        Targets are probed in chunks of ``scan_chunk_size`` addresses, sent
+        at most ``scan_rate_pps`` per second, and each chunk's replies are
+        merged into ``self.devices`` as soon as it completes. Hosts seen
+        recently are probed first so known devices refresh early in long
+        sweeps. Stale devices are only pruned after a complete sweep.
+        """
         if not SCAPY_AVAILABLE:
             return
         
-        logger.debug(f"Scanning subnet: {self.subnet}")
-        
-        # Create ARP request packet
-        arp = ARP(pdst=self.subnet)
-        ether = Ether(dst="ff:ff:ff:ff:ff:ff")
-        packet = ether / arp
+        targets = self._sweep_targets()
+        total = len(targets)
+        logger.debug(f"Scanning subnet: {self.subnet} ({total} hosts)")
         
-        # Send and capture responses
-        result = srp(packet, timeout=2, verbose=0)[0]
-        
-        current_time = time.time()
+        sweep_start = time.time()
+        started = time.monotonic()
+        self.scan_progress.update(scanning=True, scanned=0, total=total, percent=0.0, replies=0)
         
-        # Process responses
-        for sent, received in result:
-            ip = received.psrc
-            mac = received.hwsrc
-            
-            # Skip if already discovered recently
-            if ip in self.devices:
-                self.devices[ip].last_seen = current_time
-                continue
-            
-            # Resolve hostname
-            hostname = self._resolve_hostname(ip)
-            
-            # Lookup vendor
-            vendor = self._lookup_vendor(mac)
+        scanned = 0
+        replies = 0
+        for offset in range(0, total, self.scan_chunk_size):
+            if self._stop_event.is_set():
+                break
             
-            # Add device
-            device = NetworkDevice(
-                ip=ip,
-                mac=mac,
-                hostname=hostname,
-                vendor=vendor,
-                last_seen=current_time
+            chunk = targets[offset:offset + self.scan_chunk_size]
+            replies += self._scan_chunk(chunk)
+            scanned += len(chunk)
+            self._drain_sightings()
+            self.snapshots.tick()
+            self.scan_progress.update(
+                scanned=scanned,
+                percent=round(100.0 * scanned / total, 1),
+                replies=replies
             )
-            self.devices[ip] = device
-            logger.info(f"Discovered device: {ip} ({mac}) - {vendor}")
         
-        # Remove stale devices (not seen in 5 minutes)
-        stale_threshold = current_time - 300
-        stale_ips = [ip for ip, dev in self.devices.items() if dev.last_seen < stale_threshold]
+        self.scan_progress.update(
+            scanning=False,
+            last_sweep_seconds=round(time.monotonic() - started, 2)
+        )
+        
+        self._resolver.expire_overdue()
+        
+        if scanned < total:
+            return  # Interrupted sweep: unscanned hosts are not stale
+        
+        # Remove devices not seen for stale_after seconds before this sweep
+        stale_threshold = sweep_start - self.stale_after
+        stale_ips = [ip for ip, dev in list(self.devices.items()) if dev.last_seen < stale_threshold]
         for ip in stale_ips:
             logger.info(f"Removing stale device: {ip}")
             del self.devices[ip]
     
+    def _sweep_targets(self) -> List[str]:
+        """Addresses to probe this sweep, most recently seen hosts first."""
+        try:
+            network = ipaddress.IPv4Network(self.subnet, strict=False)
+        except ValueError:
+            logger.warning(f"Invalid subnet {self.subnet!r}, using {DEFAULT_SUBNET}")
+            network = ipaddress.IPv4Network(DEFAULT_SUBNET)
+        
+        if network.num_addresses > self.max_scan_hosts:
+            network = self._narrow_network(network)
+        
+        recent = sorted(self.devices.values(), key=lambda dev: dev.last_seen, reverse=True)
+        targets = []
+        for dev in recent:
+            try:
+                if ipaddress.IPv4Address(dev.ip) in network:
+                    targets.append(dev.ip)
+            except ValueError:
+                continue
+        
+        known = set(targets)
+        if network.prefixlen >= 31:
+            hosts = (str(addr) for addr in network)  # /31 and /32 have no broadcast
+        else:
+            hosts = (str(addr) for addr in network.hosts())
+        targets.extend(ip for ip in hosts if ip not in known)
+        return targets
+    
+    def _narrow_network(self, network: ipaddress.IPv4Network) -> ipaddress.IPv4Network:
+        """Shrink an oversized subnet to the block around our own address."""
+        new_prefix = 32
+        while new_prefix > network.prefixlen and 2 ** (32 - new_prefix + 1) <= self.max_scan_hosts:
+            new_prefix -= 1
+        anchor = self.local_ip or str(network.network_address)
+        narrowed = ipaddress.IPv4Network(f"{anchor}/{new_prefix}", strict=False)
+        logger.warning(
+            f"Subnet {network} has {network.num_addresses} addresses; "
+            f"sweeping {narrowed} only (max_scan_hosts={self.max_scan_hosts})"
+        )
+        return narrowed
+    
+    def _scan_chunk(self, targets: List[str]) -> int:
+        """ARP-probe one batch of addresses and merge replies. Returns reply count."""
+        packet = Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=targets)
+        
+        # inter spaces the requests so the batch respects the pps budget
+        result = srp(
+            packet,
+            timeout=self.scan_chunk_timeout,
+            inter=1.0 / self.scan_rate_pps,
+            verbose=0
+        )[0]
+        
+        current_time = time.time()
+        count = 0
+        for sent, received in result:
+            self._merge_device(received.psrc, received.hwsrc, current_time)
+            count += 1
+        return count
+    
+    def _merge_device(self, ip: str, mac: str, current_time: float,
+                      hostname: Optional[str] = None) -> None:
+        """Record a sighting: refresh a known device or add a new one."""
+        hostname = hostname or self._dhcp_hostnames.pop(mac, None)
+        if hostname:
+            # Announced names beat reverse DNS; seed the cache so no lookup is made
+            self._resolver.remember(ip, hostname)
+        
+        # Skip if already discovered recently
+        if ip in self.devices:
+            device = self.devices[ip]
+            device.last_seen = current_time
+            if hostname:
+                device.hostname = hostname
+            # Refresh the name once its cache entry has expired
+            self._request_hostname(ip)
+            return
+        
+        # Lookup vendor
+        vendor = self._lookup_vendor(mac)
+        
+        # Add device right away; the hostname arrives asynchronously
+        device = NetworkDevice(
+            ip=ip,
+            mac=mac,
+            hostname=self._resolver.get_cached(ip) or HOSTNAME_PENDING,
+            vendor=vendor,
+            last_seen=current_time
+        )
+        self.devices[ip] = device
+        self._request_hostname(ip)
+        logger.info(f"Discovered device: {ip} ({mac}) - {vendor}")
+    
+    def observe_packet(self, packet) -> None:
+        """
+        Capture callback: queue any device sighting found in ``packet``.
+        
+        Runs on whichever thread captured the packet (capture hub publishers
+        or our own sniff), so it only extracts fields and never blocks.
+        """
+        if not SCAPY_AVAILABLE:
+            return
+        
+        try:
+            sighting = self._extract_sighting(packet)
+        except Exception as e:
+            logger.debug(f"Ignoring unparseable packet: {e}")
+            return
+        
+        if sighting is None:
+            return
+        
+        try:
+            self._sightings.put_nowait(sighting)
+        except queue.Full:
+            self.passive_stats['dropped'] += 1
+    
+    def _extract_sighting(self, packet) -> Optional[Tuple[str, Optional[str], str, Optional[str]]]:
+        """Return (source, ip, mac, hostname) for ARP/DHCP/mDNS packets, else None."""
+        if packet.haslayer(ARP):
+            arp = packet[ARP]
+            # Requests and replies both carry the sender's binding; probes use 0.0.0.0
+            if arp.op in (1, 2) and arp.psrc and arp.psrc != "0.0.0.0":
+                return ("arp", arp.psrc, arp.hwsrc.lower(), None)
+            return None
+        
+        if packet.haslayer(DHCP) and packet.haslayer(BOOTP):
+            return self._dhcp_sighting(packet)
+        
+        if packet.haslayer(DNS) and packet.haslayer(UDP) and packet.haslayer(IP):
+            udp = packet[UDP]
+            if MDNS_PORT in (udp.sport, udp.dport) and packet.haslayer(Ether):
+                return self._mdns_sighting(packet)
+        
+        return None
+    
+    def _dhcp_sighting(self, packet) -> Optional[Tuple[str, Optional[str], str, Optional[str]]]:
+        """Client MAC, address and hostname (option 12) from a DHCP message."""
+        bootp = packet[BOOTP]
+        options = {}
+        for option in packet[DHCP].options:
+            if isinstance(option, tuple) and len(option) >= 2:
+                options[option[0]] = option[1]
+        
+        mac = ":".join(f"{b:02x}" for b in bytes(bootp.chaddr)[:6])
+        hostname = options.get('hostname')
+        if isinstance(hostname, bytes):
+            hostname = hostname.decode('utf-8', errors='replace')
+        
+        # DISCOVER/REQUEST/INFORM name the client; ACK carries the leased address
+        ip = None
+        for candidate in (options.get('requested_addr'), bootp.ciaddr, bootp.yiaddr):
+            if candidate and candidate != "0.0.0.0":
+                ip = candidate
+                break
+        
+        if ip is None and not hostname:
+            return None
+        return ("dhcp", ip, mac, hostname or None)
+    
+    def _mdns_sighting(self, packet) -> Optional[Tuple[str, Optional[str], str, Optional[str]]]:
+        """Sender and its announced ``.local`` name from an mDNS response."""
+        src_ip = packet[IP].src
+        if not src_ip or src_ip == "0.0.0.0":
+            return None
+        
+        hostname = None
+        dns = packet[DNS]
+        for field in ('an', 'ar'):
+            records = getattr(dns, field, None)
+            if records is None:
+                continue
+            if not isinstance(records, list):
+                records = [records]
+            for record in records:
+                # A record pointing at the sender names the sender
+                if getattr(record, 'type', None) == 1 and getattr(record, 'rdata', None) == src_ip:
+                    name = record.rrname
+                    if isinstance(name, bytes):
+                        name = name.decode('utf-8', errors='replace')
+                    hostname = name.rstrip('.')
+                    break
+            if hostname:
+                break
+        
+        return ("mdns", src_ip, packet[Ether].src.lower(), hostname)
+    
+    def _record_sighting(self, source: str, ip: Optional[str], mac: str,
+                         hostname: Optional[str]) -> None:
+        """Merge one passive sighting into the device table (scan thread)."""
+        self.passive_stats[source] += 1
+        
+        if ip is None:
+            # DHCP DISCOVER: remember the name until the address shows up
+            device = next((d for d in list(self.devices.values()) if d.mac == mac), None)
+            if device is not None:
+                self._merge_device(device.ip, mac, time.time(), hostname=hostname)
+            else:
+                self._dhcp_hostnames[mac] = hostname
+            return
+        
+        self._merge_device(ip, mac, time.time(), hostname=hostname)
+    
+    def _drain_sightings(self, timeout: float = 0.0) -> int:
+        """Merge queued sightings, waiting up to ``timeout`` for the first."""
+        count = 0
+        block = timeout > 0
+        while True:
+            try:
+                sighting = self._sightings.get(block=block, timeout=timeout if block else None)
+            except queue.Empty:
+                return count
+            block = False
+            try:
+                self._record_sighting(*sighting)
+            except Exception as e:
+                logger.debug(f"Failed to record sighting {sighting}: {e}")
+            count += 1
+    
+    def _own_capture_filter(self) -> str:
+        """BPF filter for passive traffic no capture hub publisher already covers."""
+        if self._own_capture_failed:
+            return ""
+        parts = []
+        if not self._capture_hub.covers(PASSIVE_ARP_FILTER):
+            parts.append(PASSIVE_ARP_FILTER)
+        if not self._capture_hub.covers("ip"):
+            parts.append(f"({PASSIVE_UDP_FILTER})")
+        return " or ".join(parts)
+    
+    def _listen(self, timeout: float) -> None:
+        """Collect passive sightings for up to ``timeout`` seconds."""
+        bpf_filter = self._own_capture_filter()
+        if not bpf_filter:
+            self._drain_sightings(timeout=timeout)
+            return
+        
+        try:
+            sniff(filter=bpf_filter, prn=self.observe_packet, store=0, timeout=timeout)
+        except (PermissionError, OSError) as e:
+            # Without capture rights rely on the hub and the fallback sweeps
+            logger.warning(f"Passive capture unavailable ({e}); using capture hub and sweeps only")
+            self._own_capture_failed = True
+        except Exception as e:
+            logger.error(f"Passive capture error: {e}")
+            self._stop_event.wait(timeout=timeout)
+        self._drain_sightings()
+    
+    def _request_hostname(self, ip: str) -> None:
+        """Queue a background reverse lookup for a device (no-op if cached)."""
+        self._resolver.submit(ip, self._on_hostname_resolved)
+    
+    def _on_hostname_resolved(self, ip: str, hostname: str) -> None:
+        """Resolver callback: update the device in place."""
+        device = self.devices.get(ip)
+        if device is None:
+            return
+        # Never downgrade a known name to Unknown on a later failed refresh
+        if hostname == HOSTNAME_UNKNOWN and device.hostname not in (HOSTNAME_PENDING, HOSTNAME_UNKNOWN):
+            return
+        device.hostname = hostname
+    
     def _resolve_hostname(self, ip: str) -> str:
-        """Resolve hostname from IP."""
+        """Resolve hostname from IP (blocking; runs on resolver workers)."""
         try:
             hostname = socket.gethostbyaddr(ip)[0]
             return hostname
@@ -228,6 +782,7 @@ def _lookup_vendor(self, mac: str) -> str:
             return self._vendor_cache[mac]
         
         try:
+            import requests  # Deferred: only needed for vendor lookups
             response = requests.get(f"https://api.macvendors.com/{mac}", timeout=2)
             if response.status_code == 200:
                 vendor = response.text.strip()
@@ -9,10 +9,12 @@
 Date: 2025-11-11
 """
 
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 import time
 
 from .base import Plugin, PluginConfig, PluginStatus
+from .packet_sampler import PacketSampler
 
 
 class PacketAnalyzerPlugin(Plugin):
@@ -45,6 +47,15 @@ class PacketAnalyzerPlugin(Plugin):
         total_packets: int - Total packets captured in this collection
         recent_packets: List[Dict] - Last N packets with educational flags (safe/unsafe)
         backend: str - Backend used ('scapy', 'pyshark', or 'mock')
+        sampling: Dict - With sampling_mode set: sampler counters and the
+            scaled protocol counts with 95% intervals (None otherwise)
+        interfaces: Dict[str, Dict] - With ``interfaces`` configured: the
+            fields above per interface; the top-level fields aggregate them
+
+    Config options:
+        interface: Capture interface (default 'wlan0')
+        interfaces: Several interfaces, each sniffed by its own thread
+            concurrently (takes precedence over ``interface``)
 
     Example:
         >>> config = PluginConfig(name="packet_analyzer", rate_ms=1000)
@@ -74,6 +85,15 @@ def initialize(self) -> None:
         # Check if running in mock mode
         self._mock_mode = self.config.config.get('mock_mode', False)
 
+        # Optional sampling of the per-packet analysis (sampling_mode in config)
+        self.sampler = PacketSampler.from_config(self.config.config)
+
+        # One capture thread per interface (``interfaces`` in config)
+        self._interfaces = list(self.config.config.get('interfaces') or []) or \
+            [self.config.config.get('interface', 'wlan0')]
+        self._interface = self._interfaces[0]
+        self._executor: Optional[ThreadPoolExecutor] = None
+
         if self._mock_mode:
             # Mock mode: use MockDataGenerator (educational, no deps)
             from src.utils.mock_data_generator import get_mock_packet_generator
@@ -104,6 +124,13 @@ def initialize(self) -> None:
         print("Install Scapy: pip install scapy")
         print("Or run with --mock for educational mode")
 
+    def reconfigure(self, rate_ms: int, settings: Dict[str, Any]) -> None:
+        """New rate and settings; the sampler follows a changed CPU budget."""
+        super().reconfigure(rate_ms, settings)
+        sampler = getattr(self, 'sampler', None)  # Created by initialize()
+        if sampler is not None:
+            sampler.update(settings)
+
     def _try_initialize_scapy(self) -> bool:
         """
         Try to initialize Scapy backend.
@@ -122,17 +149,19 @@ def _try_initialize_scapy(self) -> bool:
 
             self._backend = 'scapy'
 
-            # Get interface to monitor
-            self._interface = self.config.config.get('interface', 'wlan0')
-
-            # Validate interface exists (P2: Validation preventive)
+            # Validate interfaces exist (P2: Validation preventive)
             if not hasattr(self.conf, 'ifaces'):
                 return False
 
-            if self._interface not in self.conf.ifaces:
-                raise RuntimeError(
-                    f"Interface '{self._interface}' not found.\n"
-                    f"Available interfaces: {list(self.conf.ifaces.keys())}"
+            for interface in self._interfaces:
+                if interface not in self.conf.ifaces:
+                    raise RuntimeError(
+                        f"Interface '{interface}' not found.\n"
+                        f"Available interfaces: {list(self.conf.ifaces.keys())}"
+                    )
+            if len(self._interfaces) > 1:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=len(self._interfaces), thread_name_prefix="packet-capture"
                 )
 
             self._status = PluginStatus.READY
@@ -168,7 +197,6 @@ def _try_initialize_pyshark(self) -> bool:
             )
 
             self._backend = 'pyshark'
-            self._interface = self.config.config.get('interface', 'wlan0')
 
             self._status = PluginStatus.READY
             return True
@@ -275,33 +303,86 @@ def _collect_scapy(self) -> Dict[str, Any]:
         count = self.config.config.get('capture_count', 100)
         timeout = self.config.config.get('capture_timeout', 1)
 
-        # Capture packets
+        # Capture packets (every interface at once, each on its own thread)
         start_time = time.time()
-        packets = self.sniff(
-            iface=self._interface,
-            count=count,
-            timeout=timeout,
-            store=True
-        )
+        if self._executor is not None:
+            futures = {
+                interface: self._executor.submit(
+                    self.sniff, iface=interface, count=count, timeout=timeout, store=True
+                )
+                for interface in self._interfaces
+            }
+            captured = {interface: future.result() for interface, future in futures.items()}
+        else:
+            captured = {self._interface: self.sniff(
+                iface=self._interface,
+                count=count,
+                timeout=timeout,
+                store=True
+            )}
         elapsed = time.time() - start_time
 
-        # Analyze packets
+        sampler = self.sampler
+        sampler.reset_estimates()
+        analysis_start = time.perf_counter()
+        per_interface = {interface: self._analyze_scapy(packets) for interface, packets in captured.items()}
+        sampler.charge(time.perf_counter() - analysis_start)
+
+        # Aggregated view: counts summed over the interfaces
+        protocols: Dict[str, int] = {}
+        sources: Dict[str, int] = {}
+        destinations: Dict[str, int] = {}
+        for iface_protocols, iface_sources, iface_destinations in per_interface.values():
+            for total, counts in ((protocols, iface_protocols), (sources, iface_sources),
+                                  (destinations, iface_destinations)):
+                for key, value in counts.items():
+                    total[key] = total.get(key, 0) + value
+        packet_count = sum(len(packets) for packets in captured.values())
+
+        data = {
+            **self._summarize(protocols, sources, destinations, packet_count, elapsed),
+            'recent_packets': [],  # Real mode: no recent packets list (privacy)
+            'backend': 'scapy',
+            'sampling': sampler.snapshot() if sampler.enabled else None
+        }
+        if self.config.config.get('interfaces'):
+            data['interfaces'] = {
+                interface: self._summarize(*per_interface[interface], len(captured[interface]), elapsed)
+                for interface in captured
+            }
+        return data
+
+    def _analyze_scapy(self, packets) -> Tuple[Dict[str, int], Dict[str, int], Dict[str, int]]:
+        """(protocols, sources, destinations) counts, scaled by sampling weight."""
         protocols = {}
         sources = {}
         destinations = {}
+        sampler = self.sampler
 
         for pkt in packets:
+            weight = sampler.admit(pkt)
+            if not weight:
+                continue
+
             # Protocol (last layer name)
             proto = pkt.lastlayer().name
-            protocols[proto] = protocols.get(proto, 0) + 1
+            protocols[proto] = protocols.get(proto, 0) + weight
+            if sampler.enabled:
+                sampler.observe(f'protocol:{proto}', 1, weight)
 
             # IP addresses (if present)
             if pkt.haslayer('IP'):
                 src = pkt['IP'].src
                 dst = pkt['IP'].dst
-                sources[src] = sources.get(src, 0) + 1
-                destinations[dst] = destinations.get(dst, 0) + 1
+                sources[src] = sources.get(src, 0) + weight
+                destinations[dst] = destinations.get(dst, 0) + weight
+
+        return protocols, sources, destinations
 
+    @staticmethod
+    def _summarize(protocols: Dict[str, int], sources: Dict[str, int],
+                   destinations: Dict[str, int], packet_count: int, elapsed: float) -> Dict[str, Any]:
+        """Top-10 tables and packet rate of one capture."""
         # Sort and limit to top 10
         top_protocols = dict(
             sorted(protocols.items(), key=lambda x: x[1], reverse=True)[:10]
@@ -314,16 +395,14 @@ def _collect_scapy(self) -> Dict[str, Any]:
         )
 
         # Calculate packet rate
-        packet_rate = len(packets) / elapsed if elapsed > 0 else 0.0
+        packet_rate = packet_count / elapsed if elapsed > 0 else 0.0
 
         return {
             'top_protocols': top_protocols,
             'top_sources': top_sources,
             'top_destinations': top_destinations,
             'packet_rate': packet_rate,
-            'total_packets': len(packets),
-            'recent_packets': [],  # Real mode: no recent packets list (privacy)
-            'backend': 'scapy'
+            'total_packets': packet_count
         }
 
     def _collect_pyshark(self) -> Dict[str, Any]:
@@ -343,8 +422,9 @@ def _collect_pyshark(self) -> Dict[str, Any]:
         count = self.config.config.get('capture_count', 100)
         timeout = self.config.config.get('capture_timeout', 1)
 
-        # Create capture object
-        capture = self.pyshark.LiveCapture(interface=self._interface)
+        # Create capture object (tshark captures several interfaces at once)
+        interface = self._interfaces if len(self._interfaces) > 1 else self._interface
+        capture = self.pyshark.LiveCapture(interface=interface)
 
         # Capture packets
         start_time = time.time()
@@ -402,6 +482,11 @@ def cleanup(self) -> None:
         """
         Cleanup packet analyzer plugin.
 
-        Scapy and PyShark don't require explicit cleanup, but we set status.
+        Scapy and PyShark don't require explicit cleanup; the per-interface
+        capture threads are shut down.
         """
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            executor.shutdown(wait=False)
+            self._executor = None
         self._status = PluginStatus.STOPPED
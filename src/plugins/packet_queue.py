@@ -0,0 +1,322 @@
+"""
+Packet Queue - Bounded hand-off between capture and analysis
+
+scapy runs ``sniff(prn=...)`` callbacks on the sniffer thread, so a slow
+handler stalls capture: packets pile up in the kernel socket buffer and are
+dropped there, silently. Capture plugins instead give sniff() the queue's
+``put()``, which only appends to a bounded deque, and an analysis worker
+thread runs the real handler.
+
+When analysis falls behind and the queue is full, the overflow policy
+decides what is lost:
+
+- ``drop_newest``: refuse the arriving packet (keeps the oldest backlog)
+- ``drop_oldest``: evict the oldest queued packet (keeps the freshest traffic)
+- ``sample``: once the queue is 3/4 full only every ``sample_every``-th
+  arriving packet is admitted (evicting the oldest if full), so overload
+  degrades into a thinner but still current view
+
+Every loss is counted (enqueued / processed / dropped per consumer). With
+the capture socket attached, the kernel's own drops (``PACKET_STATISTICS``
+on Linux packet sockets) are counted too, so loss before the queue is
+visible as well. A plugin capturing on several interfaces attaches one
+socket per interface; kernel counters are then also kept per interface.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import struct
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+SAMPLE = "sample"
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, SAMPLE)
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_SAMPLE_EVERY = 10
+
+# Packets the worker takes per lock acquisition
+WORKER_BATCH = 256
+
+# Seconds an idle worker waits before calling its idle callback
+DEFAULT_IDLE_INTERVAL = 0.5
+
+# Linux <linux/if_packet.h>: getsockopt(SOL_PACKET, PACKET_STATISTICS) -> struct tpacket_stats
+SOL_PACKET = 263
+PACKET_STATISTICS = 6
+_TPACKET_STATS = struct.Struct("II")  # tp_packets, tp_drops (reset on read)
+
+
+def open_capture_socket(bpf_filter: Optional[str] = None, iface: Optional[str] = None) -> Optional[Any]:
+    """
+    Open a scapy listen socket for sniff(opened_socket=...).
+
+    Returns:
+        The socket, or None without scapy or capture privileges (sniff()
+        then opens its own and kernel drops are not available)
+    """
+    try:
+        from scapy.config import conf
+        return conf.L2listen(filter=bpf_filter, iface=iface)
+    except Exception as e:
+        logger.debug(f"Capture socket unavailable ({e}); kernel drop counters disabled")
+        return None
+
+
+def read_packet_statistics(sock: Any) -> Optional[Tuple[int, int]]:
+    """
+    (packets, drops) the kernel counted since the last read.
+
+    Args:
+        sock: scapy socket (its ``ins``) or a raw AF_PACKET socket
+
+    Returns:
+        None if the socket has no PACKET_STATISTICS (non-Linux, closed, ...)
+    """
+    raw = getattr(sock, 'ins', sock)
+    try:
+        return _TPACKET_STATS.unpack(raw.getsockopt(SOL_PACKET, PACKET_STATISTICS, _TPACKET_STATS.size))
+    except (AttributeError, OSError, TypeError, struct.error):
+        return None
+
+
+class PacketQueue:
+    """
+    Bounded packet queue drained by an analysis worker thread.
+
+    Args:
+        handler: Called with each packet on the worker thread
+        name: Consumer name (thread name, logs)
+        maxsize: Packets waiting for analysis before the overflow policy applies
+        policy: drop_newest, drop_oldest or sample
+        sample_every: Admission rate of the sample policy under pressure
+        idle: Called on the worker thread after each batch and whenever the
+            queue stayed empty for ``idle_interval`` seconds (e.g. a
+            snapshot publisher's tick(), so a quiet capture still publishes)
+        idle_interval: Seconds the worker waits for packets before ``idle``
+
+    Raises:
+        ValueError: Unknown policy or non-positive sizes
+    """
+
+    def __init__(self, handler: Callable[[Any], Any], name: str = "packets",
+                 maxsize: int = DEFAULT_QUEUE_SIZE, policy: str = DROP_NEWEST,
+                 sample_every: int = DEFAULT_SAMPLE_EVERY,
+                 idle: Optional[Callable[[], Any]] = None,
+                 idle_interval: float = DEFAULT_IDLE_INTERVAL):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r} (use {', '.join(OVERFLOW_POLICIES)})")
+        if maxsize < 1 or sample_every < 1:
+            raise ValueError("maxsize and sample_every must be positive")
+        self.handler = handler
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.sample_every = sample_every
+        self.idle = idle
+        self.idle_interval = idle_interval
+        self._sample_above = max(1, maxsize * 3 // 4)
+        self._sample_count = 0
+
+        self._cond = threading.Condition(threading.Lock())
+        self._queue: Deque[Any] = deque()
+        self._accepting = True
+        self._stopping = False
+        self._worker: Optional[threading.Thread] = None
+        # {capture socket: interface it is bound to (None: scapy's default)}
+        self.sockets: Dict[Any, Optional[str]] = {}
+        self.kernel_by_interface: Dict[str, Dict[str, int]] = {}
+
+        self.stats = {
+            'enqueued': 0,
+            'processed': 0,
+            'dropped': 0,
+            'errors': 0,
+            'high_water': 0,
+            'kernel_packets': 0,
+            'kernel_drops': 0
+        }
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Change the capacity while running (config reload).
+
+        Packets already queued above a smaller capacity stay and are analysed.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        with self._cond:
+            self.maxsize = maxsize
+            self._sample_above = max(1, maxsize * 3 // 4)
+
+    # Capture side (sniffer thread)
+
+    def put(self, packet: Any) -> bool:
+        """
+        Queue ``packet`` for analysis; never blocks.
+
+        Returns:
+            False if the packet (not an older one) was dropped
+        """
+        with self._cond:
+            queue = self._queue
+            depth = len(queue)
+            if not self._accepting:
+                self.stats['dropped'] += 1
+                return False
+            if self.policy == SAMPLE and depth >= self._sample_above:
+                self._sample_count += 1
+                if self._sample_count % self.sample_every:
+                    self.stats['dropped'] += 1
+                    return False
+            if depth >= self.maxsize:
+                if self.policy == DROP_NEWEST:
+                    self.stats['dropped'] += 1
+                    return False
+                queue.popleft()
+                self.stats['dropped'] += 1
+                depth -= 1
+            queue.append(packet)
+            self.stats['enqueued'] += 1
+            if depth >= self.stats['high_water']:
+                self.stats['high_water'] = depth + 1
+            if depth == 0:
+                self._cond.notify()  # The worker only waits on an empty queue
+        return True
+
+    # Analysis side
+
+    def start(self) -> None:
+        """Start the analysis worker."""
+        if self._worker and self._worker.is_alive():
+            return
+        with self._cond:
+            self._accepting = True
+            self._stopping = False
+        self._worker = threading.Thread(target=self._run, name=f"{self.name}-analysis", daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop accepting packets, analyse what is queued and join the worker."""
+        with self._cond:
+            self._accepting = False
+            self._stopping = True
+            self._cond.notify()
+        if self._worker:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._queue and not self._stopping:
+                    self._cond.wait(self.idle_interval if self.idle else None)
+                if not self._queue:
+                    if self._stopping:
+                        return
+                    batch = []
+                else:
+                    queue = self._queue
+                    batch = [queue.popleft() for _ in range(min(len(queue), WORKER_BATCH))]
+            for packet in batch:
+                try:
+                    self.handler(packet)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.debug(f"{self.name} packet handler failed: {e}")
+                self.stats['processed'] += 1
+            self._run_idle()
+
+    def _run_idle(self) -> None:
+        if self.idle is None:
+            return
+        try:
+            self.idle()
+        except Exception as e:
+            logger.debug(f"{self.name} idle callback failed: {e}")
+
+    def drain(self) -> int:
+        """Analyse everything queued on the calling thread (no worker needed)."""
+        handled = 0
+        while True:
+            with self._cond:
+                if not self._queue:
+                    return handled
+                packet = self._queue.popleft()
+            try:
+                self.handler(packet)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.debug(f"{self.name} packet handler failed: {e}")
+            self.stats['processed'] += 1
+            handled += 1
+
+    # Kernel drops
+
+    def attach_socket(self, sock: Optional[Any], iface: Optional[str] = None) -> None:
+        """Capture socket (one per interface) whose PACKET_STATISTICS poll_kernel_stats() reads."""
+        if sock is not None:
+            self.sockets[sock] = iface
+
+    @property
+    def socket(self) -> Optional[Any]:
+        """The first attached capture socket (None without one)."""
+        return next(iter(self.sockets), None)
+
+    def poll_kernel_stats(self) -> None:
+        """Add the kernel's packet/drop counts since the last poll."""
+        for sock, iface in list(self.sockets.items()):
+            counts = read_packet_statistics(sock)
+            if counts is None:
+                continue
+            packets, drops = counts
+            with self._cond:
+                self.stats['kernel_packets'] += packets
+                self.stats['kernel_drops'] += drops
+                if iface is not None:
+                    per_iface = self.kernel_by_interface.setdefault(
+                        iface, {'kernel_packets': 0, 'kernel_drops': 0})
+                    per_iface['kernel_packets'] += packets
+                    per_iface['kernel_drops'] += drops
+
+    def close_socket(self) -> None:
+        """Close the attached capture sockets."""
+        sockets, self.sockets = self.sockets, {}
+        for sock in sockets:
+            try:
+                sock.close()
+            except Exception as e:
+                logger.debug(f"Closing capture socket failed: {e}")
+
+    # Reporting
+
+    @property
+    def running(self) -> bool:
+        """True between start() and stop()."""
+        return self._worker is not None
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus current depth, capacity and policy."""
+        self.poll_kernel_stats()
+        with self._cond:
+            snapshot = dict(self.stats)
+            snapshot['depth'] = len(self._queue)
+            if self.kernel_by_interface:
+                snapshot['interfaces'] = {iface: dict(counts)
+                                          for iface, counts in self.kernel_by_interface.items()}
+        snapshot['capacity'] = self.maxsize
+        snapshot['policy'] = self.policy
+        return snapshot
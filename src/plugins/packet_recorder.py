@@ -0,0 +1,443 @@
+"""
+Packet Recorder - Ring buffer of pcapng segments for forensic lookback
+
+Captures every frame on the IP interfaces itself (one unfiltered socket per
+interface, so the ring doesn't depend on which plugins are running) and
+appends it to a ring of pcapng segment files (dumpcap style): once a
+segment reaches ``segment_size`` bytes the next one starts, and the oldest
+segment beyond ``ring_size`` is deleted, so the ring never uses more than
+``ring_size * segment_size`` of disk. 802.11 frames from the monitor-mode
+plugins (rogue AP, handshake) arrive through the capture hub, while those
+plugins run. Without scapy or capture privileges the recorder falls back to
+the hub alone, i.e. to what the running plugins publish.
+
+Per packet the recorder only packs a block header and copies the frame
+into a write buffer; the buffer goes to disk once it holds ``flush_bytes``
+or ``flush_interval`` seconds have passed.
+
+When a detector raises a CRITICAL alert it calls ``freeze()``: the current
+segment is closed and every ring segment is hard-linked into
+``lookback/<time>_<reason>/``, where the ring can no longer delete it. The
+alert records those paths, so the packets from *before* the attack can be
+opened in Wireshark.
+
+pcapng (not classic pcap) because one ring mixes link types: Ethernet
+frames from the ARP/traffic sniffers and 802.11 radiotap frames from the
+monitor-mode sniffers each get their own interface block.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import os
+import re
+import shutil
+import struct
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from .capture_hub import CaptureHub, get_capture_hub
+from .packet_queue import open_capture_socket
+
+
+logger = logging.getLogger(__name__)
+
+
+# pcapng block types
+SHB_TYPE = 0x0A0D0D0A
+IDB_TYPE = 0x00000001
+EPB_TYPE = 0x00000006
+BYTE_ORDER_MAGIC = 0x1A2B3C4D
+
+# Link types (tcpdump.org/linktypes.html)
+LINKTYPE_ETHERNET = 1
+LINKTYPE_IEEE802_11_RADIOTAP = 127
+
+_EPB_HEADER = struct.Struct("<IIIIIII")  # type, length, interface, ts high, ts low, caplen, len
+_BLOCK_TRAILER = struct.Struct("<I")
+
+
+def _shb() -> bytes:
+    """Section header block (little endian, section length unknown)."""
+    body = struct.pack("<IHHq", BYTE_ORDER_MAGIC, 1, 0, -1)
+    length = 12 + len(body)
+    return struct.pack("<II", SHB_TYPE, length) + body + struct.pack("<I", length)
+
+
+def _idb(linktype: int, snaplen: int) -> bytes:
+    """Interface description block (microsecond timestamps)."""
+    body = struct.pack("<HHI", linktype, 0, snaplen)
+    length = 12 + len(body)
+    return struct.pack("<II", IDB_TYPE, length) + body + struct.pack("<I", length)
+
+
+class PacketRecorder:
+    """
+    Bounded ring of pcapng segments fed by its own capture and the capture hub.
+
+    Args:
+        directory: Where ``ring/`` and ``lookback/`` live
+        segment_size: Bytes per segment before the ring moves on
+        ring_size: Segments kept in the ring (disk budget = ring_size * segment_size)
+        max_lookbacks: Frozen lookback windows kept (oldest deleted first)
+        snaplen: Bytes kept per frame
+        flush_bytes: Buffered bytes that trigger a write
+        flush_interval: Seconds after which buffered frames are written anyway
+        min_freeze_interval: Alerts within this many seconds of a freeze share it
+    """
+
+    def __init__(self, directory: Union[str, Path], segment_size: int = 16 * 1024 * 1024,
+                 ring_size: int = 8, max_lookbacks: int = 10, snaplen: int = 65535,
+                 flush_bytes: int = 64 * 1024, flush_interval: float = 1.0,
+                 min_freeze_interval: float = 10.0):
+        if ring_size < 1 or segment_size < 1024:
+            raise ValueError("Ring needs at least one segment of at least 1 KiB")
+        self.directory = Path(directory)
+        self.ring_dir = self.directory / "ring"
+        self.lookback_dir = self.directory / "lookback"
+        self.segment_size = segment_size
+        self.ring_size = ring_size
+        self.max_lookbacks = max_lookbacks
+        self.snaplen = snaplen
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.min_freeze_interval = min_freeze_interval
+
+        self.ring_dir.mkdir(parents=True, exist_ok=True)
+        self.lookback_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hub: Optional[CaptureHub] = None
+        # Own capture: {socket: interface} read by the capture thread
+        self._sockets: Dict[Any, Optional[str]] = {}
+        self._capture_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._segments: Deque[Path] = deque()
+        self._sequence = 0
+        self._file = None
+        self._size = 0  # Bytes in the current segment, buffered ones included
+        self._buffer = bytearray()
+        self._last_flush = 0.0
+        self._interfaces: Dict[int, int] = {}  # {linktype: interface id} in this segment
+        self._linktypes: Dict[type, int] = {}  # {packet class: linktype}
+        self._last_freeze = 0.0
+        self._last_lookback: List[str] = []
+
+        # Segments left by a previous run stay part of the ring (and its budget)
+        leftovers = []
+        for path in self.ring_dir.glob("wf_*.pcapng"):
+            match = re.match(r"wf_(\d+)_", path.name)
+            if match:
+                leftovers.append((int(match.group(1)), path))
+        for sequence, path in sorted(leftovers):
+            self._segments.append(path)
+            self._sequence = sequence
+
+        self.stats = {
+            'packets': 0,
+            'bytes': 0,
+            'truncated': 0,
+            'flushes': 0,
+            'segments': 0,
+            'segments_deleted': 0,
+            'lookbacks': 0,
+            'errors': 0
+        }
+
+    # Capture
+
+    @property
+    def recording(self) -> bool:
+        return self._hub is not None
+
+    @property
+    def capturing(self) -> bool:
+        """True while the recorder's own capture runs."""
+        return self._capture_thread is not None
+
+    def start(self, hub: Optional[CaptureHub] = None, interfaces: Optional[List[str]] = None,
+              capture: bool = True) -> None:
+        """
+        Start recording.
+
+        Args:
+            hub: Capture hub the plugins publish on (default: the global hub)
+            interfaces: IP interfaces to capture on (None: scapy's default)
+            capture: Capture the interfaces unfiltered; False records only
+                what is published on ``hub``
+        """
+        if self._hub is not None:
+            return
+        self._hub = hub or get_capture_hub()
+        self._hub.subscribe(self.record_packet)
+        if capture:
+            self._start_capture(interfaces or [None])
+        source = "all frames" if self.capturing else "frames published by the capture plugins"
+        logger.info(f"Recording {source} to {self.ring_dir} "
+                    f"({self.ring_size} x {self.segment_size // (1024 * 1024)} MB)")
+
+    def stop(self) -> None:
+        """Stop capturing, unsubscribe and close the current segment."""
+        self._stop_capture()
+        if self._hub is not None:
+            self._hub.unsubscribe(self.record_packet)
+            self._hub = None
+        with self._lock:
+            self._close_segment()
+
+    def _start_capture(self, interfaces: List[Optional[str]]) -> None:
+        try:
+            from scapy.sendrecv import sniff
+        except ImportError:
+            logger.warning("Scapy not available: the packet recorder only records what the plugins publish")
+            return
+        for iface in interfaces:
+            sock = open_capture_socket(None, iface)
+            if sock is not None:
+                self._sockets[sock] = iface
+        if not self._sockets:
+            logger.warning("Cannot capture (root needed?): the packet recorder only records "
+                           "what the plugins publish")
+            return
+        self._stop_event.clear()
+        self._capture_thread = threading.Thread(target=self._capture_loop, args=(sniff,),
+                                                name="pcap-recorder", daemon=True)
+        self._capture_thread.start()
+
+    def _stop_capture(self) -> None:
+        if self._capture_thread is not None:
+            self._stop_event.set()
+            self._capture_thread.join(timeout=2.0)
+            self._capture_thread = None
+        sockets, self._sockets = self._sockets, {}
+        for sock in sockets:
+            try:
+                sock.close()
+            except Exception as e:
+                logger.debug(f"Closing recorder socket failed: {e}")
+
+    def _capture_loop(self, sniff) -> None:
+        opened = next(iter(self._sockets)) if len(self._sockets) == 1 else dict(self._sockets)
+        while not self._stop_event.is_set():
+            try:
+                sniff(opened_socket=opened, prn=self._record_captured, store=0, timeout=1)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Packet recorder capture error: {e}")
+                self._stop_event.wait(1.0)
+
+    # Hot path
+
+    def record_packet(self, packet: Any) -> None:
+        """Capture hub callback for scapy packets."""
+        linktype = self._linktype(packet)
+        if linktype == LINKTYPE_ETHERNET and self.capturing:
+            return  # Already recorded from the recorder's own capture
+        self._record(packet, linktype)
+
+    def _record_captured(self, packet: Any) -> None:
+        self._record(packet, self._linktype(packet))
+
+    def _record(self, packet: Any, linktype: int) -> None:
+        data = getattr(packet, 'original', None) or bytes(packet)
+        self.write_frame(data, float(getattr(packet, 'time', 0) or time.time()), linktype)
+
+    def write_frame(self, data: bytes, timestamp: float, linktype: int = LINKTYPE_ETHERNET) -> None:
+        """Append one raw frame (buffered)."""
+        orig_len = len(data)
+        if orig_len > self.snaplen:
+            data = data[:self.snaplen]
+            self.stats['truncated'] += 1
+        caplen = len(data)
+        padding = -caplen % 4
+        block_len = _EPB_HEADER.size + caplen + padding + _BLOCK_TRAILER.size
+        ts = int(timestamp * 1_000_000)
+
+        with self._lock:
+            try:
+                if self._file is None or self._size + block_len > self.segment_size:
+                    self._next_segment()
+                interface = self._interfaces.get(linktype)
+                if interface is None:
+                    interface = self._add_interface(linktype)
+
+                buffer = self._buffer
+                buffer += _EPB_HEADER.pack(EPB_TYPE, block_len, interface, ts >> 32, ts & 0xFFFFFFFF,
+                                           caplen, orig_len)
+                buffer += data
+                if padding:
+                    buffer += b"\0" * padding
+                buffer += _BLOCK_TRAILER.pack(block_len)
+                self._size += block_len
+                self.stats['packets'] += 1
+                self.stats['bytes'] += caplen
+
+                now = time.monotonic()
+                if len(buffer) >= self.flush_bytes or now - self._last_flush >= self.flush_interval:
+                    self._flush()
+            except OSError as e:
+                self.stats['errors'] += 1
+                logger.error(f"Packet recorder write failed: {e}")
+                self._close_segment()
+
+    def flush(self) -> None:
+        """Write buffered frames now."""
+        with self._lock:
+            if self._file:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._file.flush()
+            self._buffer.clear()
+            self.stats['flushes'] += 1
+        self._last_flush = time.monotonic()
+
+    def _linktype(self, packet: Any) -> int:
+        cls = type(packet)
+        linktype = self._linktypes.get(cls)
+        if linktype is None:
+            linktype = LINKTYPE_ETHERNET
+            try:
+                from scapy.config import conf
+                linktype = conf.l2types.layer2num.get(cls, LINKTYPE_ETHERNET)
+            except ImportError:
+                pass
+            self._linktypes[cls] = linktype
+        return linktype
+
+    # Ring
+
+    def _next_segment(self) -> None:
+        self._close_segment()
+        self._sequence += 1
+        stamp = time.strftime("%Y%m%d%H%M%S")
+        path = self.ring_dir / f"wf_{self._sequence:05d}_{stamp}.pcapng"
+        self._file = open(path, 'wb')
+        self._segments.append(path)
+        self._interfaces = {}
+        self._buffer += _shb()
+        self._size = len(self._buffer)
+        self._last_flush = time.monotonic()
+        self.stats['segments'] += 1
+
+        while len(self._segments) > self.ring_size:
+            oldest = self._segments.popleft()
+            try:
+                oldest.unlink()
+                self.stats['segments_deleted'] += 1
+            except OSError as e:
+                logger.error(f"Removing ring segment {oldest} failed: {e}")
+
+    def _add_interface(self, linktype: int) -> int:
+        interface = len(self._interfaces)
+        self._interfaces[linktype] = interface
+        block = _idb(linktype, self.snaplen)
+        self._buffer += block
+        self._size += len(block)
+        return interface
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def segments(self) -> List[Path]:
+        """Ring segments, oldest first."""
+        with self._lock:
+            return list(self._segments)
+
+    # Lookback
+
+    def freeze(self, reason: str) -> List[str]:
+        """
+        Preserve the ring as a lookback window for an alert.
+
+        Closes the current segment (the next packet starts a new one) and
+        hard-links every ring segment into ``lookback/<time>_<reason>/``.
+        Alerts within ``min_freeze_interval`` of the last freeze get the same
+        window instead of a new one.
+
+        Args:
+            reason: Short label, e.g. "arp_192.168.1.1"
+
+        Returns:
+            Paths of the frozen segments, oldest first ([] if nothing recorded)
+        """
+        with self._lock:
+            now = time.time()
+            if self._last_lookback and now - self._last_freeze < self.min_freeze_interval:
+                return list(self._last_lookback)
+
+            try:
+                frozen = self._freeze_segments(reason)
+            except OSError as e:
+                self.stats['errors'] += 1
+                logger.error(f"Freezing packet lookback failed: {e}")
+                return []
+            if not frozen:
+                return []
+
+            self._last_freeze = now
+            self._last_lookback = frozen
+            self.stats['lookbacks'] += 1
+            self._prune_lookbacks()
+            return list(frozen)
+
+    def _freeze_segments(self, reason: str) -> List[str]:
+        self._close_segment()
+        segments = [path for path in self._segments if path.exists()]
+        if not segments:
+            return []
+
+        label = re.sub(r"[^A-Za-z0-9_.-]+", "_", reason)[:64]
+        stamp = time.strftime('%Y%m%d%H%M%S')
+        target = self.lookback_dir / f"{stamp}_{label}"
+        suffix = 1
+        while target.exists():
+            suffix += 1
+            target = self.lookback_dir / f"{stamp}_{label}_{suffix}"
+        target.mkdir(parents=True)
+
+        frozen = []
+        for path in segments:
+            dest = target / path.name
+            try:
+                os.link(path, dest)  # The ring deletes its name only, not the data
+            except OSError:
+                shutil.copy2(path, dest)
+            frozen.append(str(dest))
+        logger.warning(f"Froze {len(frozen)} pcap segment(s) to {target}")
+        return frozen
+
+    def lookbacks(self) -> List[Path]:
+        """Frozen lookback directories, oldest first."""
+        return sorted(p for p in self.lookback_dir.iterdir() if p.is_dir())
+
+    def _prune_lookbacks(self) -> None:
+        lookbacks = self.lookbacks()
+        for old in lookbacks[:max(len(lookbacks) - self.max_lookbacks, 0)]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def disk_usage(self) -> int:
+        """Bytes used by ring and lookback files (hard links counted once)."""
+        seen = set()
+        total = 0
+        for path in self.directory.rglob("*.pcapng"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            if st.st_ino not in seen:
+                seen.add(st.st_ino)
+                total += st.st_size
+        return total
@@ -0,0 +1,313 @@
+"""
+Packet Sampler - Statistically scaled packet sampling for volume counters
+
+On a busy mirror port Python can't dissect and count every packet. The
+volume counters (traffic totals, top talkers, protocol distributions) don't
+need to: they can analyse a sample and scale it back up. Modes:
+
+- ``off``: every packet is analysed (default)
+- ``count``: deterministic 1-in-N
+- ``flow``: whole flows are kept or skipped by a symmetric hash of the
+  5-tuple, 1 flow in N (per-flow views stay complete)
+- ``adaptive``: 1-in-N with N adjusted every second so analysis stays
+  within ``cpu_budget`` (fraction of one core)
+
+Security-critical traffic (ARP, DNS, EAPOL, beacons) is never sampled: it
+is always admitted with weight 1.
+
+Each admitted packet carries a weight (the inverse of its inclusion
+probability, i.e. N). Counters add ``value * weight`` - the Horvitz-Thompson
+estimator - and ``ScaledCounter`` also tracks its variance, so every
+estimate comes with a 95% confidence interval. In flow mode packets of one
+flow are kept together, so the per-packet interval is optimistic for
+traffic dominated by a few heavy flows.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import math
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+SAMPLING_OFF = "off"
+SAMPLING_COUNT = "count"
+SAMPLING_FLOW = "flow"
+SAMPLING_ADAPTIVE = "adaptive"
+SAMPLING_MODES = (SAMPLING_OFF, SAMPLING_COUNT, SAMPLING_FLOW, SAMPLING_ADAPTIVE)
+
+DEFAULT_SAMPLING_RATE = 10
+DEFAULT_CPU_BUDGET = 0.25  # Fraction of one core spent analysing sampled packets
+MAX_ADAPTIVE_RATE = 1000
+ADAPT_INTERVAL = 1.0  # Seconds between adaptive rate updates
+
+# z for a two-sided 95% interval
+Z_95 = 1.96
+
+# Layers whose packets are always analysed (scapy layer names)
+EXEMPT_LAYERS = ("ARP", "DNS", "EAPOL", "Dot11Beacon")
+
+
+def is_exempt(packet: Any) -> bool:
+    """True for security-critical packets that must never be sampled out."""
+    haslayer = packet.haslayer
+    for layer in EXEMPT_LAYERS:
+        if haslayer(layer):
+            return True
+    return False
+
+
+def flow_hash(packet: Any) -> Optional[int]:
+    """
+    Symmetric hash of the packet's 5-tuple.
+
+    Both directions of a connection hash alike, so a sampled flow keeps its
+    requests and replies. None for packets without an IP layer.
+    """
+    ip = packet.getlayer("IP") or packet.getlayer("IPv6")
+    if ip is None:
+        return None
+    l4 = packet.getlayer("TCP") or packet.getlayer("UDP")
+    a = (str(ip.src), getattr(l4, 'sport', 0))
+    b = (str(ip.dst), getattr(l4, 'dport', 0))
+    if b < a:
+        a, b = b, a
+    proto = getattr(ip, 'proto', getattr(ip, 'nh', 0))
+    return zlib.crc32(f"{proto}|{a[0]}|{a[1]}|{b[0]}|{b[1]}".encode())
+
+
+class ScaledCounter:
+    """
+    Horvitz-Thompson total of weighted samples with its variance.
+
+    A value seen with weight w (inclusion probability 1/w) adds w * value to
+    the estimate and (w^2 - w) * value^2 to its variance; unsampled
+    observations (w = 1) are exact and add no variance.
+    """
+
+    __slots__ = ('total', 'variance', 'samples')
+
+    def __init__(self):
+        self.total = 0
+        self.variance = 0
+        self.samples = 0
+
+    def add(self, value: float, weight: int = 1) -> None:
+        self.total += value * weight
+        self.variance += (weight * weight - weight) * value * value
+        self.samples += 1
+
+    def interval(self, z: float = Z_95) -> Tuple[float, float]:
+        """(low, high) confidence interval of the total (low never below 0)."""
+        margin = z * math.sqrt(self.variance)
+        return max(0.0, self.total - margin), self.total + margin
+
+    def to_dict(self) -> Dict[str, Any]:
+        low, high = self.interval()
+        return {
+            'estimate': self.total,
+            'ci_low': round(low, 1),
+            'ci_high': round(high, 1),
+            'samples': self.samples
+        }
+
+
+class PacketSampler:
+    """
+    Decides which packets a plugin analyses, and their weights.
+
+    Called from one analysis thread, so it isn't locked.
+
+    Args:
+        mode: off, count, flow or adaptive
+        rate: N of 1-in-N (adaptive: starting N)
+        cpu_budget: adaptive mode's target share of one core
+        max_rate: Largest N adaptive mode may reach
+        clock: Monotonic clock in seconds (tests)
+
+    Raises:
+        ValueError: Unknown mode or non-positive rate/budget
+    """
+
+    def __init__(self, mode: str = SAMPLING_OFF, rate: int = DEFAULT_SAMPLING_RATE,
+                 cpu_budget: float = DEFAULT_CPU_BUDGET, max_rate: int = MAX_ADAPTIVE_RATE,
+                 clock: Callable[[], float] = time.perf_counter):
+        if mode not in SAMPLING_MODES:
+            raise ValueError(f"Unknown sampling mode {mode!r} (use {', '.join(SAMPLING_MODES)})")
+        if rate < 1 or max_rate < 1 or cpu_budget <= 0:
+            raise ValueError("rate, max_rate and cpu_budget must be positive")
+        self.mode = mode
+        self.rate = 1 if mode == SAMPLING_OFF else min(rate, max_rate)
+        self.cpu_budget = cpu_budget
+        self.max_rate = max_rate
+        self._clock = clock
+        self._counter = 0
+
+        # Adaptive mode: analysis time charged in the current window
+        self._busy = 0.0
+        self._window_start = clock()
+        self.busy_fraction = 0.0
+
+        self.estimates: Dict[str, ScaledCounter] = {}
+        self.stats = {
+            'seen': 0,
+            'admitted': 0,
+            'exempt': 0,
+            'skipped': 0
+        }
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'PacketSampler':
+        """Sampler from a plugin config (sampling_mode, sampling_rate, sampling_cpu_budget)."""
+        return cls(
+            mode=config.get('sampling_mode', SAMPLING_OFF),
+            rate=config.get('sampling_rate', DEFAULT_SAMPLING_RATE),
+            cpu_budget=config.get('sampling_cpu_budget', DEFAULT_CPU_BUDGET)
+        )
+
+    def update(self, config: Dict[str, Any]) -> None:
+        """
+        Follow a changed plugin config (config reload) keeping the estimates.
+
+        A new mode restarts its 1-in-N at ``sampling_rate``; the CPU budget
+        applies from the next adaptive window. Not synchronised with the
+        analysis thread: a packet or two may still see the old settings.
+        """
+        mode = config.get('sampling_mode', SAMPLING_OFF)
+        rate = config.get('sampling_rate', DEFAULT_SAMPLING_RATE)
+        cpu_budget = config.get('sampling_cpu_budget', DEFAULT_CPU_BUDGET)
+        if mode not in SAMPLING_MODES:
+            raise ValueError(f"Unknown sampling mode {mode!r} (use {', '.join(SAMPLING_MODES)})")
+        if rate < 1 or cpu_budget <= 0:
+            raise ValueError("rate and cpu_budget must be positive")
+        self.cpu_budget = cpu_budget
+        if mode != self.mode:
+            self.rate = 1 if mode == SAMPLING_OFF else min(rate, self.max_rate)
+            self._counter = 0
+            self._busy = 0.0
+            self._window_start = self._clock()
+            self.mode = mode
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != SAMPLING_OFF
+
+    def admit(self, packet: Any) -> int:
+        """
+        Weight of ``packet`` in the scaled counters.
+
+        Returns:
+            0 to skip the packet, 1 for exempt (or unsampled) packets,
+            otherwise N
+        """
+        if self.mode == SAMPLING_OFF:
+            return 1
+        stats = self.stats
+        stats['seen'] += 1
+        if is_exempt(packet):
+            stats['exempt'] += 1
+            stats['admitted'] += 1
+            return 1
+
+        rate = self.rate
+        if self.mode == SAMPLING_FLOW:
+            key = flow_hash(packet)
+            admitted = key is None or key % rate == 0
+            weight = rate if key is not None else 1
+        else:
+            self._counter += 1
+            admitted = self._counter >= rate
+            if admitted:
+                self._counter = 0
+            weight = rate
+        if not admitted:
+            stats['skipped'] += 1
+            return 0
+        stats['admitted'] += 1
+        return weight
+
+    def charge(self, seconds: float) -> None:
+        """Analysis time spent on admitted packets (drives adaptive mode)."""
+        if self.mode != SAMPLING_ADAPTIVE:
+            return
+        self._busy += seconds
+        now = self._clock()
+        if now - self._window_start >= ADAPT_INTERVAL:
+            self._adapt(now)
+
+    def _adapt(self, now: float) -> None:
+        """Scale N by how far the last window's analysis time was off budget."""
+        busy = self._busy / (now - self._window_start)
+        self.busy_fraction = busy
+        # Analysis time is ~proportional to 1/N: N * busy / budget lands on budget
+        target = math.ceil(self.rate * busy / self.cpu_budget) if busy > 0 else 1
+        if target > self.rate:
+            rate = min(self.max_rate, target)
+        else:
+            rate = max(1, target, self.rate // 2)  # Back off at most by half per window
+        if rate != self.rate:
+            logger.debug(f"Adaptive sampling: 1 in {self.rate} -> 1 in {rate} (busy {busy:.0%})")
+            self.rate = rate
+        self._busy = 0.0
+        self._window_start = now
+
+    # Scaled estimates
+
+    def observe(self, name: str, value: float, weight: int) -> None:
+        """Add a weighted observation to estimate ``name``."""
+        counter = self.estimates.get(name)
+        if counter is None:
+            counter = self.estimates[name] = ScaledCounter()
+        counter.add(value, weight)
+
+    def interval(self, name: str) -> Tuple[float, float]:
+        """95% interval of estimate ``name`` ((0, 0) if never observed)."""
+        counter = self.estimates.get(name)
+        return counter.interval() if counter is not None else (0.0, 0.0)
+
+    def reset_estimates(self) -> None:
+        self.estimates = {}
+
+    def take_partial(self) -> Dict[str, Any]:
+        """Counters and estimates since the last call, reset (worker mode)."""
+        partial = {
+            'stats': dict(self.stats),
+            'estimates': {name: (c.total, c.variance, c.samples) for name, c in self.estimates.items()}
+        }
+        self.stats = dict.fromkeys(self.stats, 0)
+        self.estimates = {}
+        return partial
+
+    def merge_partial(self, partial: Dict[str, Any]) -> None:
+        """
+        Add another sampler's take_partial().
+
+        Shards sample disjoint packets independently, so totals and
+        variances simply add.
+        """
+        for key, value in partial['stats'].items():
+            self.stats[key] += value
+        for name, (total, variance, samples) in partial['estimates'].items():
+            counter = self.estimates.get(name)
+            if counter is None:
+                counter = self.estimates[name] = ScaledCounter()
+            counter.total += total
+            counter.variance += variance
+            counter.samples += samples
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Mode, current N, counters and every estimate with its interval."""
+        return {
+            'mode': self.mode,
+            'rate': self.rate,
+            'cpu_budget': self.cpu_budget,
+            'busy_fraction': round(self.busy_fraction, 3),
+            **self.stats,
+            'estimates': {name: counter.to_dict() for name, counter in self.estimates.items()}
+        }
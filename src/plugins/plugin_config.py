@@ -0,0 +1,345 @@
+"""
+Plugin Config - Which plugins run, how often and on what budget
+
+Deployments differ: a Raspberry Pi sensor can't afford the HTTP sniffer,
+handshake capture or topology sweeps, while a laptop demo wants everything
+at full rate. The ``plugins:`` section of ``config/dashboard.yml`` says, per
+plugin:
+
+    plugins:
+      - name: http_sniffer
+        enabled: false
+      - name: topology
+        rate_ms: 60000          # sweep once a minute
+      - name: packet_analyzer
+        interface: eth0
+        budget:
+          max_queue: 2000       # packets buffered for analysis
+          max_entries: 50       # records kept in rolling lists
+          cpu_share: 0.1        # of one core
+        config:
+          capture_count: 50
+
+Entries are laid over the built-in specs (plugin_set.DEFAULT_PLUGIN_SPECS)
+by name; only the fields given change. A new name adds a plugin loaded
+from its ``module`` (``class``: its plugin class, default the module's only
+Plugin subclass; ``mock_class``: used instead in mock mode).
+
+Budgets map onto knobs the plugins already have:
+- ``max_queue``: capacity of the capture -> analysis PacketQueue
+  (``queue_size``)
+- ``max_entries``: length of the rolling lists (recent DNS queries, HTTP
+  requests, alerts)
+- ``cpu_share``: adaptive sampling within that CPU budget, for plugins that
+  sample their volume counters (ARP, DNS, EAPOL and beacons never are)
+
+PluginConfigWatcher polls the file. plugin_set.reload_plugin_set() applies
+a change: new rates and budgets are set on the running plugins, and only
+plugins that were enabled, disabled or otherwise changed are rebuilt, so
+the other captures keep running.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import importlib
+import importlib.util
+import inspect
+import logging
+import os
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .base import Plugin
+from .packet_sampler import SAMPLING_ADAPTIVE
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RELOAD_INTERVAL = 1.0  # Seconds between config file checks
+
+# Shared settings the plugin set hands a plugin (``uses``)
+USE_INTERFACE = "interface"  # The managed WiFi NIC (--wifi-interface) as ``interface``
+USE_INTERFACES = "interfaces"  # The --interface list, for per-interface counters
+USE_CAPTURE = "capture"  # Packet queue, sampling and capture interfaces
+USE_VENDOR_CACHE = "vendor_cache"  # MAC vendor cache surviving mode switches
+USE_CONSENT = "consent"  # ethical_consent: granted in mock mode only
+USE_WORKERS = "workers"  # Analysed in the worker pool (--workers)
+PLUGIN_USES = (USE_INTERFACE, USE_INTERFACES, USE_CAPTURE, USE_VENDOR_CACHE, USE_CONSENT, USE_WORKERS)
+
+# Keys of a ``plugins:`` entry
+SPEC_FIELDS = ("name", "enabled", "module", "class", "mock_class", "rate_ms", "on_demand",
+               "interface", "uses", "budget", "config")
+
+
+@dataclass(frozen=True)
+class PluginBudget:
+    """
+    Resources a plugin may use (None: the plugin's default).
+
+    Raises:
+        ValueError: Non-positive limits or a CPU share outside (0, 1]
+    """
+    max_queue: Optional[int] = None
+    max_entries: Optional[int] = None
+    cpu_share: Optional[float] = None
+
+    def __post_init__(self):
+        for name in ("max_queue", "max_entries"):
+            value = getattr(self, name)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ValueError(f"{name} must be a positive integer, got {value!r}")
+        if self.cpu_share is not None and not (
+                isinstance(self.cpu_share, (int, float)) and 0 < self.cpu_share <= 1):
+            raise ValueError(f"cpu_share must be in (0, 1], got {self.cpu_share!r}")
+
+    def settings(self) -> Dict[str, Any]:
+        """Plugin config keys enforcing the budget."""
+        settings: Dict[str, Any] = {}
+        if self.max_queue is not None:
+            settings['queue_size'] = self.max_queue
+        if self.max_entries is not None:
+            settings['max_entries'] = self.max_entries
+        if self.cpu_share is not None:
+            settings['sampling_mode'] = SAMPLING_ADAPTIVE
+            settings['sampling_cpu_budget'] = float(self.cpu_share)
+        return settings
+
+
+@dataclass(frozen=True)
+class PluginSpec:
+    """
+    How to build one plugin of the set.
+
+    Attributes:
+        name: Plugin name (lifecycle, screens, daemon protocol)
+        module: Module defining the plugin class (leading dot: relative
+            to this package)
+        class_name: Plugin class (None: the module's only Plugin subclass)
+        mock_class: Class used instead in mock mode
+        enabled: Build the plugin at all
+        rate_ms: Collection interval
+        on_demand: Start with the first consumer (see PluginActivation)
+        interface: Interface to use instead of the command line's
+        uses: Shared settings to hand the plugin (PLUGIN_USES)
+        budget: Resource budget
+        config: Plugin-specific options
+    """
+    name: str
+    module: str
+    class_name: Optional[str] = None
+    mock_class: Optional[str] = None
+    enabled: bool = True
+    rate_ms: int = 1000
+    on_demand: bool = False
+    interface: Optional[str] = None
+    uses: Tuple[str, ...] = ()
+    budget: PluginBudget = PluginBudget()
+    config: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.name or not self.module:
+            raise ValueError("name and module are required")
+        if not isinstance(self.rate_ms, int) or self.rate_ms < 0:
+            raise ValueError(f"rate_ms must be an integer >= 0, got {self.rate_ms!r}")
+        unknown = [use for use in self.uses if use not in PLUGIN_USES]
+        if unknown:
+            raise ValueError(f"unknown uses {', '.join(map(str, unknown))} (use {', '.join(PLUGIN_USES)})")
+        if not isinstance(self.config, Mapping):
+            raise ValueError("config must be a mapping")
+
+    def retunes(self, other: 'PluginSpec') -> bool:
+        """True if ``other`` differs from this spec in rate and budget only."""
+        return replace(self, rate_ms=other.rate_ms, budget=other.budget) == other
+
+
+def _absolute(module: str) -> str:
+    """Module name with a leading-dot name resolved against this package."""
+    return importlib.util.resolve_name(module, __package__) if module.startswith(".") else module
+
+
+def _merge_spec(base: Optional[PluginSpec], entry: Mapping[str, Any]) -> PluginSpec:
+    """``entry`` (one item of ``plugins:``) laid over ``base``."""
+    name = entry['name']
+    if base is None:
+        if not entry.get('module'):
+            raise ValueError(f"plugin {name!r}: a new plugin needs a module")
+        base = PluginSpec(name=name, module=entry['module'])
+
+    changes: Dict[str, Any] = {}
+    if _absolute(entry.get('module', base.module)) != _absolute(base.module):
+        # Another module: the built-in class names don't apply to it
+        changes.update(module=entry['module'], class_name=None, mock_class=None)
+    if 'class' in entry:
+        changes['class_name'] = entry['class']
+    for key in ("mock_class", "enabled", "rate_ms", "on_demand", "interface"):
+        if key in entry:
+            changes[key] = entry[key]
+    try:
+        if 'uses' in entry:
+            changes['uses'] = tuple(entry['uses'] or ())
+        if 'budget' in entry:
+            changes['budget'] = PluginBudget(**(entry['budget'] or {}))
+        if 'config' in entry:
+            changes['config'] = {**base.config, **(entry['config'] or {})}
+        return replace(base, **changes)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"plugin {name!r}: {e}") from e
+
+
+def parse_plugin_specs(entries: Optional[List[Any]],
+                       defaults: Iterable[PluginSpec] = ()) -> Dict[str, PluginSpec]:
+    """
+    Specs from the ``plugins:`` list laid over ``defaults``.
+
+    Args:
+        entries: Parsed ``plugins:`` section (None: defaults only)
+        defaults: Built-in specs
+
+    Returns:
+        {name: spec}, defaults first in their order, then new plugins
+
+    Raises:
+        ValueError: Malformed entries or invalid values
+    """
+    specs = {spec.name: spec for spec in defaults}
+    if entries is None:
+        return specs
+    if not isinstance(entries, list):
+        raise ValueError("plugins must be a list")
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get('name'):
+            raise ValueError(f"plugins[{index}]: each plugin needs a name")
+        unknown = sorted(set(entry) - set(SPEC_FIELDS))
+        if unknown:
+            raise ValueError(f"plugin {entry['name']!r}: unknown field(s) {', '.join(unknown)}")
+        specs[entry['name']] = _merge_spec(specs.get(entry['name']), entry)
+    return specs
+
+
+def plugin_class(spec: PluginSpec, mock_mode: bool = False) -> type:
+    """
+    Import the plugin class of ``spec``.
+
+    Raises:
+        ValueError: The module can't be imported or has no such plugin class
+    """
+    try:
+        module = importlib.import_module(spec.module, package=__package__)
+    except ImportError as e:
+        raise ValueError(f"plugin {spec.name!r}: cannot import {spec.module}: {e}") from e
+
+    class_name = spec.mock_class if mock_mode and spec.mock_class else spec.class_name
+    if class_name is None:
+        candidates = [
+            obj for obj in vars(module).values()
+            if inspect.isclass(obj) and issubclass(obj, Plugin) and obj.__module__ == module.__name__
+            and not inspect.isabstract(obj) and not obj.__name__.startswith("Mock")
+        ]
+        if len(candidates) != 1:
+            raise ValueError(f"plugin {spec.name!r}: {spec.module} defines {len(candidates)} "
+                             f"plugin classes, set its class")
+        return candidates[0]
+
+    cls = getattr(module, class_name, None)
+    if not (inspect.isclass(cls) and issubclass(cls, Plugin)):
+        raise ValueError(f"plugin {spec.name!r}: {spec.module} has no plugin class {class_name!r}")
+    return cls
+
+
+def load_plugin_specs(path: str, defaults: Iterable[PluginSpec] = ()) -> Dict[str, PluginSpec]:
+    """
+    Plugin specs from the dashboard config at ``path``.
+
+    The classes of enabled plugins are imported (for both modes), so a
+    typo fails here rather than at the next mode switch.
+
+    Raises:
+        ValueError: Unreadable file, invalid entries or unknown classes
+    """
+    try:
+        import yaml  # Only needed with a config file
+    except ImportError as e:
+        raise ValueError("reading the plugin config needs PyYAML (pip install pyyaml)") from e
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            document = yaml.safe_load(f) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise ValueError(f"cannot read {path}: {e}") from e
+    if not isinstance(document, dict):
+        raise ValueError(f"{path}: expected a mapping at the top level")
+
+    specs = parse_plugin_specs(document.get('plugins'), defaults)
+    for spec in specs.values():
+        if spec.enabled:
+            plugin_class(spec, mock_mode=False)
+            plugin_class(spec, mock_mode=True)
+    return specs
+
+
+class PluginConfigWatcher:
+    """
+    Reloads the plugin specs when the config file changes.
+
+    Args:
+        path: Dashboard config (YAML)
+        defaults: Built-in specs the file's entries are laid over
+        interval: Seconds between file checks
+        clock: Monotonic clock in seconds (tests)
+
+    Raises:
+        ValueError: The file can't be loaded now; later failures are
+            logged and the current specs kept
+    """
+
+    def __init__(self, path: str, defaults: Iterable[PluginSpec] = (),
+                 interval: float = DEFAULT_RELOAD_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        self.path = path
+        self.defaults = tuple(defaults)
+        self.interval = interval
+        self._clock = clock
+        self._signature = self._stat()
+        self.specs = load_plugin_specs(path, self.defaults)
+        self._next_check = clock() + interval
+        self.stats = {
+            'reloads': 0,
+            'errors': 0
+        }
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self) -> Optional[Dict[str, PluginSpec]]:
+        """
+        Specs of the changed file, or None if nothing changed (or the new
+        file is invalid, or it is not time to check yet).
+        """
+        now = self._clock()
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.interval
+
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None  # Unchanged, or gone/being replaced: keep running as is
+        self._signature = signature
+        try:
+            specs = load_plugin_specs(self.path, self.defaults)
+        except ValueError as e:
+            self.stats['errors'] += 1
+            logger.error(f"Plugin config not reloaded, keeping the current one: {e}")
+            return None
+        if specs == self.specs:
+            return None
+        self.specs = specs
+        self.stats['reloads'] += 1
+        logger.info(f"Plugin config reloaded from {self.path}")
+        return specs
@@ -0,0 +1,211 @@
+"""
+Plugin Set - The dashboard's plugins, built for one mode
+
+Shared by the Textual app and the headless collector daemon, so both run
+exactly the same collectors with the same rates and settings.
+
+The set is described by PluginSpecs: DEFAULT_PLUGIN_SPECS, or those the
+lifecycle's resources carry from the ``plugins:`` section of
+config/dashboard.yml (see plugins.plugin_config). Plugin classes are
+imported from the spec's module when the set is built.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+from .base import Plugin, PluginConfig
+from .lifecycle import PluginLifecycle
+from .plugin_config import (
+    USE_CAPTURE, USE_CONSENT, USE_INTERFACE, USE_INTERFACES, USE_VENDOR_CACHE, USE_WORKERS,
+    PluginSpec, plugin_class
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# Capture plugins are initialized (and their workers started) on demand
+DEFAULT_PLUGIN_SPECS = (
+    PluginSpec(name="system", module=".system_plugin", class_name="SystemPlugin",
+               rate_ms=100),  # 10 FPS
+    PluginSpec(name="wifi", module=".wifi_plugin", class_name="WiFiPlugin",
+               rate_ms=1000,  # 1 Hz (WiFi data changes slowly)
+               uses=(USE_INTERFACE,)),
+    PluginSpec(name="network", module=".network_plugin", class_name="NetworkPlugin",
+               rate_ms=500,  # 2 Hz
+               uses=(USE_INTERFACE, USE_INTERFACES)),
+    PluginSpec(name="packet_analyzer", module=".packet_analyzer_plugin",
+               class_name="PacketAnalyzerPlugin",
+               rate_ms=2000,  # 0.5 Hz (packet capture is slow)
+               uses=(USE_CAPTURE, USE_INTERFACE)),
+    PluginSpec(name="topology", module=".network_topology_plugin",
+               class_name="NetworkTopologyPlugin", mock_class="MockNetworkTopologyPlugin",
+               rate_ms=2000,  # Device table refresh; ARP sweeps run every sweep_interval
+               on_demand=True, uses=(USE_VENDOR_CACHE,),
+               config={"passive": True, "sweep_interval": 300.0}),
+    PluginSpec(name="arp_detector", module=".arp_spoofing_detector",
+               class_name="ARPSpoofingDetector", mock_class="MockARPSpoofingDetector",
+               rate_ms=1000,  # Check every second
+               on_demand=True, uses=(USE_CAPTURE,)),
+    PluginSpec(name="dns_monitor", module=".dns_monitor_plugin", class_name="DNSMonitorPlugin",
+               rate_ms=500,  # Fast updates for queries
+               on_demand=True, uses=(USE_CAPTURE, USE_WORKERS)),
+    # ETHICAL USE ONLY!
+    PluginSpec(name="http_sniffer", module=".http_sniffer_plugin", class_name="HTTPSnifferPlugin",
+               rate_ms=1000, on_demand=True, uses=(USE_CAPTURE, USE_CONSENT, USE_WORKERS)),
+    PluginSpec(name="rogue_ap", module=".rogue_ap_detector", class_name="RogueAPDetector",
+               rate_ms=2000, on_demand=True, uses=(USE_CAPTURE,)),
+    # LEGAL USE ONLY!
+    PluginSpec(name="handshake", module=".handshake_capturer", class_name="HandshakeCapturer",
+               rate_ms=2000, on_demand=True, uses=(USE_CAPTURE, USE_CONSENT),
+               config={"capture_dir": "/tmp/handshakes"}),
+)
+
+
+def plugin_specs(lifecycle: PluginLifecycle) -> Dict[str, PluginSpec]:
+    """The specs ``lifecycle`` builds from: --config's, else DEFAULT_PLUGIN_SPECS."""
+    specs = lifecycle.resources.plugin_specs
+    if specs is None:
+        return {spec.name: spec for spec in DEFAULT_PLUGIN_SPECS}
+    return specs
+
+
+def plugin_settings(lifecycle: PluginLifecycle, spec: PluginSpec, mock_mode: bool,
+                    monitor_capture: bool = False) -> Dict[str, Any]:
+    """
+    The config dict of the plugin ``spec`` describes.
+
+    Shared settings (``uses``) come first, then the spec's own config, its
+    budget and interface; consent is never taken from the file.
+
+    Args:
+        monitor_capture: The plugin class captures on the monitor NIC
+    """
+    resources = lifecycle.resources
+    # Packet queue size/overflow policy, sampling and capture interfaces of
+    # the capture plugins (--capture-queue, --sampling, --interface)
+    capture = resources.capture_settings
+    settings: Dict[str, Any] = {"mock_mode": mock_mode}
+    if USE_CAPTURE in spec.uses:
+        settings.update(capture)
+    if USE_INTERFACE in spec.uses:
+        settings["interface"] = capture.get('wifi_interface') or "wlan0"
+    if USE_INTERFACES in spec.uses:
+        # Wired uplink / managed WiFi NICs: counters per interface
+        settings["interfaces"] = list(capture.get('interfaces') or [])
+    settings.update(spec.config)
+    settings.update(spec.budget.settings())
+    if spec.interface:
+        settings["interface"] = spec.interface
+        if USE_CAPTURE in spec.uses:
+            if monitor_capture:
+                settings["monitor_interface"] = spec.interface
+            else:
+                settings["interfaces"] = [spec.interface]
+    if USE_VENDOR_CACHE in spec.uses:
+        settings["vendor_cache"] = resources.vendor_cache  # Survives mode switches
+    if USE_CONSENT in spec.uses:
+        settings["ethical_consent"] = mock_mode  # Only auto-consent in mock mode
+    return settings
+
+
+def build_plugin(lifecycle: PluginLifecycle, spec: PluginSpec, mock_mode: bool) -> Plugin:
+    """
+    Create the plugin ``spec`` describes (not yet added to ``lifecycle``).
+
+    Raises:
+        ValueError: The plugin class can't be loaded
+    """
+    cls = plugin_class(spec, mock_mode)
+    config = PluginConfig(
+        name=spec.name,
+        rate_ms=spec.rate_ms,
+        config=plugin_settings(lifecycle, spec, mock_mode, cls.monitor_capture)
+    )
+    # Worker mode (--workers): analysis runs in the pool's processes. Sharded
+    # plugins skip their own initialize(), so those needing consent are
+    # only sharded once it is given
+    pool = None if mock_mode else lifecycle.resources.worker_pool
+    consented = USE_CONSENT not in spec.uses or config.config['ethical_consent']
+    if pool is not None and USE_WORKERS in spec.uses and consented:
+        return pool.add(config, cls)
+    return cls(config)
+
+
+def build_plugin_set(lifecycle: PluginLifecycle, mock_mode: bool) -> Dict[str, Plugin]:
+    """
+    Create every enabled plugin and hand it to ``lifecycle``.
+
+    Always-on plugins are initialized here; on-demand plugins are only
+    registered for on-demand activation.
+
+    Args:
+        lifecycle: Lifecycle that owns the plugins (torn down by the caller)
+        mock_mode: Build mock/educational plugins instead of real collectors
+
+    Returns:
+        {name: plugin} in build order
+    """
+    specs = plugin_specs(lifecycle)
+    plugins: Dict[str, Plugin] = {}
+    for spec in specs.values():
+        if spec.enabled:
+            plugins[spec.name] = build_plugin(lifecycle, spec, mock_mode)
+
+    for name, plugin in plugins.items():
+        lifecycle.add(name, plugin, on_demand=specs[name].on_demand)
+    return plugins
+
+
+def reload_plugin_set(lifecycle: PluginLifecycle, plugins: Dict[str, Plugin], mock_mode: bool,
+                      specs: Dict[str, PluginSpec]) -> Tuple[Dict[str, Plugin], Dict[str, List[str]]]:
+    """
+    Move a running plugin set to new specs (plugin config file changed).
+
+    Plugins whose rate or budget changed are reconfigured in place, so
+    their captures keep running; disabled, dropped and otherwise changed
+    plugins are removed from ``lifecycle``, and new or changed ones built
+    and added.
+
+    Args:
+        lifecycle: Lifecycle owning ``plugins``; its resources take ``specs``
+        plugins: The live set (from build_plugin_set() or a previous reload)
+        mock_mode: Mode the set was built for
+        specs: New specs
+
+    Returns:
+        (the new {name: plugin}, {'updated': [...], 'removed': [...], 'added': [...]})
+    """
+    previous = plugin_specs(lifecycle)
+    lifecycle.resources.plugin_specs = specs
+    report: Dict[str, List[str]] = {'updated': [], 'removed': [], 'added': []}
+
+    kept: Dict[str, Plugin] = {}
+    for name, plugin in plugins.items():
+        old, new = previous.get(name), specs.get(name)
+        if new is not None and new.enabled and old is not None and old.retunes(new):
+            if new != old:
+                plugin.reconfigure(new.rate_ms, plugin_settings(lifecycle, new, mock_mode,
+                                                                plugin.monitor_capture))
+                report['updated'].append(name)
+            kept[name] = plugin
+        else:
+            lifecycle.remove(name)
+            report['removed'].append(name)
+
+    result: Dict[str, Plugin] = {}
+    for name, spec in specs.items():
+        if name in kept:
+            result[name] = kept[name]
+        elif spec.enabled:
+            try:
+                plugin = build_plugin(lifecycle, spec, mock_mode)
+            except ValueError as e:
+                logger.error(f"Plugin {name} not started: {e}")
+                continue
+            result[name] = lifecycle.add(name, plugin, on_demand=spec.on_demand)
+            report['added'].append(name)
+    return result, report
@@ -12,23 +12,29 @@
 import threading
 import time
 from typing import Dict, List, Any, Optional, Set, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from collections import defaultdict
 
-try:
-    from scapy.all import Dot11, Dot11Beacon, Dot11Elt, RadioTap, sniff, conf
-    conf.verb = 0
-    SCAPY_AVAILABLE = True
-except ImportError:
-    SCAPY_AVAILABLE = False
+from .scapy_loader import scapy_binder, scapy_installed
+
+SCAPY_AVAILABLE = scapy_installed()
+
+# scapy names, bound by _load_scapy() on first real-mode use
+_SCAPY_NAMES = ('Dot11', 'Dot11Beacon', 'Dot11Elt', 'RadioTap', 'sniff', 'conf')
+Dot11 = Dot11Beacon = Dot11Elt = RadioTap = sniff = conf = None
 
 from .base import Plugin, PluginConfig
+from .capture_hub import get_capture_hub
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Imports scapy and binds _SCAPY_NAMES (clears SCAPY_AVAILABLE on failure)
+_load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
+
+
+@dataclass(slots=True)
 class AccessPoint:
     """Represents a detected Access Point."""
     bssid: str  # MAC address
@@ -42,10 +48,20 @@ class AccessPoint:
     beacon_count: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'bssid': self.bssid,
+            'ssid': self.ssid,
+            'channel': self.channel,
+            'signal_strength': self.signal_strength,
+            'encryption': self.encryption,
+            'vendor': self.vendor,
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen,
+            'beacon_count': self.beacon_count
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class RogueAPAlert:
     """Represents a rogue AP detection alert."""
     timestamp: float
@@ -57,9 +73,22 @@ class RogueAPAlert:
     channel_diff: int
     signal_diff: int
     educational_note: str
+    pcap_files: List[str] = field(default_factory=list)  # Lookback capture (CRITICAL only)
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        """Shallow copy (pcap_files copied: mutated in place)."""
+        return {
+            'timestamp': self.timestamp,
+            'rogue_bssid': self.rogue_bssid,
+            'legitimate_bssid': self.legitimate_bssid,
+            'ssid': self.ssid,
+            'severity': self.severity,
+            'reason': self.reason,
+            'channel_diff': self.channel_diff,
+            'signal_diff': self.signal_diff,
+            'educational_note': self.educational_note,
+            'pcap_files': list(self.pcap_files)
+        }
 
 
 class RogueAPDetector(Plugin):
@@ -80,6 +109,10 @@ class RogueAPDetector(Plugin):
     3. Encryption Downgrade: WPA2 → Open/WEP
     4. Vendor Mismatch: Different manufacturer
     """
+
+    packet_handlers = ("_process_beacon",)
+    monitor_capture = True
+    snapshot_entities = {'access_points': 'bssid'}
     
     def __init__(self, config: PluginConfig):
         super().__init__(config)
@@ -108,11 +141,17 @@ def __init__(self, config: PluginConfig):
         # Thread control
         self._stop_event = threading.Event()
         self._monitor_thread: Optional[threading.Thread] = None
+        self._capture_hub = get_capture_hub()
+        self._baseline_timer: Optional[threading.Timer] = None
         
         # Detection settings
         self.baseline_learning_time = 60  # Learn baseline for 60s
         self.signal_threshold = -30  # Strong signal = suspicious
         self._baseline_learned = False
+
+        # Real mode: import scapy before any capture or packet handling
+        if not self.config.config.get('mock_mode', False):
+            _load_scapy()
     
     def initialize(self) -> None:
         """Initialize plugin."""
@@ -137,48 +176,77 @@ def collect_data(self) -> Dict[str, Any]:
     def start(self):
         """Start AP monitoring."""
         logger.info("Starting Rogue AP Detector...")
-        logger.info("Learning baseline APs for 60 seconds...")
         
         self._stop_event.clear()
+        self.snapshots.start()
         
         # Start monitoring thread
         self._monitor_thread = threading.Thread(target=self._monitor_aps, daemon=True)
+        self._capture_hub.add_publisher(self.config.name, "type mgt subtype beacon")
         self._monitor_thread.start()
         
+        # Baseline restored from a previous run: detect right away
+        if self._baseline_learned:
+            logger.info(f"Using saved baseline ({len(self.baseline_aps)} APs)")
+            return
+        
         # Start baseline learning
-        threading.Timer(self.baseline_learning_time, self._finalize_baseline).start()
+        logger.info("Learning baseline APs for 60 seconds...")
+        self._baseline_timer = threading.Timer(self.baseline_learning_time, self._finalize_baseline)
+        self._baseline_timer.daemon = True
+        self._baseline_timer.start()
     
     def stop(self):
         """Stop AP monitoring."""
         logger.info("Stopping Rogue AP Detector...")
         self._stop_event.set()
+        self._capture_hub.remove_publisher(self.config.name)
+        if self._baseline_timer:
+            self._baseline_timer.cancel()
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
+        self.snapshots.stop()
     
     def cleanup(self) -> None:
         """Cleanup resources."""
         self.stop()
+
+    def build_state(self) -> Dict[str, Any]:
+        """Learned baseline (persisted so restarts skip re-learning)."""
+        return {
+            'baseline_aps': dict(self.baseline_aps),
+            'baseline_learned': self._baseline_learned
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore a baseline saved by build_state()."""
+        self.baseline_aps = dict(state.get('baseline_aps', {}))
+        self._baseline_learned = bool(state.get('baseline_learned')) and bool(self.baseline_aps)
+        self.stats['baseline_aps'] = len(self.baseline_aps)
     
-    def get_data(self) -> Dict[str, Any]:
-        """Get current detection data."""
+    def build_snapshot(self) -> Dict[str, Any]:
+        """APs, baseline and recent alerts (capture thread side)."""
         # Update stats
         self.stats['total_aps_detected'] = len(self.access_points)
         self.stats['baseline_aps'] = len(self.baseline_aps)
         
-        # Get AP list
-        ap_list = [ap.to_dict() for ap in self.access_points.values()]
-        
-        # Get recent alerts (last 10)
-        recent_alerts = [alert.to_dict() for alert in self.rogue_alerts[-10:]]
-        
         return {
-            'monitoring': not self._stop_event.is_set(),
             'baseline_learned': self._baseline_learned,
             'stats': self.stats.copy(),
-            'access_points': ap_list,
+            'access_points': [ap.to_dict() for ap in self.access_points.values()],
             'baseline_aps': dict(self.baseline_aps),
-            'rogue_alerts': recent_alerts,
-            'educational_tip': self._get_educational_tip()
+            'rogue_alerts': [alert.to_dict() for alert in self.rogue_alerts[-10:]]
+        }
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get current detection data (the latest published snapshot)."""
+        snapshot = self.snapshots.current()
+        return {
+            **snapshot.data,
+            'monitoring': not self._stop_event.is_set(),
+            'educational_tip': self._get_educational_tip(),
+            'capture': self.capture_stats(),
+            'snapshot_version': snapshot.version
         }
     
     def requires_root(self) -> bool:
@@ -187,24 +255,33 @@ def requires_root(self) -> bool:
     
     def _monitor_aps(self):
         """Monitor AP beacons continuously."""
-        while not self._stop_event.is_set():
-            try:
-                # Sniff WiFi beacons on monitor mode interface
-                sniff(
-                    iface="wlan0mon",  # Requires monitor mode
-                    prn=self._process_beacon,
-                    store=0,
-                    timeout=1,
-                    filter="type mgt subtype beacon"
-                )
-            except Exception as e:
-                logger.error(f"AP monitoring error: {e}")
-                logger.warning("Ensure WiFi adapter is in monitor mode!")
-                time.sleep(1)
+        # Packets are analysed on the queue's worker, off the sniffer thread
+        self.start_packet_queue(self._process_beacon, "type mgt subtype beacon")
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    # Sniff WiFi beacons on the monitor mode interface
+                    # (monitor_interface, see capture_options)
+                    sniff(
+                        store=0,
+                        timeout=1,
+                        filter="type mgt subtype beacon",
+                        **self.capture_options(self._process_beacon)
+                    )
+                    self.capture_tick()
+                except Exception as e:
+                    logger.error(f"AP monitoring error: {e}")
+                    logger.warning("Ensure WiFi adapter is in monitor mode!")
+                    time.sleep(1)
+        finally:
+            self.stop_packet_queue()
     
     def _process_beacon(self, packet):
         """Process beacon frame from AP."""
+        self._capture_hub.publish(packet)
+        
         if not packet.haslayer(Dot11Beacon):
+            self.snapshots.tick()
             return
         
         self.stats['beacons_captured'] += 1
@@ -273,6 +350,8 @@ def _process_beacon(self, packet):
                 
         except Exception as e:
             logger.error(f"Error processing beacon: {e}")
+        finally:
+            self.snapshots.tick()
     
     def _detect_encryption(self, packet) -> str:
         """Detect encryption type from beacon."""
@@ -389,10 +468,12 @@ def _raise_rogue_alert(self, rogue_ap: AccessPoint, legitimate_bssid: Optional[s
             reason=reason,
             channel_diff=channel_diff,
             signal_diff=signal_diff,
-            educational_note=educational_note
+            educational_note=educational_note,
+            pcap_files=self.freeze_lookback(rogue_ap.bssid) if severity == "CRITICAL" else []
         )
         
         self.rogue_alerts.append(alert)
+        self.emit_event("rogue_ap_alert", alert)
         self.stats['rogue_aps_confirmed'] += 1
         
         logger.warning(f"🚨 ROGUE AP DETECTED: {rogue_ap.ssid} ({rogue_ap.bssid}) - {severity}")
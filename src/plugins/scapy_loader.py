@@ -0,0 +1,85 @@
+"""
+Scapy Loader - Deferred scapy import for the sniffer plugins
+
+``from scapy.all import ...`` loads every scapy layer and takes around half a
+second, which used to be paid at module import even in mock mode. Plugin
+modules now only check that scapy is installed (a cheap ``find_spec``) and
+keep their scapy names as ``None`` placeholders; ``bind_scapy()`` imports
+scapy the first time a real-mode plugin needs it and fills the names in.
+
+Each module gets its loader from ``scapy_binder()``:
+
+    SCAPY_AVAILABLE = scapy_installed()
+    _SCAPY_NAMES = ('ARP', 'sniff', 'conf')
+    ARP = sniff = conf = None
+    _load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
+
+Names that are already set (e.g. patched by tests) are left alone.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import importlib
+import importlib.util
+import logging
+from typing import Any, Callable, Dict, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+
+def scapy_installed() -> bool:
+    """True if scapy can be imported (without importing it)."""
+    return importlib.util.find_spec("scapy") is not None
+
+
+def bind_scapy(namespace: Dict[str, Any], names: Iterable[str]) -> bool:
+    """
+    Import scapy.all and bind ``names`` into ``namespace`` (module globals).
+
+    Args:
+        namespace: ``globals()`` of the calling plugin module
+        names: scapy.all attributes the module uses
+
+    Returns:
+        True if every name is bound
+    """
+    missing = [name for name in names if namespace.get(name) is None]
+    if not missing:
+        return True
+
+    try:
+        scapy_all = importlib.import_module("scapy.all")
+    except (ImportError, OSError) as e:
+        logger.error(f"Scapy import failed: {e}. Install with: pip install scapy")
+        return False
+
+    scapy_all.conf.verb = 0  # Suppress scapy verbosity
+    for name in missing:
+        namespace[name] = getattr(scapy_all, name)
+    return True
+
+
+def scapy_binder(namespace: Dict[str, Any], names: Iterable[str]) -> Callable[[], bool]:
+    """
+    Loader binding ``names`` into a plugin module on first real-mode use.
+
+    The loader follows the module's ``SCAPY_AVAILABLE`` flag: it imports
+    nothing while the flag is False, and clears it if the import fails.
+
+    Args:
+        namespace: ``globals()`` of the calling plugin module
+        names: scapy.all attributes the module uses
+
+    Returns:
+        ``_load_scapy()``: True if scapy is usable
+    """
+    names = tuple(names)
+
+    def load() -> bool:
+        available = bool(namespace.get('SCAPY_AVAILABLE', True)) and bind_scapy(namespace, names)
+        namespace['SCAPY_AVAILABLE'] = available
+        return available
+
+    return load
@@ -0,0 +1,218 @@
+"""
+Shared-memory frame ring - capture process -> analysis worker hand-off
+
+A single-producer/single-consumer ring of raw frames in a
+``multiprocessing.shared_memory`` block, so frames reach a worker process
+without pickling or a pipe write per packet. The block starts with a
+64-byte header of 8-byte counters:
+
+    head, dropped, written, high_water   (written by the producer)
+    tail, read                           (written by the consumer)
+
+``head``/``tail`` are byte positions that only grow; a record lives at
+``position % capacity``. Records are 8-byte aligned and never split: one
+that doesn't fit before the end of the block leaves a wrap marker and
+starts at offset 0. The producer publishes ``head`` only after the record
+is written, and the consumer publishes ``tail`` only after copying it out.
+A full ring drops the arriving frame (counted in ``dropped``).
+
+``frame_flow_hash()`` shards raw Ethernet frames without dissecting them:
+both directions of a TCP/UDP conversation hash alike, so each flow (a DNS
+query and its answer, an HTTP request) is analysed by one worker.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import struct
+import zlib
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RING_BYTES = 4 * 1024 * 1024
+
+HEADER_SIZE = 64
+_HEAD, _DROPPED, _WRITTEN, _HIGH_WATER, _TAIL, _READ = 0, 8, 16, 24, 32, 40
+_COUNTER = struct.Struct("<Q")
+
+# Record: length, reserved, timestamp, then the frame padded to 8 bytes
+_RECORD = struct.Struct("<IId")
+_WRAP = 0xFFFFFFFF
+
+# Ethernet
+_VLAN_TYPES = (b"\x81\x00", b"\x88\xa8")
+_IPV4 = b"\x08\x00"
+_IPV6 = b"\x86\xdd"
+_PORT_PROTOCOLS = (6, 17)  # TCP, UDP
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def frame_flow_hash(frame: bytes) -> int:
+    """
+    Symmetric flow hash of a raw Ethernet frame (0 for non-IP frames).
+
+    Hashes protocol, addresses and TCP/UDP ports with the two endpoints
+    sorted; IPv4 fragments hash without ports so they follow their flow's
+    addresses rather than scatter.
+    """
+    offset = 12
+    ethertype = frame[offset:offset + 2]
+    while ethertype in _VLAN_TYPES:
+        offset += 4
+        ethertype = frame[offset:offset + 2]
+    l3 = offset + 2
+
+    if ethertype == _IPV4 and len(frame) >= l3 + 20:
+        proto = frame[l3 + 9]
+        src, dst = frame[l3 + 12:l3 + 16], frame[l3 + 16:l3 + 20]
+        l4 = l3 + (frame[l3] & 0x0F) * 4
+        fragmented = (frame[l3 + 6] & 0x3F) or frame[l3 + 7]  # MF flag or fragment offset
+    elif ethertype == _IPV6 and len(frame) >= l3 + 40:
+        proto = frame[l3 + 6]
+        src, dst = frame[l3 + 8:l3 + 24], frame[l3 + 24:l3 + 40]
+        l4 = l3 + 40
+        fragmented = False
+    else:
+        return 0
+
+    a, b = src, dst
+    if proto in _PORT_PROTOCOLS and not fragmented and len(frame) >= l4 + 4:
+        a += frame[l4:l4 + 2]
+        b += frame[l4 + 2:l4 + 4]
+    if b < a:
+        a, b = b, a
+    return zlib.crc32(a + b + bytes((proto,)))
+
+
+class ShmRing:
+    """
+    SPSC frame ring in shared memory.
+
+    Create it in the parent (``ShmRing(size)``), open it in the producer and
+    consumer processes with ``ShmRing.attach(name)``, and ``unlink()`` it
+    from the parent when both are done.
+
+    Args:
+        size: Data capacity in bytes (rounded up to a multiple of 8)
+        name: Existing block to attach to instead of creating one
+    """
+
+    def __init__(self, size: int = DEFAULT_RING_BYTES, name: Optional[str] = None):
+        if name is None:
+            capacity = _align(size)
+            if capacity < 2 * _RECORD.size:
+                raise ValueError("Ring too small")
+            self._shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity)
+            self._shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+            self.capacity = capacity
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self.capacity = _align(size)
+        self.name = self._shm.name
+        self._buf = self._shm.buf
+        self._data = self._buf[HEADER_SIZE:HEADER_SIZE + self.capacity]
+
+    @classmethod
+    def attach(cls, name: str, size: int) -> 'ShmRing':
+        """Open the ring ``name`` created elsewhere with ``size``."""
+        return cls(size, name=name)
+
+    def _load(self, field: int) -> int:
+        return _COUNTER.unpack_from(self._buf, field)[0]
+
+    def _store(self, field: int, value: int) -> None:
+        _COUNTER.pack_into(self._buf, field, value)
+
+    # Producer
+
+    def put(self, frame: bytes, ts: float = 0.0) -> bool:
+        """
+        Append ``frame``; never blocks.
+
+        Returns:
+            False if the ring was full and the frame was dropped
+        """
+        head = self._load(_HEAD)
+        tail = self._load(_TAIL)
+        capacity = self.capacity
+        record = _align(_RECORD.size + len(frame))
+        position = head % capacity
+        skip = capacity - position if capacity - position < record else 0
+        if record > capacity or head + skip + record - tail > capacity:
+            self._store(_DROPPED, self._load(_DROPPED) + 1)
+            return False
+
+        data = self._data
+        if skip:
+            struct.pack_into("<I", data, position, _WRAP)
+            position = 0
+        _RECORD.pack_into(data, position, len(frame), 0, ts)
+        start = position + _RECORD.size
+        data[start:start + len(frame)] = frame
+
+        head += skip + record
+        self._store(_HEAD, head)
+        self._store(_WRITTEN, self._load(_WRITTEN) + 1)
+        used = head - tail
+        if used > self._load(_HIGH_WATER):
+            self._store(_HIGH_WATER, used)
+        return True
+
+    # Consumer
+
+    def get_batch(self, max_frames: int = 256) -> List[Tuple[bytes, float]]:
+        """Take up to ``max_frames`` (frame, ts) pairs, oldest first."""
+        head = self._load(_HEAD)
+        tail = self._load(_TAIL)
+        if tail == head:
+            return []
+        capacity = self.capacity
+        data = self._data
+        frames = []
+        while tail < head and len(frames) < max_frames:
+            position = tail % capacity
+            if capacity - position < _RECORD.size or \
+                    struct.unpack_from("<I", data, position)[0] == _WRAP:
+                tail += capacity - position
+                continue
+            length, _, ts = _RECORD.unpack_from(data, position)
+            start = position + _RECORD.size
+            frames.append((bytes(data[start:start + length]), ts))
+            tail += _align(_RECORD.size + length)
+        self._store(_TAIL, tail)
+        self._store(_READ, self._load(_READ) + len(frames))
+        return frames
+
+    # Reporting
+
+    def stats(self) -> Dict[str, int]:
+        """Frames written/read/dropped and bytes pending, high water and capacity."""
+        return {
+            'written': self._load(_WRITTEN),
+            'read': self._load(_READ),
+            'dropped': self._load(_DROPPED),
+            'depth_bytes': self._load(_HEAD) - self._load(_TAIL),
+            'high_water_bytes': self._load(_HIGH_WATER),
+            'capacity_bytes': self.capacity
+        }
+
+    def close(self) -> None:
+        """Detach this process from the block."""
+        self._data.release()
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Free the block (creator only, after every process closed it)."""
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
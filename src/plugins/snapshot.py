@@ -0,0 +1,231 @@
+"""
+Snapshots - Copy-on-write plugin state for lock-free readers
+
+Stateful plugins (device tables, AP lists, DNS counters) are mutated on
+every packet by their capture thread while the UI thread renders them.
+Iterating those dicts from the UI risks "dictionary changed size during
+iteration" and half-updated entries, and locking the per-packet path would
+cost throughput.
+
+Instead the writer thread publishes its state: every ``interval`` seconds
+it builds an immutable ``Snapshot`` (fresh dicts and lists, never touched
+again) and swaps it in with a single reference assignment, which is atomic
+in CPython. Readers take whichever snapshot is current, so readers never
+block writers and writers never wait for readers. Each snapshot carries a
+version number that grows by one per publish.
+
+While no writer thread is running (plugin stopped, tests, replay) there is
+nothing to race with, and readers publish on demand so they always see the
+latest state.
+
+Durable state (what ``Plugin.get_state()`` persists) is built alongside the
+data, so the metrics store's flush thread reads a published copy too
+instead of iterating live containers.
+
+Changes since a version: the publisher keeps the last ``history``
+snapshots, so a reader that already holds version N can ask for what
+changed since (``Plugin.get_changes(N)``) instead of the full state. Entity
+tables - lists of records with an id field, declared in the plugin's
+``snapshot_entities`` - travel as added/updated/removed records; the other
+(small) fields are sent whole. Unknown or expired versions get the full
+data. A delta looks like:
+
+    {"full": False, "since": 41, "version": 45,
+     "keys": {"devices": "ip"},
+     "changes": {"devices": {"added": [...], "updated": [...], "removed": ["10.0.0.9"]}},
+     "data": {...every non-entity field...}}
+
+and ``apply_changes()`` turns the reader's copy at ``since`` into the full
+data at ``version``.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SNAPSHOT_MS = 250  # Publish cadence of a running writer
+DEFAULT_SNAPSHOT_HISTORY = 64  # Snapshots kept for get_changes() (16 s at 250 ms)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Published plugin state.
+
+    ``data`` is read-only at the top level; the values inside it were built
+    for this snapshot alone and must be treated as read-only too. ``state``
+    is the plugin's durable state at the same moment (None if it has none).
+    """
+    version: int
+    timestamp: float
+    data: Mapping[str, Any]
+    state: Optional[Mapping[str, Any]] = None
+
+
+class SnapshotPublisher:
+    """
+    Builds and publishes a plugin's snapshots.
+
+    Args:
+        build: Returns a fresh dict of the plugin's state (called by writers)
+        interval: Seconds between publishes while a writer is live
+        history: Recent snapshots kept for get()
+        clock: Monotonic clock in seconds (tests)
+        build_state: Returns a fresh dict of the durable state, or None
+            (optional, called with ``build``)
+    """
+
+    def __init__(self, build: Callable[[], Dict[str, Any]],
+                 interval: float = DEFAULT_SNAPSHOT_MS / 1000,
+                 history: int = DEFAULT_SNAPSHOT_HISTORY,
+                 clock: Callable[[], float] = time.monotonic,
+                 build_state: Optional[Callable[[], Optional[Dict[str, Any]]]] = None):
+        self._build = build
+        self._build_state = build_state
+        self.interval = interval
+        self._clock = clock
+        self._current: Optional[Snapshot] = None
+        self._history: Deque[Snapshot] = deque(maxlen=max(1, history))
+        self._next_due = 0.0
+        # Serialises writers (capture and housekeeping threads); readers never take it
+        self._lock = threading.Lock()
+        # A writer thread is running: readers must not build snapshots themselves
+        self.live = False
+        self.stats = {
+            'published': 0,
+            'build_seconds': 0.0
+        }
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot (0 before the first publish)."""
+        snapshot = self._current
+        return snapshot.version if snapshot is not None else 0
+
+    def publish(self) -> Snapshot:
+        """Build a snapshot of the current state and swap it in."""
+        with self._lock:
+            start = time.perf_counter()
+            data = MappingProxyType(self._build())
+            state = self._build_state() if self._build_state else None
+            if state is not None:
+                state = MappingProxyType(state)
+            snapshot = Snapshot(self.version + 1, time.time(), data, state)
+            self._history.append(snapshot)
+            self._current = snapshot
+            self._next_due = self._clock() + self.interval
+            self.stats['published'] += 1
+            self.stats['build_seconds'] += time.perf_counter() - start
+        return snapshot
+
+    def get(self, version: int) -> Optional[Snapshot]:
+        """Snapshot ``version`` if it is still in the history, else None."""
+        history = self._history
+        try:
+            # Versions are consecutive: index instead of iterating, which a
+            # concurrent append would break
+            snapshot = history[version - history[0].version]
+        except IndexError:
+            return None
+        return snapshot if snapshot.version == version else None
+
+    def tick(self) -> None:
+        """Writer side, per packet: publish if the interval has elapsed."""
+        if self.live and self._clock() >= self._next_due:
+            self.publish()
+
+    def start(self) -> None:
+        """A writer thread is about to run: publish its starting state."""
+        self.publish()
+        self.live = True
+
+    def stop(self) -> None:
+        """The writer thread stopped; readers publish on demand again."""
+        self.live = False
+
+    def current(self) -> Snapshot:
+        """Latest snapshot (published now if no writer is running)."""
+        snapshot = self._current
+        if snapshot is None or not self.live:
+            snapshot = self.publish()
+        return snapshot
+
+
+def diff_entities(old: Mapping[str, Any], new: Mapping[str, Any],
+                  keys: Mapping[str, str]) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Added, updated and removed records of each entity table.
+
+    Args:
+        old: Data the reader holds
+        new: Current data
+        keys: {table: id field}
+
+    Returns:
+        {table: {'added': [records], 'updated': [records], 'removed': [ids]}}
+    """
+    changes = {}
+    for table, key in keys.items():
+        before = {record[key]: record for record in old.get(table) or ()}
+        added, updated = [], []
+        for record in new.get(table) or ():
+            previous = before.pop(record[key], None)
+            if previous is None:
+                added.append(record)
+            elif previous is not record and previous != record:
+                updated.append(record)
+        changes[table] = {'added': added, 'updated': updated, 'removed': list(before)}
+    return changes
+
+
+def make_changes(old: Mapping[str, Any], new: Mapping[str, Any], keys: Mapping[str, str],
+                 since: int, version: int) -> Dict[str, Any]:
+    """Delta from ``old`` (version ``since``) to ``new`` (``version``)."""
+    return {
+        'full': False,
+        'since': since,
+        'version': version,
+        'keys': dict(keys),
+        'changes': diff_entities(old, new, keys),
+        'data': {name: value for name, value in new.items() if name not in keys}
+    }
+
+
+def full_changes(data: Mapping[str, Any], version: int) -> Dict[str, Any]:
+    """Fallback delta carrying the whole data."""
+    return {'full': True, 'version': version, 'data': dict(data)}
+
+
+def apply_changes(data: Mapping[str, Any], changes: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Full data after ``changes`` (from make_changes()/full_changes()).
+
+    ``data`` is left untouched: the result is a new dict with new tables.
+    Updated records keep their position, added ones are appended.
+    """
+    if changes.get('full'):
+        return dict(changes['data'])
+    result = dict(data)
+    result.update(changes['data'])
+    for table, key in changes['keys'].items():
+        delta = changes['changes'][table]
+        records = {record[key]: record for record in data.get(table) or ()}
+        for record_id in delta['removed']:
+            records.pop(record_id, None)
+        for record in delta['updated']:
+            records[record[key]] = record
+        for record in delta['added']:
+            records[record[key]] = record
+        result[table] = list(records.values())
+    return result
@@ -4,11 +4,16 @@
 Collects CPU, memory, disk, and process information from the operating system.
 Uses psutil library for cross-platform system monitoring.
 
+Metrics are collected in tiers, each at its own rate, and merged into one
+snapshot: static values once, CPU/memory on the fast tier (one per-core
+/proc/stat sample), disk and load averages on the slow tier.
+
 Author: Juan-Dev - Soli Deo Gloria ✝️
 Date: 2025-11-09
 """
 
 from typing import Dict, Any
+import time
 
 from .base import Plugin, PluginConfig, PluginStatus
 
@@ -39,6 +44,11 @@ class SystemPlugin(Plugin):
         load_avg_15m: 15-minute load average (Unix only)
         uptime_seconds: System uptime in seconds
 
+    Config options:
+        disk_path: Partition to report (default '/')
+        fast_interval: Seconds between CPU/memory samples (default rate_ms)
+        slow_interval: Seconds between disk/load samples (default 5.0)
+
     Example:
         >>> config = PluginConfig(name="system", rate_ms=1000)
         >>> plugin = SystemPlugin(config)
@@ -98,11 +108,39 @@ def initialize(self) -> None:
             # Windows or other platforms without load averages
             self._has_load_avg = False
 
+        # Static tier: never changes while we run
+        self._static = {
+            "cpu_count": self.psutil.cpu_count(),
+        }
+        self._boot_time = self.psutil.boot_time()
+
+        # Fast and slow tiers are cached until their interval elapses
+        self._set_tier_intervals()
+        self._fast: Dict[str, Any] = {}
+        self._slow: Dict[str, Any] = {}
+        self._next_fast = 0.0
+        self._next_slow = 0.0
+
         # Initialize CPU percent (first call returns 0.0)
-        self.psutil.cpu_percent(interval=None)
+        self.psutil.cpu_percent(interval=None, percpu=True)
 
         self._status = PluginStatus.READY
 
+    def _set_tier_intervals(self) -> None:
+        """Fast tier at rate_ms unless ``fast_interval`` is set; slow tier every 5 s."""
+        self._fast_interval = self.config.config.get('fast_interval', self.config.rate_ms / 1000)
+        self._slow_interval = self.config.config.get('slow_interval', 5.0)
+
+    def reconfigure(self, rate_ms: int, settings: Dict[str, Any]) -> None:
+        """New rate and settings; the cached tiers refresh at the new intervals."""
+        super().reconfigure(rate_ms, settings)
+        if not hasattr(self, '_fast_interval'):
+            return  # Mock mode or not initialized yet
+        self._set_tier_intervals()
+        now = time.monotonic()
+        self._next_fast = min(self._next_fast, now + self._fast_interval)
+        self._next_slow = min(self._next_slow, now + self._slow_interval)
+
     def collect_data(self) -> Dict[str, Any]:
         """
         Collect system metrics.
@@ -121,41 +159,60 @@ def collect_data(self) -> Dict[str, Any]:
         if self._mock_mode:
             return self._mock_generator.get_system_metrics()
 
-        # Real mode: CPU metrics
-        cpu_percent = self.psutil.cpu_percent(interval=None)
+        # Real mode: refresh whichever tiers are due
+        now = time.monotonic()
+        if now >= self._next_fast:
+            self._fast = self._collect_fast()
+            self._next_fast = now + self._fast_interval
+        if now >= self._next_slow:
+            self._slow = self._collect_slow()
+            self._next_slow = now + self._slow_interval
+
+        data = {
+            **self._fast,
+            **self._static,
+            **self._slow,
+            "uptime_seconds": time.time() - self._boot_time,
+        }
+
+        return data
+
+    def _collect_fast(self) -> Dict[str, Any]:
+        """
+        CPU and memory tier.
+
+        One per-core sample (a single /proc/stat read); the overall figure is
+        its mean, since every core accrues the same wall-clock time.
+        """
         cpu_percent_per_core = self.psutil.cpu_percent(interval=None, percpu=True)
-        cpu_count = self.psutil.cpu_count()
+        cpu_percent = (
+            sum(cpu_percent_per_core) / len(cpu_percent_per_core)
+            if cpu_percent_per_core else 0.0
+        )
 
         # Memory metrics
         memory = self.psutil.virtual_memory()
-        memory_percent = memory.percent
         memory_used_mb = memory.used / (1024 ** 2)  # bytes to MB
         memory_total_mb = memory.total / (1024 ** 2)
 
-        # Disk metrics
-        disk = self.psutil.disk_usage(self._disk_path)
-        disk_percent = disk.percent
-        disk_used_gb = disk.used / (1024 ** 3)  # bytes to GB
-        disk_total_gb = disk.total / (1024 ** 3)
-
-        # Boot time and uptime
-        import time
-        boot_time = self.psutil.boot_time()
-        uptime_seconds = time.time() - boot_time
-
-        data = {
+        return {
             "cpu_percent": cpu_percent,
             "cpu_percent_per_core": cpu_percent_per_core,
-            "cpu_count": cpu_count,
-            "memory_percent": memory_percent,
+            "memory_percent": memory.percent,
             "memory_used_mb": memory_used_mb,
             "memory_total_mb": memory_total_mb,
             "ram_used_gb": memory_used_mb / 1024,  # MB to GB
             "ram_total_gb": memory_total_mb / 1024,  # MB to GB
-            "disk_percent": disk_percent,
-            "disk_used_gb": disk_used_gb,
-            "disk_total_gb": disk_total_gb,
-            "uptime_seconds": uptime_seconds,
+        }
+
+    def _collect_slow(self) -> Dict[str, Any]:
+        """Disk and load average tier."""
+        disk = self.psutil.disk_usage(self._disk_path)
+
+        data = {
+            "disk_percent": disk.percent,
+            "disk_used_gb": disk.used / (1024 ** 3),  # bytes to GB
+            "disk_total_gb": disk.total / (1024 ** 3),
         }
 
         # Add load averages if available (Unix only)
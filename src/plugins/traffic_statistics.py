@@ -12,23 +12,30 @@
 import threading
 import time
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from collections import defaultdict
 
-try:
-    from scapy.all import sniff, IP, TCP, UDP, conf
-    conf.verb = 0
-    SCAPY_AVAILABLE = True
-except ImportError:
-    SCAPY_AVAILABLE = False
+from .scapy_loader import scapy_binder, scapy_installed
+
+SCAPY_AVAILABLE = scapy_installed()
+
+# scapy names, bound by _load_scapy() on first real-mode use
+_SCAPY_NAMES = ('sniff', 'IP', 'TCP', 'UDP', 'conf')
+sniff = IP = TCP = UDP = conf = None
 
 from .base import Plugin, PluginConfig
+from .capture_hub import get_capture_hub
+from .packet_sampler import PacketSampler
 
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+# Imports scapy and binds _SCAPY_NAMES (clears SCAPY_AVAILABLE on failure)
+_load_scapy = scapy_binder(globals(), _SCAPY_NAMES)
+
+
+@dataclass(slots=True)
 class DeviceStats:
     """Statistics for a single device."""
     mac: str
@@ -43,7 +50,19 @@ class DeviceStats:
     last_seen: float
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        """Shallow copy (protocols copied: mutated in place)."""
+        return {
+            'mac': self.mac,
+            'ip': self.ip,
+            'hostname': self.hostname,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'packets_sent': self.packets_sent,
+            'packets_received': self.packets_received,
+            'protocols': dict(self.protocols),
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen
+        }
     
     @property
     def total_bytes(self) -> int:
@@ -56,7 +75,7 @@ def total_packets(self) -> int:
         return self.packets_sent + self.packets_received
 
 
-@dataclass
+@dataclass(slots=True)
 class TrafficAlert:
     """Alert for unusual traffic patterns."""
     device_ip: str
@@ -67,7 +86,14 @@ class TrafficAlert:
     timestamp: float
     
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        return {
+            'device_ip': self.device_ip,
+            'alert_type': self.alert_type,
+            'description': self.description,
+            'value': self.value,
+            'threshold': self.threshold,
+            'timestamp': self.timestamp
+        }
 
 
 class TrafficStatistics(Plugin):
@@ -80,7 +106,12 @@ class TrafficStatistics(Plugin):
     - Traffic pattern detection
     - Bandwidth usage alerts
     - Historical data tracking
+    - Per-interface totals when capturing on several interfaces
     """
+
+    packet_handlers = ("_process_packet",)
+    capture_filter = "ip"
+    snapshot_entities = {'devices': 'ip'}
     
     def __init__(self, config: PluginConfig):
         super().__init__(config)
@@ -102,6 +133,9 @@ def __init__(self, config: PluginConfig):
         self._stop_event = threading.Event()
         self._monitor_thread: Optional[threading.Thread] = None
         
+        # Captured packets are shared with other plugins (e.g. topology)
+        self._capture_hub = get_capture_hub()
+        
         # Global statistics
         self.global_stats = {
             'total_bytes': 0,
@@ -109,6 +143,18 @@ def __init__(self, config: PluginConfig):
             'start_time': time.time(),
             'protocols': defaultdict(int)
         }
+
+        # The same totals per capture interface ({iface: {...}}), for
+        # packets sniffed on several interfaces (tagged ``sniffed_on``)
+        self.interface_stats: Dict[str, Dict[str, Any]] = {}
+
+        # Optional sampling of the volume counters (sampling_mode in config);
+        # totals are then scaled estimates
+        self.sampler = PacketSampler.from_config(self.config.config)
+
+        # Real mode: import scapy before any capture or packet handling
+        if not self.config.config.get('mock_mode', False):
+            _load_scapy()
     
     def initialize(self) -> None:
         """Initialize plugin."""
@@ -127,35 +173,135 @@ def start(self):
         logger.info("Starting Traffic Statistics Monitor...")
         self._stop_event.clear()
         self.global_stats['start_time'] = time.time()
+        self.snapshots.start()
         
         # Start monitoring thread
         self._monitor_thread = threading.Thread(target=self._monitor_traffic, daemon=True)
+        self._capture_hub.add_publisher(self.config.name, self.capture_filter)
         self._monitor_thread.start()
     
     def stop(self):
         """Stop traffic monitoring."""
         logger.info("Stopping Traffic Statistics Monitor...")
         self._stop_event.set()
+        self._capture_hub.remove_publisher(self.config.name)
         if self._monitor_thread:
             self._monitor_thread.join(timeout=2.0)
+        self.snapshots.stop()
     
-    def get_data(self) -> Dict[str, Any]:
-        """Get current statistics."""
-        uptime = time.time() - self.global_stats['start_time']
-        
+    def cleanup(self) -> None:
+        """Cleanup resources."""
+        self.stop()
+
+    def build_state(self) -> Dict[str, Any]:
+        """Device totals and protocol counters (persisted across restarts)."""
+        return {
+            'devices': [dev.to_dict() for dev in self.devices.values()],
+            'ip_to_mac': dict(self.ip_to_mac),
+            'total_bytes': self.global_stats['total_bytes'],
+            'total_packets': self.global_stats['total_packets'],
+            'protocols': dict(self.global_stats['protocols'])
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        """Restore totals saved by build_state()."""
+        self.devices = {dev['ip']: DeviceStats(**dev) for dev in state.get('devices', [])}
+        self.ip_to_mac = dict(state.get('ip_to_mac', {}))
+        self.global_stats['total_bytes'] = state.get('total_bytes', 0)
+        self.global_stats['total_packets'] = state.get('total_packets', 0)
+        self.global_stats['protocols'] = defaultdict(int, state.get('protocols', {}))
+
+    def reconfigure(self, rate_ms: int, settings: Dict[str, Any]) -> None:
+        """New rate and settings; the sampler follows a changed CPU budget."""
+        super().reconfigure(rate_ms, settings)
+        self.sampler.update(settings)
+
+    def take_partial(self) -> Optional[Dict[str, Any]]:
+        """Totals, per-device deltas and alerts since the last call (worker mode)."""
+        if not self.global_stats['total_packets']:
+            return None
+        devices = {}
+        for ip, dev in self.devices.items():
+            if dev.total_packets:
+                devices[ip] = dev.to_dict()
+                dev.bytes_sent = dev.bytes_received = 0
+                dev.packets_sent = dev.packets_received = 0
+                dev.protocols = {}
+        partial = {
+            'total_bytes': self.global_stats['total_bytes'],
+            'total_packets': self.global_stats['total_packets'],
+            'protocols': dict(self.global_stats['protocols']),
+            'devices': devices,
+            'alerts': [a.to_dict() for a in self.alerts],
+            'sampling': self.sampler.take_partial() if self.sampler.enabled else None
+        }
+        self.global_stats['total_bytes'] = 0
+        self.global_stats['total_packets'] = 0
+        self.global_stats['protocols'] = defaultdict(int)
+        self.alerts = []
+        return partial
+
+    def merge_partial(self, partial: Dict[str, Any]) -> None:
+        """Add a worker's take_partial()."""
+        self.global_stats['total_bytes'] += partial['total_bytes']
+        self.global_stats['total_packets'] += partial['total_packets']
+        for protocol, count in partial['protocols'].items():
+            self.global_stats['protocols'][protocol] += count
+
+        for ip, delta in partial['devices'].items():
+            if ip not in self.devices:
+                self.register_device(ip, delta['mac'], delta['hostname'])
+            device = self.devices[ip]
+            device.bytes_sent += delta['bytes_sent']
+            device.bytes_received += delta['bytes_received']
+            device.packets_sent += delta['packets_sent']
+            device.packets_received += delta['packets_received']
+            for protocol, count in delta['protocols'].items():
+                device.protocols[protocol] = device.protocols.get(protocol, 0) + count
+            device.last_seen = max(device.last_seen, delta['last_seen'])
+
+        self.alerts.extend(TrafficAlert(**record) for record in partial['alerts'])
+        self.alerts = self.alerts[-self.max_entries:]
+
+        if partial.get('sampling'):
+            self.sampler.merge_partial(partial['sampling'])
+    
+    def build_snapshot(self) -> Dict[str, Any]:
+        """Devices, totals, alerts and top talkers (capture thread side)."""
         return {
-            'monitoring': not self._stop_event.is_set(),
-            'uptime': uptime,
             'device_count': len(self.devices),
             'devices': [dev.to_dict() for dev in self.devices.values()],
             'global_stats': {
                 'total_bytes': self.global_stats['total_bytes'],
                 'total_packets': self.global_stats['total_packets'],
-                'protocols': dict(self.global_stats['protocols']),
-                'bandwidth_mbps': self._calculate_bandwidth(uptime)
+                'protocols': dict(self.global_stats['protocols'])
+            },
+            'interfaces': {
+                iface: {**stats, 'protocols': dict(stats['protocols'])}
+                for iface, stats in self.interface_stats.items()
             },
             'alerts': [a.to_dict() for a in self.alerts[-10:]],
-            'top_talkers': self._get_top_talkers(5)
+            'top_talkers': self._get_top_talkers(5),
+            'sampling': self.sampler.snapshot() if self.sampler.enabled else None
+        }
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get current statistics (the latest published snapshot)."""
+        snapshot = self.snapshots.current()
+        data = snapshot.data
+        uptime = time.time() - self.global_stats['start_time']
+        global_stats = data['global_stats']
+        
+        return {
+            **data,
+            'monitoring': not self._stop_event.is_set(),
+            'uptime': uptime,
+            'global_stats': {
+                **global_stats,
+                'bandwidth_mbps': self._calculate_bandwidth(uptime, global_stats['total_bytes'])
+            },
+            'capture': self.capture_stats(),
+            'snapshot_version': snapshot.version
         }
     
     def requires_root(self) -> bool:
@@ -182,21 +328,40 @@ def register_device(self, ip: str, mac: str, hostname: str = "Unknown"):
     
     def _monitor_traffic(self):
         """Monitor network traffic continuously."""
-        while not self._stop_event.is_set():
-            try:
-                # Sniff packets in batches
-                sniff(
-                    prn=self._process_packet,
-                    store=0,
-                    timeout=1,
-                    filter="ip"  # Only IP packets
-                )
-            except Exception as e:
-                logger.error(f"Traffic monitoring error: {e}")
-                time.sleep(1)
+        # Packets are analysed on the queue's worker, off the sniffer thread
+        self.start_packet_queue(self._process_packet, self.capture_filter)
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    # Sniff packets in batches
+                    sniff(
+                        store=0,
+                        timeout=1,
+                        filter=self.capture_filter,  # Only IP packets
+                        **self.capture_options(self._process_packet)
+                    )
+                    self.capture_tick()
+                except Exception as e:
+                    logger.error(f"Traffic monitoring error: {e}")
+                    time.sleep(1)
+        finally:
+            self.stop_packet_queue()
     
     def _process_packet(self, packet):
         """Process individual packet."""
+        self._capture_hub.publish(packet)
+        try:
+            weight = self.sampler.admit(packet)
+            if not weight:
+                return
+            start = time.perf_counter()
+            self._count_packet(packet, weight)
+            self.sampler.charge(time.perf_counter() - start)
+        finally:
+            self.snapshots.tick()
+
+    def _count_packet(self, packet, weight: int):
+        """Add a packet to the counters, scaled by its sampling weight."""
         if not packet.haslayer(IP):
             return
         
@@ -209,33 +374,53 @@ def _process_packet(self, packet):
         protocol = self._get_protocol(packet)
         
         # Update global stats
-        self.global_stats['total_packets'] += 1
-        self.global_stats['total_bytes'] += packet_size
-        self.global_stats['protocols'][protocol] += 1
+        self.global_stats['total_packets'] += weight
+        self.global_stats['total_bytes'] += packet_size * weight
+        self.global_stats['protocols'][protocol] += weight
+
+        iface = getattr(packet, 'sniffed_on', None)
+        if iface:
+            per_iface = self.interface_stats.get(iface)
+            if per_iface is None:
+                per_iface = self.interface_stats[iface] = {
+                    'total_bytes': 0, 'total_packets': 0, 'protocols': defaultdict(int)
+                }
+            per_iface['total_packets'] += weight
+            per_iface['total_bytes'] += packet_size * weight
+            per_iface['protocols'][protocol] += weight
+
+        sampler = self.sampler
+        if sampler.enabled:
+            sampler.observe('packets', 1, weight)
+            sampler.observe('bytes', packet_size, weight)
+            sampler.observe(f'protocol:{protocol}', 1, weight)
         
         # Update source device
         if src_ip in self.devices:
-            self._update_device_stats(src_ip, packet_size, protocol, is_sent=True)
+            self._update_device_stats(src_ip, packet_size, protocol, is_sent=True, weight=weight)
         
         # Update destination device
         if dst_ip in self.devices:
-            self._update_device_stats(dst_ip, packet_size, protocol, is_sent=False)
+            self._update_device_stats(dst_ip, packet_size, protocol, is_sent=False, weight=weight)
     
-    def _update_device_stats(self, ip: str, size: int, protocol: str, is_sent: bool):
-        """Update statistics for a device."""
+    def _update_device_stats(self, ip: str, size: int, protocol: str, is_sent: bool, weight: int = 1):
+        """Update statistics for a device (``weight``: sampling scale)."""
         device = self.devices[ip]
         
         if is_sent:
-            device.bytes_sent += size
-            device.packets_sent += 1
+            device.bytes_sent += size * weight
+            device.packets_sent += weight
         else:
-            device.bytes_received += size
-            device.packets_received += 1
+            device.bytes_received += size * weight
+            device.packets_received += weight
         
         # Update protocol count
         if protocol not in device.protocols:
             device.protocols[protocol] = 0
-        device.protocols[protocol] += 1
+        device.protocols[protocol] += weight
+
+        if self.sampler.enabled:
+            self.sampler.observe(f'bytes:{ip}', size, weight)
         
         device.last_seen = time.time()
         
@@ -296,18 +481,21 @@ def _raise_alert(self, device_ip: str, alert_type: str, description: str,
         )
         
         self.alerts.append(alert)
+        self.emit_event("traffic_alert", alert)
         logger.warning(f"🚨 TRAFFIC ALERT [{alert_type}]: {description}")
         
-        # Keep only last 100 alerts
-        if len(self.alerts) > 100:
-            self.alerts = self.alerts[-100:]
+        # Keep only the last max_entries alerts
+        if len(self.alerts) > self.max_entries:
+            self.alerts = self.alerts[-self.max_entries:]
     
-    def _calculate_bandwidth(self, uptime: float) -> float:
-        """Calculate average bandwidth in Mbps."""
+    def _calculate_bandwidth(self, uptime: float, total_bytes: Optional[int] = None) -> float:
+        """Calculate average bandwidth in Mbps (of ``total_bytes``, default the live total)."""
         if uptime == 0:
             return 0.0
         
-        bytes_per_second = self.global_stats['total_bytes'] / uptime
+        if total_bytes is None:
+            total_bytes = self.global_stats['total_bytes']
+        bytes_per_second = total_bytes / uptime
         mbps = (bytes_per_second * 8) / (1024 * 1024)
         return round(mbps, 2)
     
@@ -319,7 +507,7 @@ def _get_top_talkers(self, limit: int) -> List[Dict[str, Any]]:
             reverse=True
         )
         
-        return [
+        talkers = [
             {
                 'ip': dev.ip,
                 'hostname': dev.hostname,
@@ -328,6 +516,11 @@ def _get_top_talkers(self, limit: int) -> List[Dict[str, Any]]:
             }
             for dev in sorted_devices[:limit]
         ]
+        if self.sampler.enabled:
+            # Sampled totals are estimates: add their 95% interval
+            for talker in talkers:
+                talker['total_bytes_ci'] = self.sampler.interval(f"bytes:{talker['ip']}")
+        return talkers
 
 
 class MockTrafficStatistics(Plugin):
@@ -0,0 +1,234 @@
+"""
+WiFi link monitor - background owner of WiFi link state
+
+Keeps the current link state in memory so WiFiPlugin.collect_data() never
+spawns a process on the UI timer:
+
+1. Signal level is read from /proc/net/wireless every ``signal_interval``
+   (a file read, no subprocess)
+2. Link details (SSID, BSSID, channel, bitrate, security) are fetched with
+   the plugin's collector only when a link event arrives, or every
+   ``link_refresh_interval`` as a safety net
+3. Link events come from one long-lived ``nmcli monitor`` or ``iw event``
+   process
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-09
+"""
+
+import logging
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# Fields refreshed by the fast /proc/net/wireless path
+SIGNAL_FIELDS = ('signal_strength_dbm', 'signal_strength_percent', 'link_quality')
+
+# SSID reported by WiFiPlugin._disconnected_data()
+DISCONNECTED_SSID = "Not Connected"
+
+# iw event messages that change association or channel ("scan started" etc. do not)
+IW_LINK_KEYWORDS = ('connected', 'disconnected', 'ch_switch', 'deauth', 'disassoc', 'roam')
+
+
+def parse_link_event(line: str, interface: str) -> Optional[str]:
+    """
+    Classify one line of ``nmcli monitor`` or ``iw event`` output.
+
+    Examples:
+        "wlan0: connected"                                -> 'connected'
+        "wlan0: disconnected"                             -> 'disconnected'
+        "wlan0: using connection 'Home'"                  -> 'changed'
+        "wlan0 (phy #0): connected to 38:16:5a:69:0c:f9"  -> 'connected'
+        "wlan0 (phy #0): scan started"                    -> None
+
+    Returns:
+        'connected', 'disconnected', 'changed', or None if the line does not
+        affect ``interface``'s link
+    """
+    line = line.strip()
+    if not line.startswith(interface):
+        return None
+
+    head, sep, message = line.partition(':')
+    if not sep:
+        return None
+
+    # nmcli: "wlan0: ..."; iw: "wlan0 (phy #0): ..."
+    device = head.split()[0]
+    if device != interface:
+        return None
+
+    message = message.strip().lower()
+    is_iw = '(phy' in head
+    if is_iw and not any(keyword in message for keyword in IW_LINK_KEYWORDS):
+        return None
+
+    if message.startswith('disconnected') or 'disassoc' in message or 'deauth' in message:
+        return 'disconnected'
+    if message.startswith('connected'):
+        return 'connected'
+    return 'changed'
+
+
+class WiFiLinkMonitor:
+    """
+    Background WiFi link state cache.
+
+    ``snapshot()`` only copies a dict under a lock, so it is safe to call
+    from the UI thread at any rate.
+    """
+
+    def __init__(
+        self,
+        interface: str,
+        fetch_link: Callable[[], Dict[str, Any]],
+        read_signal: Optional[Callable[[], Optional[Dict[str, Any]]]] = None,
+        event_command: Optional[List[str]] = None,
+        initial: Optional[Dict[str, Any]] = None,
+        signal_interval: float = 1.0,
+        link_refresh_interval: float = 30.0
+    ):
+        self.interface = interface
+        self.fetch_link = fetch_link
+        self.read_signal = read_signal
+        self.event_command = event_command
+        self.signal_interval = signal_interval
+        self.link_refresh_interval = link_refresh_interval
+
+        self._state: Dict[str, Any] = dict(initial or {})
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._refresh_requested = False
+        self._thread: Optional[threading.Thread] = None
+        self._event_thread: Optional[threading.Thread] = None
+        self._process: Optional[subprocess.Popen] = None
+
+        self.stats = {
+            'link_refreshes': 0,
+            'signal_reads': 0,
+            'events': 0,
+            'errors': 0
+        }
+
+    def start(self) -> None:
+        """Start the poller and, if configured, the event reader."""
+        self._stop_event.clear()
+        self._refresh_requested = True  # Fetch link details right away
+
+        self._thread = threading.Thread(target=self._run, name="wifi-link", daemon=True)
+        self._thread.start()
+
+        if self.event_command:
+            self._event_thread = threading.Thread(
+                target=self._read_events, name="wifi-events", daemon=True
+            )
+            self._event_thread.start()
+
+    def stop(self) -> None:
+        """Stop threads and terminate the event process."""
+        self._stop_event.set()
+        self._wake.set()
+
+        process = self._process
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+        for thread in (self._thread, self._event_thread):
+            if thread is not None:
+                thread.join(timeout=2.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current link state (copy)."""
+        with self._lock:
+            return dict(self._state)
+
+    def request_refresh(self) -> None:
+        """Fetch link details on the next loop iteration."""
+        self._refresh_requested = True
+        self._wake.set()
+
+    def handle_event_line(self, line: str) -> Optional[str]:
+        """Feed one event-source line; link events trigger a refresh."""
+        event = parse_link_event(line, self.interface)
+        if event is not None:
+            self.stats['events'] += 1
+            self.request_refresh()
+        return event
+
+    def _run(self) -> None:
+        """Poll signal often, link details on demand."""
+        next_link = time.monotonic() + self.link_refresh_interval
+        while not self._stop_event.is_set():
+            if self._refresh_requested or time.monotonic() >= next_link:
+                self._refresh_requested = False
+                self._refresh_link()
+                next_link = time.monotonic() + self.link_refresh_interval
+
+            self._refresh_signal()
+
+            self._wake.wait(timeout=self.signal_interval)
+            self._wake.clear()
+
+    def _refresh_link(self) -> None:
+        try:
+            data = self.fetch_link()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.debug(f"WiFi link refresh failed: {e}")
+            return
+
+        with self._lock:
+            self._state = dict(data)
+        self.stats['link_refreshes'] += 1
+
+    def _refresh_signal(self) -> None:
+        if self.read_signal is None:
+            return
+
+        try:
+            signal = self.read_signal()
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.debug(f"WiFi signal read failed: {e}")
+            return
+
+        if not signal:
+            return  # Interface not associated; link refresh reports it
+
+        with self._lock:
+            if self._state.get('ssid') == DISCONNECTED_SSID:
+                return  # Unassociated interfaces still list a stale level
+            for field in SIGNAL_FIELDS:
+                if field in signal:
+                    self._state[field] = signal[field]
+        self.stats['signal_reads'] += 1
+
+    def _read_events(self) -> None:
+        """Read the long-lived event process line by line."""
+        try:
+            self._process = subprocess.Popen(
+                self.event_command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                bufsize=1
+            )
+        except (FileNotFoundError, OSError) as e:
+            logger.warning(f"WiFi event source unavailable ({e}); using periodic refresh")
+            return
+
+        for line in self._process.stdout:
+            if self._stop_event.is_set():
+                break
+            self.handle_event_line(line)
@@ -7,16 +7,21 @@
 2. iwconfig - fallback for older systems
 3. /proc/net/wireless - last resort for basic metrics
 
+By default the chosen method runs in the background (WiFiLinkMonitor),
+driven by link events, so collect_data() only reads cached state.
+
 Author: Juan-Dev - Soli Deo Gloria ✝️
 Date: 2025-11-09
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import subprocess
 import re
+import shutil
 from pathlib import Path
 
 from .base import Plugin, PluginConfig, PluginStatus
+from .wifi_link_monitor import WiFiLinkMonitor
 
 
 class WiFiPlugin(Plugin):
@@ -43,6 +48,13 @@ class WiFiPlugin(Plugin):
         security: Security type (WPA2, WPA3, etc.)
         interface: WiFi interface name
 
+    Config options:
+        event_driven: Collect in the background, refresh on link events
+            (default True). False polls the method on every collection.
+        signal_interval: Seconds between /proc/net/wireless reads (default 1.0)
+        link_refresh_interval: Seconds between link detail refreshes when no
+            event arrives (default 30)
+
     Example:
         >>> config = PluginConfig(name="wifi", rate_ms=500)
         >>> plugin = WiFiPlugin(config)
@@ -105,6 +117,38 @@ def initialize(self) -> None:
         self._status = PluginStatus.READY
         self._unavailable_reason = None
 
+        self._link_monitor = None
+        if self.config.config.get('event_driven', True):
+            self._start_link_monitor()
+
+    def _start_link_monitor(self) -> None:
+        """Move collection off the caller's thread into WiFiLinkMonitor."""
+        collectors = {
+            'nmcli': self._collect_nmcli,
+            'iwconfig': self._collect_iwconfig,
+            'proc': self._collect_proc,
+        }
+        read_signal = self._read_proc_signal if self._has_proc_wireless() else None
+
+        self._link_monitor = WiFiLinkMonitor(
+            interface=self._interface,
+            fetch_link=collectors[self._method],
+            read_signal=read_signal,
+            event_command=self._event_command(),
+            initial=self._disconnected_data(),
+            signal_interval=self.config.config.get('signal_interval', 1.0),
+            link_refresh_interval=self.config.config.get('link_refresh_interval', 30.0)
+        )
+        self._link_monitor.start()
+
+    def _event_command(self) -> Optional[List[str]]:
+        """Long-lived link event source: nmcli monitor, else iw event."""
+        if self._method == 'nmcli':
+            return ['nmcli', 'monitor']
+        if shutil.which('iw'):
+            return ['iw', 'event']
+        return None
+
     def collect_data(self) -> Dict[str, Any]:
         """
         Collect WiFi metrics with graceful degradation.
@@ -125,7 +169,9 @@ def collect_data(self) -> Dict[str, Any]:
 
         # Real mode: collect from system
         try:
-            if self._method == 'nmcli':
+            if getattr(self, '_link_monitor', None) is not None:
+                return self._link_monitor.snapshot()
+            elif self._method == 'nmcli':
                 return self._collect_nmcli()
             elif self._method == 'iwconfig':
                 return self._collect_iwconfig()
@@ -235,10 +281,7 @@ def _collect_nmcli(self) -> Dict[str, Any]:
         Collect WiFi data using nmcli.
 
         NetworkManager provides comprehensive WiFi information.
-        Strategy: Parse BSSID by rejoining split colon-separated hex parts.
-        The asterisk (*) in IN-USE column marks the currently connected network.
-        
-        Research: nmcli doesn't support --escape in all versions, so we rejoin BSSID parts.
+        See _parse_nmcli() for the output format.
         """
         try:
             # Get WiFi list with IN-USE marker for active connection
@@ -251,79 +294,95 @@ def _collect_nmcli(self) -> Dict[str, Any]:
                 timeout=5
             )
 
-            # Parse output and find line starting with '*' (active connection)
-            # Format: "IN-USE:SSID:BSSID_P1:\:BSSID_P2:\:...:CHAN:FREQ:SIGNAL:SECURITY:RATE"
-            # BSSID has colons that split() breaks into 6 parts
-            # Example: "*:Maximus:38\:16\:5A\:69\:0C\:F9:44:5220 MHz:71:WPA2 WPA3:270 Mbit/s"
-            # After split: ['*', 'Maximus', '38\\', '16\\', '5A\\', '69\\', '0C\\', 'F9', '44', '5220 MHz', '71', 'WPA2 WPA3', '270 Mbit/s']
-            for line in result.stdout.splitlines():
-                if not line or not line.strip():
-                    continue
-                
-                # Check if this line has '*' at start (active connection)
-                if line.startswith('*'):
-                    parts = line.split(':')
-                    
-                    # BSSID is split into 6 parts (5 colons), so total should be at least 13
-                    # IN-USE(1) + SSID(1) + BSSID(6) + CHAN(1) + FREQ(1) + SIGNAL(1) + SECURITY(1) + RATE(1) = 13
-                    if len(parts) >= 13:
-                        in_use = parts[0]                    # '*'
-                        ssid = parts[1]                      # SSID
-                        bssid = ':'.join(parts[2:8])         # Rejoin BSSID from 6 hex parts
-                        channel = parts[8]                   # Channel
-                        freq = parts[9]                      # Frequency (with ' MHz')
-                        signal = parts[10]                   # Signal percentage
-                        security = parts[11]                 # Security type
-                        rate = parts[12] if len(parts) > 12 else ''  # Bitrate
-                        
-                        # Parse signal strength (as percentage)
-                        try:
-                            signal_percent = int(signal)
-                        except ValueError:
-                            signal_percent = 0
-                        
-                        # Convert signal from percentage to dBm (approximate)
-                        # Formula: dBm ≈ (percentage / 2) - 100
-                        signal_dbm = self._percent_to_dbm(signal_percent)
-                        
-                        # Parse bitrate (e.g., "270 Mbit/s" -> 270.0)
-                        try:
-                            bitrate_mbps = float(rate.split()[0]) if rate and rate.split() else 0.0
-                        except (ValueError, IndexError):
-                            bitrate_mbps = 0.0
-                        
-                        # Parse channel
-                        try:
-                            channel_int = int(channel)
-                        except ValueError:
-                            channel_int = 0
-                        
-                        # Parse frequency (remove ' MHz' suffix)
-                        try:
-                            freq_str = freq.replace(' MHz', '').strip()
-                            freq_int = int(freq_str) if freq_str else 0
-                        except ValueError:
-                            freq_int = 0
-
-                        return {
-                            "signal_strength_dbm": signal_dbm,
-                            "signal_strength_percent": signal_percent,
-                            "ssid": ssid if ssid else "Unknown",
-                            "bssid": bssid if bssid else "00:00:00:00:00:00",
-                            "channel": channel_int,
-                            "frequency_mhz": freq_int,
-                            "link_quality": signal_percent,
-                            "bitrate_mbps": bitrate_mbps,
-                            "security": security if security else "Open",
-                            "interface": self._interface,
-                        }
-
+            data = self._parse_nmcli(result.stdout, self._interface)
             # No active connection found (no line starting with '*')
-            return self._disconnected_data()
+            return data if data else self._disconnected_data()
 
         except (subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
             return self._disconnected_data()
 
+    @classmethod
+    def _parse_nmcli(cls, output: str, interface: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse ``nmcli -t device wifi list`` output for the active network.
+
+        Strategy: Parse BSSID by rejoining split colon-separated hex parts.
+        The asterisk (*) in IN-USE column marks the currently connected network.
+        
+        Research: nmcli doesn't support --escape in all versions, so we rejoin BSSID parts.
+
+        Returns:
+            Metrics dict, or None when no network is in use
+        """
+        # Parse output and find line starting with '*' (active connection)
+        # Format: "IN-USE:SSID:BSSID_P1:\:BSSID_P2:\:...:CHAN:FREQ:SIGNAL:SECURITY:RATE"
+        # BSSID has colons that split() breaks into 6 parts
+        # Example: "*:Maximus:38\:16\:5A\:69\:0C\:F9:44:5220 MHz:71:WPA2 WPA3:270 Mbit/s"
+        # After split: ['*', 'Maximus', '38\\', '16\\', '5A\\', '69\\', '0C\\', 'F9', '44', '5220 MHz', '71', 'WPA2 WPA3', '270 Mbit/s']
+        for line in output.splitlines():
+            if not line or not line.strip():
+                continue
+            
+            # Check if this line has '*' at start (active connection)
+            if line.startswith('*'):
+                parts = line.split(':')
+                
+                # BSSID is split into 6 parts (5 colons), so total should be at least 13
+                # IN-USE(1) + SSID(1) + BSSID(6) + CHAN(1) + FREQ(1) + SIGNAL(1) + SECURITY(1) + RATE(1) = 13
+                if len(parts) >= 13:
+                    in_use = parts[0]                    # '*'
+                    ssid = parts[1]                      # SSID
+                    bssid = ':'.join(p.rstrip('\\') for p in parts[2:8])  # Rejoin BSSID, drop escapes
+                    channel = parts[8]                   # Channel
+                    freq = parts[9]                      # Frequency (with ' MHz')
+                    signal = parts[10]                   # Signal percentage
+                    security = parts[11]                 # Security type
+                    rate = parts[12] if len(parts) > 12 else ''  # Bitrate
+                    
+                    # Parse signal strength (as percentage)
+                    try:
+                        signal_percent = int(signal)
+                    except ValueError:
+                        signal_percent = 0
+                    
+                    # Convert signal from percentage to dBm (approximate)
+                    # Formula: dBm ≈ (percentage / 2) - 100
+                    signal_dbm = cls._percent_to_dbm(signal_percent)
+                    
+                    # Parse bitrate (e.g., "270 Mbit/s" -> 270.0)
+                    try:
+                        bitrate_mbps = float(rate.split()[0]) if rate and rate.split() else 0.0
+                    except (ValueError, IndexError):
+                        bitrate_mbps = 0.0
+                    
+                    # Parse channel
+                    try:
+                        channel_int = int(channel)
+                    except ValueError:
+                        channel_int = 0
+                    
+                    # Parse frequency (remove ' MHz' suffix)
+                    try:
+                        freq_str = freq.replace(' MHz', '').strip()
+                        freq_int = int(freq_str) if freq_str else 0
+                    except ValueError:
+                        freq_int = 0
+
+                    return {
+                        "signal_strength_dbm": signal_dbm,
+                        "signal_strength_percent": signal_percent,
+                        "ssid": ssid if ssid else "Unknown",
+                        "bssid": bssid if bssid else "00:00:00:00:00:00",
+                        "channel": channel_int,
+                        "frequency_mhz": freq_int,
+                        "link_quality": signal_percent,
+                        "bitrate_mbps": bitrate_mbps,
+                        "security": security if security else "Open",
+                        "interface": interface,
+                    }
+
+        return None
+
     def _collect_iwconfig(self) -> Dict[str, Any]:
         """
         Collect WiFi data using iwconfig.
@@ -338,59 +397,62 @@ def _collect_iwconfig(self) -> Dict[str, Any]:
                 timeout=2
             )
 
-            output = result.stdout
-
-            # Parse output with regex
-            ssid_match = re.search(r'ESSID:"([^"]*)"', output)
-            bssid_match = re.search(r'Access Point: ([0-9A-Fa-f:]+)', output)
-            freq_match = re.search(r'Frequency:([0-9.]+) GHz', output)
-            bitrate_match = re.search(r'Bit Rate=([0-9.]+) Mb/s', output)
-            signal_match = re.search(r'Signal level=(-?[0-9]+) dBm', output)
-            quality_match = re.search(r'Link Quality=([0-9]+)/([0-9]+)', output)
-
-            ssid = ssid_match.group(1) if ssid_match else "Unknown"
-            bssid = bssid_match.group(1) if bssid_match else "00:00:00:00:00:00"
+            return self._parse_iwconfig(result.stdout, self._interface)
 
-            # Frequency to channel approximation
-            if freq_match:
-                freq_ghz = float(freq_match.group(1))
-                frequency_mhz = int(freq_ghz * 1000)
-                channel = self._freq_to_channel(frequency_mhz)
-            else:
-                frequency_mhz = 0
-                channel = 0
+        except (subprocess.TimeoutExpired, subprocess.SubprocessError, ValueError):
+            return self._disconnected_data()
 
-            bitrate_mbps = float(bitrate_match.group(1)) if bitrate_match else 0.0
+    @classmethod
+    def _parse_iwconfig(cls, output: str, interface: str) -> Dict[str, Any]:
+        """Parse ``iwconfig <iface>`` output into metrics."""
+        # Parse output with regex
+        ssid_match = re.search(r'ESSID:"([^"]*)"', output)
+        bssid_match = re.search(r'Access Point: ([0-9A-Fa-f:]+)', output)
+        freq_match = re.search(r'Frequency:([0-9.]+) GHz', output)
+        bitrate_match = re.search(r'Bit Rate=([0-9.]+) Mb/s', output)
+        signal_match = re.search(r'Signal level=(-?[0-9]+) dBm', output)
+        quality_match = re.search(r'Link Quality=([0-9]+)/([0-9]+)', output)
+
+        ssid = ssid_match.group(1) if ssid_match else "Unknown"
+        bssid = bssid_match.group(1) if bssid_match else "00:00:00:00:00:00"
+
+        # Frequency to channel approximation
+        if freq_match:
+            freq_ghz = float(freq_match.group(1))
+            frequency_mhz = int(freq_ghz * 1000)
+            channel = cls._freq_to_channel(frequency_mhz)
+        else:
+            frequency_mhz = 0
+            channel = 0
 
-            if signal_match:
-                signal_dbm = int(signal_match.group(1))
-                signal_percent = self._dbm_to_percent(signal_dbm)
-            else:
-                signal_dbm = -100
-                signal_percent = 0
+        bitrate_mbps = float(bitrate_match.group(1)) if bitrate_match else 0.0
 
-            if quality_match:
-                quality_num = int(quality_match.group(1))
-                quality_max = int(quality_match.group(2))
-                link_quality = int((quality_num / quality_max) * 100)
-            else:
-                link_quality = signal_percent
+        if signal_match:
+            signal_dbm = int(signal_match.group(1))
+            signal_percent = cls._dbm_to_percent(signal_dbm)
+        else:
+            signal_dbm = -100
+            signal_percent = 0
 
-            return {
-                "signal_strength_dbm": signal_dbm,
-                "signal_strength_percent": signal_percent,
-                "ssid": ssid,
-                "bssid": bssid,
-                "channel": channel,
-                "frequency_mhz": frequency_mhz,
-                "link_quality": link_quality,
-                "bitrate_mbps": bitrate_mbps,
-                "security": "Unknown",  # iwconfig doesn't show security type
-                "interface": self._interface,
-            }
+        if quality_match:
+            quality_num = int(quality_match.group(1))
+            quality_max = int(quality_match.group(2))
+            link_quality = int((quality_num / quality_max) * 100)
+        else:
+            link_quality = signal_percent
 
-        except (subprocess.TimeoutExpired, subprocess.SubprocessError, ValueError):
-            return self._disconnected_data()
+        return {
+            "signal_strength_dbm": signal_dbm,
+            "signal_strength_percent": signal_percent,
+            "ssid": ssid,
+            "bssid": bssid,
+            "channel": channel,
+            "frequency_mhz": frequency_mhz,
+            "link_quality": link_quality,
+            "bitrate_mbps": bitrate_mbps,
+            "security": "Unknown",  # iwconfig doesn't show security type
+            "interface": interface,
+        }
 
     def _collect_proc(self) -> Dict[str, Any]:
         """
@@ -398,45 +460,61 @@ def _collect_proc(self) -> Dict[str, Any]:
 
         Minimal data, but always available on Linux.
         """
+        data = self._read_proc_signal()
+        return data if data else self._disconnected_data()
+
+    def _read_proc_signal(self) -> Optional[Dict[str, Any]]:
+        """Read signal metrics from /proc/net/wireless (no subprocess)."""
         try:
             with open('/proc/net/wireless', 'r') as f:
-                lines = f.readlines()
-
-            # Find line for our interface
-            for line in lines[2:]:  # Skip header lines
-                if line.strip().startswith(self._interface):
-                    parts = line.split()
-                    # Format: iface status quality level noise
-                    quality = int(parts[2].rstrip('.'))
-                    level = int(parts[3].rstrip('.'))
-
-                    # /proc/net/wireless shows quality as 0-70 or signal in dBm
-                    if level < 0:
-                        # Already in dBm
-                        signal_dbm = level
-                    else:
-                        # Convert from quality (0-70) to dBm
-                        signal_dbm = -100 + quality
-
-                    signal_percent = self._dbm_to_percent(signal_dbm)
+                return self._parse_proc_wireless(f.read(), self._interface)
+        except (FileNotFoundError, OSError):
+            return None
 
-                    return {
-                        "signal_strength_dbm": signal_dbm,
-                        "signal_strength_percent": signal_percent,
-                        "ssid": "Unknown",
-                        "bssid": "00:00:00:00:00:00",
-                        "channel": 0,
-                        "frequency_mhz": 0,
-                        "link_quality": quality,
-                        "bitrate_mbps": 0.0,
-                        "security": "Unknown",
-                        "interface": self._interface,
-                    }
+    @classmethod
+    def _parse_proc_wireless(cls, content: str, interface: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse /proc/net/wireless for one interface.
 
-            return self._disconnected_data()
+        Returns:
+            Metrics dict, or None if the interface is not listed
+        """
+        # Find line for our interface
+        for line in content.splitlines()[2:]:  # Skip header lines
+            if not line.strip().startswith(f"{interface}:"):
+                continue
+            try:
+                parts = line.split()
+                # Format: iface status quality level noise
+                quality = int(parts[2].rstrip('.'))
+                level = int(parts[3].rstrip('.'))
+            except (ValueError, IndexError):
+                return None
+
+            # /proc/net/wireless shows quality as 0-70 or signal in dBm
+            if level < 0:
+                # Already in dBm
+                signal_dbm = level
+            else:
+                # Convert from quality (0-70) to dBm
+                signal_dbm = -100 + quality
 
-        except (FileNotFoundError, ValueError, IndexError):
-            return self._disconnected_data()
+            signal_percent = cls._dbm_to_percent(signal_dbm)
+
+            return {
+                "signal_strength_dbm": signal_dbm,
+                "signal_strength_percent": signal_percent,
+                "ssid": "Unknown",
+                "bssid": "00:00:00:00:00:00",
+                "channel": 0,
+                "frequency_mhz": 0,
+                "link_quality": quality,
+                "bitrate_mbps": 0.0,
+                "security": "Unknown",
+                "interface": interface,
+            }
+
+        return None
 
     def _get_bitrate_iwconfig(self) -> float:
         """Get bitrate from iwconfig (helper for nmcli method)"""
@@ -520,6 +598,9 @@ def cleanup(self) -> None:
         """
         Cleanup WiFi plugin.
 
-        No persistent resources to clean up.
+        Stops the background link monitor, if running.
         """
+        if getattr(self, '_link_monitor', None) is not None:
+            self._link_monitor.stop()
+            self._link_monitor = None
         self._status = PluginStatus.STOPPED
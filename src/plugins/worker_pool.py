@@ -0,0 +1,489 @@
+"""
+Worker Pool - Multi-process packet analysis sharded by flow
+
+Plugin threads share one interpreter, so packet analysis uses one core
+however many the sensor has. In worker mode (``--workers N``):
+
+- a capture process reads raw frames from one packet socket (no scapy
+  dissection) and writes each to one of N shared-memory rings, chosen by
+  a symmetric flow hash, so every flow is analysed by a single worker
+- N worker processes each decode their frames and run the sharded
+  plugins' own per-packet handlers (DNS, HTTP, traffic statistics) on
+  private plugin instances
+- every ``merge_interval`` each worker ships ``take_partial()`` - what it
+  counted since the last shipment - to the UI process, where it is added
+  into a parent-side instance of the plugin with ``merge_partial()``
+
+The app's lifecycle sees a ``ShardedPlugin`` per sharded plugin: its
+collect_data() returns the merged instance's get_data(), so screens,
+history and /metrics are unchanged. Detection events the workers' handlers
+emit travel with the partials and reach the event log from the UI process.
+
+Usage:
+    >>> pool = WorkerPool(workers=4)
+    >>> dns = pool.add(PluginConfig(name="dns_monitor", rate_ms=500), DNSMonitorPlugin)
+    >>> lifecycle.add("dns_monitor", dns, on_demand=True)  # starts the pool on activation
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+import importlib
+import logging
+import multiprocessing
+import queue
+import select
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
+
+from .base import Plugin, PluginConfig, PluginStatus
+from .shm_ring import DEFAULT_RING_BYTES, ShmRing, frame_flow_hash
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MERGE_INTERVAL = 0.5  # Seconds between partial aggregate shipments
+DEFAULT_DECODER = "scapy.layers.l2:Ether"  # Raw frame -> packet, resolved in the workers
+WORKER_BATCH = 256  # Frames taken from the ring per pass
+IDLE_SLEEP = 0.001  # Worker poll interval while its ring is empty
+
+
+@dataclass
+class ShardSpec:
+    """A plugin whose per-packet analysis runs in the workers."""
+    name: str
+    plugin_class: Type[Plugin]
+    config: Dict[str, Any] = field(default_factory=dict)
+
+
+def _resolve(spec: str) -> Any:
+    """``"module:attribute"`` -> the attribute."""
+    module, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module), attribute)
+
+
+class _EventBuffer:
+    """Worker-side event sink: events wait for the next partial shipment."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+
+    def emit(self, event: str, record: Any, source: Optional[str] = None) -> None:
+        self.events.append((event, record if isinstance(record, dict) else record.to_dict()))
+
+    def take(self) -> List[Tuple[str, Dict[str, Any]]]:
+        events, self.events = self.events, []
+        return events
+
+
+def _send_partials(results, index: int, plugins: Dict[str, Plugin], stats: Dict[str, int]) -> None:
+    partials = {}
+    events = {}
+    for name, plugin in plugins.items():
+        partial = plugin.take_partial()
+        if partial:
+            partials[name] = partial
+        if plugin.event_sink.events:
+            events[name] = plugin.event_sink.take()
+    results.put((index, partials, events, dict(stats)))
+
+
+def _worker_main(index: int, ring_name: str, ring_size: int, specs: List[ShardSpec],
+                 decoder: str, results, stop, merge_interval: float) -> None:
+    """Worker process: decode frames from one ring and run the plugins' handlers."""
+    ring = ShmRing.attach(ring_name, ring_size)
+    decode = _resolve(decoder)
+    plugins = {spec.name: spec.plugin_class(PluginConfig(name=spec.name, config=spec.config))
+               for spec in specs}
+    for plugin in plugins.values():
+        plugin.event_sink = _EventBuffer()
+    handlers = [getattr(plugin, handler) for plugin in plugins.values()
+                for handler in plugin.packet_handlers]
+    stats = {'frames': 0, 'errors': 0}
+    last_merge = time.monotonic()
+
+    try:
+        while True:
+            frames = ring.get_batch(WORKER_BATCH)
+            if not frames:
+                if stop.is_set():
+                    break  # Capture has ended and the ring is drained
+                time.sleep(IDLE_SLEEP)
+            for frame, ts in frames:
+                stats['frames'] += 1
+                try:
+                    packet = decode(frame)
+                    if ts:
+                        packet.time = ts
+                except Exception:
+                    stats['errors'] += 1
+                    continue
+                for handler in handlers:
+                    try:
+                        handler(packet)
+                    except Exception:
+                        stats['errors'] += 1
+            now = time.monotonic()
+            if now - last_merge >= merge_interval:
+                _send_partials(results, index, plugins, stats)
+                last_merge = now
+    finally:
+        _send_partials(results, index, plugins, stats)
+        ring.close()
+
+
+def _capture_main(ring_names: List[str], ring_size: int, iface: Optional[str],
+                  bpf_filter: Optional[str], stop) -> None:
+    """Capture process: raw frames from one socket, sharded into the rings."""
+    rings = [ShmRing.attach(name, ring_size) for name in ring_names]
+    shards = len(rings)
+    try:
+        from scapy.config import conf
+        sock = conf.L2listen(iface=iface, filter=bpf_filter)
+    except Exception as e:
+        logger.error(f"Worker capture socket failed: {e}")
+        for ring in rings:
+            ring.close()
+        return
+
+    try:
+        while not stop.is_set():
+            ready, _, _ = select.select([sock], [], [], 0.5)
+            if not ready:
+                continue
+            _, frame, ts = sock.recv_raw()
+            if frame:
+                rings[frame_flow_hash(frame) % shards].put(frame, ts or time.time())
+    except Exception as e:
+        logger.error(f"Worker capture error: {e}")
+    finally:
+        sock.close()
+        for ring in rings:
+            ring.close()
+
+
+class WorkerPool:
+    """
+    Capture process + N analysis workers + partial aggregate merging.
+
+    Args:
+        workers: Analysis processes (shards)
+        iface: Capture interface (None: scapy's default)
+        ring_size: Bytes of shared memory per worker ring
+        merge_interval: Seconds between partial aggregate shipments
+        decoder: ``"module:callable"`` turning a raw frame into a packet
+        context: multiprocessing start method ("spawn" is safe with the
+            UI's threads running)
+
+    Raises:
+        ValueError: workers < 1
+    """
+
+    def __init__(self, workers: int, iface: Optional[str] = None,
+                 ring_size: int = DEFAULT_RING_BYTES,
+                 merge_interval: float = DEFAULT_MERGE_INTERVAL,
+                 decoder: str = DEFAULT_DECODER, context: str = "spawn"):
+        if workers < 1:
+            raise ValueError("workers must be positive")
+        self.workers = workers
+        self.iface = iface
+        self.ring_size = ring_size
+        self.merge_interval = merge_interval
+        self.decoder = decoder
+        self._context = multiprocessing.get_context(context)
+
+        self._specs: Dict[str, ShardSpec] = {}
+        self._views: Dict[str, Plugin] = {}  # Parent-side instances the partials merge into
+        self._lock = threading.Lock()
+        self._active: Set[str] = set()
+
+        self._rings: List[ShmRing] = []
+        self._processes: List[Any] = []
+        self._capture: Optional[Any] = None
+        self._results = None
+        self._stop_workers = None
+        self._stop_capture = None
+        self._merger: Optional[threading.Thread] = None
+        self._merging = False
+        self._worker_stats: Dict[int, Dict[str, int]] = {}
+        self.stats = {
+            'partials_merged': 0,
+            'merge_errors': 0
+        }
+
+    def add(self, config: PluginConfig, plugin_class: Type[Plugin]) -> 'ShardedPlugin':
+        """
+        Shard ``plugin_class``: its handlers run in every worker.
+
+        Adding a name again (plugin set rebuilt) keeps its merged counts.
+
+        Args:
+            config: The plugin's config, as for an unsharded instance
+
+        Returns:
+            The stand-in plugin to register with the lifecycle
+
+        Raises:
+            ValueError: The plugin doesn't support partial aggregates
+        """
+        if plugin_class.take_partial is Plugin.take_partial or not plugin_class.packet_handlers:
+            raise ValueError(f"{plugin_class.__name__} can't be sharded (no take_partial/packet_handlers)")
+        name = config.name
+        self._specs[name] = ShardSpec(name, plugin_class, dict(config.config))
+        if type(self._views.get(name)) is not plugin_class:
+            self._views[name] = plugin_class(config)
+        return ShardedPlugin(config, self)
+
+    def view(self, name: str) -> Plugin:
+        """Parent-side instance holding ``name``'s merged aggregates."""
+        return self._views[name]
+
+    @property
+    def running(self) -> bool:
+        return bool(self._processes)
+
+    def capture_filter(self) -> Optional[str]:
+        """Union of the sharded plugins' capture filters (None: everything)."""
+        filters = [spec.plugin_class.capture_filter for spec in self._specs.values()]
+        if not filters or not all(filters):
+            return None
+        return " or ".join(f"({f})" for f in dict.fromkeys(filters))
+
+    # Activation (ShardedPlugin.initialize/stop)
+
+    def acquire(self, name: str) -> None:
+        """Start the pool when its first sharded plugin is activated."""
+        self._active.add(name)
+        if not self.running:
+            self.start()
+
+    def release(self, name: str) -> None:
+        """Stop the pool when its last sharded plugin is deactivated."""
+        self._active.discard(name)
+        if not self._active and self.running:
+            self.stop()
+
+    def start(self, capture: bool = True) -> None:
+        """
+        Create the rings and start the workers (and the capture process).
+
+        Args:
+            capture: False to feed frames with dispatch() instead of a socket
+        """
+        if self.running:
+            return
+        ctx = self._context
+        specs = list(self._specs.values())
+        self._results = ctx.Queue()
+        self._stop_workers = ctx.Event()
+        self._stop_capture = ctx.Event()
+        self._rings = [ShmRing(self.ring_size) for _ in range(self.workers)]
+        for index, ring in enumerate(self._rings):
+            process = ctx.Process(
+                target=_worker_main,
+                args=(index, ring.name, ring.capacity, specs, self.decoder,
+                      self._results, self._stop_workers, self.merge_interval),
+                name=f"wf-analysis-{index}",
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+        # The merge thread is now the views' writer: readers get snapshots
+        for view in self._views.values():
+            view.snapshots.start()
+        self._merging = True
+        self._merger = threading.Thread(target=self._merge_loop, name="wf-partial-merge", daemon=True)
+        self._merger.start()
+
+        if capture:
+            self._capture = ctx.Process(
+                target=_capture_main,
+                args=([ring.name for ring in self._rings], self._rings[0].capacity, self.iface,
+                      self.capture_filter(), self._stop_capture),
+                name="wf-capture",
+                daemon=True
+            )
+            self._capture.start()
+        logger.info(f"Worker pool started: {self.workers} analysis processes")
+
+    def dispatch(self, frame: bytes, ts: float = 0.0, shard: Optional[int] = None) -> bool:
+        """
+        Hand a frame to its worker from this process (no capture process).
+
+        Args:
+            shard: Worker index (default: by flow hash)
+
+        Returns:
+            False if the worker's ring was full
+        """
+        if shard is None:
+            shard = frame_flow_hash(frame) % self.workers
+        return self._rings[shard].put(frame, ts)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop capture, let the workers drain their rings, merge their last partials."""
+        if not self.running:
+            return
+        if self._capture is not None:
+            self._stop_capture.set()
+            self._capture.join(timeout=timeout)
+            self._capture = None
+        self._stop_workers.set()
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                logger.warning(f"{process.name} did not stop; terminating")
+                process.terminate()
+        self._merging = False
+        self._merger.join(timeout=timeout)
+        self._drain_results()
+        for view in self._views.values():
+            view.snapshots.stop()
+
+        for ring in self._rings:
+            ring.close()
+            ring.unlink()
+        self._rings = []
+        self._processes = []
+        self._results.close()
+        logger.info("Worker pool stopped")
+
+    # Merging (UI process)
+
+    def _merge_loop(self) -> None:
+        while self._merging:
+            try:
+                item = self._results.get(timeout=0.2)
+            except queue.Empty:
+                self._publish_views()  # Workers quiet: the last merged partials become visible
+                continue
+            except (EOFError, OSError):
+                break
+            self._merge(*item)
+
+    def _publish_views(self) -> None:
+        with self._lock:
+            for view in self._views.values():
+                view.snapshots.tick()
+
+    def _drain_results(self) -> None:
+        while True:
+            try:
+                item = self._results.get(timeout=0.1)
+            except (queue.Empty, EOFError, OSError):
+                return
+            self._merge(*item)
+
+    def _merge(self, index: int, partials: Dict[str, Any],
+               events: Dict[str, List[Tuple[str, Dict[str, Any]]]], stats: Dict[str, int]) -> None:
+        for name, records in events.items():
+            sink = self._views[name].event_sink
+            if sink is not None:
+                for event, record in records:
+                    sink.emit(event, record, source=name)
+        with self._lock:
+            self._worker_stats[index] = stats
+            for name, partial in partials.items():
+                view = self._views[name]
+                try:
+                    view.merge_partial(partial)
+                    view.snapshots.tick()
+                    self.stats['partials_merged'] += 1
+                except Exception as e:
+                    self.stats['merge_errors'] += 1
+                    logger.error(f"Merging {name} partial from worker {index} failed: {e}")
+
+    def snapshot(self, name: str) -> Dict[str, Any]:
+        """
+        get_data() of ``name``'s merged instance.
+
+        Lock-free: while the pool runs, the view serves the snapshot the
+        merge thread last published.
+        """
+        return self._views[name].get_data()
+
+    def capture_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Ring counters summed over the workers, in PacketQueue snapshot form.
+
+        Depth, high water and capacity are bytes of shared memory.
+        """
+        if not self._rings:
+            return None
+        rings = [ring.stats() for ring in self._rings]
+        with self._lock:
+            errors = sum(stats.get('errors', 0) for stats in self._worker_stats.values())
+        return {
+            'enqueued': sum(r['written'] for r in rings),
+            'processed': sum(r['read'] for r in rings),
+            'dropped': sum(r['dropped'] for r in rings),
+            'errors': errors,
+            'high_water': max(r['high_water_bytes'] for r in rings),
+            'kernel_packets': 0,
+            'kernel_drops': 0,
+            'depth': sum(r['depth_bytes'] for r in rings),
+            'capacity': sum(r['capacity_bytes'] for r in rings),
+            'policy': f"{self.workers} workers",
+            'workers': [dict(r, worker=i) for i, r in enumerate(rings)]
+        }
+
+
+class ShardedPlugin(Plugin):
+    """Stand-in for a plugin whose packet analysis runs in a WorkerPool."""
+
+    def __init__(self, config: PluginConfig, pool: WorkerPool):
+        super().__init__(config)
+        self.pool = pool
+        self.snapshot_entities = pool.view(config.name).snapshot_entities
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """The merged instance's counters."""
+        return self.pool.view(self.name).stats
+
+    def initialize(self) -> None:
+        """Start the pool's workers (shared with the other sharded plugins)."""
+        self.pool.view(self.name).event_sink = self.event_sink
+        self.pool.acquire(self.name)
+        self._status = PluginStatus.READY
+
+    def stop(self) -> None:
+        self.pool.release(self.name)
+        self._status = PluginStatus.STOPPED
+
+    def cleanup(self) -> None:
+        if self._status is not PluginStatus.STOPPED:
+            self.stop()
+
+    def reconfigure(self, rate_ms: int, settings: Dict[str, Any]) -> None:
+        """New rate and settings, for the merged instance too (workers keep theirs)."""
+        super().reconfigure(rate_ms, settings)
+        self.pool.view(self.name).reconfigure(rate_ms, settings)
+
+    def collect_data(self) -> Dict[str, Any]:
+        """Aggregates merged from every worker, with the rings' counters."""
+        data = self.pool.snapshot(self.name)
+        data['capture'] = self.pool.capture_stats()
+        return data
+
+    def get_data(self) -> Dict[str, Any]:
+        return self.collect_data()
+
+    def get_changes(self, since_version: Optional[int] = None) -> Dict[str, Any]:
+        """The merged instance's changes since ``since_version``."""
+        changes = self.pool.view(self.name).get_changes(since_version)
+        changes['data']['capture'] = self.pool.capture_stats()
+        return changes
+
+    def get_state(self) -> Optional[Dict[str, Any]]:
+        return self.pool.view(self.name).get_state()
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        self.pool.view(self.name).restore_state(state)
+
+    def capture_stats(self) -> Optional[Dict[str, Any]]:
+        return self.pool.capture_stats()
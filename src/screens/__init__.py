@@ -15,6 +15,7 @@
 from .http_sniffer_dashboard import HTTPSnifferDashboard
 from .rogue_ap_dashboard import RogueAPDashboard
 from .handshake_dashboard import HandshakeDashboard
+from .perf_dashboard import PerfDashboard
 
 __all__ = [
     "LandingScreen",
@@ -32,4 +33,5 @@
     "HTTPSnifferDashboard",
     "RogueAPDashboard",
     "HandshakeDashboard",
+    "PerfDashboard",
 ]
@@ -91,6 +91,8 @@ def compose(self) -> ComposeResult:
                     "[bold cyan]⌨️  KEYBOARD SHORTCUTS[/bold cyan]\n\n"
                     "[bold yellow]q[/bold yellow]        Quit dashboard\n"
                     "[bold yellow]0-4[/bold yellow]      Switch dashboards\n"
+                    "[bold yellow]i[/bold yellow]        Perf inspector\n"
+                    "[bold yellow]n[/bold yellow]        Next interface (Network, Packets)\n"
                     "[bold yellow]h / ?[/bold yellow]    Show this help\n"
                     "[bold yellow]ESC[/bold yellow]      Close modals\n\n"
                     "[dim]Navigation:[/dim]\n"
@@ -0,0 +1,43 @@
+"""
+Interface View - Aggregated vs per-interface drill-down for dashboards
+
+Plugins capturing on several interfaces (--interface) report their totals
+plus an ``interfaces`` dict of the same fields per interface. Screens keep
+the selected interface (None: all of them) and show its slice; ``n`` cycles
+all -> each interface -> all.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+def interface_names(data: Optional[Dict[str, Any]]) -> List[str]:
+    """Interfaces with their own counters in ``data`` (sorted)."""
+    return sorted((data or {}).get('interfaces') or {})
+
+
+def next_interface(data: Optional[Dict[str, Any]], current: Optional[str]) -> Optional[str]:
+    """The view after ``current``: all, then each interface in turn."""
+    options: List[Optional[str]] = [None, *interface_names(data)]
+    index = options.index(current) if current in options else 0
+    return options[(index + 1) % len(options)]
+
+
+def interface_view(data: Dict[str, Any], interface: Optional[str]) -> Dict[str, Any]:
+    """
+    ``data`` with the selected interface's fields laid over the totals.
+
+    Args:
+        data: Plugin data (with an ``interfaces`` dict when capturing on several)
+        interface: Selected interface (None or unknown: the aggregate)
+    """
+    per_interface = (data.get('interfaces') or {}).get(interface) if interface else None
+    if per_interface is None:
+        return data
+    return {**data, **per_interface}
+
+
+def interface_label(interface: Optional[str]) -> str:
+    return f"Interface: {interface}" if interface else "All interfaces"
@@ -166,6 +166,13 @@ def _render_menu(self):
         else:
             menu_text.append(" ⚖️\n", style="#ff4444")
 
+        menu_text.append("  i ", style="#00aa55")
+        menu_text.append("Perf Inspector", style="#00cc66")
+        if not compact:
+            menu_text.append("  Latency per plugin\n", style=desc_style)
+        else:
+            menu_text.append("\n", style="#000000")
+
         # Controles - ultra limpo
         menu_text.append("\n CONTROLS\n", style="bold #00cc66")
         if not compact:
@@ -263,6 +270,7 @@ class LandingScreen(Screen):
         ("9", "launch_dashboard('http_sniffer')", "HTTP Sniffer"),
         ("a", "launch_dashboard('rogue_ap')", "Rogue AP"),
         ("b", "launch_dashboard('handshake')", "Handshake"),
+        ("i", "launch_dashboard('perf')", "Perf Inspector"),
         ("m", "toggle_mode", "Toggle Mode"),
         ("h", "show_help", "Help"),
         ("q", "quit", "Quit"),
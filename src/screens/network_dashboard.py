@@ -13,6 +13,7 @@
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Static
 from textual.reactive import reactive
+from src.screens.interface_view import interface_label, interface_names, interface_view, next_interface
 from src.widgets import NetworkChart
 
 
@@ -114,9 +115,14 @@ class NetworkDashboard(Screen):
         ("2", "switch_screen('network')", "Network"),
         ("3", "switch_screen('wifi')", "WiFi"),
         ("4", "switch_screen('packets')", "Packets"),
+        ("n", "cycle_interface", "Next Interface"),
         ("q", "app.quit", "Quit"),
     ]
 
+    # Interface shown (None: all of them, see interface_view)
+    interface = None
+    _last_data: dict = {}
+
     def compose(self) -> ComposeResult:
         """Compose the network dashboard layout."""
         yield Header(show_clock=True)
@@ -136,6 +142,9 @@ def update_metrics(self, network_data):
         Args:
             network_data: Dict from NetworkPlugin
         """
+        self._last_data = network_data
+        network_data = interface_view(network_data, self.interface)
+
         # Update chart
         network_chart = self.query_one("#network-chart", NetworkChart)
         network_chart.update_data({'network': network_data})
@@ -152,3 +161,12 @@ def update_metrics(self, network_data):
         stats_widget.connections_total = network_data.get('connections_total', 0)
         stats_widget.errors_in = network_data.get('errors_in', 0)
         stats_widget.errors_out = network_data.get('errors_out', 0)
+
+    def action_cycle_interface(self) -> None:
+        """Show the next interface's counters (all -> each interface -> all)."""
+        if not interface_names(self._last_data):
+            self.app.notify("Capturing on a single interface", severity="information")
+            return
+        self.interface = next_interface(self._last_data, self.interface)
+        self.sub_title = interface_label(self.interface)
+        self.update_metrics(self._last_data)
@@ -13,6 +13,7 @@
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Static
 from textual.reactive import reactive
+from src.screens.interface_view import interface_label, interface_names, interface_view, next_interface
 from src.widgets import PacketTable
 
 
@@ -184,9 +185,14 @@ class PacketsDashboard(Screen):
         ("2", "switch_screen('network')", "Network"),
         ("3", "switch_screen('wifi')", "WiFi"),
         ("4", "switch_screen('packets')", "Packets"),
+        ("n", "cycle_interface", "Next Interface"),
         ("q", "app.quit", "Quit"),
     ]
 
+    # Interface shown (None: all of them, see interface_view)
+    interface = None
+    _last_data: dict = {}
+
     def compose(self) -> ComposeResult:
         """Compose the packets dashboard layout."""
         yield Header(show_clock=True)
@@ -208,6 +214,9 @@ def update_metrics(self, packet_data):
         Args:
             packet_data: Dict from PacketAnalyzerPlugin
         """
+        self._last_data = packet_data
+        packet_data = interface_view(packet_data, self.interface)
+
         # Update table
         packet_table = self.query_one("#packet-table", PacketTable)
         packet_table.update_data({'packet_analyzer': packet_data})
@@ -220,3 +229,12 @@ def update_metrics(self, packet_data):
         stats_widget.top_sources = packet_data.get('top_sources', {})
         stats_widget.top_destinations = packet_data.get('top_destinations', {})
         stats_widget.backend = packet_data.get('backend', 'unknown')
+
+    def action_cycle_interface(self) -> None:
+        """Show the next interface's counters (all -> each interface -> all)."""
+        if not interface_names(self._last_data):
+            self.app.notify("Capturing on a single interface", severity="information")
+            return
+        self.interface = next_interface(self._last_data, self.interface)
+        self.sub_title = interface_label(self.interface)
+        self.update_metrics(self._last_data)
@@ -0,0 +1,202 @@
+"""
+Perf Inspector Dashboard
+
+Live latency percentiles per plugin, packet handler and screen, to find
+what is eating the CPU, and the capture queues' packet loss.
+
+Author: Professor JuanCS-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-12
+"""
+
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import Screen
+from textual.widgets import Header, Footer, Static, DataTable
+
+
+# Rows above this p99 (ms) are highlighted: a 10 FPS UI has 100 ms per frame
+SLOW_P99_MS = 50.0
+
+
+class PerfDashboard(Screen):
+    """
+    Perf inspector.
+
+    Shows:
+    - UI update rate and tick jitter
+    - p50/p99/max per component (collect_data, packet handlers, screen refreshes)
+    - Packets seen/processed/dropped per capture plugin
+    - Capture queue depth and drops (overflow policy and kernel)
+    """
+
+    BINDINGS = [
+        ("r", "refresh", "Refresh"),
+        ("c", "reset_stats", "Reset"),
+        ("0", "switch_consolidated", "Overview"),
+        ("h", "show_help", "Help"),
+        ("q", "quit_app", "Quit"),
+    ]
+
+    CSS = """
+    PerfDashboard {
+        background: #000000;
+    }
+
+    #perf-header {
+        background: #000000;
+        color: #00cc66;
+        height: auto; min-height: 4;
+        border: round #00aa55;
+        padding: 1;
+        margin: 0 1 1 1;
+    }
+
+    #perf-table {
+        height: auto; min-height: 12;
+        border: round #00aa55;
+        background: #000000;
+        color: #00cc66;
+        margin: 0 1 1 1;
+    }
+
+    #capture-table {
+        height: auto; min-height: 6;
+        border: round #00aa55;
+        background: #000000;
+        color: #00cc66;
+        margin: 0 1 1 1;
+    }
+
+    Header {
+        background: #000000;
+        color: #00cc66;
+    }
+
+    Footer {
+        background: #000000;
+        color: #00aa55;
+    }
+    """
+
+    def compose(self) -> ComposeResult:
+        """Compose perf inspector layout."""
+        yield Header()
+
+        with Vertical():
+            yield Static("", id="perf-header")
+            yield DataTable(id="perf-table")
+            yield DataTable(id="capture-table")
+
+        yield Footer()
+
+    def on_mount(self) -> None:
+        """Setup table and start refresh timer."""
+        table = self.query_one("#perf-table", DataTable)
+        table.add_columns("Kind", "Component", "Calls", "p50 ms", "p99 ms", "Max ms",
+                          "Seen", "Processed", "Dropped")
+        capture_table = self.query_one("#capture-table", DataTable)
+        capture_table.add_columns("Capture queue", "Policy", "Depth", "High water", "Enqueued",
+                                  "Processed", "Dropped", "Kernel drops")
+
+        self.set_interval(1.0, self.refresh_data)
+        self.refresh_data()
+
+    def refresh_data(self) -> None:
+        """Update percentiles from the app's perf registry."""
+        perf = getattr(self.app, 'perf', None)
+        if perf is None:
+            return
+        try:
+            summary = perf.summary()
+            self._update_header(perf, summary)
+            self._update_table(summary)
+            self._update_capture_table()
+        except Exception as e:
+            self.app.notify(f"Perf refresh error: {e}", severity="error")
+
+    def _update_header(self, perf, summary: dict) -> None:
+        """Update header with the UI update rate."""
+        header = self.query_one("#perf-header", Static)
+        frame = summary.get(("frame", "app"), {})
+        content = (
+            f"[bold #00cc66]PERF INSPECTOR[/]\n"
+            f"[#00aa55]UI updates:[/] [bold #00cc66]{perf.frame_rate:.1f}/s[/]  "
+            f"[#00aa55]Tick interval p50/p99:[/] "
+            f"[#00cc66]{frame.get('p50_ms', 0.0):.1f} / {frame.get('p99_ms', 0.0):.1f} ms[/]  "
+            f"[#00aa55]Components:[/] [#00cc66]{len(summary)}[/]"
+        )
+        if getattr(self.app, 'remote', None):
+            content += "\n[dim]Attached: plugin timings are the daemon proxies; see the daemon's /metrics[/]"
+        header.update(content)
+
+    def _update_table(self, summary: dict) -> None:
+        """Update component table, slowest p99 first."""
+        table = self.query_one("#perf-table", DataTable)
+        table.clear()
+
+        rows = sorted(((key, entry) for key, entry in summary.items() if key[0] != "frame"),
+                      key=lambda item: item[1]['p99_ms'], reverse=True)
+        for (kind, component), entry in rows:
+            p99 = f"{entry['p99_ms']:.2f}"
+            if entry['p99_ms'] >= SLOW_P99_MS:
+                p99 = f"[bold red]{p99}[/]"
+            table.add_row(
+                kind,
+                component,
+                str(entry['count']),
+                f"{entry['p50_ms']:.2f}",
+                p99,
+                f"{entry['max_ms']:.2f}",
+                str(entry.get('seen', '')),
+                str(entry.get('processed', '')),
+                str(entry.get('dropped', '')),
+            )
+
+    def _update_capture_table(self) -> None:
+        """Update packet queue counters of the running capture plugins."""
+        table = self.query_one("#capture-table", DataTable)
+        table.clear()
+
+        lifecycle = self.app.lifecycle
+        for name in lifecycle.names():
+            plugin = lifecycle.get(name)
+            stats = plugin.capture_stats() if plugin else None
+            if not stats:
+                continue
+            dropped = str(stats['dropped'])
+            if stats['dropped'] or stats['kernel_drops']:
+                dropped = f"[bold red]{dropped}[/]"
+            table.add_row(
+                name,
+                stats['policy'],
+                f"{stats['depth']}/{stats['capacity']}",
+                str(stats['high_water']),
+                str(stats['enqueued']),
+                str(stats['processed']),
+                dropped,
+                str(stats['kernel_drops']),
+            )
+
+    def action_refresh(self) -> None:
+        """Manual refresh."""
+        self.refresh_data()
+
+    def action_reset_stats(self) -> None:
+        """Start measuring afresh."""
+        perf = getattr(self.app, 'perf', None)
+        if perf is not None:
+            perf.reset()
+            self.refresh_data()
+            self.app.notify("Perf histograms reset", severity="information")
+
+    def action_switch_consolidated(self) -> None:
+        """Switch to consolidated dashboard."""
+        self.app.action_switch_screen('consolidated')
+
+    def action_show_help(self) -> None:
+        """Show help screen."""
+        self.app.push_screen("help")
+
+    def action_quit_app(self) -> None:
+        """Quit application."""
+        self.app.action_quit()
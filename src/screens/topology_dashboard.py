@@ -69,6 +69,7 @@ def __init__(self, *args, **kwargs):
         self.gateway_ip = "N/A"
         self.subnet = "N/A"
         self.device_count = 0
+        self.scan_progress = {}
     
     def compose(self) -> ComposeResult:
         """Compose topology dashboard layout."""
@@ -101,6 +102,7 @@ def refresh_data(self) -> None:
             self.gateway_ip = data.get('gateway_ip', 'N/A')
             self.subnet = data.get('subnet', 'N/A')
             self.device_count = data.get('device_count', 0)
+            self.scan_progress = data.get('scan_progress', {})
             devices = data.get('devices', [])
             
             # Update header
@@ -119,6 +121,12 @@ def _update_header(self) -> None:
         content = f"""[bold #00cc66]NETWORK TOPOLOGY MAPPER[/]
 [#00aa55]Gateway:[/] [#00cc66]{self.gateway_ip}[/]  [#00aa55]Subnet:[/] [#00cc66]{self.subnet}[/]  [#00aa55]Devices:[/] [bold #00cc66]{self.device_count}[/]"""
         
+        if self.scan_progress.get('scanning'):
+            content += (
+                f"  [#00aa55]Scan:[/] [#00cc66]{self.scan_progress.get('percent', 0.0):.0f}%[/]"
+                f" [dim]({self.scan_progress.get('scanned', 0)}/{self.scan_progress.get('total', 0)})[/]"
+            )
+        
         header.update(content)
     
     def _update_table(self, devices: list) -> None:
@@ -0,0 +1,333 @@
+"""
+Event log - batched, rotating JSON-lines sink for detections.
+
+Plugins hand every DNS query, HTTP request, alert and handshake to
+``emit()``, which only appends to an in-memory buffer; a background thread
+serializes and appends the buffer to the log in one write every
+``flush_interval`` seconds (sooner once ``batch_size`` events are waiting).
+Sniffer threads therefore never block on disk I/O. A SIEM can tail the
+active file.
+
+One JSON object per line:
+
+    {"ts": 1731240000.1, "event": "dns_query", "source": "dns_monitor", "domain": ...}
+
+The active file rotates when it reaches ``max_bytes`` or is ``max_age``
+seconds old; rotated segments are renamed ``<stem>-<UTC time><suffix>``,
+optionally compressed (gzip, or zstd with the ``zstandard`` package), and
+only the newest ``backups`` are kept.
+
+When events arrive faster than the disk takes them, the buffer stops at
+``max_pending`` and further events are dropped and counted per type; the
+next batch starts with an ``events_dropped`` record, so gaps are visible
+downstream.
+
+Usage:
+    >>> log = EventLog("/var/log/wf-tool/events.jsonl", compression="gzip")
+    >>> log.start()
+    >>> log.emit("dns_query", {"domain": "example.com"}, source="dns_monitor")
+    >>> log.close()
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+logger = logging.getLogger(__name__)
+
+
+COMPRESSION_SUFFIXES = {
+    None: "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+class EventLog:
+    """
+    JSON-lines event sink with a background writer.
+
+    Args:
+        path: Active log file (rotated segments go next to it)
+        max_bytes: Rotate once the active file reaches this size
+        max_age: Rotate once the active file is this many seconds old (None: never)
+        compression: None, "gzip" or "zstd" for rotated segments
+        backups: Rotated segments to keep (None: keep all)
+        flush_interval: Seconds between writes
+        batch_size: Buffered events that trigger an early write
+        max_pending: Buffered events beyond which new events are dropped
+
+    Raises:
+        ValueError: Unknown compression, or zstd without the zstandard package
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 64 * 1024 * 1024,
+                 max_age: Optional[float] = 3600.0, compression: Optional[str] = None,
+                 backups: Optional[int] = 24, flush_interval: float = 1.0,
+                 batch_size: int = 1000, max_pending: int = 50_000):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unknown compression {compression!r} (use gzip or zstd)")
+        self._zstd = None
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise ValueError("zstd compression needs the zstandard package: pip install zstandard")
+            self._zstd = zstandard
+
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = None
+        self._opened_at = 0.0
+        self._write_lock = threading.RLock()
+        self._closed = False
+
+        # Buffer, swapped out under _lock by flush()
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[float, str, Optional[str], Any]] = []
+        self._unreported_drops: Dict[str, int] = defaultdict(int)
+
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+        self.stats = {
+            'emitted': 0,
+            'written': 0,
+            'dropped': 0,
+            'dropped_by_type': defaultdict(int),
+            'batches': 0,
+            'bytes_written': 0,
+            'rotations': 0,
+            'errors': 0,
+            'last_flush_ms': 0.0
+        }
+
+    # Hot path: in-memory append only
+
+    def emit(self, event: str, record: Any, source: Optional[str] = None,
+             timestamp: Optional[float] = None) -> bool:
+        """
+        Buffer one event.
+
+        Args:
+            event: Event type, e.g. "dns_query", "arp_alert"
+            record: Dict, or an object with to_dict() (serialized by the writer)
+            source: Plugin that produced the event
+            timestamp: Event time (default: now)
+
+        Returns:
+            False if the event was dropped (buffer full)
+        """
+        ts = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.stats['dropped'] += 1
+                self.stats['dropped_by_type'][event] += 1
+                self._unreported_drops[event] += 1
+                return False
+            self._pending.append((ts, event, source, record))
+            self.stats['emitted'] += 1
+            pending = len(self._pending)
+        if pending >= self.batch_size:
+            self._wake.set()
+        return True
+
+    # Background writer
+
+    def start(self) -> None:
+        """Start the background writer."""
+        if self._writer and self._writer.is_alive():
+            return
+        self._stop_event.clear()
+        self._writer = threading.Thread(target=self._write_loop, name="event-log", daemon=True)
+        self._writer.start()
+
+    def stop(self) -> None:
+        """Stop the writer and write everything still buffered."""
+        self._stop_event.set()
+        self._wake.set()
+        if self._writer:
+            self._writer.join(timeout=5.0)
+            self._writer = None
+        self.flush()
+
+    def close(self) -> None:
+        """Flush and close the active file (idempotent)."""
+        if self._closed:
+            return
+        self.stop()
+        with self._write_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+        self._closed = True
+
+    def _write_loop(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Serialize and append buffered events (rotating first if due).
+
+        Returns:
+            Number of events written
+        """
+        with self._lock:
+            batch, self._pending = self._pending, []
+            drops, self._unreported_drops = dict(self._unreported_drops), defaultdict(int)
+
+        now = time.time()
+        lines = []
+        if drops:
+            lines.append(self._encode(now, "events_dropped", "event_log",
+                                      {"count": sum(drops.values()), "by_type": drops}))
+        for ts, event, source, record in batch:
+            try:
+                lines.append(self._encode(ts, event, source, record))
+            except (TypeError, ValueError) as e:
+                self.stats['errors'] += 1
+                self._count_drop(event)
+                logger.error(f"Unserializable {event} event: {e}")
+        if not lines:
+            return 0
+
+        payload = "".join(lines).encode('utf-8')
+        start = time.perf_counter()
+        try:
+            with self._write_lock:
+                if self._closed:
+                    raise OSError("event log is closed")
+                self._rotate_if_due(len(payload), now)
+                self._open()
+                self._file.write(payload)
+                self._file.flush()
+        except OSError as e:
+            self.stats['errors'] += 1
+            with self._lock:
+                for event, count in drops.items():
+                    self._unreported_drops[event] += count  # Report them with the next batch
+            for _, event, _, _ in batch:
+                self._count_drop(event)
+            logger.error(f"Event log write failed: {e}")
+            return 0
+
+        written = len(lines) - (1 if drops else 0)
+        self.stats['written'] += written
+        self.stats['bytes_written'] += len(payload)
+        self.stats['batches'] += 1
+        self.stats['last_flush_ms'] = (time.perf_counter() - start) * 1000
+        return written
+
+    def _count_drop(self, event: str) -> None:
+        with self._lock:
+            self.stats['dropped'] += 1
+            self.stats['dropped_by_type'][event] += 1
+            self._unreported_drops[event] += 1
+
+    @staticmethod
+    def _encode(ts: float, event: str, source: Optional[str], record: Any) -> str:
+        data = record.to_dict() if hasattr(record, 'to_dict') else dict(record)
+        data.update(ts=ts, event=event, source=source)
+        return json.dumps(data, default=str, separators=(',', ':')) + "\n"
+
+    # Rotation
+
+    def _open(self) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'ab')
+            self._opened_at = time.time()
+
+    def _rotate_if_due(self, incoming: int, now: float) -> None:
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size == 0:
+            return
+        too_big = size + incoming > self.max_bytes
+        too_old = self.max_age is not None and self._file is not None and now - self._opened_at >= self.max_age
+        if too_big or too_old:
+            self.rotate()
+
+    def rotate(self) -> Optional[Path]:
+        """
+        Close the active file and move it aside (compressed if configured).
+
+        Returns:
+            Path of the rotated segment, or None if there was nothing to rotate
+        """
+        with self._write_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            if not self.path.exists() or self.path.stat().st_size == 0:
+                return None
+
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+            target = self.path.with_name(f"{self.path.stem}-{stamp}{self.path.suffix}")
+            counter = 1
+            while target.exists() or self._compressed(target).exists():
+                target = self.path.with_name(f"{self.path.stem}-{stamp}.{counter}{self.path.suffix}")
+                counter += 1
+            os.replace(self.path, target)
+            target = self._compress(target)
+            self.stats['rotations'] += 1
+            self._prune()
+            return target
+
+    def _compressed(self, path: Path) -> Path:
+        return path.with_name(path.name + COMPRESSION_SUFFIXES[self.compression])
+
+    def _compress(self, path: Path) -> Path:
+        if not self.compression:
+            return path
+        target = self._compressed(path)
+        with open(path, 'rb') as src:
+            if self.compression == "gzip":
+                with gzip.open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                with open(target, 'wb') as raw:
+                    with self._zstd.ZstdCompressor().stream_writer(raw) as dst:
+                        shutil.copyfileobj(src, dst)
+        path.unlink()
+        return target
+
+    def segments(self) -> List[Path]:
+        """Rotated segments, oldest first."""
+        prefix = f"{self.path.stem}-"
+        return sorted(
+            (p for p in self.path.parent.iterdir()
+             if p.name.startswith(prefix) and p != self.path),
+            key=lambda p: (p.stat().st_mtime_ns, p.name)
+        )
+
+    def _prune(self) -> None:
+        if self.backups is None:
+            return
+        segments = self.segments()
+        for old in segments[:max(len(segments) - self.backups, 0)]:
+            try:
+                old.unlink()
+            except OSError as e:
+                logger.error(f"Removing old event log {old} failed: {e}")
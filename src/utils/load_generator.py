@@ -0,0 +1,700 @@
+"""
+Synthetic load generator for scaling tests.
+
+Where MockDataGenerator tells a small, stable story for teaching, this
+generator produces *volume*: thousands of devices, tens of thousands of
+domains and 100k+ packets, all from a seed so every run is identical.
+
+Generation is vectorized with NumPy: a batch is a handful of column arrays
+(kind, device, flow, domain, length, time), so producing it is never the
+bottleneck. A batch can then be materialized as:
+
+- records: scapy-free packet objects that answer ``haslayer()`` and
+  ``packet[Layer]`` like scapy does, so they can be fed straight into the
+  real plugin handlers (TrafficStatistics, DNSMonitor, HTTPSniffer,
+  ARPSpoofingDetector, NetworkTopologyPlugin.observe_packet)
+- frames: raw Ethernet frame bytes (and 802.11 beacon frames) for anything
+  that decodes wire data, e.g. ``scapy.all.Ether(frame)``
+
+Usage:
+    >>> gen = SyntheticLoadGenerator(seed=7, devices=5000, domains=50000)
+    >>> batch = gen.batch(100_000, rate_pps=100_000)
+    >>> for packet in gen.records(batch):
+    ...     traffic_plugin._process_packet(packet)
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import ipaddress
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Packet kinds (values of PacketBatch.kind)
+KIND_TCP = 0
+KIND_UDP = 1
+KIND_DNS_QUERY = 2
+KIND_DNS_RESPONSE = 3
+KIND_HTTP = 4
+KIND_ARP = 5
+
+KIND_NAMES = ('tcp', 'udp', 'dns_query', 'dns_response', 'http', 'arp')
+
+# Typical home/office mix; overridable per generator
+DEFAULT_MIX = {
+    'tcp': 0.55,
+    'udp': 0.20,
+    'dns_query': 0.10,
+    'dns_response': 0.10,
+    'http': 0.03,
+    'arp': 0.02,
+}
+
+# Header sizes (bytes)
+ETHER_LEN = 14
+IPV4_LEN = 20
+TCP_LEN = 20
+UDP_LEN = 8
+DNS_HEADER_LEN = 12
+DNS_ANSWER_LEN = 16
+ARP_FRAME_LEN = ETHER_LEN + 28
+
+_WORDS = (
+    'cloud', 'stream', 'photo', 'news', 'shop', 'game', 'mail', 'video',
+    'music', 'maps', 'social', 'learn', 'code', 'docs', 'cdn', 'api',
+    'static', 'media', 'play', 'chat', 'store', 'home', 'smart', 'sync',
+)
+_TLDS = ('com', 'net', 'org', 'io', 'edu', 'br', 'tv', 'app')
+_CHANNELS = (1, 6, 11, 36, 40, 44, 48, 149, 153, 157, 161)
+_DEVICE_TYPES = ('phone', 'laptop', 'tablet', 'tv', 'console', 'camera', 'sensor', 'printer')
+
+# RSN element body: WPA2, CCMP pairwise, PSK auth
+_RSN_BODY = bytes.fromhex('0100000fac040100000fac040100000fac020000')
+
+
+@dataclass
+class PacketBatch:
+    """
+    Column-oriented batch of synthetic packets (one NumPy array per field).
+
+    Attributes:
+        kind: Packet kind (KIND_* constants)
+        device: Index of the local device involved
+        flow: Flow index for TCP/UDP packets, -1 otherwise
+        domain: Domain index for DNS/HTTP packets, -1 otherwise
+        uplink: True when the local device is the sender
+        length: Frame length in bytes
+        time: Synthetic capture timestamp (seconds)
+    """
+    kind: Any
+    device: Any
+    flow: Any
+    domain: Any
+    uplink: Any
+    length: Any
+    time: Any
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def counts(self) -> Dict[str, int]:
+        """Packets per kind name."""
+        totals = np.bincount(self.kind, minlength=len(KIND_NAMES))
+        return {name: int(totals[i]) for i, name in enumerate(KIND_NAMES)}
+
+
+class SyntheticLayer:
+    """One protocol layer of a SyntheticPacket (plain attribute bag)."""
+
+    def __init__(self, **fields):
+        self.__dict__ = fields
+
+    def __repr__(self) -> str:
+        return f"SyntheticLayer({self.__dict__})"
+
+
+class SyntheticPacket:
+    """
+    Scapy-free packet record.
+
+    Layers are looked up by class name, so ``packet.haslayer(IP)`` and
+    ``packet[DNSQR]`` work with scapy's own classes (or plain strings)
+    without scapy building or dissecting anything.
+    """
+
+    __slots__ = ('layers', 'length', 'time')
+
+    def __init__(self, layers: Dict[str, SyntheticLayer], length: int, time: float = 0.0):
+        self.layers = layers
+        self.length = length
+        self.time = time
+
+    @staticmethod
+    def _name(layer) -> str:
+        return layer if isinstance(layer, str) else layer.__name__
+
+    def haslayer(self, layer) -> bool:
+        return self._name(layer) in self.layers
+
+    def getlayer(self, layer) -> Optional[SyntheticLayer]:
+        return self.layers.get(self._name(layer))
+
+    def __getitem__(self, layer) -> SyntheticLayer:
+        name = self._name(layer)
+        try:
+            return self.layers[name]
+        except KeyError:
+            raise IndexError(f"Layer [{name}] not found")
+
+    def __contains__(self, layer) -> bool:
+        return self.haslayer(layer)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return f"<SyntheticPacket {'/'.join(self.layers)} len={self.length}>"
+
+
+def _zipf_probabilities(n: int, exponent: float) -> "np.ndarray":
+    """Popularity skew: rank r is chosen with probability ~ 1 / r**exponent."""
+    weights = 1.0 / np.arange(1, n + 1, dtype=np.float64) ** exponent
+    return weights / weights.sum()
+
+
+def _be16(values) -> "np.ndarray":
+    values = np.asarray(values, dtype=np.uint32)
+    return np.stack([(values >> 8) & 0xFF, values & 0xFF], axis=1).astype(np.uint8)
+
+
+def _be32(values) -> "np.ndarray":
+    values = np.asarray(values, dtype=np.uint64)
+    shifts = np.array([24, 16, 8, 0], dtype=np.uint64)
+    return ((values[:, None] >> shifts) & 0xFF).astype(np.uint8)
+
+
+def _mac_bytes(values) -> "np.ndarray":
+    values = np.asarray(values, dtype=np.uint64)
+    shifts = np.array([40, 32, 24, 16, 8, 0], dtype=np.uint64)
+    return ((values[:, None] >> shifts) & 0xFF).astype(np.uint8)
+
+
+def _mac_str(value: int) -> str:
+    return ':'.join(f"{(int(value) >> shift) & 0xFF:02x}" for shift in (40, 32, 24, 16, 8, 0))
+
+
+def _ip_str(value: int) -> str:
+    return str(ipaddress.IPv4Address(int(value)))
+
+
+def _ipv4_headers(src, dst, proto: int, payload_len, ident) -> "np.ndarray":
+    """Vectorized IPv4 headers (n, 20) with valid checksums."""
+    n = len(src)
+    header = np.zeros((n, IPV4_LEN), dtype=np.uint8)
+    header[:, 0] = 0x45
+    header[:, 2:4] = _be16(IPV4_LEN + np.asarray(payload_len))
+    header[:, 4:6] = _be16(ident)
+    header[:, 6] = 0x40  # Don't fragment
+    header[:, 8] = 64  # TTL
+    header[:, 9] = proto
+    header[:, 12:16] = _be32(src)
+    header[:, 16:20] = _be32(dst)
+
+    words = header.reshape(n, 10, 2).astype(np.uint32)
+    total = (words[:, :, 0] << 8 | words[:, :, 1]).sum(axis=1)
+    total = (total & 0xFFFF) + (total >> 16)
+    total = (total & 0xFFFF) + (total >> 16)
+    header[:, 10:12] = _be16(~total & 0xFFFF)
+    return header
+
+
+def _ether_headers(dst_mac, src_mac, ethertype: int) -> "np.ndarray":
+    n = len(src_mac)
+    header = np.zeros((n, ETHER_LEN), dtype=np.uint8)
+    header[:, 0:6] = _mac_bytes(dst_mac)
+    header[:, 6:12] = _mac_bytes(src_mac)
+    header[:, 12:14] = _be16(np.full(n, ethertype))
+    return header
+
+
+class SyntheticLoadGenerator:
+    """
+    Seeded, vectorized traffic generator for load-testing plugins and screens.
+
+    The same seed and parameters always yield the same populations and the
+    same packet sequence.
+
+    Args:
+        seed: RNG seed
+        devices: Local devices (hosts on ``subnet``)
+        domains: Distinct DNS names (Zipf-distributed popularity)
+        access_points: Access points for beacon frames
+        flows: Long-lived TCP/UDP conversations between devices and the internet
+        subnet: Local network; the first host is the gateway
+        mix: Share of each packet kind (keys from KIND_NAMES)
+        start_time: Timestamp of the first packet
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        devices: int = 50,
+        domains: int = 500,
+        access_points: int = 10,
+        flows: int = 1000,
+        subnet: str = "10.0.0.0/16",
+        mix: Optional[Dict[str, float]] = None,
+        start_time: float = 0.0
+    ):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy library not installed. Install with: pip install numpy")
+
+        network = ipaddress.IPv4Network(subnet)
+        if devices < 1 or devices > network.num_addresses - 3:
+            raise ValueError(f"{devices} devices do not fit in {subnet}")
+
+        self._rng = np.random.default_rng(seed)
+        self._clock = start_time
+
+        mix = dict(DEFAULT_MIX if mix is None else mix)
+        unknown = set(mix) - set(KIND_NAMES)
+        if unknown:
+            raise ValueError(f"Unknown packet kinds in mix: {sorted(unknown)}")
+        weights = np.array([mix.get(name, 0.0) for name in KIND_NAMES], dtype=np.float64)
+        self._mix = weights / weights.sum()
+
+        self._build_devices(network, devices)
+        self._build_domains(domains)
+        self._build_flows(flows)
+        self._build_access_points(access_points)
+
+    # ------------------------------------------------------------------
+    # Populations
+    # ------------------------------------------------------------------
+
+    def _build_devices(self, network: ipaddress.IPv4Network, count: int) -> None:
+        base = int(network.network_address)
+        self.gateway_ip_int = base + 1
+        self.gateway_mac_int = int(self._rng.integers(0, 2 ** 40)) | 0x02 << 40
+        self.device_ip_int = base + 2 + np.arange(count, dtype=np.uint64)
+        # Locally administered, unicast MACs
+        macs = self._rng.integers(0, 2 ** 40, size=count, dtype=np.uint64)
+        self.device_mac_int = macs | np.uint64(0x02 << 40)
+        self._device_p = _zipf_probabilities(count, 0.8)
+
+        self.gateway_ip = _ip_str(self.gateway_ip_int)
+        self.gateway_mac = _mac_str(self.gateway_mac_int)
+        self.device_ips = [_ip_str(ip) for ip in self.device_ip_int]
+        self.device_macs = [_mac_str(mac) for mac in self.device_mac_int]
+        types = self._rng.integers(0, len(_DEVICE_TYPES), size=count)
+        self.device_hostnames = [f"{_DEVICE_TYPES[t]}-{i:05d}" for i, t in enumerate(types)]
+
+    def _build_domains(self, count: int) -> None:
+        first = self._rng.integers(0, len(_WORDS), size=count)
+        second = self._rng.integers(0, len(_WORDS), size=count)
+        tld = self._rng.integers(0, len(_TLDS), size=count)
+        self.domains = [
+            f"{_WORDS[a]}{_WORDS[b]}{i}.{_TLDS[t]}"
+            for i, (a, b, t) in enumerate(zip(first, second, tld))
+        ]
+        self.domain_ip_int = self._rng.integers(0x17000000, 0xDF000000, size=count, dtype=np.uint64)
+        self.domain_ips = [_ip_str(ip) for ip in self.domain_ip_int]
+        self._domain_p = _zipf_probabilities(count, 1.1)
+        # Wire-format pieces, built lazily per domain
+        self._qnames: List[Optional[bytes]] = [None] * count
+        self._http_requests: List[Optional[bytes]] = [None] * count
+
+    def _build_flows(self, count: int) -> None:
+        rng = self._rng
+        n_devices = len(self.device_ips)
+        self.flow_device = rng.choice(n_devices, size=count, p=self._device_p).astype(np.int32)
+        self.flow_remote_ip_int = rng.integers(0x17000000, 0xDF000000, size=count, dtype=np.uint64)
+        self.flow_local_port = rng.integers(32768, 61000, size=count).astype(np.uint32)
+        self.flow_proto = np.where(rng.random(count) < 0.8, 6, 17).astype(np.uint8)
+        tcp_ports = np.array([443, 443, 443, 80, 22, 8080, 993])
+        udp_ports = np.array([443, 123, 3478, 4500, 1900])
+        self.flow_remote_port = np.where(
+            self.flow_proto == 6,
+            rng.choice(tcp_ports, size=count),
+            rng.choice(udp_ports, size=count)
+        ).astype(np.uint32)
+        self.flow_remote_ips = [_ip_str(ip) for ip in self.flow_remote_ip_int]
+        self._flow_ports = list(zip(self.flow_local_port.tolist(), self.flow_remote_port.tolist()))
+
+        self._tcp_flows = np.nonzero(self.flow_proto == 6)[0]
+        self._udp_flows = np.nonzero(self.flow_proto == 17)[0]
+        self._tcp_flow_p = _zipf_probabilities(len(self._tcp_flows), 1.0) if len(self._tcp_flows) else None
+        self._udp_flow_p = _zipf_probabilities(len(self._udp_flows), 1.0) if len(self._udp_flows) else None
+
+    def _build_access_points(self, count: int) -> None:
+        rng = self._rng
+        macs = rng.integers(0, 2 ** 40, size=count, dtype=np.uint64)
+        self.ap_bssid_int = macs | np.uint64(0x02 << 40)
+        self.ap_bssids = [_mac_str(mac) for mac in self.ap_bssid_int]
+        self.ap_ssids = [f"Net-{i:04d}" for i in range(count)]
+        self.ap_channels = rng.choice(_CHANNELS, size=count).astype(np.uint8)
+        self.ap_signal = rng.integers(-90, -30, size=count).astype(np.int8)
+        self._beacons = [self._beacon_template(i) for i in range(count)]
+
+    def device_table(self) -> List[Dict[str, str]]:
+        """Local devices as dicts (ip, mac, hostname), e.g. for register_device()."""
+        return [
+            {"ip": ip, "mac": mac, "hostname": hostname}
+            for ip, mac, hostname in zip(self.device_ips, self.device_macs, self.device_hostnames)
+        ]
+
+    def access_point_table(self) -> List[Dict[str, Any]]:
+        """Access points as dicts (bssid, ssid, channel)."""
+        return [
+            {"bssid": bssid, "ssid": ssid, "channel": int(channel)}
+            for bssid, ssid, channel in zip(self.ap_bssids, self.ap_ssids, self.ap_channels)
+        ]
+
+    # ------------------------------------------------------------------
+    # Batches
+    # ------------------------------------------------------------------
+
+    def batch(self, count: int, rate_pps: Optional[float] = None) -> PacketBatch:
+        """
+        Generate ``count`` packets as column arrays.
+
+        Args:
+            count: Number of packets
+            rate_pps: Mean packet rate for the synthetic timestamps
+                (Poisson arrivals); None stamps the whole batch at once
+        """
+        rng = self._rng
+        kind = rng.choice(len(KIND_NAMES), size=count, p=self._mix).astype(np.int8)
+
+        device = rng.choice(len(self.device_ips), size=count, p=self._device_p).astype(np.int32)
+        flow = np.full(count, -1, dtype=np.int32)
+        domain = np.full(count, -1, dtype=np.int32)
+        uplink = rng.random(count) < 0.4
+        length = np.zeros(count, dtype=np.int32)
+
+        # TCP/UDP packets belong to a flow, whose device wins
+        for flow_kind, flows, probs in ((KIND_TCP, self._tcp_flows, self._tcp_flow_p),
+                                        (KIND_UDP, self._udp_flows, self._udp_flow_p)):
+            sel = np.nonzero(kind == flow_kind)[0]
+            if len(sel) == 0:
+                continue
+            if flows is None or len(flows) == 0:
+                kind[sel] = KIND_DNS_QUERY  # No flows of this protocol
+                continue
+            chosen = flows[rng.choice(len(flows), size=len(sel), p=probs)]
+            flow[sel] = chosen
+            device[sel] = self.flow_device[chosen]
+
+        sel = np.nonzero(kind == KIND_TCP)[0]
+        bulk = rng.random(len(sel)) < 0.55
+        length[sel] = np.where(bulk, rng.integers(200, 1515, size=len(sel)), 66)
+        sel = np.nonzero(kind == KIND_UDP)[0]
+        length[sel] = rng.integers(60, 1200, size=len(sel))
+
+        # DNS and HTTP name a domain; lengths follow from the name
+        named = np.nonzero((kind == KIND_DNS_QUERY) | (kind == KIND_DNS_RESPONSE) | (kind == KIND_HTTP))[0]
+        domain[named] = rng.choice(len(self.domains), size=len(named), p=self._domain_p)
+        for i in named:
+            length[i] = self._named_length(int(kind[i]), int(domain[i]))
+
+        uplink[kind == KIND_DNS_QUERY] = True
+        uplink[kind == KIND_DNS_RESPONSE] = False
+        uplink[kind == KIND_HTTP] = True
+        uplink[kind == KIND_ARP] = True
+        length[kind == KIND_ARP] = ARP_FRAME_LEN
+
+        if rate_pps:
+            gaps = rng.exponential(1.0 / rate_pps, size=count)
+            stamps = self._clock + np.cumsum(gaps)
+        else:
+            stamps = np.full(count, self._clock)
+        if count:
+            self._clock = float(stamps[-1])
+
+        return PacketBatch(kind=kind, device=device, flow=flow, domain=domain,
+                           uplink=uplink, length=length, time=stamps)
+
+    def stream(self, rate_pps: float, duration: float, batch_size: int = 10_000,
+               realtime: bool = False) -> Iterator[PacketBatch]:
+        """
+        Yield batches totalling ``rate_pps * duration`` packets.
+
+        With ``realtime=True`` each batch is released when its last
+        timestamp is due, so consumers see the configured rate.
+        """
+        remaining = int(rate_pps * duration)
+        started = time.monotonic()
+        origin = self._clock
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            batch = self.batch(size, rate_pps=rate_pps)
+            remaining -= size
+            if realtime:
+                delay = (self._clock - origin) - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            yield batch
+
+    def feed(self, handler: Callable[[Any], Any], count: int, batch_size: int = 10_000) -> int:
+        """Generate ``count`` packet records and pass each to ``handler``."""
+        fed = 0
+        while fed < count:
+            batch = self.batch(min(batch_size, count - fed))
+            for packet in self.records(batch):
+                handler(packet)
+            fed += len(batch)
+        return fed
+
+    # ------------------------------------------------------------------
+    # Records (scapy-free packet objects)
+    # ------------------------------------------------------------------
+
+    def records(self, batch: PacketBatch) -> List[SyntheticPacket]:
+        """Materialize a batch as SyntheticPacket records."""
+        packets = []
+        kinds = batch.kind.tolist()
+        devices = batch.device.tolist()
+        flows = batch.flow.tolist()
+        domains = batch.domain.tolist()
+        uplinks = batch.uplink.tolist()
+        lengths = batch.length.tolist()
+        stamps = batch.time.tolist()
+        ports = self._rng.integers(32768, 61000, size=len(batch)).tolist()
+
+        for i, kind in enumerate(kinds):
+            device = devices[i]
+            local_ip = self.device_ips[device]
+            local_mac = self.device_macs[device]
+            up = uplinks[i]
+
+            if kind == KIND_ARP:
+                layers = {
+                    'Ether': SyntheticLayer(src=local_mac, dst="ff:ff:ff:ff:ff:ff", type=0x0806),
+                    'ARP': SyntheticLayer(op=2, psrc=local_ip, hwsrc=local_mac,
+                                          pdst=self.gateway_ip, hwdst=self.gateway_mac),
+                }
+                packets.append(SyntheticPacket(layers, lengths[i], stamps[i]))
+                continue
+
+            if kind in (KIND_TCP, KIND_UDP):
+                f = flows[i]
+                remote_ip = self.flow_remote_ips[f]
+                local_port, remote_port = self._flow_ports[f]
+            elif kind == KIND_HTTP:
+                remote_ip = self.domain_ips[domains[i]]
+                local_port, remote_port = ports[i], 80
+            else:
+                remote_ip = self.gateway_ip  # Gateway is the DNS resolver
+                local_port, remote_port = ports[i], 53
+
+            src, dst = (local_ip, remote_ip) if up else (remote_ip, local_ip)
+            sport, dport = (local_port, remote_port) if up else (remote_port, local_port)
+            ether = (SyntheticLayer(src=local_mac, dst=self.gateway_mac, type=0x0800) if up
+                     else SyntheticLayer(src=self.gateway_mac, dst=local_mac, type=0x0800))
+
+            if kind in (KIND_TCP, KIND_HTTP):
+                layers = {
+                    'Ether': ether,
+                    'IP': SyntheticLayer(src=src, dst=dst, proto=6, ttl=64, len=lengths[i] - ETHER_LEN),
+                    'TCP': SyntheticLayer(sport=sport, dport=dport, flags='PA'),
+                }
+                if kind == KIND_HTTP:
+                    layers['Raw'] = SyntheticLayer(load=self._http_request(domains[i]))
+            else:
+                layers = {
+                    'Ether': ether,
+                    'IP': SyntheticLayer(src=src, dst=dst, proto=17, ttl=64, len=lengths[i] - ETHER_LEN),
+                    'UDP': SyntheticLayer(sport=sport, dport=dport),
+                }
+                if kind in (KIND_DNS_QUERY, KIND_DNS_RESPONSE):
+                    self._add_dns_layers(layers, kind, domains[i])
+
+            packets.append(SyntheticPacket(layers, lengths[i], stamps[i]))
+
+        return packets
+
+    def _add_dns_layers(self, layers: Dict[str, SyntheticLayer], kind: int, domain: int) -> None:
+        qname = (self.domains[domain] + '.').encode()
+        is_response = kind == KIND_DNS_RESPONSE
+        layers['DNS'] = SyntheticLayer(qr=int(is_response), qdcount=1, ancount=int(is_response))
+        layers['DNSQR'] = SyntheticLayer(qname=qname, qtype=1, qclass=1)
+        if is_response:
+            layers['DNSRR'] = SyntheticLayer(rrname=qname, type=1, rclass=1, ttl=300,
+                                             rdata=self.domain_ips[domain])
+
+    def _named_length(self, kind: int, domain: int) -> int:
+        if kind == KIND_HTTP:
+            return ETHER_LEN + IPV4_LEN + TCP_LEN + len(self._http_request(domain))
+        length = ETHER_LEN + IPV4_LEN + UDP_LEN + DNS_HEADER_LEN + len(self._qname(domain)) + 4
+        if kind == KIND_DNS_RESPONSE:
+            length += DNS_ANSWER_LEN
+        return length
+
+    def _qname(self, domain: int) -> bytes:
+        encoded = self._qnames[domain]
+        if encoded is None:
+            labels = self.domains[domain].split('.')
+            encoded = b''.join(bytes([len(label)]) + label.encode() for label in labels) + b'\x00'
+            self._qnames[domain] = encoded
+        return encoded
+
+    def _http_request(self, domain: int) -> bytes:
+        request = self._http_requests[domain]
+        if request is None:
+            request = (
+                f"GET /index.html HTTP/1.1\r\nHost: {self.domains[domain]}\r\n"
+                f"User-Agent: Mozilla/5.0 (synthetic)\r\n\r\n"
+            ).encode()
+            self._http_requests[domain] = request
+        return request
+
+    # ------------------------------------------------------------------
+    # Raw frames
+    # ------------------------------------------------------------------
+
+    def frames(self, batch: PacketBatch) -> List[bytes]:
+        """
+        Materialize a batch as raw Ethernet frames.
+
+        Headers are built column-wise per packet kind (IPv4 checksums
+        included); only payload concatenation is per packet. TCP checksums
+        are left at zero and UDP uses the IPv4 "no checksum" value.
+        """
+        n = len(batch)
+        out: List[bytes] = [b''] * n
+        rng = self._rng
+        ident = rng.integers(0, 65536, size=n)
+        ports = rng.integers(32768, 61000, size=n)
+
+        device = batch.device
+        up = batch.uplink
+        local_mac = self.device_mac_int[device]
+        local_ip = self.device_ip_int[device]
+        gateway_mac = np.full(n, self.gateway_mac_int, dtype=np.uint64)
+
+        # ARP replies: fully vectorized
+        sel = np.nonzero(batch.kind == KIND_ARP)[0]
+        if len(sel):
+            rows = np.zeros((len(sel), ARP_FRAME_LEN), dtype=np.uint8)
+            rows[:, :ETHER_LEN] = _ether_headers(np.full(len(sel), 0xFFFFFFFFFFFF, dtype=np.uint64),
+                                                 local_mac[sel], 0x0806)
+            rows[:, 14:22] = np.frombuffer(bytes.fromhex('0001080006040002'), dtype=np.uint8)
+            rows[:, 22:28] = _mac_bytes(local_mac[sel])
+            rows[:, 28:32] = _be32(local_ip[sel])
+            rows[:, 32:38] = _mac_bytes(gateway_mac[sel])
+            rows[:, 38:42] = _be32(np.full(len(sel), self.gateway_ip_int, dtype=np.uint64))
+            for j, i in enumerate(sel):
+                out[i] = rows[j].tobytes()
+
+        # Remote endpoint and ports per packet
+        remote_ip = np.full(n, self.gateway_ip_int, dtype=np.uint64)
+        local_port = ports.astype(np.uint32)
+        remote_port = np.full(n, 53, dtype=np.uint32)
+        has_flow = batch.flow >= 0
+        flows = batch.flow[has_flow]
+        remote_ip[has_flow] = self.flow_remote_ip_int[flows]
+        local_port[has_flow] = self.flow_local_port[flows]
+        remote_port[has_flow] = self.flow_remote_port[flows]
+        http = batch.kind == KIND_HTTP
+        remote_ip[http] = self.domain_ip_int[batch.domain[http]]
+        remote_port[http] = 80
+
+        src_ip = np.where(up, local_ip, remote_ip)
+        dst_ip = np.where(up, remote_ip, local_ip)
+        src_mac = np.where(up, local_mac, gateway_mac)
+        dst_mac = np.where(up, gateway_mac, local_mac)
+        sport = np.where(up, local_port, remote_port)
+        dport = np.where(up, remote_port, local_port)
+
+        # TCP (bulk and HTTP)
+        sel = np.nonzero((batch.kind == KIND_TCP) | http)[0]
+        if len(sel):
+            payload_len = batch.length[sel] - (ETHER_LEN + IPV4_LEN + TCP_LEN)
+            rows = np.zeros((len(sel), ETHER_LEN + IPV4_LEN + TCP_LEN), dtype=np.uint8)
+            rows[:, :14] = _ether_headers(dst_mac[sel], src_mac[sel], 0x0800)
+            rows[:, 14:34] = _ipv4_headers(src_ip[sel], dst_ip[sel], 6, TCP_LEN + payload_len, ident[sel])
+            rows[:, 34:36] = _be16(sport[sel])
+            rows[:, 36:38] = _be16(dport[sel])
+            rows[:, 38:42] = _be32(rng.integers(0, 2 ** 32, size=len(sel), dtype=np.uint64))
+            rows[:, 46] = 0x50  # Data offset: 5 words
+            rows[:, 47] = 0x18  # PSH, ACK
+            rows[:, 48:50] = 0xFF  # Window
+            domains = batch.domain[sel]
+            for j, i in enumerate(sel):
+                if http[i]:
+                    out[i] = rows[j].tobytes() + self._http_request(int(domains[j]))
+                else:
+                    out[i] = rows[j].tobytes() + bytes(int(payload_len[j]))
+
+        # UDP, DNS queries and DNS responses
+        dns = (batch.kind == KIND_DNS_QUERY) | (batch.kind == KIND_DNS_RESPONSE)
+        sel = np.nonzero((batch.kind == KIND_UDP) | dns)[0]
+        if len(sel):
+            udp_len = batch.length[sel] - (ETHER_LEN + IPV4_LEN)
+            rows = np.zeros((len(sel), ETHER_LEN + IPV4_LEN + UDP_LEN + DNS_HEADER_LEN), dtype=np.uint8)
+            rows[:, :14] = _ether_headers(dst_mac[sel], src_mac[sel], 0x0800)
+            rows[:, 14:34] = _ipv4_headers(src_ip[sel], dst_ip[sel], 17, udp_len, ident[sel])
+            rows[:, 34:36] = _be16(sport[sel])
+            rows[:, 36:38] = _be16(dport[sel])
+            rows[:, 38:40] = _be16(udp_len)
+
+            is_response = batch.kind[sel] == KIND_DNS_RESPONSE
+            rows[:, 42:44] = _be16(ident[sel])  # DNS transaction id
+            rows[:, 44:46] = np.where(is_response[:, None],
+                                      np.array([0x81, 0x80], dtype=np.uint8),
+                                      np.array([0x01, 0x00], dtype=np.uint8))
+            rows[:, 47] = 1  # QDCOUNT
+            rows[:, 49] = is_response  # ANCOUNT
+
+            dns_sel = dns[sel]
+            domains = batch.domain[sel]
+            for j, i in enumerate(sel):
+                if not dns_sel[j]:
+                    head = rows[j, :ETHER_LEN + IPV4_LEN + UDP_LEN].tobytes()
+                    out[i] = head + bytes(int(udp_len[j]) - UDP_LEN)
+                    continue
+                domain = int(domains[j])
+                frame = rows[j].tobytes() + self._qname(domain) + b'\x00\x01\x00\x01'
+                if is_response[j]:
+                    frame += (b'\xc0\x0c\x00\x01\x00\x01\x00\x00\x01\x2c\x00\x04'
+                              + int(self.domain_ip_int[domain]).to_bytes(4, 'big'))
+                out[i] = frame
+
+        return out
+
+    def _beacon_template(self, index: int) -> bytes:
+        """RadioTap + 802.11 beacon for one AP (signal byte patched per frame)."""
+        ssid = self.ap_ssids[index].encode()
+        bssid = int(self.ap_bssid_int[index]).to_bytes(6, 'big')
+        radiotap = bytes([0, 0, 9, 0, 0x20, 0, 0, 0, 0])  # Present: dBm_AntSignal
+        dot11 = b'\x80\x00\x00\x00' + b'\xff' * 6 + bssid + bssid + b'\x00\x00'
+        fixed = bytes(8) + b'\x64\x00' + b'\x11\x04'  # Timestamp, 100 TU, ESS + privacy
+        elements = (
+            bytes([0, len(ssid)]) + ssid
+            + bytes([1, 8]) + bytes([0x82, 0x84, 0x8b, 0x96, 0x0c, 0x12, 0x18, 0x24])
+            + bytes([3, 1, int(self.ap_channels[index])])
+            + bytes([48, len(_RSN_BODY)]) + _RSN_BODY
+        )
+        return radiotap + dot11 + fixed + elements
+
+    def beacon_frames(self, count: int) -> List[bytes]:
+        """Beacon frames from the AP population (decode with scapy's RadioTap)."""
+        if not self._beacons:
+            return []
+        aps = self._rng.integers(0, len(self._beacons), size=count)
+        jitter = self._rng.integers(-3, 4, size=count)
+        signal = np.clip(self.ap_signal[aps].astype(np.int16) + jitter, -100, -1)
+        frames = []
+        for ap, dbm in zip(aps.tolist(), signal.tolist()):
+            frame = bytearray(self._beacons[ap])
+            frame[8] = dbm & 0xFF
+            frames.append(bytes(frame))
+        return frames
@@ -0,0 +1,384 @@
+"""
+Metrics exporter - Prometheus/OpenMetrics ``/metrics`` endpoint.
+
+Serves the counters the plugins already keep (detector ``stats``,
+PacketAnalyzer rates, ``error_count``) on a localhost port. A scrape only
+reads the latest snapshots the collector has already published
+(``CollectorDaemon.snapshots()``): it never calls ``collect_data()``, so
+scraping can't trigger a capture or block a collector.
+
+The detectors are on-demand plugins: given the PluginActivation, the
+exporter holds them as consumer ``exporter:metrics`` (``acquire_plugins()``)
+so a headless daemon collects them without any client attached.
+Per-component latency quantiles come from the perf registry
+(``perf_families()``).
+
+Plain Prometheus text (0.0.4) is served by default; scrapers that send
+``Accept: application/openmetrics-text`` get OpenMetrics 1.0.
+
+Usage:
+    >>> exporter = MetricsExporter(daemon.snapshots, lambda: daemon.plugins, port=9469)
+    >>> exporter.start()
+    >>> # curl http://127.0.0.1:9469/metrics
+    >>> exporter.stop()
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PORT = 9469
+
+# PluginActivation consumer holding the plugins in PLUGIN_STATS
+CONSUMER = "exporter:metrics"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+COUNTER = "counter"
+GAUGE = "gauge"
+SUMMARY = "summary"
+
+# Capture plugins' packet queue ('capture' in their snapshot)
+CAPTURE_STATS = {
+    "enqueued": ("wf_capture_enqueued_packets", COUNTER, "Packets queued for analysis"),
+    "processed": ("wf_capture_processed_packets", COUNTER, "Packets analysed"),
+    "dropped": ("wf_capture_dropped_packets", COUNTER, "Packets dropped by the queue's overflow policy"),
+    "errors": ("wf_capture_handler_errors", COUNTER, "Packets whose analysis failed"),
+    "kernel_drops": ("wf_capture_kernel_dropped_packets", COUNTER,
+                     "Packets dropped by the kernel before capture (PACKET_STATISTICS)"),
+    "depth": ("wf_capture_queue_depth", GAUGE, "Packets waiting for analysis"),
+    "high_water": ("wf_capture_queue_high_water", GAUGE, "Most packets ever waiting for analysis"),
+}
+
+# PacketSampler counters (data['sampling'] of sampled plugins)
+SAMPLING_STATS = {
+    "rate": ("wf_sampling_rate", GAUGE, "Current N of 1-in-N packet sampling"),
+    "seen": ("wf_sampling_seen_packets", COUNTER, "Packets offered to the sampler"),
+    "skipped": ("wf_sampling_skipped_packets", COUNTER, "Packets not analysed (counted by scaling)"),
+    "exempt": ("wf_sampling_exempt_packets", COUNTER, "Security-critical packets exempt from sampling"),
+    "busy_fraction": ("wf_sampling_busy_ratio", GAUGE, "Share of one core spent analysing (adaptive mode)"),
+}
+
+# Latency quantiles exported per perf component
+PERF_QUANTILES = (50, 99)
+
+# Plugin stats exported per plugin name: (metric prefix, {field: (type, help)})
+PLUGIN_STATS = {
+    "arp_detector": ("wf_arp", {
+        "arp_packets": (COUNTER, "ARP packets inspected"),
+        "mac_changes": (COUNTER, "IP to MAC binding changes seen"),
+        "alerts_raised": (COUNTER, "ARP spoofing alerts raised"),
+        "critical_alerts": (COUNTER, "Critical ARP spoofing alerts raised"),
+    }),
+    "dns_monitor": ("wf_dns", {
+        "total_queries": (COUNTER, "DNS queries seen"),
+        "unique_domains": (GAUGE, "Distinct domains queried"),
+        "queries_per_minute": (GAUGE, "DNS queries in the last minute"),
+        "cache_hits": (COUNTER, "DNS queries for already seen domains"),
+    }),
+    "rogue_ap": ("wf_rogue_ap", {
+        "total_aps_detected": (GAUGE, "Access points seen"),
+        "baseline_aps": (GAUGE, "Access points in the learned baseline"),
+        "suspicious_aps": (GAUGE, "Access points flagged as suspicious"),
+        "rogue_aps_confirmed": (GAUGE, "Access points confirmed as rogue"),
+        "beacons_captured": (COUNTER, "Beacon frames captured"),
+    }),
+    "handshake": ("wf_handshake", {
+        "networks_detected": (GAUGE, "Networks seen by the handshake capturer"),
+        "handshakes_captured": (COUNTER, "Partial WPA handshakes captured"),
+        "complete_handshakes": (COUNTER, "Complete 4-way handshakes captured"),
+        "eapol_packets": (COUNTER, "EAPOL frames captured"),
+        "deauth_sent": (COUNTER, "Deauthentication frames sent"),
+    }),
+}
+
+# PacketAnalyzer capture window
+PACKET_STATS = {
+    "packet_rate": ("wf_packet_rate", GAUGE, "Packets per second in the last capture window"),
+    "total_packets": ("wf_packet_window_packets", GAUGE, "Packets in the last capture window"),
+}
+
+
+class MetricFamily:
+    """One metric with its type, help and labelled samples."""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.samples: List[Tuple[Dict[str, str], float, str]] = []  # (labels, value, name suffix)
+
+    def add(self, value: float, **labels: str) -> 'MetricFamily':
+        self.samples.append((labels, float(value), ""))
+        return self
+
+    def add_sample(self, suffix: str, value: float, **labels: str) -> 'MetricFamily':
+        """Sample under ``<name><suffix>``, e.g. a summary's _sum and _count."""
+        self.samples.append((labels, float(value), suffix))
+        return self
+
+
+def _number(value: Any) -> Optional[float]:
+    """Numeric value of a snapshot field (None for bools and non-numbers)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(int(value)) if value.is_integer() and abs(value) < 2 ** 53 else repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _families_from_snapshot(name: str, data: Dict[str, Any],
+                            families: Dict[str, MetricFamily]) -> None:
+    def family(metric: str, kind: str, help_text: str) -> MetricFamily:
+        if metric not in families:
+            families[metric] = MetricFamily(metric, kind, help_text)
+        return families[metric]
+
+    if name in PLUGIN_STATS and isinstance(data.get('stats'), dict):
+        prefix, fields = PLUGIN_STATS[name]
+        for field, (kind, help_text) in fields.items():
+            value = _number(data['stats'].get(field))
+            if value is not None:
+                family(f"{prefix}_{field}", kind, help_text).add(value)
+
+    capture = data.get('capture')
+    if isinstance(capture, dict):
+        for field, (metric, kind, help_text) in CAPTURE_STATS.items():
+            value = _number(capture.get(field))
+            if value is not None:
+                family(metric, kind, help_text).add(value, plugin=name)
+
+    sampling = data.get('sampling')
+    if isinstance(sampling, dict):
+        for field, (metric, kind, help_text) in SAMPLING_STATS.items():
+            value = _number(sampling.get(field))
+            if value is not None:
+                family(metric, kind, help_text).add(value, plugin=name)
+
+    if name == "packet_analyzer":
+        for field, (metric, kind, help_text) in PACKET_STATS.items():
+            value = _number(data.get(field))
+            if value is not None:
+                family(metric, kind, help_text).add(value)
+        for protocol, count in (data.get('top_protocols') or {}).items():
+            value = _number(count)
+            if value is not None:
+                family("wf_packet_window_protocol_packets", GAUGE,
+                       "Packets per protocol in the last capture window").add(value, protocol=str(protocol))
+
+
+def collect_families(snapshots: Dict[str, Tuple[float, Dict[str, Any]]],
+                     plugins: Optional[Dict[str, Any]] = None,
+                     now: Optional[float] = None) -> List[MetricFamily]:
+    """
+    Metric families for the given snapshots and plugins.
+
+    Args:
+        snapshots: {plugin: (ts, data)} - latest published data
+        plugins: {plugin: Plugin} - only error_count is read
+        now: Reference time for snapshot ages (default: time.time())
+
+    Returns:
+        Families in a stable order
+    """
+    now = time.time() if now is None else now
+    families: Dict[str, MetricFamily] = {}
+
+    for name in sorted(snapshots):
+        ts, data = snapshots[name]
+        if isinstance(data, dict):
+            _families_from_snapshot(name, data, families)
+
+    age = MetricFamily("wf_plugin_snapshot_age_seconds", GAUGE, "Seconds since the plugin's last snapshot")
+    for name in sorted(snapshots):
+        age.add(max(0.0, now - snapshots[name][0]), plugin=name)
+
+    result = list(families.values())
+    if plugins:
+        errors = MetricFamily("wf_plugin_errors", COUNTER, "Collection errors per plugin")
+        up = MetricFamily("wf_plugin_up", GAUGE, "1 if the plugin has published a snapshot")
+        for name in sorted(plugins):
+            errors.add(float(plugins[name].error_count), plugin=name)
+            up.add(1.0 if name in snapshots else 0.0, plugin=name)
+        result += [errors, up]
+    result.append(age)
+    return result
+
+
+def perf_families(perf: Any) -> List[MetricFamily]:
+    """
+    Latency summaries and packet counters from a perf registry
+    (utils.perf.PerfRegistry).
+
+    Returns:
+        wf_latency_seconds{kind, component, quantile} and
+        wf_plugin_packets{plugin, outcome} families (empty before any sample)
+    """
+    latency = MetricFamily("wf_latency_seconds", SUMMARY,
+                           "Duration of plugin collections, packet handlers and screen refreshes")
+    for kind, component in perf.components():
+        histogram = perf.histogram(kind, component)
+        values = histogram.percentiles(*PERF_QUANTILES)
+        for percent, value in zip(PERF_QUANTILES, values):
+            latency.add(value / 1_000_000, kind=kind, component=component, quantile=str(percent / 100))
+        latency.add_sample("_sum", histogram.total_us / 1_000_000, kind=kind, component=component)
+        latency.add_sample("_count", histogram.count, kind=kind, component=component)
+
+    packets = MetricFamily("wf_plugin_packets", COUNTER, "Packets per plugin handler and outcome")
+    for plugin, counters in sorted(perf.packets().items()):
+        for outcome, count in counters.items():
+            packets.add(count, plugin=plugin, outcome=outcome)
+    return [family for family in (latency, packets) if family.samples]
+
+
+def render(families: List[MetricFamily], openmetrics: bool = False) -> str:
+    """
+    Text exposition of ``families``.
+
+    Args:
+        families: Families to render
+        openmetrics: OpenMetrics 1.0 instead of Prometheus text 0.0.4
+
+    Returns:
+        Exposition text
+    """
+    lines = []
+    for family in families:
+        # OpenMetrics names the counter family without its _total suffix
+        name = family.name if openmetrics or family.kind != COUNTER else f"{family.name}_total"
+        lines.append(f"# HELP {name} {family.help}")
+        lines.append(f"# TYPE {name} {family.kind}")
+        sample_name = f"{family.name}_total" if family.kind == COUNTER else family.name
+        for labels, value, suffix in family.samples:
+            if labels:
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{sample_name}{suffix}{{{label_text}}} {_format_value(value)}")
+            else:
+                lines.append(f"{sample_name}{suffix} {_format_value(value)}")
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExporter:
+    """
+    HTTP ``/metrics`` endpoint in a background thread.
+
+    Args:
+        snapshots: Returns {plugin: (ts, data)}, e.g. CollectorDaemon.snapshots
+        plugins: Returns {plugin: Plugin} for error counts (optional)
+        extra: Returns more families, e.g. daemon counters (optional)
+        host: Interface to bind (localhost by default)
+        port: TCP port (0 picks a free one, see ``port`` after start())
+        activation: PluginActivation of the on-demand plugins in
+            PLUGIN_STATS (optional, see acquire_plugins())
+    """
+
+    def __init__(self, snapshots: Callable[[], Dict[str, Tuple[float, Dict[str, Any]]]],
+                 plugins: Optional[Callable[[], Dict[str, Any]]] = None,
+                 extra: Optional[Callable[[], List[MetricFamily]]] = None,
+                 host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 activation=None):
+        self.snapshots = snapshots
+        self.plugins = plugins
+        self.extra = extra
+        self.host = host
+        self.port = port
+        self.activation = activation
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            'scrapes': 0,
+            'errors': 0,
+            'last_render_ms': 0.0
+        }
+
+    def render(self, openmetrics: bool = False) -> str:
+        """Current exposition (what a scrape returns)."""
+        start = time.perf_counter()
+        families = collect_families(self.snapshots(), self.plugins() if self.plugins else None)
+        if self.extra:
+            families += self.extra()
+        families.append(MetricFamily("wf_exporter_scrapes", COUNTER, "Scrapes served").add(self.stats['scrapes']))
+        text = render(families, openmetrics)
+        self.stats['last_render_ms'] = (time.perf_counter() - start) * 1000
+        return text
+
+    def start(self) -> None:
+        """Bind and serve in a daemon thread."""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != "/metrics":
+                    self.send_error(404, "Only /metrics is served")
+                    return
+                openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+                try:
+                    exporter.stats['scrapes'] += 1
+                    body = exporter.render(openmetrics).encode('utf-8')
+                except Exception as e:
+                    exporter.stats['errors'] += 1
+                    logger.error(f"Rendering metrics failed: {e}")
+                    self.send_error(500, "Rendering metrics failed")
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(f"{self.address_string()} {format % args}")
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics exporter on http://{self.host}:{self.port}/metrics")
+
+    def acquire_plugins(self) -> None:
+        """
+        Keep the exported on-demand plugins running (no-op without activation).
+
+        Only registered plugins can be acquired: call again after the plugin
+        set is (re)built. Held until stop().
+        """
+        if self.activation is None:
+            return
+        for name in PLUGIN_STATS:
+            self.activation.acquire(name, CONSUMER)
+
+    def stop(self) -> None:
+        """Stop serving, release the port and the acquired plugins."""
+        if self.activation is not None:
+            self.activation.release_consumer(CONSUMER)
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
@@ -0,0 +1,423 @@
+"""
+Metrics store - embedded SQLite history for metrics and plugin state.
+
+Plugins and the UI only append to in-memory buffers (``record()``,
+``record_many()``); a background thread writes them to SQLite in one
+transaction every ``flush_interval`` seconds, so the collection path never
+touches the disk. The database runs in WAL mode, so range queries don't
+block the writer.
+
+Three tables:
+
+    samples(metric, ts, value)   -- keyed (metric, ts): range scans per metric
+    rollups(resolution, metric, bucket, min, max, sum, count)
+                                 -- 1 min / 1 h tiers, see utils.rollups
+    state(key, ts, value)        -- latest JSON state per plugin, for restarts
+
+Every tier has its own retention; ``query_range()`` reads from the coarsest
+tier that satisfies the requested resolution.
+
+Usage:
+    >>> store = MetricsStore("history.db")
+    >>> store.start()
+    >>> store.record_many("system", {"cpu_percent": 12.5})
+    >>> store.query("system.cpu_percent", start=time.time() - 3600)
+    >>> tier, points = store.query_range("system.cpu_percent",
+    ...                                  start=time.time() - 7 * 86400, max_points=200)
+    >>> store.close()
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .rollups import DEFAULT_TIERS, RollupPoint, RollupTier, aggregate, select_tier
+
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    metric TEXT NOT NULL,
+    ts REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (metric, ts)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution REAL NOT NULL,
+    metric TEXT NOT NULL,
+    bucket REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    sum REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (resolution, metric, bucket)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    ts REAL NOT NULL,
+    value TEXT NOT NULL
+);
+"""
+
+# Merge a batch's partial bucket into the stored one
+UPSERT_ROLLUP = """
+INSERT INTO rollups (resolution, metric, bucket, min, max, sum, count)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (resolution, metric, bucket) DO UPDATE SET
+    min = MIN(min, excluded.min),
+    max = MAX(max, excluded.max),
+    sum = sum + excluded.sum,
+    count = count + excluded.count
+"""
+
+# Seconds between retention passes of the flush thread
+PRUNE_INTERVAL = 3600.0
+
+
+class MetricsStore:
+    """
+    Batched, thread-safe time-series and state store.
+
+    Args:
+        path: SQLite database file (``":memory:"`` for tests)
+        flush_interval: Seconds between background flushes
+        state_interval: Seconds between snapshots of registered state sources
+        tiers: Raw tier followed by rollup tiers, finest first (see
+            utils.rollups.DEFAULT_TIERS); each has its own retention
+        max_pending: Buffered samples beyond which new samples are dropped
+            (the disk is not keeping up)
+    """
+
+    def __init__(self, path: Union[str, Path], flush_interval: float = 5.0,
+                 state_interval: float = 30.0, tiers: Sequence[RollupTier] = DEFAULT_TIERS,
+                 max_pending: int = 100_000):
+        self.path = str(path)
+        self.flush_interval = flush_interval
+        self.state_interval = state_interval
+        self.tiers = tuple(sorted(tiers, key=lambda tier: tier.resolution))
+        self.max_pending = max_pending
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._db_lock = threading.Lock()
+        self._closed = False
+
+        # Buffers, swapped out under _lock by flush()
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, float, float]] = []
+        self._pending_state: Dict[str, Tuple[float, str]] = {}
+        self._state_sources: Dict[str, Callable[[], Optional[Dict[str, Any]]]] = {}
+        self._last_state_sample = 0.0
+        self._last_prune = 0.0
+
+        self._stop_event = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'recorded': 0,
+            'written': 0,
+            'dropped': 0,
+            'flushes': 0,
+            'errors': 0,
+            'rollup_rows': 0,
+            'duplicates': 0,
+            'last_flush_ms': 0.0
+        }
+
+    # Hot path: in-memory appends only
+
+    def record(self, metric: str, value: float, timestamp: Optional[float] = None) -> None:
+        """Buffer one sample."""
+        ts = time.time() if timestamp is None else timestamp
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.stats['dropped'] += 1
+                return
+            self._pending.append((metric, ts, float(value)))
+            self.stats['recorded'] += 1
+
+    def record_many(self, prefix: str, data: Dict[str, Any], timestamp: Optional[float] = None) -> int:
+        """
+        Buffer every numeric top-level value of ``data`` as ``prefix.key``.
+
+        Returns:
+            Number of samples buffered
+        """
+        ts = time.time() if timestamp is None else timestamp
+        rows = [
+            (f"{prefix}.{key}", ts, float(value))
+            for key, value in data.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        with self._lock:
+            room = self.max_pending - len(self._pending)
+            if len(rows) > room:
+                self.stats['dropped'] += len(rows) - max(room, 0)
+                rows = rows[:max(room, 0)]
+            self._pending.extend(rows)
+            self.stats['recorded'] += len(rows)
+        return len(rows)
+
+    def save_state(self, key: str, state: Dict[str, Any]) -> None:
+        """Buffer the latest state for ``key`` (written on next flush)."""
+        value = json.dumps(state, default=str)
+        with self._lock:
+            self._pending_state[key] = (time.time(), value)
+
+    def add_state_source(self, key: str, getter: Callable[[], Optional[Dict[str, Any]]]) -> None:
+        """Snapshot ``getter()`` as state ``key`` every ``state_interval`` seconds."""
+        with self._lock:
+            self._state_sources[key] = getter
+
+    def remove_state_source(self, key: str) -> None:
+        with self._lock:
+            self._state_sources.pop(key, None)
+
+    # Background writer
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._flush_thread = threading.Thread(target=self._flush_loop, name="metrics-store", daemon=True)
+        self._flush_thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and write everything still buffered."""
+        self._stop_event.set()
+        if self._flush_thread:
+            self._flush_thread.join(timeout=5.0)
+            self._flush_thread = None
+        self.sample_state()
+        self.flush()
+
+    def close(self) -> None:
+        """Flush and close the database (idempotent)."""
+        if self._closed:
+            return
+        self.stop()
+        with self._db_lock:
+            self._conn.close()
+        self._closed = True
+
+    def _flush_loop(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            now = time.time()
+            if now - self._last_state_sample >= self.state_interval:
+                self.sample_state()
+            self.flush()
+            if now - self._last_prune >= PRUNE_INTERVAL:
+                self.apply_retention(now)
+                self._last_prune = now
+
+    def sample_state(self) -> None:
+        """Snapshot every registered state source now."""
+        with self._lock:
+            sources = list(self._state_sources.items())
+        for key, getter in sources:
+            try:
+                state = getter()
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"State snapshot of {key} failed: {e}")
+                continue
+            if state is not None:
+                self.save_state(key, state)
+        self._last_state_sample = time.time()
+
+    def flush(self) -> int:
+        """
+        Write buffered samples, their rollups and state in one transaction.
+
+        Returns:
+            Number of samples written
+        """
+        with self._lock:
+            rows, self._pending = self._pending, []
+            states, self._pending_state = self._pending_state, {}
+        if not rows and not states:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            with self._db_lock, self._conn:
+                # Rollups add up, so each (metric, ts) may be counted once only
+                new_rows = self._new_rows(rows)
+                buckets = aggregate(new_rows, self.tiers)
+                self._conn.executemany(
+                    "INSERT INTO samples (metric, ts, value) VALUES (?, ?, ?)", new_rows
+                )
+                self._conn.executemany(UPSERT_ROLLUP, [
+                    (resolution, metric, bucket, low, high, total, count)
+                    for (resolution, metric, bucket), (low, high, total, count) in buckets.items()
+                ])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO state (key, ts, value) VALUES (?, ?, ?)",
+                    [(key, ts, value) for key, (ts, value) in states.items()]
+                )
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            self.stats['dropped'] += len(rows)
+            logger.error(f"Metrics flush failed: {e}")
+            return 0
+
+        self.stats['written'] += len(new_rows)
+        self.stats['duplicates'] += len(rows) - len(new_rows)
+        self.stats['rollup_rows'] += len(buckets)
+        self.stats['flushes'] += 1
+        self.stats['last_flush_ms'] = (time.perf_counter() - start) * 1000
+        return len(new_rows)
+
+    def _new_rows(self, rows: List[Tuple[str, float, float]]) -> List[Tuple[str, float, float]]:
+        """
+        ``rows`` without repeated (metric, ts): the first sample in the
+        batch wins and samples already stored win over the batch.
+
+        Called inside the flush transaction (holding _db_lock).
+        """
+        unique: Dict[Tuple[str, float], Tuple[str, float, float]] = {}
+        spans: Dict[str, Tuple[float, float]] = {}
+        for row in rows:
+            metric, ts, _ = row
+            if (metric, ts) in unique:
+                continue
+            unique[metric, ts] = row
+            low, high = spans.get(metric, (ts, ts))
+            spans[metric] = (min(low, ts), max(high, ts))
+        # One primary key range scan per metric; usually empty (new timestamps)
+        for metric, (low, high) in spans.items():
+            for (ts,) in self._conn.execute(
+                "SELECT ts FROM samples WHERE metric = ? AND ts >= ? AND ts <= ?", (metric, low, high)
+            ):
+                unique.pop((metric, ts), None)
+        return list(unique.values())
+
+    # Queries
+
+    def query(self, metric: str, start: Optional[float] = None, end: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Tuple[float, float]]:
+        """
+        Samples of ``metric`` with ``start <= ts <= end``, oldest first.
+
+        Only flushed samples are visible.
+        """
+        sql = "SELECT ts, value FROM samples WHERE metric = ? AND ts >= ? AND ts <= ? ORDER BY ts"
+        params: List[Any] = [metric, start if start is not None else float('-inf'),
+                             end if end is not None else float('inf')]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def query_range(self, metric: str, start: float, end: Optional[float] = None,
+                    resolution: Optional[float] = None,
+                    max_points: Optional[int] = None) -> Tuple[RollupTier, List[RollupPoint]]:
+        """
+        ``metric`` over ``[start, end]`` from the coarsest sufficient tier.
+
+        Args:
+            metric: Metric name
+            start: Range start (epoch seconds)
+            end: Range end (default: now)
+            resolution: Coarsest acceptable spacing between points in seconds
+            max_points: Alternatively, derive resolution from the range
+                (e.g. the chart width)
+
+        Returns:
+            (tier used, points oldest first); raw samples come back as
+            points with count 1
+        """
+        now = time.time()
+        end = now if end is None else end
+        if resolution is None and max_points:
+            resolution = (end - start) / max_points
+        tier = select_tier(self.tiers, start, now, resolution)
+
+        with self._db_lock:
+            if tier is self.tiers[0]:
+                rows = self._conn.execute(
+                    "SELECT ts, value FROM samples WHERE metric = ? AND ts >= ? AND ts <= ? ORDER BY ts",
+                    (metric, start, end)
+                ).fetchall()
+                return tier, [RollupPoint(ts, value, value, value, 1) for ts, value in rows]
+
+            rows = self._conn.execute(
+                "SELECT bucket, min, max, sum, count FROM rollups "
+                "WHERE resolution = ? AND metric = ? AND bucket >= ? AND bucket <= ? ORDER BY bucket",
+                (tier.resolution, metric, start - start % tier.resolution, end)
+            ).fetchall()
+        return tier, [RollupPoint(bucket, low, high, total / count, count)
+                      for bucket, low, high, total, count in rows]
+
+    def latest(self, metric: str) -> Optional[Tuple[float, float]]:
+        """Most recent flushed sample of ``metric``."""
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT ts, value FROM samples WHERE metric = ? ORDER BY ts DESC LIMIT 1", (metric,)
+            ).fetchone()
+
+    def metrics(self) -> List[str]:
+        """Names of all stored metrics."""
+        with self._db_lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT metric FROM samples ORDER BY metric")]
+
+    def load_state(self, key: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Latest saved state for ``key`` (buffered state wins over disk)."""
+        with self._lock:
+            pending = self._pending_state.get(key)
+        if pending:
+            return json.loads(pending[1])
+
+        with self._db_lock:
+            row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            logger.error(f"Corrupt saved state for {key}; ignoring")
+            return default
+
+    def prune(self, before: float) -> int:
+        """Delete raw samples older than ``before``; returns rows deleted."""
+        with self._db_lock, self._conn:
+            return self._conn.execute("DELETE FROM samples WHERE ts < ?", (before,)).rowcount
+
+    def apply_retention(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Drop data older than each tier's retention.
+
+        Returns:
+            Rows deleted per tier name
+        """
+        now = time.time() if now is None else now
+        deleted = {}
+        for tier in self.tiers:
+            if tier.retention is None:
+                continue
+            cutoff = now - tier.retention
+            if tier is self.tiers[0]:
+                deleted[tier.name] = self.prune(cutoff)
+                continue
+            with self._db_lock, self._conn:
+                deleted[tier.name] = self._conn.execute(
+                    "DELETE FROM rollups WHERE resolution = ? AND bucket < ?", (tier.resolution, cutoff)
+                ).rowcount
+        return deleted
@@ -0,0 +1,333 @@
+"""
+Perf instrumentation - fixed-size latency histograms per component.
+
+Answers "which plugin or screen is eating the CPU": every ``collect_data()``
+call, every per-packet handler (the plugins' ``packet_handlers``), every
+screen refresh and every UI tick is timed into a ``LatencyHistogram``
+keyed by (kind, component):
+
+    ("collect", "dns_monitor")   collect_data() duration
+    ("packet", "arp_detector")   per-packet handler duration
+    ("screen", "dns_monitor")    screen refresh duration
+    ("frame", "app")             interval between UI update ticks
+
+The histograms are HDR style: log-linear buckets (exact below 256 us, then
+128 sub-buckets per power of two, so any percentile is within 1%) in a
+preallocated array. Recording is an index computation and an increment -
+no allocation, no lock, no sorting - and memory is fixed (~20 KB per
+component) however many samples arrive.
+
+Packet handlers also count packets seen (handler calls), processed
+(returned normally) and dropped (raised).
+
+Usage:
+    >>> perf = get_perf_registry()
+    >>> start = time.perf_counter_ns()
+    >>> ...
+    >>> perf.histogram(COLLECT, "dns_monitor").record_ns(time.perf_counter_ns() - start)
+    >>> perf.summary()[(COLLECT, "dns_monitor")]['p99_ms']
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import functools
+import logging
+import math
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+# Component kinds
+COLLECT = "collect"
+PACKET = "packet"
+SCREEN = "screen"
+FRAME = "frame"
+
+PACKET_OUTCOMES = ("seen", "processed", "dropped")
+
+# Screen methods that redraw with fresh data (app-driven or on the screen's own timer)
+SCREEN_REFRESH_METHODS = ("update_metrics", "refresh_data", "refresh_metrics")
+
+# Linear region: values below 2 * SUB_BUCKETS get a bucket each
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+LINEAR_LIMIT = 2 * SUB_BUCKETS
+
+DEFAULT_MAX_US = 60_000_000  # Longer samples are clamped to one minute
+
+
+def _bucket_index(value: int) -> int:
+    if value < LINEAR_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return LINEAR_LIMIT + (shift - 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def _bucket_upper(index: int) -> int:
+    """Highest value that lands in bucket ``index``."""
+    if index < LINEAR_LIMIT:
+        return index
+    offset = index - LINEAR_LIMIT
+    shift = offset // SUB_BUCKETS + 1
+    sub = offset % SUB_BUCKETS + SUB_BUCKETS
+    return ((sub + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram of durations (microsecond resolution).
+
+    Not locked: each component is recorded by one thread (its collector,
+    sniffer or the UI), and readers tolerate a sample in flight.
+
+    Args:
+        max_us: Largest trackable value; longer samples count as max_us
+    """
+
+    def __init__(self, max_us: int = DEFAULT_MAX_US):
+        self.max_us = max_us
+        self.counts = array('Q', bytes(8 * (_bucket_index(max_us) + 1)))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_seen_us = 0
+
+    def record(self, value_us: int) -> None:
+        """Add one sample in microseconds."""
+        value = int(value_us)
+        if value < 0:
+            value = 0
+        elif value > self.max_us:
+            value = self.max_us
+        if value < LINEAR_LIMIT:
+            index = value
+        else:
+            shift = value.bit_length() - SUB_BUCKET_BITS - 1
+            index = LINEAR_LIMIT + (shift - 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+        self.counts[index] += 1
+        if self.count == 0 or value < self.min_us:
+            self.min_us = value
+        if value > self.max_seen_us:
+            self.max_seen_us = value
+        self.count += 1
+        self.total_us += value
+
+    def record_ns(self, value_ns: int) -> None:
+        """Add one sample in nanoseconds (e.g. a perf_counter_ns() delta)."""
+        self.record(value_ns // 1000)
+
+    def percentiles(self, *percents: float) -> List[int]:
+        """
+        Values (us) at the given percentiles, in one pass over the buckets.
+
+        Each value is the top of its bucket (capped at the largest sample),
+        so it's never below the true percentile and at most 1% above it.
+        """
+        if self.count == 0:
+            return [0 for _ in percents]
+        targets = sorted((min(max(1, math.ceil(p * self.count / 100)), self.count), i)
+                         for i, p in enumerate(percents))
+        results = [0] * len(percents)
+        seen = 0
+        position = 0
+        for index, bucket in enumerate(self.counts):
+            if not bucket:
+                continue
+            seen += bucket
+            while position < len(targets) and seen >= targets[position][0]:
+                results[targets[position][1]] = min(_bucket_upper(index), self.max_seen_us)
+                position += 1
+            if position == len(targets):
+                break
+        return results
+
+    def percentile(self, percent: float) -> int:
+        """Value (us) at ``percent`` (0-100)."""
+        return self.percentiles(percent)[0]
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add ``other``'s samples (histograms must share max_us)."""
+        if other.max_us != self.max_us:
+            raise ValueError("Histograms with different ranges can't be merged")
+        for index, bucket in enumerate(other.counts):
+            if bucket:
+                self.counts[index] += bucket
+        if other.count:
+            self.min_us = other.min_us if self.count == 0 else min(self.min_us, other.min_us)
+            self.max_seen_us = max(self.max_seen_us, other.max_seen_us)
+        self.count += other.count
+        self.total_us += other.total_us
+
+    def reset(self) -> None:
+        """Forget every sample (the buckets are reused)."""
+        for index in range(len(self.counts)):
+            self.counts[index] = 0
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_seen_us = 0
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50/p90/p99 and max in milliseconds."""
+        p50, p90, p99 = self.percentiles(50, 90, 99)
+        return {
+            'count': self.count,
+            'mean_ms': self.total_us / self.count / 1000 if self.count else 0.0,
+            'p50_ms': p50 / 1000,
+            'p90_ms': p90 / 1000,
+            'p99_ms': p99 / 1000,
+            'max_ms': self.max_seen_us / 1000,
+            'total_ms': self.total_us / 1000,
+        }
+
+
+class PerfRegistry:
+    """
+    Histograms and packet counters per (kind, component).
+
+    Components are created on first use; after that recording never takes
+    the registry lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._packets: Dict[str, Dict[str, int]] = {}  # {plugin: {outcome: count}}
+        self._last_tick: Optional[float] = None
+        self._interval_avg = 0.0
+
+    def histogram(self, kind: str, component: str) -> LatencyHistogram:
+        """Histogram for ``component`` (created on first use)."""
+        key = (kind, component)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def packet_counters(self, plugin: str) -> Dict[str, int]:
+        """{seen, processed, dropped} for ``plugin`` (created on first use)."""
+        counters = self._packets.get(plugin)
+        if counters is None:
+            with self._lock:
+                counters = self._packets.setdefault(plugin, dict.fromkeys(PACKET_OUTCOMES, 0))
+        return counters
+
+    def timed(self, kind: str, component: str) -> Callable:
+        """Decorator recording each call of the wrapped function."""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.histogram(kind, component).record_ns(time.perf_counter_ns() - start)
+            return wrapper
+        return decorator
+
+    def instrument_plugin(self, name: str, plugin: Any) -> None:
+        """
+        Time ``plugin.collect_data()`` and its ``packet_handlers``.
+
+        The wrappers are instance attributes, so everything that looks the
+        methods up afterwards (sniff callbacks, hub subscriptions, the
+        collector) goes through them. Call before the plugin starts its
+        capture threads.
+        """
+        plugin.collect_data = self.timed(COLLECT, name)(plugin.collect_data)
+        for handler_name in getattr(plugin, 'packet_handlers', ()):
+            handler = getattr(plugin, handler_name, None)
+            if handler is not None:
+                setattr(plugin, handler_name, self._packet_handler(name, handler))
+
+    def instrument_screen(self, name: str, screen: Any) -> None:
+        """Time ``screen``'s refresh methods (call before it's mounted)."""
+        for method_name in SCREEN_REFRESH_METHODS:
+            method = getattr(screen, method_name, None)
+            if method is not None:
+                setattr(screen, method_name, self.timed(SCREEN, name)(method))
+
+    def _packet_handler(self, name: str, handler: Callable) -> Callable:
+        histogram = self.histogram(PACKET, name)
+        counters = self.packet_counters(name)
+
+        @functools.wraps(handler)
+        def wrapper(packet, *args, **kwargs):
+            counters['seen'] += 1
+            start = time.perf_counter_ns()
+            try:
+                result = handler(packet, *args, **kwargs)
+            except Exception:
+                counters['dropped'] += 1
+                raise
+            finally:
+                histogram.record_ns(time.perf_counter_ns() - start)
+            counters['processed'] += 1
+            return result
+        return wrapper
+
+    def tick(self, now: Optional[float] = None) -> None:
+        """One UI update tick: records the interval since the previous tick."""
+        now = time.perf_counter() if now is None else now
+        if self._last_tick is not None:
+            interval = now - self._last_tick
+            self.histogram(FRAME, "app").record(int(interval * 1_000_000))
+            # Smoothed over ~10 ticks
+            self._interval_avg = interval if not self._interval_avg else \
+                0.9 * self._interval_avg + 0.1 * interval
+        self._last_tick = now
+
+    @property
+    def frame_rate(self) -> float:
+        """Recent UI update ticks per second (0 before two ticks)."""
+        return 1.0 / self._interval_avg if self._interval_avg > 0 else 0.0
+
+    def components(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return sorted(self._histograms)
+
+    def summary(self) -> Dict[Tuple[str, str], Dict[str, float]]:
+        """{(kind, component): LatencyHistogram.summary()} plus packet counters."""
+        result = {}
+        for key in self.components():
+            entry = self._histograms[key].summary()
+            if key[0] == PACKET:
+                entry.update(self.packet_counters(key[1]))
+            result[key] = entry
+        return result
+
+    def packets(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {plugin: dict(counters) for plugin, counters in self._packets.items()}
+
+    def reset(self, kinds: Optional[Iterable[str]] = None) -> None:
+        """Clear histograms (of ``kinds`` only, if given) and packet counters."""
+        kinds = set(kinds) if kinds is not None else None
+        with self._lock:
+            for (kind, _), histogram in self._histograms.items():
+                if kinds is None or kind in kinds:
+                    histogram.reset()
+            if kinds is None or PACKET in kinds:
+                for counters in self._packets.values():
+                    for outcome in counters:
+                        counters[outcome] = 0
+
+
+_registry: Optional[PerfRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_perf_registry() -> PerfRegistry:
+    """Process-wide perf registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PerfRegistry()
+        return _registry
@@ -0,0 +1,143 @@
+"""
+Rollups - multi-resolution downsampling for the metrics store.
+
+Raw samples (one per second) are kept for a day; the same samples are
+folded into per-minute and per-hour buckets holding min/max/sum/count, each
+tier with its own retention. A 7-day chart then reads ~170 hourly rows
+instead of 600k raw samples.
+
+Buckets are accumulated per flushed batch and merged into the database
+with an upsert, so the rollups never rescan raw data.
+
+    1s    raw samples        1 day
+    1min  min/max/avg/count  7 days
+    1h    min/max/avg/count  1 year
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+
+DAY = 86400.0
+
+
+@dataclass(frozen=True)
+class RollupTier:
+    """
+    One resolution level.
+
+    Attributes:
+        name: Display name ("1min")
+        resolution: Bucket width in seconds (the first tier is the raw
+            sample interval)
+        retention: Seconds of data to keep (None keeps everything)
+    """
+    name: str
+    resolution: float
+    retention: Optional[float]
+
+
+DEFAULT_TIERS: Tuple[RollupTier, ...] = (
+    RollupTier("1s", 1.0, 1 * DAY),
+    RollupTier("1min", 60.0, 7 * DAY),
+    RollupTier("1h", 3600.0, 365 * DAY),
+)
+
+
+class RollupPoint(NamedTuple):
+    """Aggregated value of one bucket (a raw sample has count 1)."""
+    ts: float
+    min: float
+    max: float
+    avg: float
+    count: int
+
+
+# {(resolution, metric, bucket): [min, max, sum, count]}
+Buckets = Dict[Tuple[float, str, float], List[float]]
+
+
+def aggregate(rows: Iterable[Tuple[str, float, float]], tiers: Sequence[RollupTier]) -> Buckets:
+    """
+    Fold ``(metric, ts, value)`` rows into the buckets of every rollup tier.
+
+    The first tier holds raw samples and is skipped.
+    """
+    resolutions = [tier.resolution for tier in tiers[1:]]
+    buckets: Buckets = {}
+    for metric, ts, value in rows:
+        for resolution in resolutions:
+            key = (resolution, metric, ts - ts % resolution)
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = [value, value, value, 1]
+            else:
+                if value < bucket[0]:
+                    bucket[0] = value
+                if value > bucket[1]:
+                    bucket[1] = value
+                bucket[2] += value
+                bucket[3] += 1
+    return buckets
+
+
+def select_tier(tiers: Sequence[RollupTier], start: float, now: float,
+                resolution: Optional[float] = None) -> RollupTier:
+    """
+    Coarsest tier that still has data at ``start`` and is at least as fine
+    as ``resolution``.
+
+    If every tier still covering ``start`` is coarser than requested, the
+    finest of them is used; if none covers it, the coarsest tier is.
+    """
+    covering = [tier for tier in tiers if tier.retention is None or start >= now - tier.retention]
+    if not covering:
+        return tiers[-1]
+    if resolution is None:
+        return covering[0]
+
+    fine_enough = [tier for tier in covering if tier.resolution <= resolution]
+    if fine_enough:
+        return max(fine_enough, key=lambda tier: tier.resolution)
+    return min(covering, key=lambda tier: tier.resolution)
+
+
+DURATION_UNITS = {'s': 1.0, 'm': 60.0, 'h': 3600.0, 'd': DAY, 'w': 7 * DAY}
+
+
+def parse_duration(text: str) -> Optional[float]:
+    """Parse "90s", "30m", "12h", "7d", "2w" (or "forever") into seconds."""
+    text = text.strip().lower()
+    if text in ('forever', 'none'):
+        return None
+    unit = DURATION_UNITS.get(text[-1:])
+    try:
+        return float(text[:-1]) * unit if unit else float(text)
+    except ValueError:
+        raise ValueError(f"Invalid duration {text!r} (use e.g. 90s, 30m, 12h, 7d, 2w, forever)")
+
+
+def with_retention(spec: str, tiers: Sequence[RollupTier] = DEFAULT_TIERS) -> Tuple[RollupTier, ...]:
+    """
+    Override tier retentions from a spec like ``"1s=2d,1h=forever"``.
+
+    Raises:
+        ValueError: Unknown tier name or bad duration
+    """
+    retention = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, duration = item.partition('=')
+        retention[name.strip()] = parse_duration(duration)
+
+    names = {tier.name for tier in tiers}
+    unknown = set(retention) - names
+    if unknown:
+        raise ValueError(f"Unknown tier(s) {', '.join(sorted(unknown))}; known: {', '.join(sorted(names))}")
+
+    return tuple(
+        RollupTier(tier.name, tier.resolution, retention.get(tier.name, tier.retention))
+        for tier in tiers
+    )
@@ -0,0 +1,134 @@
+"""
+Startup profiler for ``app_textual.py --profile-startup``.
+
+Times every first-time module import (self and cumulative, like
+``python -X importtime``) plus named startup phases, and prints a breakdown
+once the first frame has been drawn:
+
+    Startup profile
+      imports             180.4 ms
+      plugins              41.2 ms
+      screens              12.9 ms
+      first frame          56.1 ms
+      total               290.6 ms
+
+Author: Juan-Dev - Soli Deo Gloria ✝️
+Date: 2025-11-10
+"""
+
+import builtins
+import importlib.util
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+PROFILE_FLAG = '--profile-startup'
+
+
+class StartupProfiler:
+    """
+    Import and phase timer for application startup.
+
+    Only imports on the thread that installed the profiler are timed;
+    modules already in ``sys.modules`` cost nothing and are skipped.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # {module: (self seconds, cumulative seconds)}
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self.marks: List[Tuple[str, float]] = []
+        self._stack: List[float] = []
+        self._original_import = None
+        self._thread_id: Optional[int] = None
+
+    @classmethod
+    def from_argv(cls, argv: Sequence[str]) -> Optional['StartupProfiler']:
+        """Installed profiler if ``--profile-startup`` is on the command line."""
+        if PROFILE_FLAG not in argv:
+            return None
+        profiler = cls()
+        profiler.install()
+        return profiler
+
+    def install(self) -> None:
+        """Start timing imports."""
+        if self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        self._thread_id = threading.get_ident()
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self) -> None:
+        """Stop timing imports."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def mark(self, phase: str) -> None:
+        """Record the end of a startup phase."""
+        self.marks.append((phase, time.perf_counter()))
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if threading.get_ident() != self._thread_id:
+            return original(name, globals, locals, fromlist, level)
+
+        module = name
+        if level:
+            try:
+                package = (globals or {}).get('__package__') or ''
+                module = importlib.util.resolve_name('.' * level + name, package)
+            except (ImportError, ValueError):
+                return original(name, globals, locals, fromlist, level)
+        if module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            self.imports[module] = (elapsed - children, elapsed)
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def package_totals(self) -> Dict[str, float]:
+        """Self import time per package (``src.*`` split by subpackage)."""
+        totals: Dict[str, float] = defaultdict(float)
+        for module, (own, _) in self.imports.items():
+            parts = module.split('.')
+            key = '.'.join(parts[:2]) if parts[0] == 'src' and len(parts) > 1 else parts[0]
+            totals[key] += own
+        return dict(totals)
+
+    def report(self, top: int = 12) -> str:
+        """Human-readable breakdown (milliseconds)."""
+        lines = ["Startup profile"]
+        previous = self.started
+        for phase, moment in self.marks:
+            lines.append(f"  {phase:<16} {(moment - previous) * 1000:8.1f} ms")
+            previous = moment
+        lines.append(f"  {'total':<16} {(previous - self.started) * 1000:8.1f} ms")
+
+        lines.append("")
+        lines.append("Import time by package (self)")
+        packages = sorted(self.package_totals().items(), key=lambda item: item[1], reverse=True)
+        for package, seconds in packages[:top]:
+            lines.append(f"  {package:<32} {seconds * 1000:8.1f} ms")
+
+        lines.append("")
+        lines.append("Slowest imports (cumulative)")
+        modules = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        for module, (_, cumulative) in modules[:top]:
+            lines.append(f"  {module:<32} {cumulative * 1000:8.1f} ms")
+
+        heavy = [name for name in ('scapy', 'requests', 'numpy') if name in sys.modules]
+        lines.append("")
+        lines.append(f"Heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+        return "\n".join(lines)
@@ -5,7 +5,9 @@
 """
 
 import pytest
+import subprocess
 import sys
+import time
 from pathlib import Path
 
 # Add src to path
@@ -240,5 +242,220 @@ def test_mock_topology_data_structure(self):
         assert "vendor" in device
 
 
+class TestOnDemandPlugins:
+    """Test that capture plugins run only while a screen shows them."""
+
+    def test_capture_plugins_idle_until_screen_opens(self):
+        """Test no capture plugin runs at startup and switching screens hands them over."""
+        app = WiFiSecurityDashboardApp(mock_mode=True)
+        app.activation.grace_period = 0
+        app._initialize_plugins()
+
+        assert app.activation.running() == []
+
+        app._use_screen_plugins("dns_monitor")
+        assert app.activation.running() == ["dns_monitor"]
+
+        app._use_screen_plugins("topology")
+        assert app.activation.running() == ["topology"]
+
+        app._use_screen_plugins("system")
+        assert app.activation.running() == []
+
+    def test_mode_toggle_tears_down_previous_plugins(self):
+        """Test rebuilding the plugin set stops the old one and doesn't grow threads."""
+        app = WiFiSecurityDashboardApp(mock_mode=True)
+        app.activation.grace_period = 0
+        app._initialize_plugins()
+        app._use_screen_plugins("dns_monitor")
+        old_dns = app.dns_monitor_plugin
+        baseline = app.lifecycle.resource_counts()
+
+        for _ in range(5):
+            app._initialize_plugins()
+
+        counts = app.lifecycle.resource_counts()
+        assert app.dns_monitor_plugin is not old_dns
+        assert app.activation.running() == ["dns_monitor"]
+        assert counts['threads'] <= baseline['threads']
+        assert app.lifecycle.stats['generation'] == 5
+        app.lifecycle.teardown()
+        assert app.activation.running() == []
+
+
+class TestPerfInspector:
+    """Test the perf registry wiring."""
+
+    def test_plugins_and_screens_are_timed(self):
+        """Test collect_data() is timed per plugin and the perf screen is installed."""
+        app = WiFiSecurityDashboardApp(mock_mode=True)
+        app._initialize_plugins()
+        before = app.perf.histogram("collect", "system").count
+        app.system_plugin.collect_data()
+
+        assert app.perf.histogram("collect", "system").count == before + 1
+        assert "perf" in app.screen_names
+        app.lifecycle.teardown()
+
+
+class TestCollectionRate:
+    """Test the 10 FPS refresh collects each plugin at its own rate_ms."""
+
+    def test_reload_to_slower_rate_collects_less(self, tmp_path, monkeypatch):
+        """Test a reloaded, slower rate_ms means fewer collect_data() calls."""
+        import src.plugins.base as base
+        from src.plugins.plugin_config import PluginConfigWatcher
+        from src.plugins.plugin_set import DEFAULT_PLUGIN_SPECS
+
+        now = [1000.0]
+        monkeypatch.setattr(base, "time", type("Clock", (), {"time": staticmethod(lambda: now[0])}))
+        config = tmp_path / "dashboard.yml"
+        config.write_text("plugins:\n  - name: system\n    rate_ms: 100\n")
+        watcher = PluginConfigWatcher(str(config), DEFAULT_PLUGIN_SPECS, interval=0)
+        app = WiFiSecurityDashboardApp(mock_mode=True, plugin_config=watcher)
+        monkeypatch.setattr(app, "notify", lambda *args, **kwargs: None)
+        app._initialize_plugins()
+        collects = app.perf.histogram("collect", "system")
+
+        def refresh_for(seconds):
+            before = collects.count
+            for _ in range(int(seconds * 10)):
+                app._collect("system")
+                now[0] += 0.1
+            return collects.count - before
+
+        assert refresh_for(2) == 20
+
+        config.write_text("plugins:\n  - name: system\n    rate_ms: 1000\n")
+        app._reload_plugin_config()
+        assert app.system_plugin.config.rate_ms == 1000
+
+        assert refresh_for(2) == 2
+        assert app._collect("system") is app._collect("system")  # served from the cache
+        app.lifecycle.teardown()
+
+
+class TestHistory:
+    """Test --history persistence wiring."""
+
+    def test_real_mode_state_survives_restart(self, tmp_path):
+        """Test plugin state saved by one app instance is restored by the next."""
+        path = str(tmp_path / "history.db")
+        app = WiFiSecurityDashboardApp(mock_mode=False, history_path=path)
+        app._initialize_plugins()
+        app.dns_monitor_plugin.stats['total_queries'] = 42
+        app.lifecycle.teardown()
+        app.history.close()
+
+        restarted = WiFiSecurityDashboardApp(mock_mode=False, history_path=path)
+        restarted._initialize_plugins()
+
+        assert restarted.dns_monitor_plugin.stats['total_queries'] == 42
+        restarted.lifecycle.teardown()
+        restarted.history.close()
+
+    def test_mock_mode_records_nothing(self, tmp_path):
+        """Test mock data never reaches the history file."""
+        app = WiFiSecurityDashboardApp(mock_mode=True, history_path=str(tmp_path / "history.db"))
+        app._initialize_plugins()
+        app._record_history({"cpu_percent": 50.0}, {}, {})
+
+        assert app.lifecycle.persist_state is False
+        assert app.history.stats['recorded'] == 0
+        app.lifecycle.teardown()
+        app.history.close()
+
+    def test_history_flag(self):
+        """Test --history takes a path."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(sys, "argv", ["app_textual.py", "--history", "/tmp/h.db"])
+            from app_textual import parse_args
+            args = parse_args()
+
+        assert args.history == "/tmp/h.db"
+
+
+class TestAttachMode:
+    """Test the app as a thin client of the collector daemon (--attach)."""
+
+    def test_attached_app_uses_daemon_plugins(self, tmp_path):
+        """Test --attach plugins are proxies that follow the daemon's mode."""
+        from src.daemon import CollectorDaemon, DaemonClient, RemotePlugin
+
+        daemon = CollectorDaemon(str(tmp_path / "wf.sock"), mock_mode=True, grace_period=0)
+        daemon.start()
+        client = DaemonClient(daemon.socket_path)
+        client.connect()
+        try:
+            app = WiFiSecurityDashboardApp(mock_mode=False, remote=client)
+            app.activation.grace_period = 0
+            app._initialize_plugins()
+
+            assert app.mock_mode is True
+            assert isinstance(app.dns_monitor_plugin, RemotePlugin)
+            assert app.lifecycle.persist_state is False
+
+            app._use_screen_plugins("dns_monitor")
+            deadline = time.time() + 5.0
+            while daemon.activation.running() != ["dns_monitor"] and time.time() < deadline:
+                time.sleep(0.02)
+            assert daemon.activation.running() == ["dns_monitor"]
+            app.lifecycle.teardown()
+        finally:
+            client.close()
+            daemon.stop()
+
+    def test_daemon_flags(self):
+        """Test --daemon/--attach share the --socket path."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(sys, "argv", ["app_textual.py", "--attach", "--socket", "/tmp/x.sock"])
+            from app_textual import parse_args
+            args = parse_args()
+
+        assert args.attach is True
+        assert args.daemon is False
+        assert args.socket == "/tmp/x.sock"
+
+
+class TestStartupImports:
+    """Test that mock-mode startup stays free of heavy dependencies."""
+
+    def test_app_import_does_not_load_scapy_or_requests(self):
+        """Test importing the app and creating mock plugins loads no scapy/requests."""
+        code = (
+            "import sys\n"
+            "import app_textual\n"
+            "from src.plugins.base import PluginConfig\n"
+            "from src.plugins.dns_monitor_plugin import DNSMonitorPlugin\n"
+            "DNSMonitorPlugin(PluginConfig(name='dns', config={'mock_mode': True})).initialize()\n"
+            "print(sorted(m for m in ('scapy', 'requests') if m in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=Path(__file__).parent.parent, timeout=60)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "[]"
+
+    def test_real_mode_plugin_loads_scapy(self):
+        """Test creating a real-mode sniffer binds its scapy names."""
+        from src.plugins import dns_monitor_plugin
+
+        if not dns_monitor_plugin.SCAPY_AVAILABLE:
+            pytest.skip("scapy not installed")
+        dns_monitor_plugin.DNSMonitorPlugin(PluginConfig(name="dns", config={}))
+
+        assert dns_monitor_plugin.DNS is not None
+        assert dns_monitor_plugin.sniff is not None
+
+    def test_profile_startup_flag(self):
+        """Test --profile-startup is a known option."""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(sys, "argv", ["app_textual.py", "--mock", "--profile-startup"])
+            from app_textual import parse_args
+            args = parse_args()
+
+        assert args.profile_startup is True
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
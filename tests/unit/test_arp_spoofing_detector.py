@@ -9,6 +9,7 @@
 
 import pytest
 from unittest.mock import Mock, MagicMock, patch, call
+import json
 import time
 
 from plugins.base import PluginConfig
@@ -324,6 +325,24 @@ def test_handle_mac_change_tracks_history(self):
         assert "11:22:33:44:55:66" in detector.mac_history["192.168.1.100"]
 
 
+    def test_handle_mac_change_emits_alert_event(self):
+        """Test that alerts reach the event sink."""
+        config = PluginConfig(name="arp_detector", enabled=True, config={})
+        detector = ARPSpoofingDetector(config)
+        detector.event_sink = Mock()
+
+        detector._handle_mac_change(
+            "192.168.1.100",
+            "aa:bb:cc:dd:ee:ff",
+            "11:22:33:44:55:66",
+            time.time()
+        )
+
+        detector.event_sink.emit.assert_called_once_with(
+            "arp_alert", detector.alerts[-1], source="arp_detector"
+        )
+
+
 class TestThreatAssessment:
     """Test threat level assessment."""
     
@@ -890,3 +909,22 @@ def test_mock_full_lifecycle(self):
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
+
+
+class TestStatePersistence:
+    """Test get_state/restore_state round trip."""
+
+    def test_restored_bindings_detect_change(self):
+        """Test a restored IP->MAC binding flags a changed MAC after restart."""
+        config = PluginConfig(name="arp_detector", enabled=True, config={})
+        detector = ARPSpoofingDetector(config)
+        detector.add_trusted_device("AA:BB:CC:DD:EE:FF")
+        detector._check_arp_entry("192.168.1.50", "aa:bb:cc:dd:ee:ff")
+
+        restored = ARPSpoofingDetector(config)
+        restored.restore_state(json.loads(json.dumps(detector.get_state())))
+        restored._check_arp_entry("192.168.1.50", "11:22:33:44:55:66")
+
+        assert restored.trusted_devices == {"aa:bb:cc:dd:ee:ff"}
+        assert restored.stats['mac_changes'] == 1
+        assert restored.arp_cache["192.168.1.50"].mac == "11:22:33:44:55:66"
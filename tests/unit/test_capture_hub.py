@@ -0,0 +1,82 @@
+"""
+Tests for Capture Hub - shared packet fan-out
+
+Focus: subscriber delivery, publisher coverage, fault isolation
+"""
+
+from unittest.mock import Mock
+
+from plugins.capture_hub import CaptureHub, get_capture_hub
+
+
+class TestCaptureHub:
+    """Test CaptureHub fan-out."""
+
+    def test_publish_without_subscribers_is_noop(self):
+        """Test publishing with nobody listening costs nothing."""
+        hub = CaptureHub()
+
+        hub.publish(object())
+
+        assert hub.stats['published'] == 0
+
+    def test_publish_reaches_every_subscriber(self):
+        """Test each subscriber receives the packet once."""
+        hub = CaptureHub()
+        first, second = Mock(), Mock()
+        hub.subscribe(first)
+        hub.subscribe(second)
+        hub.subscribe(first)  # Duplicate subscription ignored
+
+        packet = object()
+        hub.publish(packet)
+
+        first.assert_called_once_with(packet)
+        second.assert_called_once_with(packet)
+        assert hub.subscriber_count() == 2
+        assert hub.stats['delivered'] == 2
+
+    def test_unsubscribe_stops_delivery(self):
+        """Test unsubscribed callbacks no longer receive packets."""
+        hub = CaptureHub()
+        callback = Mock()
+        hub.subscribe(callback)
+        hub.unsubscribe(callback)
+        hub.unsubscribe(callback)  # Idempotent
+
+        hub.publish(object())
+
+        callback.assert_not_called()
+
+    def test_failing_subscriber_is_isolated(self):
+        """Test one broken subscriber neither raises nor starves others."""
+        hub = CaptureHub()
+        broken = Mock(side_effect=ValueError("bad packet"))
+        healthy = Mock()
+        hub.subscribe(broken)
+        hub.subscribe(healthy)
+
+        hub.publish(object())
+
+        healthy.assert_called_once()
+        assert hub.stats['subscriber_errors'] == 1
+
+    def test_covers_tracks_active_publishers(self):
+        """Test coverage follows publisher filters."""
+        hub = CaptureHub()
+        assert not hub.covers("arp")
+
+        hub.add_publisher("arp_detector", "arp")
+        assert hub.covers("arp")
+        assert not hub.covers("ip")
+
+        hub.add_publisher("sniffer", None)  # Unfiltered capture covers everything
+        assert hub.covers("ip")
+
+        hub.remove_publisher("sniffer")
+        hub.remove_publisher("arp_detector")
+        assert not hub.covers("arp")
+
+    def test_global_hub_is_singleton(self):
+        """Test get_capture_hub returns one shared instance."""
+        assert get_capture_hub() is get_capture_hub()
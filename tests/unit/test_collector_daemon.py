@@ -0,0 +1,312 @@
+"""
+Tests for the Collector Daemon - headless plugins shared over a Unix socket
+
+Focus: handshake, snapshot fan-out, on-demand activation per client,
+mode switches, plugin config reloads, socket hygiene and the RemotePlugin
+proxies
+"""
+
+import os
+import socket
+import stat
+import time
+
+import pytest
+
+from src.daemon import CollectorDaemon, DaemonClient, RemotePlugin
+from src.daemon.protocol import decode, encode
+from src.daemon.server import _Client
+from src.plugins.activation import PluginActivation
+from src.plugins.lifecycle import PluginLifecycle
+from src.plugins.plugin_config import PluginConfigWatcher
+from src.plugins.plugin_set import DEFAULT_PLUGIN_SPECS
+
+
+def wait_for(condition, timeout=5.0):
+    """Poll ``condition`` until it is truthy (or give up)."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Mock-mode daemon on a private socket."""
+    daemon = CollectorDaemon(str(tmp_path / "wf.sock"), mock_mode=True, tick=0.02, grace_period=0)
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+@pytest.fixture
+def connect(daemon):
+    """Factory for clients attached to ``daemon``."""
+    clients = []
+
+    def _connect():
+        client = DaemonClient(daemon.socket_path, timeout=2.0)
+        client.connect()
+        clients.append(client)
+        return client
+
+    yield _connect
+    for client in clients:
+        client.close()
+
+
+class TestProtocol:
+    """Test message framing."""
+
+    def test_encode_decode_round_trip(self):
+        """Test one message per line survives a round trip."""
+        line = encode({"type": "snapshot", "data": {"cpu": 1.5}})
+
+        assert line.endswith(b"\n")
+        assert decode(line) == {"type": "snapshot", "data": {"cpu": 1.5}}
+
+    def test_decode_rejects_garbage(self):
+        """Test blank, malformed and non-object lines decode to None."""
+        assert decode(b"\n") is None
+        assert decode(b"{not json\n") is None
+        assert decode(b"[1, 2]\n") is None
+
+
+class TestCollectorDaemon:
+    """Test the daemon against real clients."""
+
+    def test_hello_lists_plugins_and_mode(self, connect):
+        """Test a client learns the mode and on-demand flags on connect."""
+        client = connect()
+
+        assert client.mode == "mock"
+        assert client.plugins["system"] == {"on_demand": False}
+        assert client.plugins["dns_monitor"] == {"on_demand": True}
+
+    def test_watch_delivers_snapshots(self, connect):
+        """Test watching an always-on plugin streams its data."""
+        client = connect()
+        client.watch(["system"])
+
+        assert wait_for(lambda: client.snapshot("system"))
+        assert "cpu_percent" in client.snapshot("system")
+
+    def test_watch_starts_on_demand_plugin_until_disconnect(self, daemon, connect):
+        """Test an on-demand plugin runs while a client watches it."""
+        client = connect()
+        assert daemon.activation.running() == []
+
+        client.watch(["dns_monitor"])
+        assert wait_for(lambda: daemon.activation.running() == ["dns_monitor"])
+        assert wait_for(lambda: client.snapshot("dns_monitor"))
+
+        client.close()
+        assert wait_for(lambda: daemon.client_count() == 0)
+        assert daemon.activation.running() == []
+
+    def test_clients_share_one_plugin_set(self, daemon, connect):
+        """Test two clients watching the same plugin run it once."""
+        first, second = connect(), connect()
+        first.watch(["dns_monitor"])
+        second.watch(["dns_monitor"])
+        assert wait_for(lambda: first.snapshot("dns_monitor") and second.snapshot("dns_monitor"))
+        plugin = daemon.plugins["dns_monitor"]
+
+        first.close()
+        assert wait_for(lambda: daemon.client_count() == 1)
+        assert daemon.activation.running() == ["dns_monitor"]
+        assert daemon.plugins["dns_monitor"] is plugin
+
+    def test_unknown_plugin_is_an_error_not_a_crash(self, daemon, connect):
+        """Test a bad watch request leaves the connection usable."""
+        client = connect()
+        client.watch(["nope"])
+
+        status = client.status()
+        assert status["clients"][0]["watching"] == []
+        assert daemon.client_count() == 1
+
+    def test_set_mode_is_broadcast(self, daemon, connect):
+        """Test one client's mode switch reaches every client."""
+        first, second = connect(), connect()
+        events = []
+        second.on_event = events.append
+        generation = daemon.lifecycle.stats['generation']
+
+        first.set_mode(True)  # Same mode: rebuild only
+
+        assert wait_for(lambda: any(e.get("event") == "mode" for e in events))
+        assert second.mode == "mock"
+        assert daemon.lifecycle.stats['generation'] == generation + 1
+
+    def test_slow_client_drops_instead_of_blocking(self, daemon):
+        """Test a client that stops reading loses snapshots, publishing never blocks."""
+        ours, theirs = socket.socketpair()
+        stalled = _Client(99, ours, queue_size=2)  # No writer thread: never drains
+        stalled.watching.add("system")
+        daemon._clients[stalled.id] = stalled
+        try:
+            for i in range(5):
+                daemon._publish_snapshot("system", {"tick": i}, float(i))
+        finally:
+            daemon._clients.pop(stalled.id)
+            ours.close()
+            theirs.close()
+
+        assert stalled.queue.qsize() == 2
+        assert stalled.dropped == 3
+        assert daemon.stats['dropped'] == 3
+
+
+class TestDeltas:
+    """Test entity tables streamed as changes."""
+
+    def test_daemon_sends_changes_after_first_snapshot(self, daemon):
+        """Test watchers get a full snapshot, then only what changed."""
+        ours, theirs = socket.socketpair()
+        watcher = _Client(98, ours, queue_size=8)  # No writer thread: inspect the queue
+        watcher.watching.add("system")
+        daemon._clients[watcher.id] = watcher
+        keys = {"devices": "ip"}
+        try:
+            daemon._publish_snapshot("system", {"devices": [{"ip": "a", "n": 1}], "count": 1}, 1.0, keys)
+            daemon._publish_snapshot("system", {"devices": [{"ip": "a", "n": 1}, {"ip": "b", "n": 1}],
+                                                "count": 2}, 2.0, keys)
+        finally:
+            daemon._clients.pop(watcher.id)
+            ours.close()
+            theirs.close()
+
+        full, delta = decode(watcher.queue.get()), decode(watcher.queue.get())
+        assert full["type"] == "snapshot"
+        assert delta["type"] == "changes"
+        assert delta["changes"]["since"] == full["version"]
+        assert delta["changes"]["changes"]["devices"] == {"added": [{"ip": "b", "n": 1}], "updated": [], "removed": []}
+        assert delta["changes"]["data"] == {"count": 2}
+
+    def test_client_applies_changes_or_resyncs(self):
+        """Test a client follows deltas and asks for a resync after a gap."""
+        client = DaemonClient("/nonexistent.sock")
+        client._dispatch({"type": "snapshot", "plugin": "topology", "version": 1,
+                          "data": {"devices": [{"ip": "a"}], "count": 1}})
+        client._dispatch({"type": "changes", "plugin": "topology", "changes": {
+            "full": False, "since": 1, "version": 2, "keys": {"devices": "ip"},
+            "changes": {"devices": {"added": [{"ip": "b"}], "updated": [], "removed": ["a"]}},
+            "data": {"count": 1}
+        }})
+        assert client.snapshot("topology") == {"devices": [{"ip": "b"}], "count": 1}
+
+        client._dispatch({"type": "changes", "plugin": "topology", "changes": {"since": 5, "version": 6}})
+        assert client.stats == {"deltas": 1, "resyncs": 1}
+        assert client.snapshot("topology") == {"devices": [{"ip": "b"}], "count": 1}
+
+
+class TestConfigReload:
+    """Test plugin config file changes applied by a running daemon."""
+
+    def test_disable_retune_and_enable(self, tmp_path):
+        """Test a watched plugin stops when disabled and restarts for its client when enabled."""
+        config = tmp_path / "dashboard.yml"
+        config.write_text("plugins:\n  - name: system\n    rate_ms: 100\n")
+        watcher = PluginConfigWatcher(str(config), DEFAULT_PLUGIN_SPECS, interval=0)
+        daemon = CollectorDaemon(str(tmp_path / "wf.sock"), mock_mode=True, tick=0.02,
+                                 grace_period=0, plugin_config=watcher)
+        daemon.start()
+        client = DaemonClient(daemon.socket_path, timeout=2.0)
+        try:
+            client.connect()
+            events = []
+            client.on_event = events.append
+            client.watch(["dns_monitor"])
+            assert wait_for(lambda: daemon.activation.running() == ["dns_monitor"])
+            system = daemon.plugins["system"]
+
+            def rewrite(text):
+                config.write_text(text)
+                st = os.stat(config)
+                os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+                count = daemon.stats['config_reloads']
+                assert wait_for(lambda: daemon.stats['config_reloads'] > count)
+
+            rewrite("plugins:\n  - name: system\n    rate_ms: 200\n"
+                    "  - name: dns_monitor\n    enabled: false\n")
+            assert "dns_monitor" not in daemon.plugins
+            assert daemon.activation.running() == []
+            assert daemon.plugins["system"] is system and system.config.rate_ms == 200
+            assert wait_for(lambda: any(e.get("event") == "config" for e in events))
+
+            rewrite("plugins:\n  - name: system\n    rate_ms: 200\n")
+            assert wait_for(lambda: daemon.activation.running() == ["dns_monitor"])
+            assert daemon.plugins["system"] is system
+        finally:
+            client.close()
+            daemon.stop()
+
+
+class TestSocketHygiene:
+    """Test socket permissions and stale/live socket handling."""
+
+    def test_socket_is_owner_only(self, daemon):
+        """Test other users cannot connect to the daemon."""
+        assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+
+    def test_stale_socket_is_replaced(self, tmp_path):
+        """Test a socket left by a dead daemon doesn't block startup."""
+        path = str(tmp_path / "stale.sock")
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(path)
+        dead.close()
+
+        daemon = CollectorDaemon(path, mock_mode=True)
+        daemon.start()
+        try:
+            client = DaemonClient(path)
+            client.connect()
+            client.close()
+        finally:
+            daemon.stop()
+        assert not os.path.exists(path)
+
+    def test_second_daemon_refuses_live_socket(self, daemon):
+        """Test a running daemon is never hijacked."""
+        with pytest.raises(RuntimeError):
+            CollectorDaemon(daemon.socket_path, mock_mode=True).start()
+
+    def test_connect_without_daemon(self, tmp_path):
+        """Test attaching with no daemon explains how to start one."""
+        with pytest.raises(ConnectionError, match="--daemon"):
+            DaemonClient(str(tmp_path / "missing.sock")).connect()
+
+
+class TestRemotePlugin:
+    """Test the proxies the app uses in --attach mode."""
+
+    def test_plugin_set_mirrors_daemon(self, connect):
+        """Test proxies keep names and on-demand flags of the daemon's plugins."""
+        client = connect()
+        lifecycle = PluginLifecycle(PluginActivation(grace_period=0))
+        plugins = client.build_plugin_set(lifecycle)
+
+        assert set(plugins) == set(client.plugins)
+        assert all(isinstance(plugin, RemotePlugin) for plugin in plugins.values())
+        assert lifecycle.is_on_demand("dns_monitor")
+        assert not lifecycle.is_on_demand("system")
+        lifecycle.teardown()
+
+    def test_activation_drives_daemon(self, daemon, connect):
+        """Test acquiring a proxy starts the real plugin on the daemon."""
+        client = connect()
+        activation = PluginActivation(grace_period=0)
+        lifecycle = PluginLifecycle(activation)
+        plugins = client.build_plugin_set(lifecycle)
+
+        activation.acquire("dns_monitor", "screen")
+        assert wait_for(lambda: plugins["dns_monitor"].collect_data())
+        assert daemon.activation.running() == ["dns_monitor"]
+
+        activation.release("dns_monitor", "screen")
+        assert wait_for(lambda: daemon.activation.running() == [])
+        assert plugins["dns_monitor"].collect_data() == {}
+        lifecycle.teardown()
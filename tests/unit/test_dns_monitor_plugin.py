@@ -8,6 +8,7 @@
 """
 
 import pytest
+import json
 import time
 from unittest.mock import Mock, patch
 
@@ -256,3 +257,25 @@ def test_concurrent_data_access(self):
         # All should succeed
         assert len(results) == 5
         assert all(r is not None for r in results)
+
+
+class TestDNSMonitorState:
+    """Test get_state/restore_state round trip."""
+
+    def test_counters_round_trip(self):
+        """Test counters and cache survive a JSON round trip into a new plugin."""
+        config = PluginConfig(name="dns_monitor", config={})
+        plugin = DNSMonitorPlugin(config)
+        plugin.domain_counter.update({"example.com": 3, "github.com": 1})
+        plugin.query_types["A"] = 4
+        plugin.dns_cache["example.com"] = "93.184.216.34"
+        plugin.stats['total_queries'] = 4
+
+        restored = DNSMonitorPlugin(config)
+        restored.restore_state(json.loads(json.dumps(plugin.get_state())))
+
+        assert restored.domain_counter.most_common(1) == [("example.com", 3)]
+        assert restored.query_types["A"] == 4
+        assert restored.dns_cache == {"example.com": "93.184.216.34"}
+        assert restored.stats['total_queries'] == 4
+        assert restored.stats['unique_domains'] == 2
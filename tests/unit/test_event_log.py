@@ -0,0 +1,250 @@
+"""
+Tests for Event Log - batched, rotating JSON-lines sink
+
+Focus: record format, batching off the emit path, size/age rotation,
+compression, retention of segments, drop accounting
+"""
+
+import gzip
+import json
+import time
+
+import pytest
+
+from plugins.activation import PluginActivation
+from plugins.base import Plugin, PluginConfig
+from plugins.lifecycle import PluginLifecycle
+from utils.event_log import EventLog
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+class Record:
+    """Record with to_dict(), like the plugins' dataclasses."""
+
+    def __init__(self, domain):
+        self.domain = domain
+
+    def to_dict(self):
+        return {"domain": self.domain}
+
+
+class TestEventLog:
+    """Test writing and batching."""
+
+    def test_emit_only_buffers(self, tmp_path):
+        """Test nothing touches the disk until the writer flushes."""
+        log = EventLog(tmp_path / "events.jsonl")
+        log.emit("dns_query", {"domain": "example.com"}, source="dns_monitor")
+
+        assert not (tmp_path / "events.jsonl").exists()
+        assert log.flush() == 1
+        log.close()
+
+    def test_record_format(self, tmp_path):
+        """Test one JSON object per line with ts, event and source."""
+        log = EventLog(tmp_path / "events.jsonl")
+        log.emit("dns_query", Record("example.com"), source="dns_monitor", timestamp=123.5)
+        log.close()
+
+        assert read_lines(tmp_path / "events.jsonl") == [
+            {"domain": "example.com", "ts": 123.5, "event": "dns_query", "source": "dns_monitor"}
+        ]
+
+    def test_background_writer_batches(self, tmp_path):
+        """Test the writer thread writes many events in few batches."""
+        log = EventLog(tmp_path / "events.jsonl", flush_interval=0.05)
+        log.start()
+        for i in range(500):
+            log.emit("dns_query", {"n": i})
+        deadline = time.time() + 5.0
+        while log.stats['written'] < 500 and time.time() < deadline:
+            time.sleep(0.02)
+        log.close()
+
+        assert log.stats['written'] == 500
+        assert log.stats['batches'] < 500
+        assert [line["n"] for line in read_lines(tmp_path / "events.jsonl")] == list(range(500))
+
+    def test_batch_size_wakes_writer(self, tmp_path):
+        """Test a full batch is written before the flush interval."""
+        log = EventLog(tmp_path / "events.jsonl", flush_interval=60.0, batch_size=10)
+        log.start()
+        for i in range(10):
+            log.emit("http_request", {"n": i})
+        deadline = time.time() + 5.0
+        while log.stats['written'] < 10 and time.time() < deadline:
+            time.sleep(0.02)
+
+        assert log.stats['written'] == 10
+        log.close()
+
+    def test_unserializable_record_is_dropped_not_fatal(self, tmp_path):
+        """Test a bad record doesn't lose the rest of the batch."""
+        log = EventLog(tmp_path / "events.jsonl")
+        log.emit("bad", 42)
+        log.emit("good", {"ok": True})
+        log.close()
+
+        assert [line["event"] for line in read_lines(tmp_path / "events.jsonl")] == ["good"]
+        assert log.stats['dropped_by_type']['bad'] == 1
+
+    def test_invalid_compression(self, tmp_path):
+        """Test unknown compression is rejected up front."""
+        with pytest.raises(ValueError):
+            EventLog(tmp_path / "events.jsonl", compression="lz4")
+
+
+class TestDropAccounting:
+    """Test behaviour when events outpace the disk."""
+
+    def test_full_buffer_drops_and_counts(self, tmp_path):
+        """Test emit never blocks: overflow is dropped and counted per type."""
+        log = EventLog(tmp_path / "events.jsonl", max_pending=3)
+        results = [log.emit("dns_query", {"n": i}) for i in range(5)]
+        log.emit("arp_alert", {})
+
+        assert results == [True, True, True, False, False]
+        assert log.stats['dropped'] == 3
+        assert dict(log.stats['dropped_by_type']) == {"dns_query": 2, "arp_alert": 1}
+        log.close()
+
+    def test_drops_are_reported_in_the_log(self, tmp_path):
+        """Test the next batch starts with an events_dropped record."""
+        log = EventLog(tmp_path / "events.jsonl", max_pending=1)
+        log.emit("dns_query", {"n": 0})
+        log.emit("dns_query", {"n": 1})
+        log.close()
+
+        lines = read_lines(tmp_path / "events.jsonl")
+        assert lines[0]["event"] == "events_dropped"
+        assert lines[0]["count"] == 1
+        assert lines[0]["by_type"] == {"dns_query": 1}
+        assert lines[1]["n"] == 0
+
+    def test_write_failure_counts_drops(self, tmp_path):
+        """Test events lost to a failing disk are accounted for."""
+        log = EventLog(tmp_path / "events.jsonl")
+        log.close()
+        log.emit("dns_query", {})
+
+        assert log.flush() == 0
+        assert log.stats['dropped'] == 1
+        assert log.stats['errors'] == 1
+
+
+class TestRotation:
+    """Test size/age rotation, compression and segment retention."""
+
+    def test_rotates_at_max_bytes(self, tmp_path):
+        """Test the active file never grows past max_bytes."""
+        log = EventLog(tmp_path / "events.jsonl", max_bytes=200)
+        for i in range(10):
+            log.emit("dns_query", {"domain": f"host{i}.example.com"})
+            log.flush()
+        log.close()
+
+        segments = log.segments()
+        assert log.stats['rotations'] == len(segments) > 0
+        assert (tmp_path / "events.jsonl").stat().st_size <= 200
+        total = sum(len(read_lines(p)) for p in segments) + len(read_lines(tmp_path / "events.jsonl"))
+        assert total == 10
+
+    def test_rotates_at_max_age(self, tmp_path):
+        """Test an old active file is rotated on the next write."""
+        log = EventLog(tmp_path / "events.jsonl", max_age=0.05)
+        log.emit("dns_query", {"n": 0})
+        log.flush()
+        time.sleep(0.1)
+        log.emit("dns_query", {"n": 1})
+        log.flush()
+        log.close()
+
+        assert log.stats['rotations'] == 1
+        assert read_lines(tmp_path / "events.jsonl") == [
+            {"n": 1, "ts": pytest.approx(time.time(), abs=5), "event": "dns_query", "source": None}
+        ]
+
+    def test_gzip_segments(self, tmp_path):
+        """Test rotated segments are gzip-compressed JSON lines."""
+        log = EventLog(tmp_path / "events.jsonl", compression="gzip")
+        log.emit("arp_alert", {"ip": "192.168.1.1"})
+        log.flush()
+        segment = log.rotate()
+        log.close()
+
+        assert segment.name.endswith(".jsonl.gz")
+        with gzip.open(segment, 'rt', encoding='utf-8') as f:
+            assert json.loads(f.readline())["ip"] == "192.168.1.1"
+
+    def test_zstd_segments(self, tmp_path):
+        """Test zstd compression when the zstandard package is installed."""
+        zstandard = pytest.importorskip("zstandard")
+        log = EventLog(tmp_path / "events.jsonl", compression="zstd")
+        log.emit("handshake", {"ssid": "HomeNetwork"})
+        log.flush()
+        segment = log.rotate()
+        log.close()
+
+        with open(segment, 'rb') as f:
+            data = zstandard.ZstdDecompressor().stream_reader(f).read()
+        assert json.loads(data)["ssid"] == "HomeNetwork"
+
+    def test_keeps_newest_backups(self, tmp_path):
+        """Test old segments beyond ``backups`` are deleted."""
+        log = EventLog(tmp_path / "events.jsonl", backups=2)
+        for i in range(4):
+            log.emit("dns_query", {"n": i})
+            log.flush()
+            log.rotate()
+        log.close()
+
+        segments = log.segments()
+        assert len(segments) == 2
+        assert [read_lines(p)[0]["n"] for p in segments] == [2, 3]
+
+    def test_rotate_empty_is_noop(self, tmp_path):
+        """Test rotating with nothing written creates no segment."""
+        log = EventLog(tmp_path / "events.jsonl")
+
+        assert log.rotate() is None
+        log.close()
+
+
+class TestPluginEvents:
+    """Test plugins reach the sink through the lifecycle."""
+
+    class AlertPlugin(Plugin):
+        def initialize(self) -> None:
+            pass
+
+        def collect_data(self):
+            self.emit_event("traffic_alert", {"device_ip": "10.0.0.5"})
+            return {}
+
+    def test_lifecycle_wires_event_sink(self, tmp_path):
+        """Test plugins added in real mode emit into the shared event log."""
+        log = EventLog(tmp_path / "events.jsonl")
+        lifecycle = PluginLifecycle(PluginActivation())
+        lifecycle.resources.event_log = log
+        plugin = lifecycle.add("traffic", self.AlertPlugin(PluginConfig(name="traffic")))
+        plugin.collect_data()
+        log.close()
+
+        assert read_lines(tmp_path / "events.jsonl")[0]["source"] == "traffic"
+
+    def test_mock_plugins_emit_nothing(self, tmp_path):
+        """Test mock-mode plugin sets never write to the event log."""
+        log = EventLog(tmp_path / "events.jsonl")
+        lifecycle = PluginLifecycle(PluginActivation())
+        lifecycle.resources.event_log = log
+        lifecycle.persist_state = False
+        plugin = lifecycle.add("traffic", self.AlertPlugin(PluginConfig(name="traffic")))
+        plugin.collect_data()
+
+        assert plugin.event_sink is None
+        assert log.stats['emitted'] == 0
+        log.close()
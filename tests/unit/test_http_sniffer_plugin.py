@@ -100,6 +100,26 @@ def test_http_request_dataclass(self):
         assert isinstance(request_dict, dict)
         assert request_dict['host'] == "example.com"
     
+    def test_http_request_event_omits_cookies_and_body(self):
+        """Test event log records never carry cookies or POST data."""
+        request = HTTPRequest(
+            timestamp=time.time(),
+            source_ip="192.168.1.100",
+            dest_ip="93.184.216.34",
+            method="POST",
+            host="example.com",
+            path="/login",
+            cookies="session=abc123",
+            post_data="user=bob&password=hunter2"
+        )
+
+        event = request.to_event()
+        assert 'cookies' not in event
+        assert 'post_data' not in event
+        assert event['has_cookies'] is True
+        assert event['has_post_data'] is True
+        assert 'hunter2' not in str(event)
+
     def test_credential_capture_dataclass(self):
         """Test CredentialCapture dataclass."""
         credential = CredentialCapture(
@@ -0,0 +1,206 @@
+"""
+Tests for the Metrics Exporter - Prometheus/OpenMetrics /metrics endpoint
+
+Focus: exposition format, plugin counter mapping, scrapes served from
+cached snapshots only, headless daemon wiring over real HTTP
+"""
+
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from plugins.base import Plugin, PluginConfig
+from utils.metrics_exporter import (
+    GAUGE, MetricFamily, MetricsExporter, collect_families, render
+)
+
+
+class CountingPlugin(Plugin):
+    """Plugin that counts collect_data() calls (scrapes must not make any)."""
+
+    def initialize(self) -> None:
+        self.calls = 0
+
+    def collect_data(self):
+        self.calls += 1
+        raise RuntimeError("capture failed")
+
+
+def scrape(port, accept=None):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}/metrics")
+    if accept:
+        request.add_header("Accept", accept)
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.headers["Content-Type"], response.read().decode("utf-8")
+
+
+SNAPSHOTS = {
+    "arp_detector": (100.0, {"stats": {"arp_packets": 1523, "mac_changes": 2,
+                                       "alerts_raised": 3, "critical_alerts": 1}}),
+    "dns_monitor": (100.0, {"stats": {"total_queries": 42, "unique_domains": 7,
+                                      "queries_per_minute": 12.5, "cache_hits": 35}}),
+    "rogue_ap": (100.0, {"stats": {"total_aps_detected": 5, "beacons_captured": 900}}),
+    "handshake": (100.0, {"stats": {"eapol_packets": 8, "complete_handshakes": 1}}),
+    "packet_analyzer": (99.0, {"packet_rate": 48.5, "total_packets": 97,
+                               "top_protocols": {"TCP": 60, "UDP": 37}}),
+}
+
+
+class TestExposition:
+    """Test metric names, types and text format."""
+
+    def test_plugin_counters_are_exported(self):
+        """Test every plugin's counters map to metrics."""
+        text = render(collect_families(SNAPSHOTS, now=100.0))
+
+        assert "wf_arp_arp_packets_total 1523" in text
+        assert "wf_arp_critical_alerts_total 1" in text
+        assert "wf_dns_total_queries_total 42" in text
+        assert "wf_dns_queries_per_minute 12.5" in text
+        assert "wf_rogue_ap_beacons_captured_total 900" in text
+        assert "wf_handshake_eapol_packets_total 8" in text
+        assert "wf_packet_rate 48.5" in text
+        assert 'wf_packet_window_protocol_packets{protocol="TCP"} 60' in text
+        assert 'wf_plugin_snapshot_age_seconds{plugin="packet_analyzer"} 1' in text
+
+    def test_types_and_help(self):
+        """Test counters carry _total in Prometheus text, gauges don't."""
+        text = render(collect_families(SNAPSHOTS, now=100.0))
+
+        assert "# TYPE wf_dns_total_queries_total counter" in text
+        assert "# TYPE wf_dns_unique_domains gauge" in text
+        assert "# HELP wf_dns_cache_hits_total DNS queries for already seen domains" in text
+
+    def test_openmetrics_format(self):
+        """Test OpenMetrics names counter families without _total and ends with # EOF."""
+        text = render(collect_families(SNAPSHOTS, now=100.0), openmetrics=True)
+
+        assert "# TYPE wf_dns_total_queries counter" in text
+        assert "wf_dns_total_queries_total 42" in text
+        assert text.endswith("# EOF\n")
+
+    def test_missing_and_non_numeric_fields_are_skipped(self):
+        """Test partial or odd snapshots never break the exposition."""
+        snapshots = {"dns_monitor": (1.0, {"stats": {"total_queries": "many", "cache_hits": True}}),
+                     "arp_detector": (1.0, {"available": False})}
+        text = render(collect_families(snapshots, now=1.0))
+
+        assert "wf_dns" not in text
+        assert "wf_arp" not in text
+
+    def test_label_values_are_escaped(self):
+        """Test quotes and backslashes in labels stay valid exposition."""
+        family = MetricFamily("wf_test", GAUGE, "Test").add(1, protocol='a"b\\c')
+
+        assert 'wf_test{protocol="a\\"b\\\\c"} 1' in render([family])
+
+    def test_plugin_errors_and_up(self):
+        """Test error_count and snapshot presence per plugin."""
+        plugin = CountingPlugin(PluginConfig(name="dns_monitor"))
+        plugin.initialize()
+        plugin.collect_tracked()
+        plugin.collect_tracked()
+
+        text = render(collect_families({}, {"dns_monitor": plugin}))
+
+        assert 'wf_plugin_errors_total{plugin="dns_monitor"} 2' in text
+        assert 'wf_plugin_up{plugin="dns_monitor"} 0' in text
+
+
+class TestMetricsExporter:
+    """Test the HTTP endpoint with a local client."""
+
+    @pytest.fixture
+    def exporter(self):
+        plugin = CountingPlugin(PluginConfig(name="dns_monitor"))
+        plugin.initialize()
+        exporter = MetricsExporter(lambda: SNAPSHOTS, lambda: {"dns_monitor": plugin}, port=0)
+        exporter.plugin = plugin
+        exporter.start()
+        yield exporter
+        exporter.stop()
+
+    def test_scrape_serves_prometheus_text(self, exporter):
+        """Test GET /metrics returns the exposition."""
+        content_type, body = scrape(exporter.port)
+
+        assert content_type.startswith("text/plain; version=0.0.4")
+        assert "wf_dns_total_queries_total 42" in body
+        assert "wf_exporter_scrapes_total 1" in body
+
+    def test_scrape_negotiates_openmetrics(self, exporter):
+        """Test OpenMetrics scrapers get OpenMetrics."""
+        content_type, body = scrape(exporter.port, accept="application/openmetrics-text; version=1.0.0")
+
+        assert content_type.startswith("application/openmetrics-text")
+        assert body.endswith("# EOF\n")
+
+    def test_scrape_never_collects(self, exporter):
+        """Test scraping only reads cached snapshots."""
+        for _ in range(3):
+            scrape(exporter.port)
+
+        assert exporter.plugin.calls == 0
+        assert exporter.stats['scrapes'] == 3
+
+    def test_other_paths_404(self, exporter):
+        """Test only /metrics is served."""
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f"http://127.0.0.1:{exporter.port}/", timeout=5)
+        assert excinfo.value.code == 404
+
+    def test_stop_releases_port(self, exporter):
+        """Test the port can be reused after stop()."""
+        port = exporter.port
+        exporter.stop()
+
+        again = MetricsExporter(lambda: {}, port=port)
+        again.start()
+        again.stop()
+
+    def test_headless_daemon_exports(self, tmp_path):
+        """Test a mock daemon serves /metrics with no UI attached."""
+        from src.daemon import CollectorDaemon
+
+        daemon = CollectorDaemon(str(tmp_path / "wf.sock"), mock_mode=True, tick=0.02, metrics_port=0)
+        daemon.start()
+        try:
+            deadline = time.time() + 5.0
+            while "packet_analyzer" not in daemon.snapshots() and time.time() < deadline:
+                time.sleep(0.02)
+            _, body = scrape(daemon.exporter.port)
+        finally:
+            daemon.stop()
+
+        assert "wf_packet_rate " in body
+        assert 'wf_plugin_up{plugin="packet_analyzer"} 1' in body
+        assert 'wf_plugin_up{plugin="topology"} 0' in body  # On-demand, not exported
+        assert "wf_daemon_clients 0" in body
+
+    def test_headless_daemon_exports_detectors(self, tmp_path):
+        """Test the exporter keeps the detectors running with no client attached."""
+        from src.daemon import CollectorDaemon
+        from utils.metrics_exporter import CONSUMER, PLUGIN_STATS
+
+        daemon = CollectorDaemon(str(tmp_path / "wf.sock"), mock_mode=True, tick=0.02,
+                                 grace_period=0, metrics_port=0)
+        daemon.start()
+        try:
+            assert sorted(daemon.activation.running()) == sorted(PLUGIN_STATS)
+            assert daemon.activation.consumers("dns_monitor") == {CONSUMER}
+            deadline = time.time() + 5.0
+            while not set(PLUGIN_STATS) <= set(daemon.snapshots()) and time.time() < deadline:
+                time.sleep(0.02)
+            _, body = scrape(daemon.exporter.port)
+            exporter = daemon.exporter
+            exporter.stop()
+            assert daemon.activation.running() == []  # Released on stop
+        finally:
+            daemon.stop()
+
+        assert "wf_daemon_clients 0" in body
+        for name, (prefix, _) in PLUGIN_STATS.items():
+            assert f'wf_plugin_up{{plugin="{name}"}} 1' in body
+            assert f"{prefix}_" in body
@@ -0,0 +1,145 @@
+"""
+Tests for Metrics Store - embedded SQLite history
+
+Focus: batching off the hot path, range queries, state restore across
+reopen, backpressure and retention
+"""
+
+import sqlite3
+
+import pytest
+
+from utils.metrics_store import MetricsStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "history.db"
+
+
+class TestMetricsStore:
+    """Test recording, flushing and querying."""
+
+    def test_wal_mode(self, db_path):
+        """Test the database is opened in WAL mode."""
+        store = MetricsStore(db_path)
+        mode = sqlite3.connect(db_path).execute("PRAGMA journal_mode").fetchone()[0]
+        store.close()
+
+        assert mode == "wal"
+
+    def test_record_is_buffered_until_flush(self, db_path):
+        """Test samples only reach the database on flush."""
+        store = MetricsStore(db_path)
+        store.record("system.cpu_percent", 12.5, timestamp=100.0)
+
+        assert store.query("system.cpu_percent") == []
+        assert store.flush() == 1
+        assert store.query("system.cpu_percent") == [(100.0, 12.5)]
+        store.close()
+
+    def test_record_many_keeps_numeric_values(self, db_path):
+        """Test non-numeric and boolean fields are skipped."""
+        store = MetricsStore(db_path)
+        count = store.record_many("wifi", {
+            "signal_strength_dbm": -55, "bitrate_mbps": 144.4,
+            "ssid": "HomeNet", "available": True, "per_core": [1, 2]
+        }, timestamp=1.0)
+        store.flush()
+
+        assert count == 2
+        assert store.metrics() == ["wifi.bitrate_mbps", "wifi.signal_strength_dbm"]
+        store.close()
+
+    def test_range_query(self, db_path):
+        """Test start/end bounds are inclusive and results are time ordered."""
+        store = MetricsStore(db_path)
+        for ts in (5.0, 1.0, 3.0, 2.0, 4.0):
+            store.record("network.bandwidth_rx_mbps", ts * 10, timestamp=ts)
+        store.record("network.bandwidth_tx_mbps", 1.0, timestamp=3.0)
+        store.flush()
+
+        assert store.query("network.bandwidth_rx_mbps", start=2.0, end=4.0) == [
+            (2.0, 20.0), (3.0, 30.0), (4.0, 40.0)
+        ]
+        assert store.query("network.bandwidth_rx_mbps", start=2.0, limit=1) == [(2.0, 20.0)]
+        assert store.latest("network.bandwidth_rx_mbps") == (5.0, 50.0)
+        store.close()
+
+    def test_background_flush(self, db_path):
+        """Test the flush thread writes without an explicit flush()."""
+        store = MetricsStore(db_path, flush_interval=0.05)
+        store.start()
+        store.record("system.cpu_percent", 1.0)
+
+        store._stop_event.wait(0.3)
+
+        assert len(store.query("system.cpu_percent")) == 1
+        store.close()
+        assert store._flush_thread is None
+
+    def test_close_flushes_pending(self, db_path):
+        """Test closing writes buffered samples, and close is idempotent."""
+        store = MetricsStore(db_path)
+        store.record("system.cpu_percent", 1.0, timestamp=1.0)
+        store.close()
+        store.close()
+
+        reopened = MetricsStore(db_path)
+        assert reopened.query("system.cpu_percent") == [(1.0, 1.0)]
+        reopened.close()
+
+    def test_backpressure_drops_and_counts(self, db_path):
+        """Test samples beyond max_pending are dropped and counted."""
+        store = MetricsStore(db_path, max_pending=3)
+        for i in range(5):
+            store.record("m", i, timestamp=float(i))
+        store.record_many("p", {"a": 1, "b": 2})
+
+        assert store.stats['recorded'] == 3
+        assert store.stats['dropped'] == 4
+        store.close()
+
+    def test_prune(self, db_path):
+        """Test pruning removes only samples older than the cutoff."""
+        store = MetricsStore(db_path)
+        for ts in (1.0, 2.0, 3.0):
+            store.record("m", ts, timestamp=ts)
+        store.flush()
+
+        assert store.prune(2.5) == 2
+        assert store.query("m") == [(3.0, 3.0)]
+        store.close()
+
+
+class TestMetricsStoreState:
+    """Test plugin state persistence."""
+
+    def test_state_survives_reopen(self, db_path):
+        """Test saved state is restored by a new store on the same file."""
+        store = MetricsStore(db_path)
+        store.save_state("dns_monitor", {"total_queries": 42})
+        assert store.load_state("dns_monitor") == {"total_queries": 42}  # Buffered
+        store.close()
+
+        reopened = MetricsStore(db_path)
+        assert reopened.load_state("dns_monitor") == {"total_queries": 42}
+        assert reopened.load_state("missing", default={}) == {}
+        reopened.close()
+
+    def test_state_sources_sampled(self, db_path):
+        """Test registered sources are snapshotted, and failures are isolated."""
+        store = MetricsStore(db_path)
+        store.add_state_source("good", lambda: {"value": 1})
+        store.add_state_source("empty", lambda: None)
+        store.add_state_source("broken", lambda: 1 / 0)
+
+        store.sample_state()
+        store.flush()
+
+        assert store.load_state("good") == {"value": 1}
+        assert store.load_state("empty") is None
+        assert store.stats['errors'] == 1
+
+        store.remove_state_source("good")
+        store.close()
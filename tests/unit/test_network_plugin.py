@@ -12,7 +12,7 @@
 from unittest.mock import Mock, MagicMock, patch
 import time
 
-from src.plugins.network_plugin import NetworkPlugin
+from src.plugins.network_plugin import NetworkPlugin, count_proc_sockets, counter_delta
 from src.plugins.base import PluginConfig, PluginStatus
 
 
@@ -242,9 +242,10 @@ def test_collect_data_handles_zero_time_delta(self, mock_time_func, plugin_confi
         assert data["bandwidth_rx_mbps"] == 0.0
 
     @patch('time.time')
-    def test_collect_data_counts_connections(self, mock_time_func, plugin_config):
+    def test_collect_data_counts_connections(self, mock_time_func):
         """Test collect_data counts ESTABLISHED vs total connections"""
         mock_time_func.side_effect = [1000.0, 1001.0]
+        plugin_config = PluginConfig(name="network", config={"connections_backend": "psutil"})
 
         # Create connections with different statuses
         conns = [
@@ -322,6 +323,134 @@ def test_collect_data_updates_baseline(self, mock_time_func, plugin_config):
             assert plugin._last_bytes_recv == 2100000
 
 
+# ============================================================================
+# CONNECTION ACCOUNTING TESTS
+# ============================================================================
+
+PROC_TCP = """  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 0100007F:0277 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0000000000000000 100 0 0 10 0
+   1: 3201A8C0:B5D2 22D8B85D:01BB 01 00000000:00000000 02:00000A3E 00000000  1000        0 1002 2 0000000000000000 20 4 30 10 -1
+   2: 3201A8C0:B5D4 22D8B85D:01BB 01 00000000:00000000 02:00000A3E 00000000  1000        0 1003 2 0000000000000000 20 4 30 10 -1
+   3: 3201A8C0:B5D6 22D8B85D:01BB 06 00000000:00000000 03:00001692 00000000     0        0 0 3 0000000000000000
+"""
+
+PROC_TCP6 = """  sl  local_address                         remote_address                        st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000000000000000000000000000:0016 00000000000000000000000000000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 2001 1 0000000000000000 100 0 0 10 0
+"""
+
+PROC_UDP = """   sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode ref pointer drops
+  100: 00000000:14E9 00000000:0000 07 00000000:00000000 00:00000000 00000000   101        0 3001 2 0000000000000000 0
+  200: 3500007F:0035 00000000:0000 07 00000000:00000000 00:00000000 00000000   101        0 3002 2 0000000000000000 0
+"""
+
+
+@pytest.fixture
+def proc_net(tmp_path):
+    """Recorded /proc/net socket tables (no udp6: IPv6 UDP unused)"""
+    (tmp_path / "tcp").write_text(PROC_TCP)
+    (tmp_path / "tcp6").write_text(PROC_TCP6)
+    (tmp_path / "udp").write_text(PROC_UDP)
+    return tmp_path
+
+
+class TestConnectionAccounting:
+    """Test /proc socket counting, cadence and per-interface counters"""
+
+    def test_count_proc_sockets_by_state(self, proc_net):
+        """Test sockets are counted per state across all tables"""
+        counts = count_proc_sockets(proc_net)
+
+        assert counts == {'LISTEN': 2, 'ESTABLISHED': 2, 'TIME_WAIT': 1, 'UDP': 2}
+
+    def test_count_proc_sockets_empty_dir(self, tmp_path):
+        """Test missing tables count as zero"""
+        assert count_proc_sockets(tmp_path) == {}
+
+    @patch('time.time')
+    def test_proc_backend_feeds_connection_fields(self, mock_time_func, mock_psutil, proc_net):
+        """Test the proc backend replaces psutil.net_connections"""
+        mock_time_func.side_effect = [1000.0, 1001.0]
+        config = PluginConfig(name="network", config={"connections_backend": "proc"})
+        plugin = NetworkPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+        with patch('src.plugins.network_plugin.PROC_NET', proc_net):
+            data = plugin.collect_data()
+
+        assert data["connections_established"] == 2
+        assert data["connections_total"] == 7
+        mock_psutil.net_connections.assert_not_called()
+
+    @patch('time.time')
+    def test_connections_refreshed_on_own_cadence(self, mock_time_func, mock_psutil):
+        """Test socket counts are cached between connections_interval refreshes"""
+        mock_time_func.side_effect = [1000.0, 1001.0, 1002.0, 1003.0]
+        config = PluginConfig(name="network", config={
+            "connections_backend": "psutil", "connections_interval": 60.0
+        })
+        plugin = NetworkPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            plugin.collect_data()
+            plugin.collect_data()
+            plugin._connections_at -= 61.0  # Interval elapsed
+            data = plugin.collect_data()
+
+        assert mock_psutil.net_connections.call_count == 2
+        assert data["connections_established"] == 2
+
+    @patch('time.time')
+    def test_configured_interface_counters_used(self, mock_time_func):
+        """Test the configured NIC's counters are reported, not the total"""
+        mock_time_func.side_effect = [1000.0, 1001.0]
+        wlan_before = MagicMock(bytes_sent=1_000, bytes_recv=2_000, packets_sent=1,
+                                packets_recv=2, errin=0, errout=0, dropin=0, dropout=0)
+        wlan_after = MagicMock(bytes_sent=126_000, bytes_recv=2_000, packets_sent=5,
+                               packets_recv=2, errin=0, errout=0, dropin=0, dropout=0)
+        mock_psutil = MagicMock()
+        mock_psutil.net_io_counters = Mock(side_effect=[
+            {'wlan0': wlan_before, 'eth0': MagicMock()},
+            {'wlan0': wlan_after, 'eth0': MagicMock()},
+        ])
+        config = PluginConfig(name="network", config={
+            "interface": "wlan0", "connections_backend": "psutil"
+        })
+        plugin = NetworkPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            data = plugin.collect_data()
+
+        assert data["bytes_sent"] == 126_000
+        assert data["bandwidth_tx_mbps"] == pytest.approx(1.0)
+        mock_psutil.net_io_counters.assert_called_with(pernic=True)
+
+    @patch('time.time')
+    def test_missing_interface_falls_back_to_total(self, mock_time_func, mock_psutil):
+        """Test an absent NIC reports all interfaces instead of failing"""
+        mock_time_func.return_value = 1000.0
+        totals = mock_psutil.net_io_counters.return_value
+        mock_psutil.net_io_counters = Mock(
+            side_effect=lambda pernic=False: {'eth0': MagicMock()} if pernic else totals
+        )
+        config = PluginConfig(name="network", config={"interface": "wlan0"})
+        plugin = NetworkPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+
+        assert plugin._last_bytes_sent == 1000000
+
+    def test_counter_delta_wraparound_and_reset(self):
+        """Test 32-bit wrap is bridged and resets never go negative"""
+        assert counter_delta(1_500, 1_000) == 500
+        assert counter_delta(100, 2 ** 32 - 400) == 500  # 32-bit wrap
+        assert counter_delta(300, 5_000_000_000) == 300  # Reset on a 64-bit counter
+        assert counter_delta(300, 1_000_000) == 300  # Reset, not a plausible wrap
+
+
 # ============================================================================
 # CLEANUP TESTS
 # ============================================================================
@@ -445,3 +574,76 @@ def test_mock_mode_data_is_cohesive(self):
         # Download should consistently exceed upload
         for rx, tx in zip(samples_rx, samples_tx):
             assert rx >= tx, "Download should be >= upload"
+
+
+class TestMultipleInterfaces:
+    """Test aggregated and per-interface counters for several NICs."""
+
+    @patch('time.time')
+    def test_interfaces_summed_and_reported(self, mock_time_func):
+        """Test the configured NICs are summed, each with its own bandwidth"""
+        mock_time_func.side_effect = [1000.0, 1001.0]
+
+        def nic(sent, recv):
+            return MagicMock(bytes_sent=sent, bytes_recv=recv, packets_sent=1, packets_recv=1,
+                             errin=0, errout=0, dropin=0, dropout=0)
+
+        mock_psutil = MagicMock()
+        mock_psutil.net_io_counters = Mock(side_effect=[
+            {'eth0': nic(0, 0), 'wlan0': nic(0, 0), 'lo': nic(0, 0)},
+            {'eth0': nic(250_000, 0), 'wlan0': nic(0, 125_000), 'lo': nic(9_999_999, 0)},
+        ])
+        config = PluginConfig(name="network", config={
+            "interfaces": ["eth0", "wlan0"], "connections_backend": "psutil"
+        })
+        plugin = NetworkPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            data = plugin.collect_data()
+
+        assert data["bytes_sent"] == 250_000  # lo is not configured
+        assert data["bandwidth_tx_mbps"] == pytest.approx(2.0)
+        assert set(data["interfaces"]) == {"eth0", "wlan0"}
+        assert data["interfaces"]["eth0"]["bandwidth_tx_mbps"] == pytest.approx(2.0)
+        assert data["interfaces"]["wlan0"]["bandwidth_rx_mbps"] == pytest.approx(1.0)
+        assert data["interfaces"]["wlan0"]["packets_recv"] == 1
+
+    @patch('time.time')
+    def test_interface_disappearing_does_not_spike(self, mock_time_func):
+        """Test the aggregate is the sum of per-NIC deltas when one NIC goes away"""
+        mock_time_func.side_effect = [1000.0, 1001.0]
+
+        def nic(sent, recv):
+            return MagicMock(bytes_sent=sent, bytes_recv=recv, packets_sent=1, packets_recv=1,
+                             errin=0, errout=0, dropin=0, dropout=0)
+
+        mock_psutil = MagicMock()
+        mock_psutil.net_io_counters = Mock(side_effect=[
+            {'eth0': nic(1_000_000_000, 0), 'wlan0': nic(2_000_000_000, 0)},
+            {'wlan0': nic(2_000_125_000, 0)},  # eth0 unplugged
+        ])
+        config = PluginConfig(name="network", config={
+            "interfaces": ["eth0", "wlan0"], "connections_backend": "psutil"
+        })
+        plugin = NetworkPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            data = plugin.collect_data()
+
+        assert data["bytes_sent"] == 2_000_125_000
+        assert data["bandwidth_tx_mbps"] == pytest.approx(1.0)
+        assert set(data["interfaces"]) == {"wlan0"}
+
+    @patch('time.time')
+    def test_single_interface_has_no_breakdown(self, mock_time_func, plugin_config, mock_psutil):
+        """Test the per-interface dict only appears with 'interfaces' configured"""
+        mock_time_func.return_value = 1000.0
+        plugin = NetworkPlugin(plugin_config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            data = plugin.collect_data()
+
+        assert "interfaces" not in data
@@ -13,9 +13,14 @@
 from dataclasses import asdict
 
 from plugins.base import PluginConfig
+from plugins.capture_hub import CaptureHub
 from plugins.network_topology_plugin import (
     NetworkTopologyPlugin,
     NetworkDevice,
+    HostnameResolver,
+    HOSTNAME_PENDING,
+    HOSTNAME_UNKNOWN,
+    PASSIVE_UDP_FILTER,
     SCAPY_AVAILABLE,
     NETIFACES_AVAILABLE
 )
@@ -192,6 +197,24 @@ def test_detect_network_with_netifaces(self, mock_netifaces):
         assert plugin.gateway_ip == "192.168.1.1"
         assert plugin.subnet == "192.168.1.0/24"
     
+    @patch('plugins.network_topology_plugin.NETIFACES_AVAILABLE', True)
+    @patch('plugins.network_topology_plugin.netifaces')
+    def test_detect_network_uses_real_netmask(self, mock_netifaces):
+        """Test subnet is sized from the netmask, not assumed /24."""
+        config = PluginConfig(name="topology", enabled=True, config={})
+        plugin = NetworkTopologyPlugin(config)
+        
+        mock_netifaces.AF_INET = 2
+        mock_netifaces.gateways.return_value = {'default': {2: ('10.20.0.1', 'eth0')}}
+        mock_netifaces.ifaddresses.return_value = {
+            2: [{'addr': '10.20.3.7', 'netmask': '255.255.252.0'}]
+        }
+        
+        plugin._detect_network()
+        
+        assert plugin.subnet == "10.20.0.0/22"
+        assert plugin.local_ip == "10.20.3.7"
+    
     @patch('plugins.network_topology_plugin.NETIFACES_AVAILABLE', True)
     @patch('plugins.network_topology_plugin.netifaces')
     def test_detect_network_handles_exception(self, mock_netifaces):
@@ -291,6 +314,113 @@ def test_resolve_hostname_failure(self, mock_gethostbyaddr):
         assert hostname == "Unknown"
 
 
+def _wait_for(predicate, timeout=2.0):
+    """Poll until predicate() is true (resolver callbacks run on worker threads)."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestHostnameResolver:
+    """Test background reverse-DNS resolver with positive/negative cache."""
+    
+    def test_resolves_in_background_and_caches(self):
+        """Test successful lookups are delivered and cached."""
+        resolve = Mock(return_value="laptop.local")
+        resolver = HostnameResolver(resolve, max_workers=2)
+        results = {}
+        
+        assert resolver.submit("192.168.1.100", lambda ip, name: results.update({ip: name}))
+        assert _wait_for(lambda: "192.168.1.100" in results)
+        
+        assert results["192.168.1.100"] == "laptop.local"
+        assert resolver.get_cached("192.168.1.100") == "laptop.local"
+        # Cached: no second lookup
+        assert resolver.submit("192.168.1.100", lambda ip, name: None) is False
+        resolve.assert_called_once_with("192.168.1.100")
+        resolver.shutdown()
+    
+    def test_failures_are_negatively_cached(self):
+        """Test failed lookups are cached as Unknown and not retried."""
+        resolve = Mock(side_effect=Exception("NXDOMAIN"))
+        resolver = HostnameResolver(resolve, negative_ttl=60)
+        results = {}
+        
+        resolver.submit("192.168.1.200", lambda ip, name: results.update({ip: name}))
+        assert _wait_for(lambda: "192.168.1.200" in results)
+        
+        assert results["192.168.1.200"] == HOSTNAME_UNKNOWN
+        assert resolver.get_cached("192.168.1.200") == HOSTNAME_UNKNOWN
+        assert resolver.submit("192.168.1.200", lambda ip, name: None) is False
+        assert resolver.stats['failures'] == 1
+        resolver.shutdown()
+    
+    def test_expired_entries_are_looked_up_again(self):
+        """Test TTL expiry triggers a fresh lookup."""
+        resolve = Mock(return_value="host")
+        resolver = HostnameResolver(resolve, ttl=0.0)
+        done = []
+        
+        resolver.submit("10.0.0.5", lambda ip, name: done.append(name))
+        assert _wait_for(lambda: len(done) == 1)
+        
+        assert resolver.get_cached("10.0.0.5") is None
+        assert resolver.submit("10.0.0.5", lambda ip, name: done.append(name))
+        assert _wait_for(lambda: len(done) == 2)
+        resolver.shutdown()
+    
+    def test_timeout_reports_unknown_then_late_answer_upgrades(self):
+        """Test slow lookups time out without blocking, late names still land."""
+        import threading
+        release = threading.Event()
+        
+        def slow_resolve(ip):
+            release.wait(2.0)
+            return "slow.local"
+        
+        resolver = HostnameResolver(slow_resolve, timeout=0.0)
+        results = []
+        resolver.submit("10.0.0.9", lambda ip, name: results.append(name))
+        
+        assert resolver.expire_overdue() == 1
+        assert results == [HOSTNAME_UNKNOWN]
+        # Still in flight: no duplicate lookup piled on the blocked host
+        assert resolver.submit("10.0.0.9", lambda ip, name: None) is False
+        
+        release.set()
+        assert _wait_for(lambda: len(results) == 2)
+        assert results[-1] == "slow.local"
+        resolver.shutdown()
+    
+    @patch('plugins.network_topology_plugin.SCAPY_AVAILABLE', True)
+    @patch('plugins.network_topology_plugin.srp')
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    def test_scan_adds_devices_before_names_resolve(self, mock_vendor, mock_srp):
+        """Test devices appear with a pending hostname that is filled in later."""
+        import threading
+        release = threading.Event()
+        
+        config = PluginConfig(name="topology", enabled=True, config={})
+        plugin = NetworkTopologyPlugin(config)
+        
+        received = Mock(psrc="192.168.1.100", hwsrc="aa:bb:cc:dd:ee:ff")
+        mock_srp.return_value = ([(None, received)], [])
+        
+        with patch.object(plugin._resolver, '_resolve_fn',
+                          side_effect=lambda ip: release.wait(2.0) and "phone.local"):
+            plugin._scan_network()
+            
+            assert plugin.devices["192.168.1.100"].hostname == HOSTNAME_PENDING
+            
+            release.set()
+            assert _wait_for(lambda: plugin.devices["192.168.1.100"].hostname == "phone.local")
+        
+        plugin.stop()
+
+
 class TestVendorLookup:
     """Test MAC vendor lookup."""
     
@@ -462,6 +592,274 @@ def test_scan_network_removes_stale_devices(self, mock_time, mock_srp):
         assert "192.168.1.100" not in plugin.devices
 
 
+class TestChunkedSweep:
+    """Test chunked, rate-limited ARP sweeps."""
+    
+    @staticmethod
+    def _reply(ip, mac):
+        received = Mock()
+        received.psrc = ip
+        received.hwsrc = mac
+        return (None, received)
+    
+    @staticmethod
+    def _probed(mock_srp):
+        """Addresses probed per srp() call, in order."""
+        batches = []
+        for c in mock_srp.call_args_list:
+            pdst = c.args[0].payload.pdst
+            batches.append(pdst if isinstance(pdst, list) else [pdst])
+        return batches
+    
+    @patch('plugins.network_topology_plugin.SCAPY_AVAILABLE', True)
+    @patch('plugins.network_topology_plugin.srp')
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    def test_sweep_split_into_chunks_with_pps_budget(self, mock_vendor, mock_srp):
+        """Test a /22 is probed in chunks paced by scan_rate_pps."""
+        config = PluginConfig(name="topology", enabled=True, config={
+            "scan_chunk_size": 256, "scan_rate_pps": 500
+        })
+        plugin = NetworkTopologyPlugin(config)
+        plugin.subnet = "10.0.0.0/22"
+        mock_srp.return_value = ([], [])
+        
+        with patch.object(plugin, '_request_hostname'):
+            plugin._scan_network()
+        
+        batches = self._probed(mock_srp)
+        assert [len(b) for b in batches] == [256, 256, 256, 254]
+        assert all(c.kwargs['inter'] == pytest.approx(1 / 500) for c in mock_srp.call_args_list)
+        assert batches[0][0] == "10.0.0.1"
+        assert batches[-1][-1] == "10.0.3.254"
+    
+    @patch('plugins.network_topology_plugin.SCAPY_AVAILABLE', True)
+    @patch('plugins.network_topology_plugin.srp')
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    def test_results_merged_per_chunk_and_progress_reported(self, mock_vendor, mock_srp):
+        """Test devices appear after their chunk and progress advances."""
+        config = PluginConfig(name="topology", enabled=True, config={"scan_chunk_size": 100})
+        plugin = NetworkTopologyPlugin(config)
+        seen_between_chunks = []
+        
+        def respond(packet, **kwargs):
+            seen_between_chunks.append((len(plugin.devices), plugin.scan_progress["scanned"]))
+            first = packet.payload.pdst[0]
+            return ([self._reply(first, "aa:bb:cc:00:00:01")], [])
+        
+        mock_srp.side_effect = respond
+        
+        with patch.object(plugin, '_request_hostname'):
+            plugin._scan_network()
+        
+        assert seen_between_chunks == [(0, 0), (1, 100), (2, 200)]
+        progress = plugin.get_data()["scan_progress"]
+        assert progress["scanning"] is False
+        assert progress["scanned"] == progress["total"] == 254
+        assert progress["percent"] == 100.0
+        assert progress["replies"] == 3
+    
+    @patch('plugins.network_topology_plugin.SCAPY_AVAILABLE', True)
+    @patch('plugins.network_topology_plugin.srp')
+    def test_recently_seen_hosts_probed_first(self, mock_srp):
+        """Test known devices lead the sweep, newest first, without duplicates."""
+        config = PluginConfig(name="topology", enabled=True, config={})
+        plugin = NetworkTopologyPlugin(config)
+        now = time.time()
+        for ip, age in (("192.168.1.200", 50), ("192.168.1.42", 5), ("10.9.9.9", 1)):
+            plugin.devices[ip] = NetworkDevice(ip=ip, mac="aa:bb:cc:dd:ee:ff",
+                                               hostname="h", vendor="v", last_seen=now - age)
+        mock_srp.return_value = ([], [])
+        
+        plugin._scan_network()
+        
+        targets = self._probed(mock_srp)[0]
+        assert targets[:2] == ["192.168.1.42", "192.168.1.200"]
+        assert "10.9.9.9" not in targets
+        assert len(targets) == len(set(targets)) == 254
+    
+    def test_oversized_subnet_narrowed_around_local_ip(self):
+        """Test a /16 is capped to max_scan_hosts around our address."""
+        config = PluginConfig(name="topology", enabled=True, config={"max_scan_hosts": 1024})
+        plugin = NetworkTopologyPlugin(config)
+        plugin.subnet = "172.16.0.0/16"
+        plugin.local_ip = "172.16.77.10"
+        
+        targets = plugin._sweep_targets()
+        
+        assert len(targets) == 1022
+        assert targets[0] == "172.16.76.1"
+        assert targets[-1] == "172.16.79.254"
+    
+    @patch('plugins.network_topology_plugin.SCAPY_AVAILABLE', True)
+    @patch('plugins.network_topology_plugin.srp')
+    def test_interrupted_sweep_keeps_unscanned_devices(self, mock_srp):
+        """Test stop mid-sweep does not prune devices it never probed."""
+        config = PluginConfig(name="topology", enabled=True, config={"scan_chunk_size": 10})
+        plugin = NetworkTopologyPlugin(config)
+        plugin.devices["192.168.1.250"] = NetworkDevice(
+            ip="192.168.1.250", mac="aa:bb:cc:dd:ee:ff", hostname="h",
+            vendor="v", last_seen=time.time() - 1000
+        )
+        
+        def stop_after_first(packet, **kwargs):
+            plugin._stop_event.set()
+            return ([], [])
+        
+        mock_srp.side_effect = stop_after_first
+        
+        plugin._scan_network()
+        
+        assert mock_srp.call_count == 1
+        assert "192.168.1.250" in plugin.devices
+        assert plugin.scan_progress["scanned"] == 10
+
+
+@pytest.mark.skipif(not SCAPY_AVAILABLE, reason="Scapy required to build packets")
+class TestPassiveDiscovery:
+    """Test passive discovery from ARP/DHCP/mDNS traffic."""
+    
+    @staticmethod
+    def _plugin(**options):
+        config = PluginConfig(name="topology", enabled=True, config=options)
+        plugin = NetworkTopologyPlugin(config)
+        plugin._capture_hub = CaptureHub()  # Isolate from the global hub
+        return plugin
+    
+    @staticmethod
+    def _arp_reply(ip, mac):
+        from scapy.all import Ether, ARP
+        return Ether(src=mac) / ARP(op=2, psrc=ip, hwsrc=mac)
+    
+    @staticmethod
+    def _dhcp(mac, hostname, requested=None):
+        from scapy.all import Ether, IP, UDP, BOOTP, DHCP
+        options = [('message-type', 'request' if requested else 'discover'), ('hostname', hostname)]
+        if requested:
+            options.append(('requested_addr', requested))
+        return (Ether(src=mac, dst="ff:ff:ff:ff:ff:ff") / IP(src="0.0.0.0", dst="255.255.255.255")
+                / UDP(sport=68, dport=67) / BOOTP(chaddr=bytes.fromhex(mac.replace(":", "")))
+                / DHCP(options=options + ['end']))
+    
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    def test_arp_reply_adds_device_without_sweep(self, mock_vendor):
+        """Test an observed ARP reply becomes a device with no injected traffic."""
+        plugin = self._plugin()
+        
+        with patch.object(plugin, '_request_hostname'):
+            plugin.observe_packet(self._arp_reply("192.168.1.30", "AA:BB:CC:00:00:30"))
+            assert plugin.devices == {}  # Capture thread only enqueues
+            
+            assert plugin._drain_sightings() == 1
+        
+        device = plugin.devices["192.168.1.30"]
+        assert device.mac == "aa:bb:cc:00:00:30"
+        assert plugin.get_data()["passive_stats"]["arp"] == 1
+    
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    @patch.object(NetworkTopologyPlugin, '_resolve_hostname')
+    def test_dhcp_hostname_names_device_without_reverse_dns(self, mock_resolve, mock_vendor):
+        """Test DHCP option 12 names the device and skips the PTR lookup."""
+        plugin = self._plugin()
+        
+        plugin.observe_packet(self._dhcp("aa:bb:cc:00:00:40", "kitchen-tablet", requested="192.168.1.40"))
+        plugin._drain_sightings()
+        
+        assert plugin.devices["192.168.1.40"].hostname == "kitchen-tablet"
+        assert plugin._resolver.pending_count() == 0
+        mock_resolve.assert_not_called()
+    
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    def test_dhcp_discover_name_applied_when_address_appears(self, mock_vendor):
+        """Test a name seen before the lease is attached to the later ARP sighting."""
+        plugin = self._plugin()
+        
+        plugin.observe_packet(self._dhcp("aa:bb:cc:00:00:50", "new-phone"))
+        plugin.observe_packet(self._arp_reply("192.168.1.50", "aa:bb:cc:00:00:50"))
+        plugin._drain_sightings()
+        
+        assert plugin.devices["192.168.1.50"].hostname == "new-phone"
+        assert plugin.passive_stats["dhcp"] == 1
+    
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    def test_mdns_announcement_names_sender(self, mock_vendor):
+        """Test an mDNS A record for the sender provides its hostname."""
+        from scapy.all import Ether, IP, UDP, DNS, DNSRR
+        plugin = self._plugin()
+        packet = (Ether(src="aa:bb:cc:00:00:60") / IP(src="192.168.1.60", dst="224.0.0.251")
+                  / UDP(sport=5353, dport=5353)
+                  / DNS(qr=1, aa=1, an=DNSRR(rrname="printer.local.", type="A", rdata="192.168.1.60")))
+        
+        plugin.observe_packet(Ether(bytes(packet)))
+        plugin._drain_sightings()
+        
+        assert plugin.devices["192.168.1.60"].hostname == "printer.local"
+        assert plugin.passive_stats["mdns"] == 1
+    
+    def test_unrelated_traffic_ignored(self):
+        """Test non-discovery packets are not queued."""
+        from scapy.all import Ether, IP, TCP
+        plugin = self._plugin()
+        
+        plugin.observe_packet(Ether() / IP(src="192.168.1.70", dst="8.8.8.8") / TCP(dport=443))
+        
+        assert plugin._sightings.qsize() == 0
+    
+    def test_full_queue_counts_drops(self):
+        """Test sightings beyond passive_queue_size are dropped and counted."""
+        plugin = self._plugin(passive_queue_size=2)
+        
+        for i in range(5):
+            plugin.observe_packet(self._arp_reply(f"192.168.1.{i + 1}", "aa:bb:cc:00:00:01"))
+        
+        assert plugin._sightings.qsize() == 2
+        assert plugin.passive_stats["dropped"] == 3
+    
+    def test_own_capture_only_covers_what_hub_lacks(self):
+        """Test the fallback BPF filter shrinks as hub publishers appear."""
+        plugin = self._plugin()
+        assert plugin._own_capture_filter() == f"arp or ({PASSIVE_UDP_FILTER})"
+        
+        plugin._capture_hub.add_publisher("arp_detector", "arp")
+        assert plugin._own_capture_filter() == f"({PASSIVE_UDP_FILTER})"
+        
+        plugin._capture_hub.add_publisher("traffic_stats", "ip")
+        assert plugin._own_capture_filter() == ""
+    
+    @patch('plugins.network_topology_plugin.SCAPY_AVAILABLE', True)
+    @patch.object(NetworkTopologyPlugin, '_lookup_vendor', return_value="Vendor")
+    def test_packets_from_arp_detector_reach_topology(self, mock_vendor):
+        """Test the ARP detector's captured packets feed topology via the hub."""
+        from plugins.arp_spoofing_detector import ARPSpoofingDetector
+        plugin = self._plugin()
+        detector = ARPSpoofingDetector(PluginConfig(name="arp_detector", enabled=True, config={}))
+        detector._capture_hub = plugin._capture_hub
+        
+        with patch.object(plugin, '_detect_network'), patch('threading.Thread'):
+            plugin.start()
+        detector._process_arp_packet(self._arp_reply("192.168.1.80", "aa:bb:cc:00:00:80"))
+        plugin.stop()
+        plugin._drain_sightings()
+        
+        assert "192.168.1.80" in plugin.devices
+        assert detector.stats['arp_packets'] == 1
+        assert plugin._capture_hub.subscriber_count() == 0
+    
+    def test_scan_loop_listens_between_sweeps(self):
+        """Test passive mode sweeps once, then listens until the next sweep is due."""
+        plugin = self._plugin(sweep_interval=300)
+        
+        def stop_listening(timeout):
+            assert timeout <= 1.0
+            plugin._stop_event.set()
+        
+        with patch.object(plugin, '_scan_network') as mock_scan, \
+                patch.object(plugin, '_listen', side_effect=stop_listening) as mock_listen:
+            plugin._scan_loop()
+        
+        mock_scan.assert_called_once()
+        mock_listen.assert_called_once()
+
+
 class TestScanLoop:
     """Test continuous scanning loop."""
     
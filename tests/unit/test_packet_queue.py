@@ -0,0 +1,320 @@
+"""
+Tests for Packet Queue - bounded capture -> analysis hand-off
+
+Focus: overflow policies and drop accounting, the analysis worker,
+kernel PACKET_STATISTICS and the plugins' sniff() wiring
+"""
+
+import struct
+import threading
+
+import pytest
+
+from plugins.base import Plugin, PluginConfig
+from plugins.packet_queue import (
+    DROP_NEWEST, DROP_OLDEST, PACKET_STATISTICS, SAMPLE, SOL_PACKET, PacketQueue, read_packet_statistics
+)
+from utils.metrics_exporter import collect_families, render
+
+
+class TestOverflowPolicies:
+    """Test what each policy drops once the queue is full."""
+
+    def test_drop_newest_keeps_backlog(self):
+        """Test arriving packets are refused when full."""
+        queue = PacketQueue(lambda p: None, maxsize=3, policy=DROP_NEWEST)
+        results = [queue.put(i) for i in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert list(queue._queue) == [0, 1, 2]
+        assert queue.stats['dropped'] == 2
+        assert queue.stats['enqueued'] == 3
+
+    def test_drop_oldest_keeps_freshest(self):
+        """Test the oldest queued packet is evicted when full."""
+        queue = PacketQueue(lambda p: None, maxsize=3, policy=DROP_OLDEST)
+        results = [queue.put(i) for i in range(5)]
+
+        assert results == [True] * 5
+        assert list(queue._queue) == [2, 3, 4]
+        assert queue.stats['dropped'] == 2
+        assert queue.stats['high_water'] == 3
+
+    def test_sample_thins_under_pressure(self):
+        """Test only every N-th packet is admitted above 3/4 full."""
+        queue = PacketQueue(lambda p: None, maxsize=8, policy=SAMPLE, sample_every=4)
+        for i in range(6):
+            queue.put(i)  # fills to the sampling threshold (6)
+
+        admitted = [queue.put(i) for i in range(100, 108)]
+
+        assert admitted == [False, False, False, True, False, False, False, True]
+        assert queue.depth == 8
+        assert queue.stats['dropped'] == 6
+
+    def test_every_packet_is_accounted(self):
+        """Test enqueued + refused == offered, processed + depth == enqueued - evicted."""
+        queue = PacketQueue(lambda p: None, maxsize=10, policy=DROP_NEWEST)
+        for i in range(25):
+            queue.put(i)
+        queue.drain()
+
+        assert queue.stats['enqueued'] + queue.stats['dropped'] == 25
+        assert queue.stats['processed'] == 10
+        assert queue.depth == 0
+
+    def test_invalid_settings(self):
+        """Test unknown policies and empty queues are rejected."""
+        with pytest.raises(ValueError):
+            PacketQueue(lambda p: None, policy="drop_everything")
+        with pytest.raises(ValueError):
+            PacketQueue(lambda p: None, maxsize=0)
+
+
+class TestWorker:
+    """Test the analysis worker thread."""
+
+    def test_worker_runs_handler(self):
+        """Test queued packets are analysed off the calling thread."""
+        seen = []
+        threads = set()
+        done = threading.Event()
+
+        def handler(packet):
+            seen.append(packet)
+            threads.add(threading.current_thread().name)
+            if len(seen) == 50:
+                done.set()
+
+        queue = PacketQueue(handler, name="dns_monitor")
+        queue.start()
+        for i in range(50):
+            queue.put(i)
+
+        assert done.wait(2.0)
+        queue.stop()
+        assert seen == list(range(50))
+        assert threads == {"dns_monitor-analysis"}
+        assert not queue.running
+
+    def test_stop_drains_queue(self):
+        """Test packets queued before stop() are still analysed."""
+        release = threading.Event()
+        seen = []
+
+        def handler(packet):
+            release.wait(2.0)
+            seen.append(packet)
+
+        queue = PacketQueue(handler)
+        queue.start()
+        for i in range(20):
+            queue.put(i)
+        release.set()
+        queue.stop()
+
+        assert seen == list(range(20))
+        assert queue.put("late") is False
+
+    def test_handler_errors_are_counted(self):
+        """Test a failing handler doesn't stop analysis."""
+        def handler(packet):
+            if packet == "bad":
+                raise ValueError("malformed")
+
+        queue = PacketQueue(handler)
+        for packet in ("a", "bad", "b"):
+            queue.put(packet)
+
+        assert queue.drain() == 3
+        assert queue.stats['errors'] == 1
+        assert queue.stats['processed'] == 3
+
+    def test_idle_runs_while_quiet(self):
+        """Test the idle callback runs on the worker with no packets arriving."""
+        threads = []
+        quiet = threading.Event()
+
+        def idle():
+            threads.append(threading.current_thread().name)
+            if len(threads) >= 3:
+                quiet.set()
+
+        queue = PacketQueue(lambda p: None, name="dns_monitor", idle=idle, idle_interval=0.01)
+        queue.start()
+
+        assert quiet.wait(2.0)
+        queue.stop()
+        assert set(threads) == {"dns_monitor-analysis"}
+
+
+class FakeSocket:
+    """Packet socket returning canned tpacket_stats."""
+
+    def __init__(self, packets, drops):
+        self.value = struct.pack("II", packets, drops)
+        self.closed = False
+
+    def getsockopt(self, level, option, size):
+        assert (level, option, size) == (SOL_PACKET, PACKET_STATISTICS, 8)
+        return self.value
+
+    def close(self):
+        self.closed = True
+
+
+class TestKernelStats:
+    """Test kernel drop counters from PACKET_STATISTICS."""
+
+    def test_read_packet_statistics(self):
+        """Test tpacket_stats is unpacked (scapy sockets via .ins)."""
+        class ScapySocket:
+            ins = FakeSocket(120, 7)
+
+        assert read_packet_statistics(ScapySocket()) == (120, 7)
+
+    def test_unsupported_socket(self):
+        """Test sockets without PACKET_STATISTICS report None."""
+        assert read_packet_statistics(object()) is None
+
+    def test_polls_accumulate(self):
+        """Test the kernel's reset-on-read counts are summed."""
+        queue = PacketQueue(lambda p: None)
+        sock = FakeSocket(100, 3)
+        queue.attach_socket(sock)
+        queue.poll_kernel_stats()
+        snapshot = queue.snapshot()
+
+        assert snapshot['kernel_packets'] == 200
+        assert snapshot['kernel_drops'] == 6
+        queue.close_socket()
+        assert sock.closed
+
+
+class SnifferPlugin(Plugin):
+    """Capture plugin with a slow-path handler."""
+
+    def initialize(self) -> None:
+        self.handled = []
+
+    def collect_data(self):
+        return {"capture": self.capture_stats()}
+
+    def _process_packet(self, packet):
+        self.handled.append(packet)
+
+
+class TestPluginWiring:
+    """Test Plugin.start_packet_queue() and the sniff() options."""
+
+    def test_inline_without_queue(self):
+        """Test the handler runs on the sniffer thread without a queue."""
+        plugin = SnifferPlugin(PluginConfig(name="sniffer"))
+
+        assert plugin.capture_options(plugin._process_packet) == {'prn': plugin._process_packet}
+        assert plugin.capture_stats() is None
+
+    def test_queue_from_config(self):
+        """Test size and policy come from the plugin config."""
+        plugin = SnifferPlugin(PluginConfig(name="sniffer", config={
+            'queue_size': 4, 'overflow_policy': DROP_OLDEST
+        }))
+        queue = plugin.start_packet_queue(plugin._process_packet)
+        try:
+            options = plugin.capture_options(plugin._process_packet)
+            assert options['prn'] == queue.put
+            assert queue.maxsize == 4
+            assert queue.policy == DROP_OLDEST
+        finally:
+            plugin.stop_packet_queue()
+
+    def test_stats_survive_stop(self):
+        """Test the final counters stay visible after capture ends."""
+        plugin = SnifferPlugin(PluginConfig(name="sniffer"))
+        plugin.initialize()
+        plugin.start_packet_queue(plugin._process_packet)
+        prn = plugin.capture_options(plugin._process_packet)['prn']
+        for i in range(5):
+            prn(i)
+        plugin.stop_packet_queue()
+
+        assert plugin.handled == list(range(5))
+        assert plugin.capture_stats()['processed'] == 5
+        assert plugin.capture_options(plugin._process_packet) == {'prn': plugin._process_packet}
+
+    def test_capture_metrics(self):
+        """Test queue counters are exported per plugin."""
+        plugin = SnifferPlugin(PluginConfig(name="sniffer", config={'queue_size': 1}))
+        plugin.start_packet_queue(lambda p: None)
+        plugin.packet_queue.stop()  # keep packets queued
+        plugin.packet_queue._accepting = True
+        plugin.packet_queue.put("a")
+        plugin.packet_queue.put("b")
+
+        text = render(collect_families({"sniffer": (0.0, plugin.collect_data())}, now=0.0))
+
+        assert 'wf_capture_dropped_packets_total{plugin="sniffer"} 1' in text
+        assert 'wf_capture_queue_depth{plugin="sniffer"} 1' in text
+
+
+class MonitorPlugin(SnifferPlugin):
+    """802.11 capture plugin (rogue AP / handshake style)."""
+
+    monitor_capture = True
+
+
+class TestInterfaces:
+    """Test capture on several interfaces and on the monitor NIC."""
+
+    def test_kernel_stats_per_interface(self):
+        """Test each interface's socket is polled and counted separately."""
+        queue = PacketQueue(lambda p: None)
+        eth, wlan = FakeSocket(100, 1), FakeSocket(50, 4)
+        queue.attach_socket(eth, "eth0")
+        queue.attach_socket(wlan, "wlan0")
+        queue.attach_socket(None, "missing")
+
+        snapshot = queue.snapshot()
+
+        assert snapshot['kernel_packets'] == 150
+        assert snapshot['kernel_drops'] == 5
+        assert snapshot['interfaces'] == {
+            'eth0': {'kernel_packets': 100, 'kernel_drops': 1},
+            'wlan0': {'kernel_packets': 50, 'kernel_drops': 4},
+        }
+        queue.close_socket()
+        assert eth.closed and wlan.closed
+        assert queue.socket is None
+
+    def test_sniff_every_interface(self):
+        """Test sniff() is given the configured interfaces without a queue socket."""
+        plugin = SnifferPlugin(PluginConfig(name="sniffer", config={'interfaces': ["eth0", "wlan0"]}))
+
+        assert plugin.capture_options(plugin._process_packet) == {
+            'prn': plugin._process_packet, 'iface': ["eth0", "wlan0"]
+        }
+
+    def test_sockets_labelled_by_interface(self):
+        """Test several queue sockets are sniffed together, labelled by interface."""
+        plugin = SnifferPlugin(PluginConfig(name="sniffer", config={'interfaces': ["eth0", "wlan0"]}))
+        plugin.initialize()
+        queue = plugin.start_packet_queue(plugin._process_packet)
+        eth, wlan = FakeSocket(0, 0), FakeSocket(0, 0)
+        queue.attach_socket(eth, "eth0")
+        queue.attach_socket(wlan, "wlan0")
+        try:
+            options = plugin.capture_options(plugin._process_packet)
+            assert options['opened_socket'] == {eth: "eth0", wlan: "wlan0"}
+            assert 'iface' not in options
+        finally:
+            plugin.stop_packet_queue()
+
+    def test_monitor_interface(self):
+        """Test monitor-mode plugins sniff the monitor NIC, not the IP interfaces."""
+        plugin = MonitorPlugin(PluginConfig(name="rogue_ap", config={
+            'interfaces': ["eth0"], 'monitor_interface': "wlan1mon"
+        }))
+
+        assert plugin.capture_interfaces() == ["wlan1mon"]
+        assert plugin.capture_options(plugin._process_packet)['iface'] == "wlan1mon"
+        assert MonitorPlugin(PluginConfig(name="handshake")).capture_interfaces() == ["wlan0mon"]
@@ -0,0 +1,282 @@
+"""
+Tests for Packet Recorder - pcapng ring buffer with alert lookback
+
+Focus: valid pcapng output, bounded ring, buffering, freeze/lookback
+and the detectors linking frozen captures from CRITICAL alerts
+"""
+
+import struct
+import sys
+import time
+import types
+
+import pytest
+
+import plugins.packet_recorder as packet_recorder
+from plugins.activation import PluginActivation
+from plugins.arp_spoofing_detector import ARPSpoofingDetector
+from plugins.base import PluginConfig
+from plugins.capture_hub import CaptureHub
+from plugins.lifecycle import PluginLifecycle
+from plugins.packet_recorder import (
+    EPB_TYPE, IDB_TYPE, LINKTYPE_ETHERNET, LINKTYPE_IEEE802_11_RADIOTAP, SHB_TYPE, PacketRecorder
+)
+
+
+def read_pcapng(path):
+    """Parse a pcapng file into (linktypes, [(interface, ts_us, frame)])."""
+    data = path.read_bytes()
+    linktypes, packets, offset = [], [], 0
+    while offset < len(data):
+        block_type, length = struct.unpack_from("<II", data, offset)
+        assert struct.unpack_from("<I", data, offset + length - 4)[0] == length
+        if block_type == IDB_TYPE:
+            linktypes.append(struct.unpack_from("<H", data, offset + 8)[0])
+        elif block_type == EPB_TYPE:
+            interface, high, low, caplen, _ = struct.unpack_from("<IIIII", data, offset + 8)
+            frame = data[offset + 28:offset + 28 + caplen]
+            packets.append((interface, (high << 32) | low, frame))
+        else:
+            assert block_type == SHB_TYPE
+        offset += length
+    return linktypes, packets
+
+
+class FakePacket:
+    """Stands in for a sniffed scapy packet (raw bytes in .original)."""
+
+    def __init__(self, original, ts):
+        self.original = original
+        self.time = ts
+
+
+class TestRecording:
+    """Test frame recording and the pcapng format."""
+
+    def test_frames_round_trip(self, tmp_path):
+        """Test recorded frames come back byte for byte with timestamps."""
+        recorder = PacketRecorder(tmp_path)
+        recorder.write_frame(b"\x01" * 60, 1700000000.25)
+        recorder.write_frame(b"\x02" * 61, 1700000001.5)
+        recorder.stop()
+
+        linktypes, packets = read_pcapng(recorder.segments()[0])
+        assert linktypes == [LINKTYPE_ETHERNET]
+        assert packets == [(0, 1700000000250000, b"\x01" * 60), (0, 1700000001500000, b"\x02" * 61)]
+
+    def test_mixed_link_types_get_own_interfaces(self, tmp_path):
+        """Test Ethernet and radiotap frames share one segment."""
+        recorder = PacketRecorder(tmp_path)
+        recorder.write_frame(b"eth", 1.0, LINKTYPE_ETHERNET)
+        recorder.write_frame(b"wifi", 2.0, LINKTYPE_IEEE802_11_RADIOTAP)
+        recorder.stop()
+
+        linktypes, packets = read_pcapng(recorder.segments()[0])
+        assert linktypes == [LINKTYPE_ETHERNET, LINKTYPE_IEEE802_11_RADIOTAP]
+        assert [p[0] for p in packets] == [0, 1]
+
+    def test_snaplen_truncates(self, tmp_path):
+        """Test frames longer than snaplen are cut."""
+        recorder = PacketRecorder(tmp_path, snaplen=100)
+        recorder.write_frame(b"x" * 300, 1.0)
+        recorder.stop()
+
+        _, packets = read_pcapng(recorder.segments()[0])
+        assert len(packets[0][2]) == 100
+        assert recorder.stats['truncated'] == 1
+
+    def test_writes_are_buffered(self, tmp_path):
+        """Test small frames stay in memory until flush_bytes is reached."""
+        recorder = PacketRecorder(tmp_path, flush_bytes=4096, flush_interval=60)
+        for _ in range(10):
+            recorder.write_frame(b"y" * 100, time.time())
+        segment = recorder.segments()[0]
+        assert segment.stat().st_size == 0
+
+        for _ in range(40):
+            recorder.write_frame(b"y" * 100, time.time())
+        assert segment.stat().st_size > 0
+        assert recorder.stats['flushes'] == 1
+        recorder.stop()
+
+    def test_capture_hub_subscription(self, tmp_path):
+        """Test start() records packets published on the hub."""
+        hub = CaptureHub()
+        recorder = PacketRecorder(tmp_path)
+        recorder.start(hub, capture=False)
+        hub.publish(FakePacket(b"\xaa" * 42, 5.0))
+        recorder.stop()
+
+        assert hub.subscriber_count() == 0
+        _, packets = read_pcapng(recorder.segments()[0])
+        assert packets == [(0, 5000000, b"\xaa" * 42)]
+
+    def test_own_capture_records_unfiltered(self, tmp_path, monkeypatch):
+        """Test the recorder's own capture feeds the ring and hub copies aren't doubled."""
+        frames = [FakePacket(b"\x01" * 60, 1.0), FakePacket(b"\x02" * 60, 2.0)]
+        opened = []
+
+        class FakeSocket:
+            def __init__(self, iface):
+                self.iface = iface
+                opened.append(self)
+
+            def close(self):
+                self.closed = True
+
+        def fake_sniff(opened_socket, prn, store, timeout):
+            while frames:
+                prn(frames.pop(0))
+            time.sleep(0.01)
+
+        scapy = types.ModuleType("scapy")
+        sendrecv = types.ModuleType("scapy.sendrecv")
+        sendrecv.sniff = fake_sniff
+        monkeypatch.setitem(sys.modules, "scapy", scapy)
+        monkeypatch.setitem(sys.modules, "scapy.sendrecv", sendrecv)
+        monkeypatch.setattr(packet_recorder, "open_capture_socket", lambda bpf, iface: FakeSocket(iface))
+
+        hub = CaptureHub()
+        recorder = PacketRecorder(tmp_path)
+        recorder.start(hub, ["eth0", "wlan0"])
+        assert recorder.capturing
+        deadline = time.time() + 5.0
+        while recorder.stats['packets'] < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        hub.publish(FakePacket(b"\x01" * 60, 1.0))  # A plugin's copy of a captured frame
+        recorder.stop()
+
+        assert [sock.iface for sock in opened] == ["eth0", "wlan0"]
+        assert all(sock.closed for sock in opened)
+        _, packets = read_pcapng(recorder.segments()[0])
+        assert [frame for _, _, frame in packets] == [b"\x01" * 60, b"\x02" * 60]
+
+
+class TestRing:
+    """Test the bounded ring of segments."""
+
+    def test_ring_never_exceeds_budget(self, tmp_path):
+        """Test old segments are deleted once the ring is full."""
+        recorder = PacketRecorder(tmp_path, segment_size=4096, ring_size=3, flush_bytes=1)
+        for i in range(200):
+            recorder.write_frame(bytes([i % 256]) * 200, float(i))
+        recorder.stop()
+
+        segments = list((tmp_path / "ring").iterdir())
+        assert len(segments) == 3
+        assert all(p.stat().st_size <= 4096 for p in segments)
+        assert recorder.stats['segments_deleted'] == recorder.stats['segments'] - 3
+
+        # The newest frames survive
+        _, packets = read_pcapng(recorder.segments()[-1])
+        assert packets[-1][1] == 199 * 1_000_000
+
+    def test_restart_adopts_previous_segments(self, tmp_path):
+        """Test a new recorder counts segments left by the previous run."""
+        first = PacketRecorder(tmp_path, segment_size=2048, ring_size=2, flush_bytes=1)
+        for i in range(40):
+            first.write_frame(b"z" * 200, float(i))
+        first.stop()
+
+        second = PacketRecorder(tmp_path, segment_size=2048, ring_size=2, flush_bytes=1)
+        second.write_frame(b"z" * 200, 100.0)
+        second.stop()
+
+        assert len(list((tmp_path / "ring").iterdir())) == 2
+
+    def test_invalid_ring(self, tmp_path):
+        """Test a ring without room is rejected."""
+        with pytest.raises(ValueError):
+            PacketRecorder(tmp_path, ring_size=0)
+
+
+class TestLookback:
+    """Test freezing the ring for alerts."""
+
+    def test_freeze_survives_ring_rotation(self, tmp_path):
+        """Test frozen segments keep the packets from before the alert."""
+        recorder = PacketRecorder(tmp_path, segment_size=4096, ring_size=2, flush_bytes=1)
+        recorder.write_frame(b"before-attack", 1.0)
+        frozen = recorder.freeze("arp 192.168.1.1")
+
+        for i in range(200):
+            recorder.write_frame(b"after" * 40, 10.0 + i)
+        recorder.stop()
+
+        assert len(frozen) == 1
+        assert "arp_192.168.1.1" in frozen[0]
+        _, packets = read_pcapng(tmp_path / frozen[0])
+        assert packets[0][2] == b"before-attack"
+        assert recorder.stats['lookbacks'] == 1
+
+    def test_alert_storm_shares_one_lookback(self, tmp_path):
+        """Test freezes within min_freeze_interval reuse the window."""
+        recorder = PacketRecorder(tmp_path, min_freeze_interval=60)
+        recorder.write_frame(b"frame", 1.0)
+
+        assert recorder.freeze("a") == recorder.freeze("b")
+        assert len(recorder.lookbacks()) == 1
+        recorder.stop()
+
+    def test_old_lookbacks_are_pruned(self, tmp_path):
+        """Test only max_lookbacks windows are kept."""
+        recorder = PacketRecorder(tmp_path, max_lookbacks=2, min_freeze_interval=0)
+        for i in range(4):
+            recorder.write_frame(b"frame", float(i))
+            recorder.freeze(f"alert{i}")
+        recorder.stop()
+
+        assert [p.name.split("_", 1)[1] for p in recorder.lookbacks()] == ["alert2", "alert3"]
+
+    def test_freeze_without_packets(self, tmp_path):
+        """Test an alert before any traffic links nothing."""
+        recorder = PacketRecorder(tmp_path)
+
+        assert recorder.freeze("early") == []
+
+    def test_hard_links_share_disk(self, tmp_path):
+        """Test frozen segments don't double the disk usage."""
+        recorder = PacketRecorder(tmp_path, flush_bytes=1)
+        recorder.write_frame(b"q" * 1000, 1.0)
+        recorder.freeze("x")
+        recorder.stop()
+
+        assert recorder.disk_usage() == recorder.segments()[0].stat().st_size
+
+
+class TestAlertLinking:
+    """Test detectors link lookback captures from CRITICAL alerts."""
+
+    def test_critical_arp_alert_links_pcaps(self, tmp_path):
+        """Test a gateway MAC change (CRITICAL) freezes the ring."""
+        recorder = PacketRecorder(tmp_path)
+        recorder.write_frame(b"arp-reply", 1.0)
+        lifecycle = PluginLifecycle(PluginActivation())
+        lifecycle.resources.packet_recorder = recorder
+        detector = ARPSpoofingDetector(PluginConfig(name="arp_detector", config={"mock_mode": True}))
+        lifecycle.add("arp_detector", detector, on_demand=True)
+
+        detector.mac_history["192.168.1.1"] = ["aa:aa:aa:aa:aa:aa"]
+        detector._handle_mac_change("192.168.1.1", "aa:aa:aa:aa:aa:aa", "bb:bb:bb:bb:bb:bb", time.time())
+        recorder.stop()
+
+        alert = detector.alerts[-1]
+        assert alert.severity == "CRITICAL"
+        assert len(alert.pcap_files) == 1
+        assert "arp_detector_192.168.1.1" in alert.pcap_files[0]
+        assert alert.to_dict()['pcap_files'] == alert.pcap_files
+
+    def test_non_critical_alert_links_nothing(self, tmp_path):
+        """Test MEDIUM alerts don't freeze the ring."""
+        recorder = PacketRecorder(tmp_path)
+        recorder.write_frame(b"arp-reply", 1.0)
+        detector = ARPSpoofingDetector(PluginConfig(name="arp_detector", config={"mock_mode": True}))
+        detector.packet_recorder = recorder
+
+        detector.mac_history["192.168.1.50"] = ["aa:aa:aa:aa:aa:aa"]
+        detector._handle_mac_change("192.168.1.50", "aa:aa:aa:aa:aa:aa", "bb:bb:bb:bb:bb:bb", time.time())
+        recorder.stop()
+
+        assert detector.alerts[-1].severity != "CRITICAL"
+        assert detector.alerts[-1].pcap_files == []
+        assert recorder.lookbacks() == []
@@ -0,0 +1,203 @@
+"""
+Tests for Packet Sampler - scaled estimates under sampling
+
+Focus: 1-in-N, flow and adaptive modes, exempt security traffic,
+confidence intervals and TrafficStatistics' scaled counters
+"""
+
+import numpy as np
+import pytest
+
+import plugins.traffic_statistics as traffic_statistics
+from plugins.base import PluginConfig
+from plugins.packet_sampler import (
+    SAMPLING_ADAPTIVE, SAMPLING_COUNT, SAMPLING_FLOW, SAMPLING_OFF, PacketSampler, ScaledCounter, flow_hash
+)
+from plugins.traffic_statistics import TrafficStatistics
+from src.utils.load_generator import KIND_ARP, SyntheticLayer, SyntheticLoadGenerator, SyntheticPacket
+from utils.metrics_exporter import collect_families, render
+
+
+def tcp_packet(src="10.0.0.2", dst="93.184.216.34", sport=40000, dport=443, length=100):
+    return SyntheticPacket({
+        'IP': SyntheticLayer(src=src, dst=dst, proto=6),
+        'TCP': SyntheticLayer(sport=sport, dport=dport),
+    }, length)
+
+
+class TestModes:
+    """Test which packets each mode admits and their weights."""
+
+    def test_off_admits_everything(self):
+        """Test the default sampler never looks at packets."""
+        sampler = PacketSampler()
+
+        assert sampler.admit(object()) == 1
+        assert not sampler.enabled
+        assert sampler.stats['seen'] == 0
+
+    def test_count_mode(self):
+        """Test 1-in-N admits every N-th packet with weight N."""
+        sampler = PacketSampler(SAMPLING_COUNT, rate=4)
+        weights = [sampler.admit(tcp_packet()) for _ in range(12)]
+
+        assert weights == [0, 0, 0, 4] * 3
+        assert sampler.stats['skipped'] == 9
+        assert sampler.stats['admitted'] == 3
+
+    @pytest.mark.parametrize("layer", ["ARP", "DNS", "EAPOL", "Dot11Beacon"])
+    def test_security_traffic_is_exempt(self, layer):
+        """Test ARP, DNS, EAPOL and beacons are always analysed, unscaled."""
+        sampler = PacketSampler(SAMPLING_COUNT, rate=1000)
+        packet = SyntheticPacket({layer: SyntheticLayer()}, 60)
+
+        assert [sampler.admit(packet) for _ in range(5)] == [1] * 5
+        assert sampler.stats['exempt'] == 5
+
+    def test_flow_hash_is_symmetric(self):
+        """Test both directions of a connection hash alike."""
+        forward = tcp_packet("10.0.0.2", "1.1.1.1", 40000, 443)
+        reverse = tcp_packet("1.1.1.1", "10.0.0.2", 443, 40000)
+
+        assert flow_hash(forward) == flow_hash(reverse)
+        assert flow_hash(forward) != flow_hash(tcp_packet("10.0.0.2", "1.1.1.1", 40001, 443))
+        assert flow_hash(SyntheticPacket({'ARP': SyntheticLayer()}, 42)) is None
+
+    def test_flow_mode_keeps_whole_flows(self):
+        """Test a flow is either fully analysed or fully skipped."""
+        sampler = PacketSampler(SAMPLING_FLOW, rate=8)
+        kept = 0
+        for port in range(40000, 40400):
+            weights = {sampler.admit(tcp_packet(sport=port)) for _ in range(5)}
+            assert weights in ({0}, {8})
+            kept += weights == {8}
+
+        assert 20 < kept < 80  # ~1 flow in 8
+
+    def test_adaptive_rate_follows_budget(self):
+        """Test N grows when analysis is over budget and backs off when idle."""
+        now = [0.0]
+        sampler = PacketSampler(SAMPLING_ADAPTIVE, rate=1, cpu_budget=0.1, clock=lambda: now[0])
+
+        now[0] = 1.0
+        sampler.charge(0.8)  # 80% busy at 1 in 1
+        assert sampler.rate == 8
+
+        now[0] = 2.0
+        sampler.charge(0.01)  # 1% busy: back off by at most half
+        assert sampler.rate == 4
+        assert sampler.snapshot()['busy_fraction'] == pytest.approx(0.01)
+
+    def test_invalid_settings(self):
+        """Test unknown modes and zero rates are rejected."""
+        with pytest.raises(ValueError):
+            PacketSampler("sometimes")
+        with pytest.raises(ValueError):
+            PacketSampler(SAMPLING_COUNT, rate=0)
+
+
+class TestEstimates:
+    """Test scaled totals and their intervals."""
+
+    def test_unsampled_values_are_exact(self):
+        """Test weight 1 observations add no variance."""
+        counter = ScaledCounter()
+        counter.add(100)
+        counter.add(50)
+
+        assert counter.interval() == (150, 150)
+
+    def test_interval_widens_with_weight(self):
+        """Test sampled observations carry Horvitz-Thompson variance."""
+        counter = ScaledCounter()
+        for _ in range(100):
+            counter.add(1, weight=10)
+
+        low, high = counter.interval()
+        assert counter.total == 1000
+        assert low == pytest.approx(1000 - 1.96 * (9000 ** 0.5))
+        assert high == pytest.approx(1000 + 1.96 * (9000 ** 0.5))
+
+    def test_snapshot(self):
+        """Test the snapshot reports every estimate."""
+        sampler = PacketSampler(SAMPLING_COUNT, rate=2)
+        sampler.observe('packets', 1, 2)
+
+        snapshot = sampler.snapshot()
+        assert snapshot['mode'] == SAMPLING_COUNT
+        assert snapshot['estimates']['packets']['estimate'] == 2
+
+
+@pytest.fixture
+def synthetic_layers(monkeypatch):
+    """Let TrafficStatistics look SyntheticPacket layers up by name without scapy."""
+    for name in ("IP", "TCP", "UDP"):
+        monkeypatch.setattr(traffic_statistics, name, name)
+
+
+class TestTrafficStatisticsSampling:
+    """Test TrafficStatistics totals scaled from a sample."""
+
+    def feed(self, mode, rate=10, count=40000):
+        gen = SyntheticLoadGenerator(seed=11, devices=50, domains=500, flows=4000)
+        plugin = TrafficStatistics(PluginConfig(name="traffic_statistics", config={
+            'mock_mode': True, 'sampling_mode': mode, 'sampling_rate': rate
+        }))
+        for device in gen.device_table():
+            plugin.register_device(**device)
+        batch = gen.batch(count)
+        for packet in gen.records(batch):
+            plugin._process_packet(packet)
+        return plugin, batch
+
+    @pytest.mark.parametrize("mode", [SAMPLING_COUNT, SAMPLING_FLOW])
+    def test_totals_within_interval(self, synthetic_layers, mode):
+        """Test scaled packet and byte totals cover the true totals."""
+        plugin, batch = self.feed(mode)
+        ip = batch.kind != KIND_ARP
+        true_packets = int(np.sum(ip))
+        true_bytes = int(batch.length[ip].sum())
+
+        data = plugin.get_data()
+        sampling = data['sampling']
+        assert sampling['skipped'] > true_packets // 2
+        assert data['global_stats']['total_packets'] == sampling['estimates']['packets']['estimate']
+        assert abs(data['global_stats']['total_packets'] - true_packets) < 0.1 * true_packets
+        bytes_estimate = sampling['estimates']['bytes']
+        if mode == SAMPLING_COUNT:
+            assert bytes_estimate['ci_low'] <= true_bytes <= bytes_estimate['ci_high']
+        assert abs(bytes_estimate['estimate'] - true_bytes) < 0.15 * true_bytes
+
+    def test_dns_counts_are_exact(self, synthetic_layers):
+        """Test exempt DNS traffic is counted packet for packet."""
+        sampled, _ = self.feed(SAMPLING_COUNT, rate=50)
+        exact, _ = self.feed(SAMPLING_OFF)
+
+        assert sampled.global_stats['protocols']['DNS'] == exact.global_stats['protocols']['DNS']
+        dns = sampled.get_data()['sampling']['estimates']['protocol:DNS']
+        assert dns['ci_low'] == dns['ci_high']
+
+    def test_top_talkers_carry_intervals(self, synthetic_layers):
+        """Test sampled top talkers report a byte interval."""
+        plugin, _ = self.feed(SAMPLING_COUNT)
+
+        for talker in plugin.get_data()['top_talkers']:
+            low, high = talker['total_bytes_ci']
+            assert low <= talker['total_bytes'] <= high
+
+    def test_unsampled_by_default(self, synthetic_layers):
+        """Test totals are exact and no sampling block is reported when off."""
+        plugin, batch = self.feed(SAMPLING_OFF, count=5000)
+
+        assert plugin.global_stats['total_packets'] == int(np.sum(batch.kind != KIND_ARP))
+        assert plugin.get_data()['sampling'] is None
+        assert 'total_bytes_ci' not in plugin.get_data()['top_talkers'][0]
+
+    def test_sampling_metrics(self, synthetic_layers):
+        """Test sampler counters are exported per plugin."""
+        plugin, _ = self.feed(SAMPLING_COUNT, count=2000)
+
+        text = render(collect_families({"traffic_statistics": (0.0, plugin.get_data())}, now=0.0))
+
+        assert 'wf_sampling_rate{plugin="traffic_statistics"} 10' in text
+        assert 'wf_sampling_skipped_packets_total{plugin="traffic_statistics"}' in text
@@ -0,0 +1,200 @@
+"""
+Tests for Perf instrumentation - fixed-size latency histograms
+
+Focus: percentile accuracy, fixed memory, plugin/screen instrumentation,
+packet counters, UI tick rate and the /metrics summaries
+"""
+
+import random
+
+import pytest
+
+from plugins.activation import PluginActivation
+from plugins.base import Plugin, PluginConfig
+from plugins.lifecycle import PluginLifecycle
+from utils.metrics_exporter import perf_families, render
+from utils.perf import COLLECT, FRAME, PACKET, SCREEN, LatencyHistogram, PerfRegistry
+
+
+class TestLatencyHistogram:
+    """Test recording and percentiles."""
+
+    def test_exact_below_linear_limit(self):
+        """Test small values are recorded exactly."""
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value)
+
+        assert histogram.percentiles(50, 99, 100) == [50, 99, 100]
+        assert histogram.min_us == 1
+        assert histogram.max_seen_us == 100
+
+    def test_percentiles_within_one_percent(self):
+        """Test log buckets keep large values within 1% (never below)."""
+        rng = random.Random(7)
+        values = sorted(rng.randint(1, 5_000_000) for _ in range(10_000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 90, 99, 99.9):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert exact <= histogram.percentile(percent) <= exact * 1.01
+
+    def test_memory_is_fixed(self):
+        """Test recording allocates no buckets."""
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for value in (0, 1, 255, 256, 10 ** 6, 10 ** 12):
+            histogram.record(value)
+
+        assert len(histogram.counts) == size
+        assert histogram.max_seen_us == histogram.max_us  # clamped
+
+    def test_record_ns(self):
+        """Test nanosecond deltas are stored as microseconds."""
+        histogram = LatencyHistogram()
+        histogram.record_ns(2_500_000)
+
+        assert histogram.summary()['p50_ms'] == pytest.approx(2.5, rel=0.01)
+
+    def test_empty(self):
+        """Test an empty histogram reports zeros."""
+        summary = LatencyHistogram().summary()
+
+        assert summary['count'] == 0
+        assert summary['p99_ms'] == 0.0
+
+    def test_merge_and_reset(self):
+        """Test merging adds samples and reset forgets them."""
+        a, b = LatencyHistogram(), LatencyHistogram()
+        a.record(10)
+        b.record(1000)
+        a.merge(b)
+
+        assert a.count == 2
+        assert a.percentile(100) == 1000
+        assert a.min_us == 10
+
+        a.reset()
+        assert a.count == 0
+        assert sum(a.counts) == 0
+
+    def test_merge_rejects_other_range(self):
+        """Test histograms with another max_us can't be merged."""
+        with pytest.raises(ValueError):
+            LatencyHistogram().merge(LatencyHistogram(max_us=1000))
+
+
+class CapturePlugin(Plugin):
+    """Plugin with a per-packet handler, like the sniffers."""
+
+    packet_handlers = ("_process_packet",)
+
+    def initialize(self) -> None:
+        self.handled = []
+
+    def collect_data(self):
+        return {"handled": len(self.handled)}
+
+    def _process_packet(self, packet):
+        if packet == "bad":
+            raise ValueError("malformed")
+        self.handled.append(packet)
+
+
+class TestPluginInstrumentation:
+    """Test the lifecycle times plugins through the registry."""
+
+    @pytest.fixture
+    def setup(self):
+        perf = PerfRegistry()
+        lifecycle = PluginLifecycle(PluginActivation())
+        lifecycle.resources.perf = perf
+        plugin = lifecycle.add("capture", CapturePlugin(PluginConfig(name="capture")))
+        return perf, plugin
+
+    def test_collect_data_is_timed(self, setup):
+        """Test every collect_data() call lands in the collect histogram."""
+        perf, plugin = setup
+        for _ in range(3):
+            assert plugin.collect_tracked() == {"handled": 0}
+
+        assert perf.histogram(COLLECT, "capture").count == 3
+
+    def test_packet_counters(self, setup):
+        """Test handlers count seen, processed and dropped packets."""
+        perf, plugin = setup
+        plugin._process_packet("a")
+        plugin._process_packet("b")
+        with pytest.raises(ValueError):
+            plugin._process_packet("bad")
+
+        assert perf.packet_counters("capture") == {"seen": 3, "processed": 2, "dropped": 1}
+        assert perf.histogram(PACKET, "capture").count == 3
+        assert plugin.handled == ["a", "b"]
+
+    def test_without_registry_nothing_is_wrapped(self):
+        """Test plugins stay untouched when the lifecycle has no registry."""
+        lifecycle = PluginLifecycle(PluginActivation())
+        plugin = lifecycle.add("capture", CapturePlugin(PluginConfig(name="capture")))
+
+        assert 'collect_data' not in vars(plugin)
+
+    def test_summary_and_reset(self, setup):
+        """Test summaries carry packet counters and reset clears them."""
+        perf, plugin = setup
+        plugin._process_packet("a")
+
+        summary = perf.summary()
+        assert summary[(PACKET, "capture")]['seen'] == 1
+        perf.reset()
+        assert perf.summary()[(PACKET, "capture")]['count'] == 0
+        assert perf.packet_counters("capture")['seen'] == 0
+
+
+class TestScreensAndFrames:
+    """Test screen refresh timing and the UI tick rate."""
+
+    def test_instrument_screen(self):
+        """Test refresh methods present on a screen are timed."""
+        class Screen:
+            def refresh_data(self):
+                return "refreshed"
+
+        perf = PerfRegistry()
+        screen = Screen()
+        perf.instrument_screen("dns_monitor", screen)
+
+        assert screen.refresh_data() == "refreshed"
+        assert perf.histogram(SCREEN, "dns_monitor").count == 1
+
+    def test_frame_rate(self):
+        """Test ticks 100 ms apart report 10 updates per second."""
+        perf = PerfRegistry()
+        for i in range(20):
+            perf.tick(i * 0.1)
+
+        assert perf.frame_rate == pytest.approx(10.0)
+        assert perf.histogram(FRAME, "app").percentile(50) == pytest.approx(100_000, rel=0.01)
+
+
+class TestPerfMetrics:
+    """Test latency summaries on /metrics."""
+
+    def test_summary_exposition(self):
+        """Test quantiles, _sum and _count per component."""
+        perf = PerfRegistry()
+        perf.histogram(COLLECT, "dns_monitor").record(2000)
+        perf.packet_counters("arp_detector")['seen'] += 5
+
+        text = render(perf_families(perf))
+
+        assert "# TYPE wf_latency_seconds summary" in text
+        assert 'wf_latency_seconds{kind="collect",component="dns_monitor",quantile="0.99"} 0.002' in text
+        assert 'wf_latency_seconds_count{kind="collect",component="dns_monitor"} 1' in text
+        assert 'wf_plugin_packets_total{plugin="arp_detector",outcome="seen"} 5' in text
+
+    def test_empty_registry_exports_nothing(self):
+        """Test no families before any sample."""
+        assert perf_families(PerfRegistry()) == []
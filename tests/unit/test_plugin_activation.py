@@ -0,0 +1,127 @@
+"""
+Tests for Plugin Activation - reference-counted plugin workers
+
+Focus: first consumer starts, last consumer stops after the grace period,
+re-registration during a mode swap
+"""
+
+import time
+from unittest.mock import Mock
+
+from plugins.activation import PluginActivation
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestPluginActivation:
+    """Test reference counting and grace periods."""
+
+    def test_first_consumer_starts_once(self):
+        """Test only the first acquire starts the plugin."""
+        activation = PluginActivation(grace_period=0)
+        start, stop = Mock(), Mock()
+        activation.register("dns", start=start, stop=stop)
+
+        assert activation.acquire("dns", "screen:dns") is True
+        assert activation.acquire("dns", "exporter") is False
+        assert activation.acquire("dns", "screen:dns") is False  # Same consumer twice
+
+        start.assert_called_once()
+        assert activation.is_running("dns")
+        assert activation.consumers("dns") == {"screen:dns", "exporter"}
+
+    def test_last_release_stops(self):
+        """Test the plugin stops only when every consumer is gone."""
+        activation = PluginActivation(grace_period=0)
+        stop = Mock()
+        activation.register("dns", start=Mock(), stop=stop)
+        activation.acquire("dns", "a")
+        activation.acquire("dns", "b")
+
+        activation.release("dns", "a")
+        stop.assert_not_called()
+
+        activation.release("dns", "b")
+        stop.assert_called_once()
+        assert not activation.is_running("dns")
+
+    def test_grace_period_delays_stop(self):
+        """Test the stop happens after the grace period."""
+        activation = PluginActivation(grace_period=0.05)
+        stop = Mock()
+        activation.register("arp", start=Mock(), stop=stop)
+        activation.acquire("arp", "screen")
+
+        activation.release("arp", "screen")
+        assert activation.is_running("arp")
+
+        assert _wait_for(lambda: not activation.is_running("arp"))
+        stop.assert_called_once()
+
+    def test_reacquire_within_grace_keeps_running(self):
+        """Test coming back before the grace period ends avoids a restart."""
+        activation = PluginActivation(grace_period=0.1)
+        start, stop = Mock(), Mock()
+        activation.register("arp", start=start, stop=stop)
+        activation.acquire("arp", "screen:a")
+        activation.release_consumer("screen:a")
+
+        activation.acquire("arp", "screen:b")
+        time.sleep(0.2)
+
+        assert activation.is_running("arp")
+        start.assert_called_once()
+        stop.assert_not_called()
+
+    def test_failed_start_is_not_running(self):
+        """Test a start error leaves the plugin stopped and counted."""
+        activation = PluginActivation(grace_period=0)
+        activation.register("rogue_ap", start=Mock(side_effect=OSError("no monitor mode")), stop=Mock())
+
+        assert activation.acquire("rogue_ap", "screen") is False
+        assert not activation.is_running("rogue_ap")
+        assert activation.stats['errors'] == 1
+
+    def test_register_replaces_running_instance(self):
+        """Test re-registering stops the old plugin and starts the new one for the same consumers."""
+        activation = PluginActivation(grace_period=0)
+        old_stop, new_start = Mock(), Mock()
+        activation.register("topology", start=Mock(), stop=old_stop)
+        activation.acquire("topology", "screen:topology")
+
+        activation.register("topology", start=new_start, stop=Mock())
+
+        old_stop.assert_called_once()
+        new_start.assert_called_once()
+        assert activation.consumers("topology") == {"screen:topology"}
+
+    def test_unknown_plugin_ignored(self):
+        """Test acquiring an unregistered plugin is a no-op."""
+        activation = PluginActivation()
+
+        assert activation.acquire("missing", "screen") is False
+        activation.release("missing", "screen")
+        assert activation.running() == []
+
+    def test_stop_all(self):
+        """Test stop_all stops running plugins and cancels pending stops."""
+        activation = PluginActivation(grace_period=60)
+        first, second = Mock(), Mock()
+        activation.register("a", start=Mock(), stop=first)
+        activation.register("b", start=Mock(), stop=second)
+        activation.acquire("a", "x")
+        activation.acquire("b", "x")
+        activation.release("b", "x")  # Pending 60 s grace stop
+
+        activation.stop_all()
+
+        first.assert_called_once()
+        second.assert_called_once()
+        assert activation.running() == []
@@ -0,0 +1,312 @@
+"""
+Tests for Plugin Config - the plugin set from config/dashboard.yml
+
+Focus: entries laid over the built-in specs, budgets mapped onto plugin
+settings, dynamic class loading, and hot reload of a running set (rates and
+budgets in place, enable/disable without touching the other plugins)
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from plugins.activation import PluginActivation
+from plugins.base import PluginConfig
+from plugins.capture_hub import CaptureHub
+from plugins.dns_monitor_plugin import DNSMonitorPlugin
+from plugins.lifecycle import PluginLifecycle, SharedResources
+from plugins.network_topology_plugin import MockNetworkTopologyPlugin, NetworkTopologyPlugin
+from plugins.packet_queue import PacketQueue
+from plugins.packet_sampler import PacketSampler
+from plugins.plugin_config import (
+    PluginBudget, PluginConfigWatcher, PluginSpec, load_plugin_specs, parse_plugin_specs, plugin_class
+)
+import plugins.plugin_set as plugin_set
+from plugins.plugin_set import (
+    DEFAULT_PLUGIN_SPECS, build_plugin, build_plugin_set, plugin_settings, reload_plugin_set
+)
+from plugins.worker_pool import ShardedPlugin, WorkerPool
+from src.utils.load_generator import SyntheticLoadGenerator
+
+
+DASHBOARD_YML = Path(__file__).resolve().parents[2] / "config" / "dashboard.yml"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _lifecycle(specs=None):
+    lifecycle = PluginLifecycle(PluginActivation(grace_period=0), SharedResources(capture_hub=CaptureHub()))
+    lifecycle.resources.plugin_specs = specs
+    return lifecycle
+
+
+def _specs(*entries):
+    return parse_plugin_specs(list(entries), DEFAULT_PLUGIN_SPECS)
+
+
+def _write(path, text):
+    """Write the config and make sure its mtime moves."""
+    path.write_text(text)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestSpecs:
+    """Test parsing the plugins section."""
+
+    def test_entries_override_defaults(self):
+        """Test only the fields given change, in the built-in order."""
+        specs = _specs({'name': "http_sniffer", 'enabled': False},
+                       {'name': "topology", 'rate_ms': 60000, 'config': {'max_scan_hosts': 256}})
+
+        assert list(specs) == [spec.name for spec in DEFAULT_PLUGIN_SPECS]
+        assert not specs["http_sniffer"].enabled
+        assert specs["topology"].rate_ms == 60000
+        assert specs["topology"].mock_class == "MockNetworkTopologyPlugin"
+        assert specs["topology"].config == {'passive': True, 'sweep_interval': 300.0, 'max_scan_hosts': 256}
+        assert specs["handshake"].config == {'capture_dir': "/tmp/handshakes"}
+
+    def test_invalid_entries(self):
+        """Test unknown fields, bad values and module-less new plugins are refused."""
+        with pytest.raises(ValueError, match="unknown field"):
+            _specs({'name': "system", 'rate': 100})
+        with pytest.raises(ValueError, match="rate_ms"):
+            _specs({'name': "system", 'rate_ms': -1})
+        with pytest.raises(ValueError, match="needs a module"):
+            _specs({'name': "custom"})
+        with pytest.raises(ValueError, match="cpu_share"):
+            _specs({'name': "dns_monitor", 'budget': {'cpu_share': 2}})
+        with pytest.raises(ValueError, match="max_cores"):
+            _specs({'name': "dns_monitor", 'budget': {'max_cores': 2}})
+
+    def test_budget_settings(self):
+        """Test budgets map onto queue size, list caps and adaptive sampling."""
+        assert PluginBudget().settings() == {}
+        assert PluginBudget(max_queue=500, max_entries=20, cpu_share=0.1).settings() == {
+            'queue_size': 500,
+            'max_entries': 20,
+            'sampling_mode': "adaptive",
+            'sampling_cpu_budget': 0.1
+        }
+
+    def test_retunes(self):
+        """Test rate and budget changes are told apart from structural ones."""
+        spec = DEFAULT_PLUGIN_SPECS[6]
+
+        assert spec.retunes(PluginSpec(**{**spec.__dict__, 'rate_ms': 100}))
+        assert spec.retunes(PluginSpec(**{**spec.__dict__, 'budget': PluginBudget(max_entries=5)}))
+        assert not spec.retunes(PluginSpec(**{**spec.__dict__, 'interface': "eth1"}))
+
+    def test_plugin_class(self):
+        """Test classes load from the module, mocks in mock mode, or by discovery."""
+        topology = _specs()["topology"]
+        discovered = PluginSpec(name="dns", module="plugins.dns_monitor_plugin")
+
+        assert plugin_class(topology) is NetworkTopologyPlugin
+        assert plugin_class(topology, mock_mode=True) is MockNetworkTopologyPlugin
+        assert plugin_class(discovered) is DNSMonitorPlugin
+        with pytest.raises(ValueError, match="cannot import"):
+            plugin_class(PluginSpec(name="x", module="plugins.no_such_plugin"))
+        with pytest.raises(ValueError, match="no plugin class"):
+            plugin_class(PluginSpec(name="x", module=".dns_monitor_plugin", class_name="DNSQuery"))
+
+    def test_dashboard_yml_matches_built_in_set(self):
+        """Test the shipped config describes the built-in plugins and rates."""
+        specs = load_plugin_specs(str(DASHBOARD_YML), DEFAULT_PLUGIN_SPECS)
+
+        assert list(specs) == [spec.name for spec in DEFAULT_PLUGIN_SPECS]
+        for default in DEFAULT_PLUGIN_SPECS:
+            assert default.retunes(specs[default.name]) or default.name == "packet_analyzer"
+            assert specs[default.name].rate_ms == default.rate_ms
+            assert specs[default.name].enabled
+
+    def test_load_errors(self, tmp_path):
+        """Test unreadable files and unknown classes fail at load time."""
+        config = tmp_path / "dashboard.yml"
+        config.write_text("plugins: [\n")
+        with pytest.raises(ValueError, match="cannot read"):
+            load_plugin_specs(str(config))
+
+        config.write_text("plugins:\n  - name: wifi\n    class: NoSuchPlugin\n")
+        with pytest.raises(ValueError, match="NoSuchPlugin"):
+            load_plugin_specs(str(config), DEFAULT_PLUGIN_SPECS)
+
+
+class TestPluginSet:
+    """Test building the set from specs."""
+
+    def test_disabled_plugins_are_not_built(self):
+        """Test disabled plugins never exist; the rest keep their on-demand flags."""
+        lifecycle = _lifecycle(_specs({'name': "http_sniffer", 'enabled': False},
+                                      {'name': "handshake", 'enabled': False}))
+        plugins = build_plugin_set(lifecycle, mock_mode=True)
+        try:
+            assert "http_sniffer" not in plugins and "handshake" not in plugins
+            assert lifecycle.names() == list(plugins)
+            assert lifecycle.is_on_demand("dns_monitor")
+            assert isinstance(plugins["topology"], MockNetworkTopologyPlugin)
+        finally:
+            lifecycle.teardown()
+
+    def test_settings(self):
+        """Test shared settings, budget and interface end up in the plugin config."""
+        lifecycle = _lifecycle()
+        lifecycle.resources.capture_settings = {'queue_size': 10000, 'interfaces': ["eth0"],
+                                                'sampling_mode': "off"}
+        specs = _specs({'name': "packet_analyzer", 'interface': "eth1",
+                        'budget': {'max_queue': 256, 'cpu_share': 0.2}},
+                       {'name': "rogue_ap", 'interface': "wlan1mon"},
+                       {'name': "http_sniffer", 'config': {'ethical_consent': True}})
+
+        packets = plugin_settings(lifecycle, specs["packet_analyzer"], mock_mode=False)
+        assert packets['queue_size'] == 256
+        assert packets['sampling_mode'] == "adaptive" and packets['sampling_cpu_budget'] == 0.2
+        assert packets['interface'] == "eth1" and packets['interfaces'] == ["eth1"]
+        rogue = plugin_settings(lifecycle, specs["rogue_ap"], mock_mode=False, monitor_capture=True)
+        assert rogue['monitor_interface'] == "wlan1mon" and rogue['interfaces'] == ["eth0"]
+        # Consent follows the mode, never the file
+        assert plugin_settings(lifecycle, specs["http_sniffer"], mock_mode=False)['ethical_consent'] is False
+
+    def test_workers_shard_consented_plugins_only(self, monkeypatch):
+        """Test DNS is sharded, and HTTP only once consent is given."""
+        lifecycle = _lifecycle()
+        lifecycle.resources.worker_pool = WorkerPool(2)
+        specs = plugin_set.plugin_specs(lifecycle)
+
+        assert isinstance(build_plugin(lifecycle, specs["dns_monitor"], mock_mode=False), ShardedPlugin)
+        assert not isinstance(build_plugin(lifecycle, specs["http_sniffer"], mock_mode=False), ShardedPlugin)
+        assert not isinstance(build_plugin(lifecycle, specs["dns_monitor"], mock_mode=True), ShardedPlugin)
+
+        settings = plugin_settings
+        monkeypatch.setattr(plugin_set, "plugin_settings",
+                            lambda *args: {**settings(*args), 'ethical_consent': True})
+        assert isinstance(build_plugin(lifecycle, specs["http_sniffer"], mock_mode=False), ShardedPlugin)
+
+    def test_max_entries_caps_rolling_lists(self):
+        """Test a plugin keeps max_entries recent records."""
+        spec = _specs({'name': "dns_monitor", 'budget': {'max_entries': 7}})["dns_monitor"]
+        dns = DNSMonitorPlugin(PluginConfig(name=spec.name,
+                                            config=plugin_settings(_lifecycle(), spec, mock_mode=False)))
+        gen = SyntheticLoadGenerator(seed=31, domains=50)
+        for packet in gen.records(gen.batch(500)):
+            dns._process_dns_packet(packet)
+
+        assert dns.stats['total_queries'] > 7
+        assert len(dns.recent_queries) == 7
+
+
+class TestReload:
+    """Test applying new specs to a running set."""
+
+    @pytest.fixture
+    def running(self):
+        lifecycle = _lifecycle()
+        plugins = build_plugin_set(lifecycle, mock_mode=True)
+        lifecycle.activation.acquire("dns_monitor", "screen:dns_monitor")
+        lifecycle.activation.acquire("http_sniffer", "screen:http_sniffer")
+        yield lifecycle, plugins
+        lifecycle.teardown()
+
+    def test_rates_and_budgets_in_place(self, running):
+        """Test retuned plugins keep their instance and keep running."""
+        lifecycle, plugins = running
+        dns = plugins["dns_monitor"]
+
+        new, report = reload_plugin_set(lifecycle, plugins, True, _specs(
+            {'name': "dns_monitor", 'rate_ms': 2000, 'budget': {'max_entries': 10}}
+        ))
+
+        assert report == {'updated': ["dns_monitor"], 'removed': [], 'added': []}
+        assert new["dns_monitor"] is dns and list(new) == list(plugins)
+        assert dns.config.rate_ms == 2000 and dns.max_entries == 10
+        assert lifecycle.activation.is_running("dns_monitor")
+        assert lifecycle.stats['generation'] == 0  # No teardown
+
+    def test_disable_and_enable(self, running):
+        """Test disabling stops one plugin; enabling it again restarts it for its consumers."""
+        lifecycle, plugins = running
+        dns = plugins["dns_monitor"]
+
+        plugins, report = reload_plugin_set(lifecycle, plugins, True,
+                                            _specs({'name': "http_sniffer", 'enabled': False}))
+        assert report['removed'] == ["http_sniffer"] and not report['added']
+        assert "http_sniffer" not in plugins and "http_sniffer" not in lifecycle.names()
+        assert lifecycle.activation.running() == ["dns_monitor"]
+
+        plugins, report = reload_plugin_set(lifecycle, plugins, True, _specs())
+        assert report['added'] == ["http_sniffer"]
+        assert list(plugins) == [spec.name for spec in DEFAULT_PLUGIN_SPECS]
+        assert lifecycle.activation.is_running("http_sniffer")  # The screen still shows it
+        assert plugins["dns_monitor"] is dns
+
+    def test_structural_change_rebuilds_one_plugin(self, running):
+        """Test a changed config rebuilds only that plugin."""
+        lifecycle, plugins = running
+        system = plugins["system"]
+        topology = plugins["topology"]
+
+        new, report = reload_plugin_set(lifecycle, plugins, True,
+                                        _specs({'name': "topology", 'config': {'max_scan_hosts': 16}}))
+
+        assert report == {'updated': [], 'removed': ["topology"], 'added': ["topology"]}
+        assert new["topology"] is not topology and new["system"] is system
+        assert new["topology"].config.config['max_scan_hosts'] == 16
+
+
+class TestLiveBudgets:
+    """Test budgets applied to running queues and samplers."""
+
+    def test_queue_resize(self):
+        """Test a smaller queue drops new packets beyond its new capacity."""
+        queue = PacketQueue(lambda packet: None, maxsize=10)
+        for i in range(4):
+            queue.put(i)
+        queue.resize(4)
+
+        assert not queue.put(5)
+        assert queue.snapshot()['capacity'] == 4
+        with pytest.raises(ValueError):
+            queue.resize(0)
+
+    def test_sampler_update(self):
+        """Test a CPU share switches the sampler to adaptive, keeping its estimates."""
+        sampler = PacketSampler()
+        sampler.observe("bytes", 100, 1)
+        sampler.update({'sampling_mode': "adaptive", 'sampling_rate': 4, 'sampling_cpu_budget': 0.1})
+
+        assert sampler.mode == "adaptive" and sampler.rate == 4 and sampler.cpu_budget == 0.1
+        assert "bytes" in sampler.estimates
+        sampler.update({})
+        assert not sampler.enabled and sampler.rate == 1
+
+
+class TestWatcher:
+    """Test noticing config file changes."""
+
+    def test_poll(self, tmp_path):
+        """Test changes are picked up once, invalid files keep the current specs."""
+        config = tmp_path / "dashboard.yml"
+        config.write_text("plugins:\n  - name: dns_monitor\n    rate_ms: 500\n")
+        clock = FakeClock()
+        watcher = PluginConfigWatcher(str(config), DEFAULT_PLUGIN_SPECS, interval=1.0, clock=clock)
+        assert watcher.specs["dns_monitor"].rate_ms == 500
+
+        _write(config, "plugins:\n  - name: dns_monitor\n    rate_ms: 250\n")
+        assert watcher.poll() is None  # Not time to check yet
+        clock.now = 1.0
+        assert watcher.poll()["dns_monitor"].rate_ms == 250
+        clock.now = 2.0
+        assert watcher.poll() is None  # Unchanged since
+
+        _write(config, "plugins:\n  - name: dns_monitor\n    rate_ms: fast\n")
+        clock.now = 3.0
+        assert watcher.poll() is None
+        assert watcher.specs["dns_monitor"].rate_ms == 250
+        assert watcher.stats == {'reloads': 1, 'errors': 1}
@@ -0,0 +1,210 @@
+"""
+Tests for Plugin Lifecycle - leak-free plugin set swaps
+
+Focus: always-on vs on-demand adoption, teardown order, shared resources,
+thread/socket accounting across repeated swaps
+"""
+
+import socket
+import threading
+
+import pytest
+from unittest.mock import Mock
+
+from plugins.activation import PluginActivation
+from plugins.base import Plugin, PluginConfig
+from plugins.capture_hub import CaptureHub
+from plugins.lifecycle import PluginLifecycle, SharedResources, count_open_sockets
+from utils.metrics_store import MetricsStore
+
+
+class WorkerPlugin(Plugin):
+    """Plugin with a background thread and a socket, like the sniffers."""
+
+    def initialize(self) -> None:
+        self._stop_event = threading.Event()
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.thread = threading.Thread(target=self._stop_event.wait, daemon=True)
+        self.thread.start()
+        self._initialized = True
+
+    def stop(self) -> None:
+        if getattr(self, 'thread', None):
+            self._stop_event.set()
+            self.thread.join(timeout=2.0)
+            self.thread = None
+            self.sock.close()
+
+    def cleanup(self) -> None:
+        self.stop()
+
+    def collect_data(self):
+        return {}
+
+    def get_state(self):
+        return {'seen': getattr(self, 'seen', 0)}
+
+    def restore_state(self, state):
+        self.seen = state['seen']
+
+
+def _plugin(name="worker"):
+    return WorkerPlugin(PluginConfig(name=name))
+
+
+def _lifecycle():
+    return PluginLifecycle(PluginActivation(grace_period=0), SharedResources(capture_hub=CaptureHub()))
+
+
+class TestPluginLifecycle:
+    """Test build/teardown of plugin sets."""
+
+    def test_always_on_plugin_initialized_on_add(self):
+        """Test plugins added without on_demand start right away."""
+        lifecycle = _lifecycle()
+        plugin = lifecycle.add("worker", _plugin())
+
+        assert plugin.thread.is_alive()
+        assert lifecycle.names() == ["worker"]
+        lifecycle.teardown()
+
+    def test_on_demand_plugin_waits_for_consumer(self):
+        """Test on-demand plugins are only registered with the activation registry."""
+        lifecycle = _lifecycle()
+        plugin = lifecycle.add("worker", _plugin(), on_demand=True)
+
+        assert not hasattr(plugin, 'thread')
+        lifecycle.activation.acquire("worker", "screen")
+        assert plugin.thread.is_alive()
+        lifecycle.teardown()
+
+    def test_duplicate_name_rejected(self):
+        """Test adding the same name twice without teardown is an error."""
+        lifecycle = _lifecycle()
+        lifecycle.add("worker", Mock(spec=Plugin))
+
+        with pytest.raises(ValueError):
+            lifecycle.add("worker", Mock(spec=Plugin))
+
+    def test_teardown_joins_threads_and_closes_sockets(self):
+        """Test teardown leaves no worker threads or sockets behind."""
+        lifecycle = _lifecycle()
+        always_on = lifecycle.add("always_on", _plugin())
+        on_demand = lifecycle.add("on_demand", _plugin(), on_demand=True)
+        lifecycle.activation.acquire("on_demand", "screen")
+        workers = [always_on.thread, on_demand.thread]
+
+        report = lifecycle.teardown()
+
+        assert not any(thread.is_alive() for thread in workers)
+        assert always_on.sock.fileno() == -1
+        assert on_demand.sock.fileno() == -1
+        assert report['torn_down'] == ["always_on", "on_demand"]
+        assert report['plugins'] == 0
+        assert report['running_plugins'] == []
+
+    def test_consumers_carry_over_to_new_set(self):
+        """Test a screen's plugin restarts in the new set after a swap."""
+        lifecycle = _lifecycle()
+        lifecycle.add("worker", _plugin(), on_demand=True)
+        lifecycle.activation.acquire("worker", "screen")
+
+        lifecycle.teardown()
+        replacement = lifecycle.add("worker", _plugin(), on_demand=True)
+
+        assert replacement.thread.is_alive()
+        lifecycle.teardown()
+
+    def test_failing_cleanup_does_not_block_others(self):
+        """Test one plugin's cleanup error doesn't stop the rest from tearing down."""
+        lifecycle = _lifecycle()
+        broken = Mock(spec=Plugin)
+        broken.cleanup.side_effect = RuntimeError("boom")
+        lifecycle.add("broken", broken)
+        healthy = lifecycle.add("healthy", _plugin())
+
+        lifecycle.teardown()
+
+        assert healthy.thread is None
+        assert lifecycle.stats['cleanup_errors'] == 1
+
+    def test_repeated_swaps_do_not_leak(self):
+        """Test thread and socket counts are stable across many swaps."""
+        lifecycle = _lifecycle()
+        before = lifecycle.resource_counts()
+
+        for _ in range(20):
+            lifecycle.add("always_on", _plugin())
+            lifecycle.add("on_demand", _plugin(), on_demand=True)
+            lifecycle.activation.acquire("on_demand", "screen")
+            report = lifecycle.teardown()
+
+        assert report['threads'] == before['threads']
+        if before['sockets'] is not None:
+            assert report['sockets'] == before['sockets']
+        assert lifecycle.stats['generation'] == 20
+
+    def test_shared_resources_survive_teardown(self):
+        """Test the vendor cache and capture hub are reused across sets."""
+        lifecycle = _lifecycle()
+        resources = lifecycle.resources
+        resources.vendor_cache["aa:bb:cc:dd:ee:ff"] = "Apple"
+
+        lifecycle.add("worker", _plugin())
+        lifecycle.teardown()
+
+        assert lifecycle.resources is resources
+        assert resources.vendor_cache == {"aa:bb:cc:dd:ee:ff": "Apple"}
+
+
+class TestStatePersistence:
+    """Test plugin state saved to and restored from the metrics store."""
+
+    def _lifecycle(self, tmp_path):
+        store = MetricsStore(tmp_path / "history.db")
+        resources = SharedResources(capture_hub=CaptureHub(), metrics_store=store)
+        return PluginLifecycle(PluginActivation(grace_period=0), resources), store
+
+    def test_state_saved_on_teardown_and_restored_on_add(self, tmp_path):
+        """Test a rebuilt plugin starts from its predecessor's state."""
+        lifecycle, store = self._lifecycle(tmp_path)
+        plugin = lifecycle.add("worker", _plugin())
+        plugin.seen = 7
+        lifecycle.teardown()
+
+        replacement = lifecycle.add("worker", _plugin())
+
+        assert replacement.seen == 7
+        lifecycle.teardown()
+        store.close()
+
+    def test_state_not_persisted_when_disabled(self, tmp_path):
+        """Test persist_state=False neither restores nor saves (mock mode)."""
+        lifecycle, store = self._lifecycle(tmp_path)
+        store.save_state("worker", {'seen': 3})
+        lifecycle.persist_state = False
+
+        plugin = lifecycle.add("worker", _plugin())
+        plugin.seen = 99
+        lifecycle.teardown()
+
+        assert store.load_state("worker") == {'seen': 3}
+        store.close()
+
+
+class TestCountOpenSockets:
+    """Test /proc based socket counting."""
+
+    def test_counts_new_socket(self):
+        """Test opening a socket raises the count by one."""
+        before = count_open_sockets()
+        if before is None:
+            pytest.skip("/proc/self/fd not available")
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM):
+            assert count_open_sockets() == before + 1
+        assert count_open_sockets() == before
+
+    def test_unavailable_returns_none(self, tmp_path):
+        """Test a missing fd directory reports None instead of raising."""
+        assert count_open_sockets(str(tmp_path / "missing")) is None
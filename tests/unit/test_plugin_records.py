@@ -0,0 +1,110 @@
+"""
+Tests for plugin record types - slotted dataclasses with shallow to_dict()
+
+Focus: to_dict() matching dataclasses.asdict(), copies of the mutable
+fields, and memory per record against the plain (dict-backed) dataclasses
+they replace. Serialization throughput is measured (not asserted) by
+scripts/benchmark_records.py
+"""
+
+import dataclasses
+import tracemalloc
+
+import pytest
+
+from plugins.arp_spoofing_detector import ARPEntry, SpoofingAlert
+from plugins.dns_monitor_plugin import DNSQuery
+from plugins.handshake_capturer import HandshakeCapture, TargetNetwork
+from plugins.http_sniffer_plugin import CredentialCapture, HTTPRequest
+from plugins.network_topology_plugin import NetworkDevice
+from plugins.rogue_ap_detector import AccessPoint, RogueAPAlert
+from plugins.traffic_statistics import DeviceStats, TrafficAlert
+
+
+RECORDS = [
+    ARPEntry(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:ff", timestamp=1.0),
+    SpoofingAlert(ip="10.0.0.1", old_mac="aa", new_mac="bb", timestamp=1.0, severity="HIGH",
+                  description="d", educational_note="n", pcap_files=["a.pcapng"]),
+    DNSQuery(timestamp=1.0, source_ip="10.0.0.2", domain="example.com", query_type="A"),
+    HandshakeCapture(bssid="aa", ssid="home", client_mac="bb", timestamp=1.0,
+                     packets_captured=4, is_complete=True),
+    TargetNetwork(bssid="aa", ssid="home", channel=6, encryption="WPA2", signal_strength=-40),
+    HTTPRequest(timestamp=1.0, source_ip="10.0.0.2", dest_ip="1.1.1.1", method="GET",
+                host="example.com", path="/", cookies="c=1"),
+    CredentialCapture(timestamp=1.0, source_ip="10.0.0.2", url="/login", credential_type="password"),
+    NetworkDevice(ip="10.0.0.3", mac="cc", hostname="host", vendor="vendor", last_seen=1.0),
+    AccessPoint(bssid="aa", ssid="home", channel=6, signal_strength=-40, encryption="WPA2",
+                vendor="v", first_seen=1.0, last_seen=2.0),
+    RogueAPAlert(timestamp=1.0, rogue_bssid="aa", legitimate_bssid="bb", ssid="home",
+                 severity="CRITICAL", reason="r", channel_diff=0, signal_diff=10, educational_note="n"),
+    DeviceStats(mac="cc", ip="10.0.0.3", hostname="host", bytes_sent=10, bytes_received=20,
+                packets_sent=1, packets_received=2, protocols={"HTTPS": 3}, first_seen=1.0, last_seen=2.0),
+    TrafficAlert(device_ip="10.0.0.3", alert_type="BANDWIDTH_SPIKE", description="d",
+                 value=20, threshold=10, timestamp=1.0),
+]
+
+
+def plain_twin(record):
+    """The record as the plain dataclass it used to be (instance __dict__)."""
+    cls = type(record)
+    plain = dataclasses.make_dataclass(
+        f"Plain{cls.__name__}",
+        [(f.name, f.type, f) for f in dataclasses.fields(cls)]
+    )
+    return plain(**dataclasses.asdict(record))
+
+
+class TestRecords:
+    """Test the slotted records."""
+
+    @pytest.mark.parametrize("record", RECORDS, ids=lambda r: type(r).__name__)
+    def test_to_dict_matches_asdict(self, record):
+        """Test the hand-written to_dict() has every field, in order."""
+        assert list(record.to_dict().items()) == list(dataclasses.asdict(record).items())
+
+    @pytest.mark.parametrize("record", RECORDS, ids=lambda r: type(r).__name__)
+    def test_slotted(self, record):
+        """Test records carry no per-instance __dict__."""
+        assert not hasattr(record, '__dict__')
+        with pytest.raises(AttributeError):
+            record.not_a_field = 1
+
+    def test_mutable_fields_are_copied(self):
+        """Test snapshots don't share the live protocol counters and pcap lists."""
+        device = RECORDS[-2]
+        data = device.to_dict()
+        device.protocols["DNS"] = 1
+
+        assert "DNS" not in data['protocols']
+        assert RECORDS[1].to_dict()['pcap_files'] is not RECORDS[1].pcap_files
+
+
+class TestRecordMemory:
+    """Test slotted records use less memory than the plain dataclasses."""
+
+    COUNT = 5000
+
+    @staticmethod
+    def _memory_per_record(factory, count):
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        records = [factory(i) for i in range(count)]
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+        del records
+        return size / count
+
+    def test_device_stats(self):
+        """Test DeviceStats is smaller than before."""
+        template = RECORDS[-2]
+        plain_cls = type(plain_twin(template))
+        fields = dataclasses.asdict(template)
+
+        def slotted(i):
+            return DeviceStats(**{**fields, 'ip': f"10.0.{i >> 8}.{i & 255}", 'protocols': {"HTTPS": i}})
+
+        def plain(i):
+            return plain_cls(**{**fields, 'ip': f"10.0.{i >> 8}.{i & 255}", 'protocols': {"HTTPS": i}})
+
+        assert self._memory_per_record(slotted, self.COUNT) < self._memory_per_record(plain, self.COUNT)
@@ -8,6 +8,7 @@
 """
 
 import pytest
+import json
 import time
 from unittest.mock import Mock, patch
 
@@ -414,3 +415,32 @@ def test_concurrent_data_access(self):
         # All should succeed
         assert len(results) == 5
         assert all(r is not None for r in results)
+
+
+class TestRogueAPState:
+    """Test get_state/restore_state round trip."""
+
+    def test_restored_baseline_skips_learning(self):
+        """Test a saved baseline is used right away instead of re-learning."""
+        config = PluginConfig(name="rogue_ap", config={})
+        plugin = RogueAPDetector(config)
+        plugin.baseline_aps = {"HomeNet": "aa:bb:cc:dd:ee:ff"}
+        plugin._baseline_learned = True
+
+        restored = RogueAPDetector(config)
+        restored.restore_state(json.loads(json.dumps(plugin.get_state())))
+        with patch.object(restored, '_monitor_aps'):
+            restored.start()
+            restored.stop()
+
+        assert restored._baseline_learned is True
+        assert restored._baseline_timer is None
+        assert restored.baseline_aps == {"HomeNet": "aa:bb:cc:dd:ee:ff"}
+        assert restored.stats['baseline_aps'] == 1
+
+    def test_unlearned_state_keeps_learning(self):
+        """Test an empty saved baseline doesn't count as learned."""
+        restored = RogueAPDetector(PluginConfig(name="rogue_ap", config={}))
+        restored.restore_state({'baseline_aps': {}, 'baseline_learned': True})
+
+        assert restored._baseline_learned is False
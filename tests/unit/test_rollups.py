@@ -0,0 +1,179 @@
+"""
+Tests for Rollups - multi-resolution downsampling
+
+Focus: bucket aggregation, tier selection, retention specs, and the
+rollup tables of the metrics store
+"""
+
+import time
+
+import pytest
+
+from utils.metrics_store import MetricsStore
+from utils.rollups import (
+    DAY,
+    DEFAULT_TIERS,
+    RollupTier,
+    aggregate,
+    parse_duration,
+    select_tier,
+    with_retention,
+)
+
+
+RAW, MINUTE, HOUR = DEFAULT_TIERS
+
+
+def _hour_start():
+    """Start of the previous hour (recent enough for every tier's retention)."""
+    now = time.time()
+    return now - now % 3600 - 3600
+
+
+class TestAggregate:
+    """Test folding samples into buckets."""
+
+    def test_min_max_sum_count_per_bucket(self):
+        """Test each minute/hour bucket gets min, max, sum and count."""
+        rows = [("cpu", 60.0, 5.0), ("cpu", 90.0, 1.0), ("cpu", 119.0, 3.0), ("cpu", 120.0, 7.0)]
+
+        buckets = aggregate(rows, DEFAULT_TIERS)
+
+        assert buckets[(60.0, "cpu", 60.0)] == [1.0, 5.0, 9.0, 3]
+        assert buckets[(60.0, "cpu", 120.0)] == [7.0, 7.0, 7.0, 1]
+        assert buckets[(3600.0, "cpu", 0.0)] == [1.0, 7.0, 16.0, 4]
+
+    def test_metrics_kept_apart(self):
+        """Test samples of different metrics never share a bucket."""
+        buckets = aggregate([("a", 1.0, 1.0), ("b", 1.0, 2.0)], DEFAULT_TIERS)
+
+        assert buckets[(60.0, "a", 0.0)][2] == 1.0
+        assert buckets[(60.0, "b", 0.0)][2] == 2.0
+
+
+class TestSelectTier:
+    """Test picking the coarsest sufficient tier."""
+
+    def test_resolution_picks_coarsest_fine_enough(self):
+        """Test the requested spacing selects the matching tier."""
+        now = 10 * DAY
+        start = now - 3600
+
+        assert select_tier(DEFAULT_TIERS, start, now, resolution=5) is RAW
+        assert select_tier(DEFAULT_TIERS, start, now, resolution=60) is MINUTE
+        assert select_tier(DEFAULT_TIERS, start, now, resolution=600) is MINUTE
+        assert select_tier(DEFAULT_TIERS, start, now, resolution=7200) is HOUR
+
+    def test_no_resolution_picks_finest(self):
+        """Test full detail is returned when no resolution is given."""
+        assert select_tier(DEFAULT_TIERS, 100.0, 200.0) is RAW
+
+    def test_retention_rules_out_expired_tiers(self):
+        """Test a range older than raw retention is served from rollups."""
+        now = 30 * DAY
+
+        assert select_tier(DEFAULT_TIERS, now - 3 * DAY, now, resolution=1) is MINUTE
+        assert select_tier(DEFAULT_TIERS, now - 20 * DAY, now, resolution=1) is HOUR
+        assert select_tier(DEFAULT_TIERS, now - 400 * DAY, now) is HOUR
+
+
+class TestRetentionSpec:
+    """Test per-tier retention configuration."""
+
+    def test_parse_duration(self):
+        """Test units and forever."""
+        assert parse_duration("90s") == 90
+        assert parse_duration("30m") == 1800
+        assert parse_duration("2d") == 2 * DAY
+        assert parse_duration("1w") == 7 * DAY
+        assert parse_duration("120") == 120
+        assert parse_duration("forever") is None
+
+    def test_with_retention_overrides_named_tiers(self):
+        """Test only the named tiers change."""
+        tiers = with_retention("1s=2d, 1h=forever")
+
+        assert [tier.retention for tier in tiers] == [2 * DAY, MINUTE.retention, None]
+
+    def test_with_retention_rejects_unknown(self):
+        """Test typos in tier names or durations are errors."""
+        with pytest.raises(ValueError):
+            with_retention("5min=1d")
+        with pytest.raises(ValueError):
+            with_retention("1s=soon")
+
+
+class TestStoreRollups:
+    """Test rollups written and queried through the metrics store."""
+
+    def test_rollups_merge_across_flushes(self, tmp_path):
+        """Test a bucket filled by two flushes holds the combined aggregate."""
+        base = _hour_start()
+        store = MetricsStore(tmp_path / "history.db")
+        store.record("cpu", 10.0, timestamp=base)
+        store.flush()
+        store.record("cpu", 30.0, timestamp=base + 1)
+        store.record("cpu", 20.0, timestamp=base + 2)
+        store.flush()
+
+        tier, points = store.query_range("cpu", start=base, end=base + 59, resolution=60)
+        store.close()
+
+        assert tier is MINUTE
+        assert len(points) == 1
+        assert points[0].ts == base
+        assert (points[0].min, points[0].max, points[0].avg, points[0].count) == (10.0, 30.0, 20.0, 3)
+
+    def test_repeated_timestamp_counted_once(self, tmp_path):
+        """Test a (metric, ts) seen twice, in one batch or across flushes, is one sample."""
+        base = _hour_start()
+        store = MetricsStore(tmp_path / "history.db")
+        store.record("cpu", 10.0, timestamp=base)
+        store.record("cpu", 90.0, timestamp=base)
+        store.flush()
+        store.record("cpu", 50.0, timestamp=base)
+        store.record("cpu", 30.0, timestamp=base + 1)
+        written = store.flush()
+
+        tier, points = store.query_range("cpu", start=base, end=base + 59, resolution=60)
+        raw = store.query("cpu")
+        store.close()
+
+        assert written == 1
+        assert store.stats['duplicates'] == 2
+        assert raw == [(base, 10.0), (base + 1, 30.0)]
+        assert (points[0].min, points[0].max, points[0].avg, points[0].count) == (10.0, 30.0, 20.0, 2)
+
+    def test_query_range_raw_and_max_points(self, tmp_path):
+        """Test fine requests read raw samples and max_points derives resolution."""
+        now = _hour_start()
+        store = MetricsStore(tmp_path / "history.db")
+        for i in range(7200):
+            store.record("bw", float(i % 60), timestamp=now - 7200 + i)
+        store.flush()
+
+        raw_tier, raw = store.query_range("bw", start=now - 10, end=now)
+        minute_tier, minutes = store.query_range("bw", start=now - 7200, end=now, max_points=120)
+        store.close()
+
+        assert raw_tier is RAW
+        assert len(raw) == 10 and raw[0].count == 1
+        assert minute_tier is MINUTE
+        assert len(minutes) == 120
+        assert all(point.count == 60 for point in minutes)
+
+    def test_per_tier_retention(self, tmp_path):
+        """Test each tier is pruned by its own retention."""
+        tiers = (RollupTier("1s", 1, 100.0), RollupTier("1min", 60, 1000.0), RollupTier("1h", 3600, None))
+        store = MetricsStore(tmp_path / "history.db", tiers=tiers)
+        for ts in (0.0, 500.0, 950.0):
+            store.record("m", 1.0, timestamp=ts)
+        store.flush()
+
+        deleted = store.apply_retention(now=1050.0)
+
+        assert deleted == {"1s": 2, "1min": 1}
+        assert [ts for ts, _ in store.query("m")] == [950.0]
+        _, hours = store.query_range("m", start=0.0, end=1050.0, resolution=3600)
+        assert hours[0].count == 3
+        store.close()
@@ -0,0 +1,256 @@
+"""
+Tests for Snapshots - copy-on-write plugin state
+
+Focus: versioning, publish cadence while a writer runs, immutability and
+readers racing a capture thread
+"""
+
+import threading
+import time
+
+import pytest
+
+import plugins.traffic_statistics as traffic_statistics
+from plugins.base import PluginConfig
+from plugins.snapshot import SnapshotPublisher, apply_changes, make_changes
+from plugins.traffic_statistics import TrafficStatistics
+from src.utils.load_generator import SyntheticLoadGenerator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSnapshotPublisher:
+    """Test publishing and reading snapshots."""
+
+    def test_versions_grow(self):
+        """Test every publish swaps in the next version."""
+        state = {'count': 0}
+        publisher = SnapshotPublisher(lambda: dict(state))
+
+        assert publisher.version == 0
+        first = publisher.publish()
+        state['count'] = 5
+        second = publisher.publish()
+
+        assert (first.version, second.version) == (1, 2)
+        assert first.data['count'] == 0  # old snapshots never change
+        assert second.data['count'] == 5
+        assert publisher.stats['published'] == 2
+
+    def test_read_only(self):
+        """Test snapshot data can't be modified or rebound."""
+        snapshot = SnapshotPublisher(lambda: {'devices': []}).publish()
+
+        with pytest.raises(TypeError):
+            snapshot.data['devices'] = None
+        with pytest.raises(AttributeError):
+            snapshot.version = 7
+
+    def test_cadence_while_live(self):
+        """Test a live writer publishes once per interval, readers see the last one."""
+        clock = FakeClock()
+        state = {'count': 0}
+        publisher = SnapshotPublisher(lambda: dict(state), interval=0.25, clock=clock)
+        publisher.start()
+
+        state['count'] = 1
+        publisher.tick()
+        assert publisher.current().data['count'] == 0  # not due yet
+
+        clock.now = 0.3
+        publisher.tick()
+        assert publisher.current().data['count'] == 1
+        assert publisher.current().version == 2  # reads don't publish
+
+    def test_on_demand_without_writer(self):
+        """Test readers see the latest state while no writer runs."""
+        state = {'count': 0}
+        publisher = SnapshotPublisher(lambda: dict(state))
+        publisher.tick()  # no-op: not live
+        assert publisher.version == 0
+
+        state['count'] = 3
+        assert publisher.current().data['count'] == 3
+
+        publisher.start()
+        publisher.stop()
+        state['count'] = 4
+        assert publisher.current().data['count'] == 4
+
+
+class TestChanges:
+    """Test deltas between snapshot versions."""
+
+    def test_history(self):
+        """Test old versions stay reachable until they leave the history."""
+        publisher = SnapshotPublisher(dict, history=3)
+        for _ in range(5):
+            publisher.publish()
+
+        assert [publisher.get(v) is not None for v in range(1, 7)] == [False, False, True, True, True, False]
+        assert publisher.get(4).version == 4
+
+    def test_diff_and_apply(self):
+        """Test added, updated and removed records rebuild the new table."""
+        old = {'devices': [{'ip': "a", 'n': 1}, {'ip': "b", 'n': 1}, {'ip': "c", 'n': 1}], 'count': 3}
+        new = {'devices': [{'ip': "a", 'n': 1}, {'ip': "b", 'n': 2}, {'ip': "d", 'n': 1}], 'count': 3}
+
+        changes = make_changes(old, new, {'devices': 'ip'}, since=1, version=2)
+
+        assert changes['changes']['devices'] == {
+            'added': [{'ip': "d", 'n': 1}], 'updated': [{'ip': "b", 'n': 2}], 'removed': ["c"]
+        }
+        assert changes['data'] == {'count': 3}
+        assert apply_changes(old, changes) == new
+        assert len(old['devices']) == 3  # the reader's copy is untouched
+
+    def test_plugin_changes(self, monkeypatch):
+        """Test get_changes() sends only the devices that changed."""
+        for name in ("IP", "TCP", "UDP"):
+            monkeypatch.setattr(traffic_statistics, name, name)
+        gen = SyntheticLoadGenerator(seed=22, devices=20, flows=200)
+        packets = [p for p in gen.records(gen.batch(2000)) if p.haslayer("IP")]
+        plugin = TrafficStatistics(PluginConfig(name="traffic_statistics", config={'mock_mode': True}))
+        for ip in {p.layers['IP'].src for p in packets}:
+            plugin.register_device(ip, "aa:bb:cc:dd:ee:ff")
+
+        first = plugin.get_changes()
+        assert first['full'] and len(first['data']['devices']) == len(plugin.devices)
+
+        target = packets[0].layers['IP'].src
+        plugin._process_packet(packets[0])
+        del plugin.devices[packets[-1].layers['IP'].src]
+        delta = plugin.get_changes(first['version'])
+
+        assert not delta['full']
+        assert delta['since'] == first['version'] and delta['version'] > first['version']
+        changed = delta['changes']['devices']
+        assert target in [d['ip'] for d in changed['updated']]
+        assert changed['removed'] == [packets[-1].layers['IP'].src]
+        assert len(changed['updated']) <= 2  # source and destination at most
+        assert apply_changes(first['data'], delta)['devices'] == plugin.get_data()['devices']
+
+    def test_unknown_version_is_full(self):
+        """Test an expired or foreign version falls back to the full data."""
+        plugin = TrafficStatistics(PluginConfig(name="traffic_statistics", config={'mock_mode': True}))
+
+        assert plugin.get_changes(10_000)['full']
+
+
+class TestConcurrentReaders:
+    """Test a reader racing the capture thread."""
+
+    def test_get_data_while_capturing(self, monkeypatch):
+        """Test get_data() never fails while devices are added and updated."""
+        for name in ("IP", "TCP", "UDP"):
+            monkeypatch.setattr(traffic_statistics, name, name)
+        gen = SyntheticLoadGenerator(seed=21, devices=300, flows=2000)
+        packets = gen.records(gen.batch(20000))
+        plugin = TrafficStatistics(PluginConfig(
+            name="traffic_statistics", config={'mock_mode': True, 'snapshot_ms': 1}
+        ))
+        plugin.snapshots.start()
+
+        def capture():
+            for i, packet in enumerate(packets):
+                if i % 50 == 0 and packet.haslayer("IP"):
+                    plugin.register_device(packet.layers['IP'].src, "aa:bb:cc:dd:ee:ff")
+                plugin._process_packet(packet)
+
+        writer = threading.Thread(target=capture)
+        writer.start()
+        versions = []
+        while writer.is_alive():
+            data = plugin.get_data()
+            assert data['device_count'] == len(data['devices'])
+            versions.append(data['snapshot_version'])
+        writer.join()
+        plugin.snapshots.stop()
+
+        assert versions == sorted(versions)
+        assert plugin.get_data()['global_stats']['total_packets'] == sum(p.haslayer("IP") for p in packets)
+
+    def test_get_state_while_capturing(self, monkeypatch):
+        """Test the store's flush thread can save state while devices are added."""
+        for name in ("IP", "TCP", "UDP"):
+            monkeypatch.setattr(traffic_statistics, name, name)
+        gen = SyntheticLoadGenerator(seed=23, devices=300, flows=2000)
+        packets = gen.records(gen.batch(20000))
+        plugin = TrafficStatistics(PluginConfig(
+            name="traffic_statistics", config={'mock_mode': True, 'snapshot_ms': 1}
+        ))
+        plugin.snapshots.start()
+
+        def capture():
+            for i, packet in enumerate(packets):
+                if i % 50 == 0 and packet.haslayer("IP"):
+                    plugin.register_device(packet.layers['IP'].src, "aa:bb:cc:dd:ee:ff")
+                plugin._process_packet(packet)
+
+        writer = threading.Thread(target=capture)
+        writer.start()
+        while writer.is_alive():
+            state = plugin.get_state()
+            assert len(state['devices']) == len(state['ip_to_mac'])
+        writer.join()
+        plugin.snapshots.stop()
+
+        assert plugin.get_state()['total_packets'] == sum(p.haslayer("IP") for p in packets)
+
+
+class TestIdlePublish:
+    """Test the last packets of a burst are published once capture goes quiet."""
+
+    def _plugin(self, monkeypatch, snapshot_ms):
+        for name in ("IP", "TCP", "UDP"):
+            monkeypatch.setattr(traffic_statistics, name, name)
+        gen = SyntheticLoadGenerator(seed=24, devices=10, flows=50)
+        packets = [p for p in gen.records(gen.batch(200)) if p.haslayer("IP")]
+        plugin = TrafficStatistics(PluginConfig(
+            name="traffic_statistics", config={'mock_mode': True, 'snapshot_ms': snapshot_ms}
+        ))
+        return plugin, packets
+
+    def test_last_packet_then_idle_inline(self, monkeypatch):
+        """Test the sniff() batch boundary publishes the last inline packet."""
+        plugin, packets = self._plugin(monkeypatch, 250)
+        clock = FakeClock()
+        monkeypatch.setattr(plugin.snapshots, '_clock', clock)
+        plugin.snapshots.start()
+
+        for packet in packets[:-1]:
+            plugin._process_packet(packet)
+        clock.now = 0.3
+        plugin._process_packet(packets[-1])  # due: published with this packet counted
+        assert plugin.get_data()['global_stats']['total_packets'] == len(packets)
+
+        plugin._process_packet(packets[0])  # the burst's last packet, not due yet
+        clock.now = 0.6
+        plugin.capture_tick()  # sniff(timeout=1) returned with no more traffic
+
+        assert plugin.get_data()['global_stats']['total_packets'] == len(packets) + 1
+        plugin.snapshots.stop()
+
+    def test_last_packet_then_idle_queued(self, monkeypatch):
+        """Test the queue worker publishes the last packet while the capture is quiet."""
+        plugin, packets = self._plugin(monkeypatch, 20)
+        plugin.snapshots.start()
+        queue = plugin.start_packet_queue(plugin._process_packet)
+        for packet in packets:
+            queue.put(packet)
+
+        deadline = time.monotonic() + 2.0
+        published = 0
+        while published < len(packets) and time.monotonic() < deadline:
+            time.sleep(0.01)
+            published = plugin.get_data()['global_stats']['total_packets']
+        plugin.stop_packet_queue()
+        plugin.snapshots.stop()
+
+        assert published == len(packets)
@@ -0,0 +1,87 @@
+"""
+Tests for Startup Profiler and the deferred scapy loader
+
+Focus: import timing, phase marks, binding scapy names on demand
+"""
+
+import builtins
+import sys
+
+import pytest
+
+from src.utils.startup_profiler import StartupProfiler
+from plugins.scapy_loader import bind_scapy, scapy_binder, scapy_installed
+
+
+class TestStartupProfiler:
+    """Test import and phase timing."""
+
+    def test_from_argv_requires_flag(self):
+        """Test the profiler is only installed when asked for."""
+        assert StartupProfiler.from_argv(["app_textual.py", "--mock"]) is None
+
+    def test_times_first_imports_only(self):
+        """Test new imports are recorded and the hook is removed on uninstall."""
+        sys.modules.pop("colorsys", None)
+        original = builtins.__import__
+        profiler = StartupProfiler()
+        profiler.install()
+        try:
+            import colorsys  # noqa: F401
+            import os  # noqa: F401  (already loaded: not recorded)
+        finally:
+            profiler.uninstall()
+
+        assert builtins.__import__ is original
+        assert "colorsys" in profiler.imports
+        assert "os" not in profiler.imports
+        own, cumulative = profiler.imports["colorsys"]
+        assert 0 <= own <= cumulative
+
+    def test_report_lists_phases_and_packages(self):
+        """Test the report shows each phase and per-package totals."""
+        profiler = StartupProfiler()
+        profiler.imports = {"textual.app": (0.2, 0.3), "src.screens.x": (0.05, 0.05)}
+        profiler.mark("imports")
+        profiler.mark("first frame")
+
+        report = profiler.report()
+
+        assert "imports" in report
+        assert "first frame" in report
+        assert "total" in report
+        assert profiler.package_totals() == {"textual": 0.2, "src.screens": 0.05}
+
+
+class TestScapyLoader:
+    """Test on-demand scapy binding."""
+
+    def test_bound_names_are_kept(self):
+        """Test already-bound (e.g. patched) names are not replaced."""
+        sentinel = object()
+        namespace = {"sniff": sentinel}
+
+        assert bind_scapy(namespace, ("sniff",)) is True
+        assert namespace["sniff"] is sentinel
+
+    @pytest.mark.skipif(not scapy_installed(), reason="scapy not installed")
+    def test_missing_names_are_bound(self):
+        """Test placeholders are filled from scapy.all."""
+        namespace = {"ARP": None, "sniff": None}
+
+        assert bind_scapy(namespace, ("ARP", "sniff")) is True
+        assert namespace["ARP"].__name__ == "ARP"
+        assert callable(namespace["sniff"])
+
+    def test_binder_follows_module_flag(self):
+        """Test the module loader imports nothing while SCAPY_AVAILABLE is False."""
+        sentinel = object()
+        namespace = {"SCAPY_AVAILABLE": False, "sniff": None}
+        load = scapy_binder(namespace, ("sniff",))
+
+        assert load() is False
+        assert namespace["sniff"] is None
+
+        namespace.update(SCAPY_AVAILABLE=True, sniff=sentinel)
+        assert load() is True
+        assert namespace["SCAPY_AVAILABLE"] is True
@@ -23,8 +23,8 @@ def mock_psutil():
     """Create comprehensive psutil mock"""
     psutil = MagicMock()
 
-    # CPU
-    psutil.cpu_percent = Mock(return_value=45.2)
+    # CPU (one per-core sample per tick)
+    psutil.cpu_percent = Mock(return_value=[45.2] * 8)
     psutil.cpu_count = Mock(return_value=8)
 
     # Memory
@@ -186,8 +186,8 @@ def test_collect_data_returns_all_metrics(self, mock_time, plugin_config, mock_p
     def test_collect_data_cpu_metrics(self, mock_time, plugin_config, mock_psutil):
         """Test collect_data CPU metrics"""
         mock_time.return_value = 2000.0
-        # cpu_percent called 3 times: initialize (baseline), collect_data (overall), collect_data (per-core)
-        mock_psutil.cpu_percent = Mock(side_effect=[0.0, 45.2, [10, 20, 30, 40, 50, 60, 70, 80]])
+        # cpu_percent called twice: initialize (baseline), collect_data (single per-core sample)
+        mock_psutil.cpu_percent = Mock(side_effect=[[0.0] * 8, [10, 20, 30, 40, 50, 60, 70, 80]])
 
         plugin = SystemPlugin(plugin_config)
 
@@ -195,7 +195,7 @@ def test_collect_data_cpu_metrics(self, mock_time, plugin_config, mock_psutil):
             plugin.initialize()
             data = plugin.collect_data()
 
-        assert data["cpu_percent"] == 45.2
+        assert data["cpu_percent"] == 45.0  # Mean of the per-core sample
         assert data["cpu_percent_per_core"] == [10, 20, 30, 40, 50, 60, 70, 80]
         assert data["cpu_count"] == 8
 
@@ -278,6 +278,84 @@ def test_collect_data_omits_load_avg_when_unavailable(self, mock_time, plugin_co
         assert "load_avg_15m" not in data
 
 
+# ============================================================================
+# TIERED COLLECTION TESTS
+# ============================================================================
+
+class TestSystemPluginTiers:
+    """Test static/fast/slow tiers and their rates"""
+
+    def test_static_values_read_once(self, plugin_config, mock_psutil):
+        """Test cpu_count and boot_time are not re-read per tick"""
+        plugin = SystemPlugin(plugin_config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            for _ in range(5):
+                plugin._next_fast = 0.0
+                plugin.collect_data()
+
+        assert mock_psutil.cpu_count.call_count == 1
+        assert mock_psutil.boot_time.call_count == 1
+
+    def test_single_cpu_sample_per_tick(self, plugin_config, mock_psutil):
+        """Test one cpu_percent call (per-core) feeds both CPU fields"""
+        plugin = SystemPlugin(plugin_config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            mock_psutil.cpu_percent.reset_mock()
+            data = plugin.collect_data()
+
+        mock_psutil.cpu_percent.assert_called_once_with(interval=None, percpu=True)
+        assert data["cpu_percent"] == pytest.approx(45.2)
+
+    def test_tiers_refresh_at_own_rates(self, mock_psutil):
+        """Test the fast tier refreshes while disk/load stay cached"""
+        config = PluginConfig(name="system", config={
+            "fast_interval": 0.0, "slow_interval": 60.0
+        })
+        plugin = SystemPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            mock_psutil.disk_usage.reset_mock()
+            for _ in range(4):
+                data = plugin.collect_data()
+
+        assert mock_psutil.virtual_memory.call_count == 4
+        assert mock_psutil.disk_usage.call_count == 1
+        assert mock_psutil.getloadavg.call_count == 2  # initialize probe + first tick
+        assert data["disk_percent"] == 42.1
+
+    def test_fast_tier_cached_within_interval(self, mock_psutil):
+        """Test calls faster than fast_interval reuse the last sample"""
+        config = PluginConfig(name="system", config={"fast_interval": 60.0})
+        plugin = SystemPlugin(config)
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            first = plugin.collect_data()
+            second = plugin.collect_data()
+
+        assert mock_psutil.virtual_memory.call_count == 1
+        assert first["cpu_percent_per_core"] == second["cpu_percent_per_core"]
+        assert "uptime_seconds" in second
+
+    def test_reconfigure_changes_fast_interval(self, mock_psutil):
+        """Test a reloaded rate_ms sets the fast tier's interval"""
+        plugin = SystemPlugin(PluginConfig(name="system", rate_ms=60000))
+
+        with patch('builtins.__import__', return_value=mock_psutil):
+            plugin.initialize()
+            plugin.collect_data()
+            plugin.reconfigure(0, {})
+            plugin.collect_data()
+
+        assert plugin._fast_interval == 0.0
+        assert mock_psutil.virtual_memory.call_count == 2
+
+
 # ============================================================================
 # CLEANUP TESTS
 # ============================================================================
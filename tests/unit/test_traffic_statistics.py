@@ -9,6 +9,7 @@
 
 import pytest
 from unittest.mock import Mock, MagicMock, patch
+import json
 import time
 
 from plugins.base import PluginConfig
@@ -903,3 +904,59 @@ def test_full_statistics_cycle(self):
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
+
+
+class TestStatePersistence:
+    """Test get_state/restore_state round trip."""
+
+    def test_state_round_trip(self):
+        """Test device totals survive a JSON round trip into a new plugin."""
+        config = PluginConfig(name="traffic_stats", enabled=True, config={})
+        plugin = TrafficStatistics(config)
+        plugin.register_device("192.168.1.100", "aa:bb:cc:dd:ee:ff", "laptop")
+        plugin._update_device_stats("192.168.1.100", 1500, "TCP", is_sent=True)
+        plugin.global_stats['total_bytes'] = 1500
+        plugin.global_stats['total_packets'] = 1
+        plugin.global_stats['protocols']['TCP'] += 1
+
+        restored = TrafficStatistics(config)
+        restored.restore_state(json.loads(json.dumps(plugin.get_state())))
+
+        device = restored.devices["192.168.1.100"]
+        assert device.bytes_sent == 1500
+        assert device.hostname == "laptop"
+        assert restored.global_stats['total_bytes'] == 1500
+        assert restored.global_stats['protocols']['TCP'] == 1
+        restored.global_stats['protocols']['UDP'] += 1  # Still a defaultdict
+
+
+class TestInterfaceCounters:
+    """Test totals per capture interface."""
+
+    def test_counts_tagged_by_interface(self, monkeypatch):
+        """Test packets sniffed on several interfaces are also counted per interface."""
+        import plugins.traffic_statistics as traffic_statistics
+        from src.utils.load_generator import SyntheticLayer, SyntheticPacket
+
+        for name in ("IP", "TCP", "UDP"):
+            monkeypatch.setattr(traffic_statistics, name, name)
+
+        class SniffedPacket(SyntheticPacket):
+            __slots__ = ('sniffed_on',)
+
+        def packet(iface, dport, length):
+            p = SniffedPacket({'IP': SyntheticLayer(src="10.0.0.2", dst="1.1.1.1"),
+                               'TCP': SyntheticLayer(sport=40000, dport=dport)}, length)
+            p.sniffed_on = iface
+            return p
+
+        plugin = TrafficStatistics(PluginConfig(name="traffic_stats", config={'mock_mode': True}))
+        for p in (packet("eth0", 443, 1500), packet("eth0", 80, 500), packet("wlan0", 443, 100)):
+            plugin._process_packet(p)
+
+        data = plugin.get_data()
+        assert data['global_stats']['total_bytes'] == 2100
+        assert data['interfaces']['eth0'] == {
+            'total_bytes': 2000, 'total_packets': 2, 'protocols': {'HTTPS': 1, 'HTTP': 1}
+        }
+        assert data['interfaces']['wlan0']['total_packets'] == 1
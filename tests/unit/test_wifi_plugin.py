@@ -0,0 +1,225 @@
+"""
+Tests for WiFi Plugin - parsers and event-driven link monitor
+
+Focus: offline parsing of recorded tool output, background link state
+"""
+
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from plugins.base import PluginConfig
+from plugins.wifi_plugin import WiFiPlugin
+from plugins.wifi_link_monitor import WiFiLinkMonitor, parse_link_event
+
+
+FIXTURES = Path(__file__).parent.parent / "fixtures" / "wifi"
+
+
+def _fixture(name):
+    return (FIXTURES / name).read_text()
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestParsers:
+    """Test tool output parsers against recorded fixtures."""
+
+    def test_parse_nmcli_active_network(self):
+        """Test the in-use network is picked and BSSID escapes removed."""
+        data = WiFiPlugin._parse_nmcli(_fixture("nmcli_wifi_list.txt"), "wlan0")
+
+        assert data["ssid"] == "Maximus"
+        assert data["bssid"] == "38:16:5A:69:0C:F9"
+        assert data["channel"] == 44
+        assert data["frequency_mhz"] == 5220
+        assert data["signal_strength_percent"] == 71
+        assert data["bitrate_mbps"] == 270.0
+        assert data["security"] == "WPA2 WPA3"
+        assert data["interface"] == "wlan0"
+
+    def test_parse_nmcli_not_connected(self):
+        """Test no in-use marker means no active network."""
+        output = "\n".join(
+            line for line in _fixture("nmcli_wifi_list.txt").splitlines()
+            if not line.startswith("*")
+        )
+
+        assert WiFiPlugin._parse_nmcli(output, "wlan0") is None
+
+    def test_parse_iwconfig(self):
+        """Test iwconfig fields map to metrics."""
+        data = WiFiPlugin._parse_iwconfig(_fixture("iwconfig_wlan0.txt"), "wlan0")
+
+        assert data["ssid"] == "Maximus"
+        assert data["bssid"] == "38:16:5A:69:0C:F9"
+        assert data["frequency_mhz"] == 5220
+        assert data["channel"] == 44
+        assert data["signal_strength_dbm"] == -54
+        assert data["link_quality"] == 80
+        assert data["bitrate_mbps"] == 270.0
+
+    def test_parse_proc_wireless_exact_interface(self):
+        """Test /proc/net/wireless matches the interface name exactly."""
+        data = WiFiPlugin._parse_proc_wireless(_fixture("proc_net_wireless.txt"), "wlan0")
+
+        assert data["signal_strength_dbm"] == -54
+        assert data["signal_strength_percent"] == 92
+        assert data["link_quality"] == 56
+
+    def test_parse_proc_wireless_missing_interface(self):
+        """Test unknown interfaces return None."""
+        assert WiFiPlugin._parse_proc_wireless(_fixture("proc_net_wireless.txt"), "wlp2s0") is None
+
+    def test_parse_nmcli_monitor_events(self):
+        """Test nmcli monitor lines for our interface are link events."""
+        events = [parse_link_event(line, "wlan0")
+                  for line in _fixture("nmcli_monitor.txt").splitlines()]
+
+        assert [e for e in events if e] == ["disconnected", "changed", "changed", "connected"]
+
+    def test_parse_iw_events(self):
+        """Test iw event ignores scans and other interfaces."""
+        events = [parse_link_event(line, "wlan0")
+                  for line in _fixture("iw_event.txt").splitlines()]
+
+        assert [e for e in events if e] == ["disconnected", "connected", "changed"]
+
+
+class TestWiFiLinkMonitor:
+    """Test the background link state cache."""
+
+    def test_snapshot_is_memory_only(self):
+        """Test snapshot never calls the collectors."""
+        fetch = Mock(return_value={"ssid": "Maximus"})
+        monitor = WiFiLinkMonitor("wlan0", fetch_link=fetch, initial={"ssid": "Not Connected"})
+
+        assert monitor.snapshot() == {"ssid": "Not Connected"}
+        fetch.assert_not_called()
+
+    def test_start_fetches_link_then_signal_updates(self):
+        """Test link details load once and signal refreshes from /proc."""
+        fetch = Mock(return_value={"ssid": "Maximus", "signal_strength_dbm": -70,
+                                   "signal_strength_percent": 60, "link_quality": 60})
+        read_signal = Mock(return_value={"signal_strength_dbm": -54,
+                                         "signal_strength_percent": 92, "link_quality": 56})
+        monitor = WiFiLinkMonitor("wlan0", fetch_link=fetch, read_signal=read_signal,
+                                  signal_interval=0.01, link_refresh_interval=60)
+
+        monitor.start()
+        try:
+            assert _wait_for(lambda: monitor.stats["signal_reads"] >= 2)
+        finally:
+            monitor.stop()
+
+        data = monitor.snapshot()
+        assert data["ssid"] == "Maximus"
+        assert data["signal_strength_dbm"] == -54
+        assert fetch.call_count == 1
+
+    def test_link_event_triggers_refresh(self):
+        """Test an event line refreshes link details before the periodic deadline."""
+        states = iter([{"ssid": "Maximus"}, {"ssid": "Not Connected"}])
+        fetch = Mock(side_effect=lambda: next(states))
+        monitor = WiFiLinkMonitor("wlan0", fetch_link=fetch,
+                                  signal_interval=5, link_refresh_interval=60)
+
+        monitor.start()
+        try:
+            assert _wait_for(lambda: monitor.snapshot().get("ssid") == "Maximus")
+            assert monitor.handle_event_line("wlan0: disconnected\n") == "disconnected"
+            assert _wait_for(lambda: monitor.snapshot().get("ssid") == "Not Connected")
+        finally:
+            monitor.stop()
+
+        assert monitor.stats["events"] == 1
+
+    def test_signal_ignored_while_disconnected(self):
+        """Test stale /proc levels do not overwrite a disconnected state."""
+        monitor = WiFiLinkMonitor(
+            "wlan0", fetch_link=Mock(),
+            read_signal=Mock(return_value={"signal_strength_dbm": -54}),
+            initial={"ssid": "Not Connected", "signal_strength_dbm": -100}
+        )
+
+        monitor._refresh_signal()
+
+        assert monitor.snapshot()["signal_strength_dbm"] == -100
+
+    def test_missing_event_source_falls_back_to_polling(self):
+        """Test a missing event binary does not break the monitor."""
+        monitor = WiFiLinkMonitor("wlan0", fetch_link=Mock(return_value={"ssid": "x"}),
+                                  event_command=["definitely-not-a-real-binary"],
+                                  signal_interval=0.01)
+
+        monitor.start()
+        try:
+            assert _wait_for(lambda: monitor.stats["link_refreshes"] >= 1)
+        finally:
+            monitor.stop()
+
+
+class TestWiFiPluginEventDriven:
+    """Test WiFiPlugin wiring to the link monitor."""
+
+    @staticmethod
+    def _plugin(**options):
+        config = PluginConfig(name="wifi", rate_ms=1000,
+                              config={"interface": "wlan0", **options})
+        return WiFiPlugin(config)
+
+    def test_collect_data_reads_monitor_without_subprocess(self):
+        """Test event-driven collection never spawns a process on the caller's thread."""
+        plugin = self._plugin()
+
+        with patch.object(WiFiPlugin, '_has_nmcli', return_value=True), \
+                patch.object(WiFiPlugin, '_start_link_monitor'):
+            plugin.initialize()
+        plugin._link_monitor = Mock()
+        plugin._link_monitor.snapshot.return_value = {"ssid": "Maximus"}
+
+        with patch('subprocess.run') as mock_run:
+            assert plugin.collect_data() == {"ssid": "Maximus"}
+            mock_run.assert_not_called()
+
+    def test_event_command_prefers_nmcli_monitor(self):
+        """Test the event source follows the detected method."""
+        plugin = self._plugin()
+        plugin._method = 'nmcli'
+        assert plugin._event_command() == ['nmcli', 'monitor']
+
+        plugin._method = 'iwconfig'
+        with patch('shutil.which', return_value='/usr/sbin/iw'):
+            assert plugin._event_command() == ['iw', 'event']
+        with patch('shutil.which', return_value=None):
+            assert plugin._event_command() is None
+
+    def test_polling_mode_still_available(self):
+        """Test event_driven=False keeps per-collection polling."""
+        plugin = self._plugin(event_driven=False)
+
+        with patch.object(WiFiPlugin, '_has_nmcli', return_value=True):
+            plugin.initialize()
+        assert plugin._link_monitor is None
+
+        with patch.object(plugin, '_collect_nmcli', return_value={"ssid": "Maximus"}) as mock_collect:
+            assert plugin.collect_data() == {"ssid": "Maximus"}
+            mock_collect.assert_called_once()
+
+    def test_cleanup_stops_monitor(self):
+        """Test cleanup stops the background monitor."""
+        plugin = self._plugin()
+        monitor = Mock()
+        plugin._link_monitor = monitor
+
+        plugin.cleanup()
+
+        monitor.stop.assert_called_once()
+        assert plugin._link_monitor is None
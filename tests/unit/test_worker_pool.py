@@ -0,0 +1,283 @@
+"""
+Tests for Worker Pool - multi-process analysis sharded by flow
+
+Focus: the shared-memory ring, the symmetric frame hash, plugin partial
+aggregates and merged totals matching single-process analysis
+"""
+
+import pickle
+import queue
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import plugins.traffic_statistics as traffic_statistics
+from plugins.base import Plugin, PluginConfig
+from plugins.dns_monitor_plugin import DNSMonitorPlugin
+from plugins.http_sniffer_plugin import HTTPSnifferPlugin
+from plugins.shm_ring import ShmRing, frame_flow_hash
+from plugins.traffic_statistics import TrafficStatistics
+from plugins.worker_pool import WorkerPool
+from src.utils.load_generator import KIND_ARP, KIND_DNS_QUERY, SyntheticLoadGenerator
+
+
+class RecordingSink:
+    """Event sink keeping every event."""
+
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event, record, source=None):
+        self.events.append((event, source))
+
+
+@pytest.fixture
+def ring():
+    ring = ShmRing(256)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+class TestShmRing:
+    """Test the SPSC frame ring."""
+
+    def test_round_trip(self, ring):
+        """Test frames come out in order with their timestamps."""
+        assert ring.put(b"first", 1.5)
+        assert ring.put(b"second frame", 2.5)
+
+        assert ring.get_batch() == [(b"first", 1.5), (b"second frame", 2.5)]
+        assert ring.get_batch() == []
+
+    def test_wraps_around(self, ring):
+        """Test records never split across the end of the block."""
+        seen = []
+        for i in range(50):
+            frame = bytes([i]) * (20 + i % 30)
+            assert ring.put(frame, float(i))
+            seen += ring.get_batch()
+
+        assert [ts for _, ts in seen] == [float(i) for i in range(50)]
+        assert all(frame == bytes([i]) * (20 + i % 30) for i, (frame, _) in enumerate(seen))
+
+    def test_full_ring_drops(self, ring):
+        """Test a full ring refuses frames and counts them."""
+        results = [ring.put(b"x" * 50) for _ in range(10)]
+        stats = ring.stats()
+
+        assert results.count(False) == stats['dropped'] > 0
+        assert stats['written'] == results.count(True)
+        assert stats['high_water_bytes'] <= stats['capacity_bytes']
+
+        ring.get_batch()
+        assert ring.put(b"x" * 50)
+        assert ring.stats()['read'] == results.count(True)
+
+    def test_attach_from_name(self, ring):
+        """Test a second handle on the block sees the same records."""
+        consumer = ShmRing.attach(ring.name, ring.capacity)
+        try:
+            ring.put(b"shared", 3.0)
+            assert consumer.get_batch() == [(b"shared", 3.0)]
+            assert ring.stats()['read'] == 1
+        finally:
+            consumer.close()
+
+
+class TestFrameFlowHash:
+    """Test sharding of raw Ethernet frames."""
+
+    def test_symmetric(self):
+        """Test both directions of a flow land on the same worker."""
+        ether = b"\x00" * 12 + b"\x08\x00"
+
+        def ipv4(src, dst, sport, dport):
+            header = bytes([0x45, 0, 0, 28, 0, 0, 0, 0, 64, 17, 0, 0]) + bytes(src) + bytes(dst)
+            return ether + header + sport.to_bytes(2, "big") + dport.to_bytes(2, "big") + b"\x00" * 4
+
+        forward = ipv4([10, 0, 0, 2], [1, 1, 1, 1], 40000, 53)
+        reverse = ipv4([1, 1, 1, 1], [10, 0, 0, 2], 53, 40000)
+
+        assert frame_flow_hash(forward) == frame_flow_hash(reverse)
+        assert frame_flow_hash(forward) != frame_flow_hash(ipv4([10, 0, 0, 2], [1, 1, 1, 1], 40001, 53))
+
+    def test_non_ip_frames(self):
+        """Test ARP and truncated frames go to shard 0."""
+        assert frame_flow_hash(b"\x00" * 12 + b"\x08\x06" + b"\x00" * 28) == 0
+        assert frame_flow_hash(b"\x00" * 14) == 0
+
+    def test_spreads_generated_traffic(self):
+        """Test synthetic flows spread over every shard."""
+        gen = SyntheticLoadGenerator(seed=3, flows=2000)
+        shards = np.bincount([frame_flow_hash(f) % 4 for f in gen.frames(gen.batch(4000))], minlength=4)
+
+        assert shards.min() > 500
+
+
+@pytest.fixture
+def synthetic_layers(monkeypatch):
+    """Let TrafficStatistics look SyntheticPacket layers up by name without scapy."""
+    for name in ("IP", "TCP", "UDP"):
+        monkeypatch.setattr(traffic_statistics, name, name)
+
+
+def split(plugin_class, packets, shards=3, **config):
+    """Analyse ``packets`` in ``shards`` instances and merge their partials."""
+    merged = plugin_class(PluginConfig(name="merged", config=config))
+    workers = [plugin_class(PluginConfig(name=f"w{i}", config=config)) for i in range(shards)]
+    handler = plugin_class.packet_handlers[0]
+    for i, packet in enumerate(packets):
+        getattr(workers[i % shards], handler)(packet)
+        if i % 997 == 0:  # Ship mid-stream, like the merge interval
+            for worker in workers:
+                partial = worker.take_partial()
+                if partial:
+                    merged.merge_partial(partial)
+    for worker in workers:
+        partial = worker.take_partial()
+        if partial:
+            merged.merge_partial(partial)
+    return merged
+
+
+class TestPartials:
+    """Test take_partial()/merge_partial() add up to single-process analysis."""
+
+    def test_dns_monitor(self):
+        """Test merged DNS counters equal one instance's."""
+        gen = SyntheticLoadGenerator(seed=4, domains=500)
+        packets = gen.records(gen.batch(5000))
+        single = DNSMonitorPlugin(PluginConfig(name="dns_monitor"))
+        for packet in packets:
+            single._process_dns_packet(packet)
+
+        merged = split(DNSMonitorPlugin, packets)
+
+        assert merged.stats['total_queries'] == single.stats['total_queries']
+        assert merged.domain_counter == single.domain_counter
+        assert merged.query_types == single.query_types
+        assert len(merged.recent_queries) == 100
+        assert merged.take_partial() is not None  # the merged view is a plugin too
+
+    def test_http_sniffer(self):
+        """Test merged HTTP counters and hosts equal one instance's."""
+        gen = SyntheticLoadGenerator(seed=5, mix={'http': 1.0})
+        packets = gen.records(gen.batch(600))
+
+        merged = split(HTTPSnifferPlugin, packets)
+
+        assert merged.stats['http_requests'] == 600
+        assert merged.hosts_seen <= set(gen.domains)
+        assert len(merged.http_requests) == 100
+
+    def test_traffic_statistics(self, synthetic_layers):
+        """Test merged totals and per-device counters equal one instance's."""
+        gen = SyntheticLoadGenerator(seed=11, devices=50, flows=1000)
+        batch = gen.batch(8000)
+        packets = gen.records(batch)
+        single = TrafficStatistics(PluginConfig(name="traffic_statistics", config={'mock_mode': True}))
+        for packet in packets:
+            single._process_packet(packet)
+
+        merged = split(TrafficStatistics, packets, mock_mode=True)
+
+        assert merged.global_stats['total_packets'] == int(np.sum(batch.kind != KIND_ARP))
+        assert merged.global_stats['total_bytes'] == single.global_stats['total_bytes']
+        assert dict(merged.global_stats['protocols']) == dict(single.global_stats['protocols'])
+        assert {ip: d.total_bytes for ip, d in merged.devices.items() if d.total_packets} == \
+            {ip: d.total_bytes for ip, d in single.devices.items() if d.total_packets}
+
+
+class TestWorkerPool:
+    """Test the pool end to end (frames fed with dispatch(), no capture socket)."""
+
+    def test_rejects_plugins_without_partials(self):
+        """Test only plugins with take_partial() can be sharded."""
+        class Plain(Plugin):
+            packet_handlers = ("handle",)
+
+        with pytest.raises(ValueError):
+            WorkerPool(workers=2).add(PluginConfig(name="plain"), Plain)
+        with pytest.raises(ValueError):
+            WorkerPool(workers=0)
+
+    def test_merged_totals_match(self, synthetic_layers):
+        """Test N workers' merged counts equal single-process analysis."""
+        gen = SyntheticLoadGenerator(seed=8, devices=50, domains=300, flows=500)
+        batch = gen.batch(20000)
+        records, frames = gen.records(batch), gen.frames(batch)
+
+        pool = WorkerPool(workers=3, merge_interval=0.05, decoder="pickle:loads", context="fork")
+        dns = pool.add(PluginConfig(name="dns_monitor", rate_ms=500), DNSMonitorPlugin)
+        traffic = pool.add(PluginConfig(name="traffic_statistics", config={'mock_mode': True}),
+                           TrafficStatistics)
+        sink = RecordingSink()
+        dns.event_sink = sink
+        dns.initialize()  # starts the pool
+        traffic.initialize()
+        assert pool.running
+        try:
+            for record, frame in zip(records, frames):
+                shard = frame_flow_hash(frame) % pool.workers
+                while not pool.dispatch(pickle.dumps(record), record.time, shard=shard):
+                    time.sleep(0.001)  # worker behind: wait rather than drop
+            stats = dns.capture_stats()
+            assert stats['policy'] == "3 workers"
+            assert len(stats['workers']) == 3
+        finally:
+            dns.stop()
+            assert pool.running  # still shared with traffic_statistics
+            traffic.stop()
+        assert not pool.running
+
+        data = dns.get_data()
+        assert data['stats']['total_queries'] == int(np.sum(batch.kind == KIND_DNS_QUERY))
+        assert sink.events.count(("dns_query", "dns_monitor")) == data['stats']['total_queries']
+        assert dns.stats is pool.view("dns_monitor").stats
+        assert traffic.get_data()['global_stats']['total_packets'] == int(np.sum(batch.kind != KIND_ARP))
+        assert pool.stats['merge_errors'] == 0
+
+    def test_last_partial_then_idle(self):
+        """Test the merge thread publishes a partial once the workers go quiet."""
+        gen = SyntheticLoadGenerator(seed=9, domains=50)
+        worker = DNSMonitorPlugin(PluginConfig(name="dns_monitor"))
+        for packet in gen.records(gen.batch(200)):
+            worker._process_dns_packet(packet)
+        queries = worker.stats['total_queries']
+        pool = WorkerPool(workers=1)
+        pool.add(PluginConfig(name="dns_monitor", config={'snapshot_ms': 50}), DNSMonitorPlugin)
+        view = pool.view("dns_monitor")
+        view.snapshots.start()
+        view.snapshots.tick()  # not due: the interval starts now
+
+        pool._results = queue.Queue()
+        pool._merging = True
+        merger = threading.Thread(target=pool._merge_loop)
+        merger.start()
+        try:
+            pool._results.put((0, {'dns_monitor': worker.take_partial()}, {}, {}))
+            deadline = time.monotonic() + 2.0
+            published = 0
+            while not published and time.monotonic() < deadline:
+                time.sleep(0.05)
+                published = view.get_data()['stats']['total_queries']
+        finally:
+            pool._merging = False
+            merger.join()
+            view.snapshots.stop()
+
+        assert published == queries > 0
+
+    def test_rebuild_keeps_merged_view(self):
+        """Test re-adding a plugin (plugin set rebuilt) keeps its counts."""
+        pool = WorkerPool(workers=1)
+        pool.add(PluginConfig(name="dns_monitor"), DNSMonitorPlugin)
+        view = pool.view("dns_monitor")
+
+        pool.add(PluginConfig(name="dns_monitor"), DNSMonitorPlugin)
+
+        assert pool.view("dns_monitor") is view
+        assert pool.capture_filter() == "(udp port 53)"